@@ -0,0 +1,239 @@
+"""
+agent/agent_pool.py
+
+Pool vorgewaermter Agenten-Instanzen fuer die AgentRegistry.
+
+Der Bau eines BaseAgent ist teuer: Modell-/Provider-Aufloesung, HTTP-Clients,
+Context-Guard, Lanes und der System-Prompt mit Tool-Manifest. Bei kurzen
+Lookups dominiert dieser Setup die Delegations-Latenz. Der Pool haelt je
+Agent-Typ bis zu ``max`` Instanzen, die exklusiv ausgeliehen und nach jeder
+Nutzung zurueckgesetzt werden (``reset_for_reuse()``).
+
+- ``min``: so viele Instanzen baut ``prewarm()`` beim MCP-Start vor.
+- ``max``: so viele Instanzen behaelt der Pool. Lastspitzen darueber hinaus
+  bekommen eine Ueberlauf-Instanz, die nach der Nutzung verworfen wird —
+  Delegationen warten nie auf einen freien Pool-Platz.
+
+Aendert sich das Tool-Manifest, verwirft ``invalidate()`` die freien
+Instanzen; ausgeliehene werden bei der Rueckgabe aussortiert.
+
+Konfiguration:
+    AGENT_POOL_ENABLED       (default: true)
+    AGENT_POOL_DEFAULT_MIN   (default: 0)
+    AGENT_POOL_DEFAULT_MAX   (default: 3)
+    AGENT_POOL_SIZES         (default: "executor=1:4,research=1:3")
+                             Komma-Liste ``agent=min:max`` je Agent-Typ
+
+USAGE:
+    pool = AgentInstancePool()
+    agent = pool.acquire("research", build=lambda: ResearchAgent(tools_desc))
+    try:
+        await agent.run(task)
+    finally:
+        pool.release("research", agent)
+    pool.stats()   # Auslastung je Agent-Typ (/agent_status)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger("AgentInstancePool")
+
+_DEFAULT_POOL_SIZES = "executor=1:4,research=1:3"
+
+
+def agent_pool_enabled() -> bool:
+    return os.getenv("AGENT_POOL_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def parse_pool_sizes(raw: str) -> Dict[str, Tuple[int, int]]:
+    """Parst ``"executor=1:4,research=1:3"`` zu ``{"executor": (1, 4), ...}``."""
+    sizes: Dict[str, Tuple[int, int]] = {}
+    for item in str(raw or "").split(","):
+        name, _, bounds = item.partition("=")
+        name = name.strip().lower()
+        if not name or not bounds:
+            continue
+        min_raw, _, max_raw = bounds.partition(":")
+        try:
+            min_size = max(0, int(min_raw.strip() or 0))
+            max_size = int(max_raw.strip()) if max_raw.strip() else max(1, min_size)
+        except ValueError:
+            log.warning("AGENT_POOL_SIZES: ungueltiger Eintrag '%s' ignoriert", item.strip())
+            continue
+        sizes[name] = (min_size, max(min_size, max_size))
+    return sizes
+
+
+def reset_agent_instance(instance: Any) -> None:
+    """Setzt delegationsspezifischen Zustand einer Instanz zurueck."""
+    reset = getattr(instance, "reset_for_reuse", None)
+    if callable(reset):
+        reset()
+
+
+@dataclass
+class _TypePool:
+    min_size: int
+    max_size: int
+    idle: List[Any] = field(default_factory=list)
+    members: Dict[int, Any] = field(default_factory=dict)
+    in_use: int = 0
+    overflow_in_use: int = 0
+    created: int = 0
+    acquires: int = 0
+    reused: int = 0
+    overflow_total: int = 0
+    discarded: int = 0
+    peak_in_use: int = 0
+    generation: int = 0
+    member_generation: Dict[int, int] = field(default_factory=dict)
+
+
+class AgentInstancePool:
+    """Exklusiv ausleihbare, wiederverwendbare Agenten-Instanzen je Agent-Typ."""
+
+    def __init__(self, sizes: Optional[Dict[str, Tuple[int, int]]] = None) -> None:
+        self._sizes = dict(sizes) if sizes is not None else parse_pool_sizes(
+            os.getenv("AGENT_POOL_SIZES", _DEFAULT_POOL_SIZES)
+        )
+        self._default_min = _env_int("AGENT_POOL_DEFAULT_MIN", 0)
+        self._default_max = max(1, _env_int("AGENT_POOL_DEFAULT_MAX", 3))
+        self._pools: Dict[str, _TypePool] = {}
+
+    # ── Konfiguration ──────────────────────────────────────────────────────
+
+    def bounds(self, name: str) -> Tuple[int, int]:
+        min_size, max_size = self._sizes.get(name, (self._default_min, self._default_max))
+        return min_size, max(1, max_size)
+
+    def _pool(self, name: str) -> _TypePool:
+        pool = self._pools.get(name)
+        if pool is None:
+            min_size, max_size = self.bounds(name)
+            pool = self._pools[name] = _TypePool(min_size=min_size, max_size=max_size)
+        return pool
+
+    # ── Ausleihen / Zurueckgeben ───────────────────────────────────────────
+
+    def adopt(self, name: str, instance: Any) -> None:
+        """Uebernimmt eine extern gebaute Instanz als freies Pool-Mitglied."""
+        pool = self._pool(name)
+        key = id(instance)
+        if key in pool.members or len(pool.members) >= pool.max_size:
+            return
+        pool.members[key] = instance
+        pool.member_generation[key] = pool.generation
+        pool.idle.append(instance)
+
+    def acquire(self, name: str, *, build: Callable[[], Any]) -> Any:
+        """Leiht eine freie Instanz aus oder baut eine neue (ggf. als Ueberlauf)."""
+        pool = self._pool(name)
+        pool.acquires += 1
+        if pool.idle:
+            instance = pool.idle.pop()
+            pool.reused += 1
+            pool.in_use += 1
+        elif len(pool.members) < pool.max_size:
+            instance = build()
+            pool.created += 1
+            key = id(instance)
+            pool.members[key] = instance
+            pool.member_generation[key] = pool.generation
+            pool.in_use += 1
+        else:
+            instance = build()
+            pool.created += 1
+            pool.overflow_total += 1
+            pool.overflow_in_use += 1
+        pool.peak_in_use = max(pool.peak_in_use, pool.in_use + pool.overflow_in_use)
+        return instance
+
+    def release(self, name: str, instance: Any, *, reusable: bool = True) -> None:
+        """Gibt eine Instanz zurueck; defekte oder veraltete werden verworfen."""
+        pool = self._pool(name)
+        key = id(instance)
+        if pool.members.get(key) is not instance:
+            pool.overflow_in_use = max(0, pool.overflow_in_use - 1)
+            return
+        pool.in_use = max(0, pool.in_use - 1)
+        if reusable and pool.member_generation.get(key) == pool.generation:
+            try:
+                reset_agent_instance(instance)
+            except Exception as exc:
+                log.warning("Agent-Pool: Reset von %s fehlgeschlagen: %s", name, exc)
+                reusable = False
+            if reusable:
+                pool.idle.append(instance)
+                return
+        self._drop_member(pool, key)
+
+    def _drop_member(self, pool: _TypePool, key: int) -> None:
+        pool.members.pop(key, None)
+        pool.member_generation.pop(key, None)
+        pool.discarded += 1
+
+    def owns(self, name: str, instance: Any) -> bool:
+        pool = self._pools.get(name)
+        return bool(pool and pool.members.get(id(instance)) is instance)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Verwirft freie Instanzen (z.B. nach Aenderung des Tool-Manifests)."""
+        for pool_name, pool in list(self._pools.items()):
+            if name is not None and pool_name != name:
+                continue
+            pool.generation += 1
+            for instance in pool.idle:
+                self._drop_member(pool, id(instance))
+            pool.idle.clear()
+
+    # ── Vorwaermen ─────────────────────────────────────────────────────────
+
+    def missing_warm_instances(self, name: str) -> int:
+        pool = self._pool(name)
+        return max(0, pool.min_size - len(pool.members))
+
+    def add_warm_instance(self, name: str, instance: Any) -> None:
+        pool = self._pool(name)
+        pool.created += 1
+        self.adopt(name, instance)
+
+    # ── Reporting ──────────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        agents: Dict[str, Dict[str, Any]] = {}
+        for name, pool in sorted(self._pools.items()):
+            in_use = pool.in_use + pool.overflow_in_use
+            agents[name] = {
+                "min": pool.min_size,
+                "max": pool.max_size,
+                "size": len(pool.members),
+                "idle": len(pool.idle),
+                "in_use": in_use,
+                "overflow_in_use": pool.overflow_in_use,
+                "utilization": round(in_use / pool.max_size, 3),
+                "peak_in_use": pool.peak_in_use,
+                "acquires": pool.acquires,
+                "reused": pool.reused,
+                "reuse_ratio": round(pool.reused / pool.acquires, 3) if pool.acquires else 0.0,
+                "created": pool.created,
+                "overflow_total": pool.overflow_total,
+                "discarded": pool.discarded,
+            }
+        return {
+            "enabled": agent_pool_enabled(),
+            "total_size": sum(item["size"] for item in agents.values()),
+            "total_in_use": sum(item["in_use"] for item in agents.values()),
+            "agents": agents,
+        }
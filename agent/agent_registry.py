@@ -20,6 +20,7 @@ from typing import Dict, Any, List, Optional, Callable
 from dataclasses import dataclass, field
 from contextvars import ContextVar
 
+from agent.agent_pool import AgentInstancePool, agent_pool_enabled
 from agent.shared.delegation_handoff import parse_delegation_handoff
 from agent.providers import ModelConfigurationError
 from orchestration.approval_auth_contract import normalize_phase_d_workflow_payload
@@ -106,21 +107,39 @@ class AgentRegistry:
     def __init__(self):
         self._specs: Dict[str, AgentSpec] = {}
         self._instances: Dict[str, Any] = {}
+        # Vorgewaermte, exklusiv ausleihbare Instanzen je Agent-Typ
+        self._pool = AgentInstancePool()
         self._tools_description: Optional[str] = None
         # Task-lokaler Delegation-Stack: verhindert False-Positives bei Parallel-Requests.
         self._delegation_stack_var: ContextVar[tuple[str, ...]] = ContextVar(
             "timus_delegation_stack", default=()
         )
+        # Task-lokal ausgeliehene Instanzen (Agent-Name, Instanz) dieser Delegationskette
+        self._borrowed_var: ContextVar[tuple[tuple[str, Any], ...]] = ContextVar(
+            "timus_borrowed_agents", default=()
+        )
+        # id(Instanz) -> Anzahl laufender Ausleihen (Pool und Singleton-Pfad)
+        self._lent: Dict[int, int] = {}
 
     def _resolve_effective_session_id(
         self, from_agent: str, session_id: Optional[str]
     ) -> Optional[str]:
-        """Leitet effektive Session-ID aus Parameter oder Source-Agent ab."""
+        """Leitet effektive Session-ID aus Parameter oder Source-Agent ab.
+
+        Massgeblich ist die Instanz, die diese Delegationskette fuer den
+        Source-Agenten ausgeliehen hat — mit Pool laufen mehrere Instanzen
+        desselben Typs parallel. Eine ausserhalb der Kette ausgeliehene
+        Instanz gehoert einem anderen Task und wird ignoriert.
+        """
         if session_id:
             return session_id
 
+        for name, instance in reversed(self._borrowed_var.get()):
+            if name == from_agent:
+                return getattr(instance, "conversation_session_id", None)
+
         source_instance = self._instances.get(from_agent)
-        if source_instance is not None:
+        if source_instance is not None and not self._lent.get(id(source_instance)):
             return getattr(source_instance, "conversation_session_id", None)
         return None
 
@@ -242,6 +261,133 @@ class AgentRegistry:
             log.info(f"Agent instanziiert: {name} ({spec.factory.__name__})")
         return self._instances[name]
 
+    def set_tools_description(self, description: str) -> None:
+        """Setzt das Tool-Manifest; gepoolte Instanzen mit altem Manifest verfallen."""
+        if description and description != self._tools_description:
+            if self._tools_description:
+                self._pool.invalidate()
+                for name, instance in list(self._instances.items()):
+                    if not self._pool.owns(name, instance):
+                        self._instances.pop(name, None)
+            self._tools_description = description
+
+    def _build_instance(self, name: str, tools_desc: str) -> Any:
+        spec = self._specs[name]
+        instance = spec.factory(tools_desc, **spec.extra_kwargs)
+        log.info(f"Agent instanziiert: {name} ({spec.factory.__name__})")
+        return instance
+
+    async def _acquire_instance(self, name: str, *, fetch_tools: bool = True) -> Any:
+        """Leiht eine Instanz exklusiv aus dem Pool aus.
+
+        Ohne Pool (AGENT_POOL_ENABLED=false) gilt das alte Verhalten:
+        delegate() teilt sich die Lazy-Singleton-Instanz, parallele Tasks
+        (fetch_tools=False) bekommen jeweils eine frische Instanz.
+        """
+        if not agent_pool_enabled():
+            if fetch_tools:
+                instance = await self._get_or_create(name)
+            else:
+                instance = self._build_instance(name, self._tools_description or "")
+            return self._mark_borrowed(name, instance)
+
+        primary = self._instances.get(name)
+        # Nur eine freie Instanz uebernehmen: ein gerade (ausserhalb des Pools
+        # oder als Ueberlauf) ausgeliehener Singleton darf nicht doppelt in den Pool.
+        if primary is not None and not self._lent.get(id(primary)):
+            self._pool.adopt(name, primary)
+        tools_desc = self._tools_description or ""
+        if fetch_tools and not self._pool.stats()["agents"].get(name, {}).get("idle"):
+            tools_desc = await self._get_tools_description()
+        instance = self._pool.acquire(name, build=lambda: self._build_instance(name, tools_desc))
+        if self._pool.owns(name, instance):
+            self._instances.setdefault(name, instance)
+        return self._mark_borrowed(name, instance)
+
+    def _mark_borrowed(self, name: str, instance: Any) -> Any:
+        self._lent[id(instance)] = self._lent.get(id(instance), 0) + 1
+        self._borrowed_var.set(self._borrowed_var.get() + ((name, instance),))
+        return instance
+
+    def _release_instance(self, name: str, instance: Any, *, reusable: bool) -> None:
+        if instance is None:
+            return
+        borrowed = self._borrowed_var.get()
+        for idx in range(len(borrowed) - 1, -1, -1):
+            if borrowed[idx][1] is instance:
+                self._borrowed_var.set(borrowed[:idx] + borrowed[idx + 1:])
+                break
+        remaining = self._lent.get(id(instance), 0) - 1
+        if remaining > 0:
+            self._lent[id(instance)] = remaining
+        else:
+            self._lent.pop(id(instance), None)
+        if not agent_pool_enabled():
+            return
+        self._pool.release(name, instance, reusable=reusable)
+        if not self._pool.owns(name, instance) and self._instances.get(name) is instance:
+            self._instances.pop(name, None)
+
+    async def prewarm_pool(self, names: Optional[List[str]] = None) -> Dict[str, int]:
+        """Baut je Agent-Typ die konfigurierte Mindestzahl Instanzen vor."""
+        if not agent_pool_enabled():
+            return {}
+        tools_desc = self._tools_description or ""
+        warmed: Dict[str, int] = {}
+        for name in names or list(self._specs):
+            if name not in self._specs:
+                continue
+            for _ in range(self._pool.missing_warm_instances(name)):
+                try:
+                    instance = self._build_instance(name, tools_desc)
+                except Exception as exc:
+                    log.warning("Agent-Pool: Vorwaermen von %s fehlgeschlagen: %s", name, exc)
+                    break
+                self._pool.add_warm_instance(name, instance)
+                self._instances.setdefault(name, instance)
+                warmed[name] = warmed.get(name, 0) + 1
+                # Konstruktion ist synchron — Event-Loop zwischendurch freigeben
+                await asyncio.sleep(0)
+        return warmed
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return self._pool.stats()
+
+    @staticmethod
+    def _compose_dependent_task(task_desc: str, upstream: List[Dict[str, Any]]) -> str:
+        """Reicht Ergebnisse erledigter Abhaengigkeiten an den Folge-Task weiter.
+
+        Platzhalter {{task_id}} im Task-Text werden durch das Ergebnis ersetzt,
+        alle uebrigen Abhaengigkeiten landen als Block hinter der Aufgabe.
+        """
+        try:
+            max_chars = max(200, int(os.getenv("DELEGATE_DAG_INPUT_MAX_CHARS", "4000")))
+        except ValueError:
+            max_chars = 4000
+        text = str(task_desc or "")
+        blocks: List[str] = []
+        for payload in upstream:
+            dep_id = str(payload.get("task_id") or "")
+            result_text = str(payload.get("result") or "")
+            if len(result_text) > max_chars:
+                result_text = result_text[:max_chars] + " …[gekuerzt]"
+            placeholder = "{{" + dep_id + "}}"
+            if dep_id and placeholder in text:
+                text = text.replace(placeholder, result_text)
+                continue
+            lines = [f"[{dep_id} | {payload.get('agent', '')} | {payload.get('status', '')}]", result_text]
+            paths = [
+                str(item.get("path"))
+                for item in (payload.get("artifacts") or [])
+                if isinstance(item, dict) and item.get("path")
+            ]
+            if paths:
+                lines.append("Artefakte: " + ", ".join(paths))
+            blocks.append("\n".join(lines))
+        if not blocks:
+            return text
+        return text + "\n\n# ERGEBNISSE VORHERIGER SCHRITTE\n" + "\n\n".join(blocks)
+
     # Strings die auf ein nur teilweise abgeschlossenes Ergebnis hinweisen
     _PARTIAL_MARKERS = frozenset({"Limit erreicht.", "Max Iterationen."})
     _PARTIAL_TEXT_PATTERNS = (
@@ -895,8 +1041,9 @@ class AgentRegistry:
         progress_state: Dict[str, Any] = {}
         last_error: Optional[Exception] = None
         last_timeout_phase = "run"
+        agent_reusable = False
         try:
-            agent = await self._get_or_create(to_agent)
+            agent = await self._acquire_instance(to_agent)
             if hasattr(agent, "conversation_session_id"):
                 target_has_session_attr = True
                 previous_session_id = getattr(agent, "conversation_session_id", None)
@@ -975,6 +1122,7 @@ class AgentRegistry:
 
             if last_error is not None:
                 raise last_error
+            agent_reusable = True
 
             raw_result_str = AgentRegistry._stringify_delegation_result(raw)
             explicit_specialist_signal = parse_specialist_signal_response(raw_result_str)
@@ -1509,6 +1657,7 @@ class AgentRegistry:
                     setattr(agent, "_delegation_context", previous_delegation_context)
                 elif hasattr(agent, "_delegation_context"):
                     delattr(agent, "_delegation_context")
+            self._release_instance(to_agent, agent, reusable=agent_reusable)
             self._delegation_stack_var.reset(stack_token)
 
     @staticmethod
@@ -1902,8 +2051,16 @@ class AgentRegistry:
         Fan-Out: Startet mehrere unabhaengige Tasks parallel.
         Fan-In:  Bündelt alle Ergebnisse strukturiert zurueck.
 
-        Jeder Task bekommt eine FRISCHE Agenten-Instanz (kein Singleton-Conflict
-        wenn z.B. 2x research gleichzeitig laeuft).
+        Tasks duerfen per ``depends_on: ["t1", ...]`` auf andere Tasks verweisen.
+        Dann laeuft die Batch als Abhaengigkeitsgraph: jeder Task startet, sobald
+        seine Abhaengigkeiten fertig sind (nicht erst nach der ganzen Stufe), und
+        bekommt deren Ergebnisse in den Task-Text. Parallelitaet bleibt durch das
+        Budget-Cap begrenzt; Wartende belegen keinen Slot. Scheitert eine
+        Abhaengigkeit, wird der Folge-Task mit status=error uebersprungen.
+
+        Jeder laufende Task bekommt eine EIGENE Agenten-Instanz (kein
+        Singleton-Conflict wenn z.B. 2x research gleichzeitig laeuft). Instanzen
+        fertiger Tasks gehen in einen warmen Pool und werden wiederverwendet.
 
         MemoryAccessGuard setzt read-only pro asyncio-Task via ContextVar —
         Worker A und B beeinflussen sich gegenseitig nicht.
@@ -2021,8 +2178,11 @@ class AgentRegistry:
                 payload["error"] = result.error
             return payload
 
-        async def run_single(task: Dict[str, Any]) -> Dict[str, Any]:
-            task_id    = task.get("task_id") or f"t{uuid.uuid4().hex[:6]}"
+        async def run_single(
+            task: Dict[str, Any],
+            task_id: str,
+            upstream: Optional[List[Dict[str, Any]]] = None,
+        ) -> Dict[str, Any]:
             agent_name = self.normalize_agent_name(task.get("agent", ""))
             task_desc  = task.get("task", "")
             _default_timeout = AgentRegistry._select_delegation_timeout(agent_name, task_desc)
@@ -2041,6 +2201,9 @@ class AgentRegistry:
                 )
 
             async with semaphore:
+                fresh_agent = None
+                instance_reusable = False
+                target_has_session_attr = False
                 try:
                     # Schritt 1: Spec prüfen
                     spec = self._specs.get(agent_name)
@@ -2057,9 +2220,13 @@ class AgentRegistry:
                             ),
                         )
 
-                    # Schritt 2: FRISCHE Instanz erstellen (kein Singleton-Conflict)
-                    tools_desc = self._tools_description or ""
-                    fresh_agent = spec.factory(tools_desc, **spec.extra_kwargs)
+                    # Schritt 2: Eigene Instanz ausleihen (warm aus dem Pool oder neu)
+                    fresh_agent = await self._acquire_instance(agent_name, fetch_tools=False)
+                    run_task_desc = (
+                        AgentRegistry._compose_dependent_task(task_desc, upstream)
+                        if upstream
+                        else task_desc
+                    )
                     previous_session_id: Optional[str] = None
                     target_has_session_attr = False
                     had_progress_callback = False
@@ -2103,11 +2270,12 @@ class AgentRegistry:
                     # Schritt 5: Task ausfuehren
                     raw = await AgentRegistry._run_agent_with_watchdog(
                         fresh_agent,
-                        task_desc,
+                        run_task_desc,
                         timeout=timeout,
                         progress_timeout=progress_timeout,
                         progress_event=progress_event,
                     )
+                    instance_reusable = True
 
                     # Schritt 6: read-only zuruecksetzen
                     MemoryAccessGuard.set_read_only(False)
@@ -2176,12 +2344,71 @@ class AgentRegistry:
                                 setattr(fresh_agent, "_delegation_progress_callback", previous_progress_callback)
                             elif hasattr(fresh_agent, "_delegation_progress_callback"):
                                 delattr(fresh_agent, "_delegation_progress_callback")
+                        # Nur sauber beendete Runs wiederverwenden — abgebrochene
+                        # Instanzen koennen halbfertigen Loop-State tragen.
+                        self._release_instance(agent_name, fresh_agent, reusable=instance_reusable)
                     except Exception:
                         pass
 
+        dependency_graph: Dict[str, List[str]] = dict(policy_decision.get("dependency_graph") or {})
+        if dependency_graph:
+            # Bei deklarierten Kanten sind die IDs eindeutig (Policy prueft das).
+            task_ids = [
+                str(t.get("task_id") or f"task-{idx}") for idx, t in enumerate(tasks, start=1)
+            ]
+        else:
+            task_ids = [str(t.get("task_id") or f"t{uuid.uuid4().hex[:6]}") for t in tasks]
+        index_by_id = {task_id: idx for idx, task_id in enumerate(task_ids)}
+        node_futures: Dict[int, asyncio.Future] = {}
+
+        async def run_node(index: int) -> Dict[str, Any]:
+            task = tasks[index]
+            task_id = task_ids[index]
+            dep_ids = dependency_graph.get(task_id, [])
+            if not dep_ids:
+                return await run_single(task, task_id)
+
+            # Wartet nur auf die eigenen Abhaengigkeiten — ohne Semaphore-Slot.
+            upstream: List[Dict[str, Any]] = []
+            for dep_id in dep_ids:
+                try:
+                    upstream.append(await node_futures[index_by_id[dep_id]])
+                except Exception as exc:
+                    upstream.append({"task_id": dep_id, "status": "error", "error": str(exc)})
+            failed = [p for p in upstream if p.get("status") != "success"]
+            if failed:
+                payload = _parallel_payload(
+                    task_id=task_id,
+                    agent_name=self.normalize_agent_name(task.get("agent", "")),
+                    status="error",
+                    trace=f"{trace_id}-{task_id}",
+                    task_desc=task.get("task", ""),
+                    error=(
+                        "Uebersprungen: Abhaengigkeit "
+                        + ", ".join(f"{p.get('task_id')} ({p.get('status')})" for p in failed)
+                        + " nicht erfolgreich"
+                    ),
+                )
+                payload["skipped"] = True
+            else:
+                payload = await run_single(task, task_id, upstream)
+            payload["depends_on"] = list(dep_ids)
+            return payload
+
         # ── Fan-Out ────────────────────────────────────────────────────────────
+        # Nodes in Stufenreihenfolge anlegen, damit jede Abhaengigkeit schon als
+        # Future existiert, wenn ein Folge-Task darauf wartet.
+        stage_order = list(range(len(tasks)))
+        if dependency_graph:
+            stage_order = [
+                index_by_id[task_id]
+                for stage in policy_decision.get("execution_stages") or [task_ids]
+                for task_id in stage
+            ]
+        for index in stage_order:
+            node_futures[index] = asyncio.ensure_future(run_node(index))
         raw_results = await asyncio.gather(
-            *[run_single(t) for t in tasks],
+            *[node_futures[index] for index in range(len(tasks))],
             return_exceptions=True,
         )
 
@@ -2230,6 +2457,8 @@ class AgentRegistry:
             "independent_task_ids": policy_decision.get("independent_task_ids", []),
             "budget_state": budget_decision.state,
             "effective_max_parallel": effective_parallel,
+            "dependency_graph": dependency_graph,
+            "critical_path_length": int(policy_decision.get("critical_path_length") or 1),
             "summary":     summary,
         }
 
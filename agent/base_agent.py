@@ -19,6 +19,7 @@ import subprocess
 import platform
 import time
 import uuid
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple, Callable
 
@@ -32,7 +33,17 @@ from agent.providers import (
 )
 from agent.shared.mcp_client import MCPClient
 from agent.shared.screenshot import capture_screenshot_base64
-from agent.shared.action_parser import parse_action
+from agent.shared.action_parser import StreamingActionParser, parse_action
+from agent.shared.prompt_cache import (
+    apply_openrouter_cache_control,
+    build_anthropic_cached_request,
+    build_prefix_messages,
+    leading_system_count,
+    prompt_cache_key,
+    prompt_cache_layout_enabled,
+    prompt_cache_markers_enabled,
+    supports_openrouter_cache_control,
+)
 from agent.shared.vision_formatter import build_openai_vision_message
 from agent.shared.json_utils import extract_json_robust
 from agent.shared.delegation_handoff import parse_delegation_handoff
@@ -43,7 +54,7 @@ from utils.policy_gate import (
     evaluate_policy_gate,
 )
 from agent.dynamic_tool_mixin import DynamicToolMixin
-from tools.tool_registry_v2 import registry_v2, ValidationError
+from tools.tool_registry_v2 import ToolDispatchError, registry_v2, ValidationError
 from orchestration.lane_manager import lane_manager, Lane, LaneStatus
 from orchestration.meta_clarity_contract import (
     filter_working_memory_context,
@@ -66,11 +77,18 @@ from utils.dashscope_native import (
     extract_dashscope_native_text,
 )
 from utils.headless_service_guard import desktop_open_block_reason
+from utils.json_serialization import to_jsonable
 from utils.llm_usage import build_usage_payload
 
 log = logging.getLogger("TimusAgent-v4.4")
 
 MCP_URL = "http://127.0.0.1:5000"
+# Nur im ReAct-Loop gesetzt: Streaming darf nach der ersten vollstaendigen
+# Action abbrechen. Andere _call_llm-Aufrufer bekommen immer die ganze Antwort.
+_LLM_STOP_ON_ACTION: ContextVar[bool] = ContextVar("timus_llm_stop_on_action", default=False)
+# Provider, deren Streaming-Endpunkt stream_options.include_usage akzeptiert
+# (Override: LLM_STREAM_INCLUDE_USAGE_PROVIDERS, leer = nirgends anfordern)
+_STREAM_INCLUDE_USAGE_PROVIDERS = "openai,openrouter,deepseek,dashscope"
 IMAGE_MODEL_NAME = os.getenv("IMAGE_GENERATION_MODEL", "gpt-image-2")
 _RESTART_INTENT_KEYWORDS = (
     "restart",
@@ -704,12 +722,15 @@ class BaseAgent(DynamicToolMixin):
             self._context_budget_last_meta = meta
             return messages
 
+        # Fuehrende System-Messages (Prompt, Tools, Working-Memory) bilden den
+        # cachebaren Prefix und bleiben unangetastet.
+        protected = max(1, leading_system_count(messages))
         compacted: List[Dict[str, Any]] = []
         for index, message in enumerate(messages):
             if not isinstance(message, dict):
                 continue
             normalized = dict(message)
-            if index > 0:
+            if index >= protected:
                 compacted_content = self._compact_message_content_for_budget(
                     normalized.get("content", ""),
                     max_tokens=self._context_budget_message_cap(
@@ -727,10 +748,11 @@ class BaseAgent(DynamicToolMixin):
             meta["actions"].append("compress_messages")
 
         status = self._context_guard.get_status(compacted)
-        if status in {ContextStatus.CRITICAL, ContextStatus.OVERFLOW} and len(compacted) > 7:
-            prefix = compacted[:2]
+        prefix_len = protected + 1  # + aktuelle Nutzeranfrage
+        if status in {ContextStatus.CRITICAL, ContextStatus.OVERFLOW} and len(compacted) > prefix_len + 5:
+            prefix = compacted[:prefix_len]
             suffix = compacted[-4:]
-            middle = compacted[2:-4]
+            middle = compacted[prefix_len:-4]
             summary_message = self._build_context_budget_summary_message(middle)
             compacted = prefix + ([summary_message] if summary_message else []) + suffix
             meta["actions"].append("collapse_middle_history")
@@ -742,7 +764,7 @@ class BaseAgent(DynamicToolMixin):
                 if not isinstance(message, dict):
                     continue
                 normalized = dict(message)
-                if index > 0:
+                if index >= protected:
                     cap = 360 if index >= max(0, len(compacted) - 2) else 220
                     normalized["content"] = self._compact_message_content_for_budget(
                         normalized.get("content", ""),
@@ -2353,6 +2375,42 @@ class BaseAgent(DynamicToolMixin):
         except Exception:
             pass
 
+    @staticmethod
+    def _use_inprocess_dispatch(method: str) -> bool:
+        """Direkter Registry-Aufruf, wenn der Agent im MCP-Server-Prozess laeuft."""
+        if os.getenv("TIMUS_INPROCESS_TOOL_DISPATCH", "true").strip().lower() in {"0", "false", "no", "off"}:
+            return False
+        return registry_v2.can_dispatch_inprocess(method)
+
+    async def _dispatch_tool_inprocess(self, method: str, params: dict, timeout: float) -> dict:
+        """
+        Fuehrt ein Tool ohne HTTP aus und liefert die JSON-RPC-Antwortform
+        ({"result": ...} oder {"error": {...}}), damit _call_tool beide Pfade gleich behandelt.
+
+        Das Ergebnis laeuft durch denselben Serializer wie die HTTP-Antwort
+        (NumPy-Typen, Tupel, Nicht-JSON-Objekte), im Worker-Thread, damit
+        grosse Payloads den Loop nicht blockieren.
+        """
+        # Server-Gate wie in handle_jsonrpc (eigener Canary-Bucket pro Quelle).
+        server_decision = evaluate_policy_gate(
+            gate="tool",
+            subject=method,
+            payload={"method": method, "params": params},
+            source="server.mcp_server.handle_jsonrpc",
+        )
+        audit_policy_decision(server_decision)
+        if bool(server_decision.get("blocked")):
+            log.warning(f"[server-policy] Tool blockiert: {method}")
+            return {"error": {"code": -32600, "message": str(server_decision.get("reason") or "Policy violation")}}
+
+        try:
+            result = await asyncio.wait_for(registry_v2.dispatch(method, params), timeout=timeout)
+        except ToolDispatchError as e:
+            return {"error": e.to_jsonrpc_error()}
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"In-Process-Tool {method} Timeout nach {timeout:.0f}s")
+        return await asyncio.to_thread(to_jsonable, {"result": result})
+
     async def _call_tool(self, method: str, params: dict) -> dict:
         method, params = self._refine_tool_call(method, params)
         tool_started_at = time.perf_counter()
@@ -2439,7 +2497,9 @@ class BaseAgent(DynamicToolMixin):
                 success_override=False,
             )
 
-        await self._ensure_remote_tool_names()
+        inprocess = self._use_inprocess_dispatch(method)
+        if not inprocess:
+            await self._ensure_remote_tool_names()
 
         try:
             registry_v2.validate_tool_call(method, **params)
@@ -2483,12 +2543,15 @@ class BaseAgent(DynamicToolMixin):
 
         try:
             request_timeout = self._resolve_tool_http_timeout(method, params)
-            resp = await self.http_client.post(
-                MCP_URL,
-                json={"jsonrpc": "2.0", "method": method, "params": params, "id": "1"},
-                timeout=request_timeout,
-            )
-            data = resp.json()
+            if inprocess:
+                data = await self._dispatch_tool_inprocess(method, params, request_timeout)
+            else:
+                resp = await self.http_client.post(
+                    MCP_URL,
+                    json={"jsonrpc": "2.0", "method": method, "params": params, "id": "1"},
+                    timeout=request_timeout,
+                )
+                data = resp.json()
 
             if "result" in data:
                 result = data["result"]
@@ -3127,6 +3190,9 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
         response_payload: Any = None,
         provider_override: Optional[ModelProvider] = None,
         model_override: Optional[str] = None,
+        ttft_ms: int = 0,
+        time_to_action_ms: int = 0,
+        usage_estimated: bool = False,
     ) -> None:
         try:
             effective_provider = provider_override or self.provider
@@ -3142,9 +3208,13 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
                     input_tokens=int(usage["input_tokens"]),
                     output_tokens=int(usage["output_tokens"]),
                     cached_tokens=int(usage["cached_tokens"]),
+                    cache_write_tokens=int(usage.get("cache_write_tokens", 0)),
                     cost_usd=float(usage["cost_usd"]),
                     latency_ms=max(int(latency_ms or 0), 0),
                     success=bool(success),
+                    ttft_ms=max(int(ttft_ms or 0), 0),
+                    time_to_action_ms=max(int(time_to_action_ms or 0), 0),
+                    usage_estimated=bool(usage_estimated),
                 )
             )
         except Exception as e:
@@ -3159,7 +3229,6 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
     ) -> str:
         effective_provider = model_override.provider if model_override else self.provider
         effective_model = model_override.model if model_override else self.model
-        client = self.provider_client.get_client(effective_provider)
         max_tokens = self._get_max_tokens_for_model(effective_model)
         if budget_decision and budget_decision.max_tokens_cap:
             max_tokens = min(max_tokens, max(int(budget_decision.max_tokens_cap), 1))
@@ -3233,6 +3302,24 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
 
         kwargs = prepare_openai_params(kwargs)
 
+        if prompt_cache_markers_enabled():
+            if effective_provider == ModelProvider.OPENAI:
+                # Automatisches Prefix-Caching: gleicher Key → gleicher Cache-Shard
+                kwargs.setdefault("prompt_cache_key", prompt_cache_key(self.agent_type, messages))
+            elif effective_provider == ModelProvider.OPENROUTER and supports_openrouter_cache_control(effective_model):
+                kwargs["messages"] = apply_openrouter_cache_control(kwargs["messages"])
+
+        async_client = self._get_async_llm_client(effective_provider)
+        if async_client is not None:
+            return await self._stream_openai_compatible(
+                async_client,
+                kwargs,
+                messages=messages,
+                effective_provider=effective_provider,
+                effective_model=effective_model,
+            )
+
+        client = self.provider_client.get_client(effective_provider)
         started = time.perf_counter()
         resp = None
         try:
@@ -3297,6 +3384,170 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
             )
             raise
 
+    def _get_async_llm_client(self, provider: ModelProvider) -> Any:
+        """Async-Client fuer Streaming; None → klassischer Sync-Call im Thread."""
+        if os.getenv("LLM_STREAMING_ENABLED", "true").strip().lower() in {"0", "false", "no", "off"}:
+            return None
+        getter = getattr(self.provider_client, "get_async_client", None)
+        if getter is None:
+            return None
+        try:
+            return getter(provider)
+        except Exception as e:
+            log.debug("Async-LLM-Client fuer %s nicht verfuegbar: %s", getattr(provider, "value", provider), e)
+            return None
+
+    @staticmethod
+    def _estimate_stream_usage(messages: List[Dict], text: str) -> Dict[str, Any]:
+        """Grobe Token-Schaetzung (~4 Zeichen/Token), wenn der Stream keine Usage liefert.
+
+        Passiert bei Early-Stop (Usage-Chunk kommt erst am Ende) oder bei
+        Providern ohne stream_options.include_usage. Solche Records werden mit
+        usage_estimated markiert (Ledger zaehlt sie, Prompt-Cache-Report nicht).
+        """
+        prompt_chars = 0
+        for msg in messages or []:
+            content = msg.get("content") if isinstance(msg, dict) else ""
+            if isinstance(content, list):
+                prompt_chars += sum(
+                    len(str(item.get("text") or "")) for item in content if isinstance(item, dict)
+                )
+            else:
+                prompt_chars += len(str(content or ""))
+        return {
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(text or "") // 4,
+            }
+        }
+
+    @staticmethod
+    async def _close_llm_stream(stream: Any) -> None:
+        close = getattr(stream, "close", None)
+        if close is None:
+            return
+        try:
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            log.debug("LLM-Stream schliessen fehlgeschlagen: %s", e)
+
+    @staticmethod
+    def _stream_usage_supported(provider: ModelProvider) -> bool:
+        """stream_options.include_usage nur fuer Provider, die es akzeptieren.
+
+        Einige OpenAI-kompatible Endpunkte lehnen unbekannte stream_options
+        mit 400 ab — daher explizite Liste statt globalem Schalter.
+        """
+        raw = os.getenv("LLM_STREAM_INCLUDE_USAGE_PROVIDERS", _STREAM_INCLUDE_USAGE_PROVIDERS)
+        enabled = {item.strip().lower() for item in raw.split(",") if item.strip()}
+        return provider.value in enabled
+
+    async def _stream_openai_compatible(
+        self,
+        client: Any,
+        kwargs: Dict[str, Any],
+        *,
+        messages: List[Dict],
+        effective_provider: ModelProvider,
+        effective_model: str,
+    ) -> str:
+        """Streamt eine Chat-Completion ueber den Async-Client.
+
+        Im ReAct-Loop (_LLM_STOP_ON_ACTION) wird die Generierung beendet, sobald
+        ein vollstaendiges Action-JSON vorliegt — der Rest (halluzinierte
+        Observations etc.) wuerde ohnehin verworfen. TTFT und Time-to-Action
+        landen in der LLM-Usage-Analytics.
+        """
+        stream_kwargs = dict(kwargs)
+        stream_kwargs["stream"] = True
+        if self._stream_usage_supported(effective_provider):
+            stream_kwargs["stream_options"] = {"include_usage": True}
+        stop_on_action = _LLM_STOP_ON_ACTION.get() and os.getenv(
+            "LLM_STREAM_EARLY_ACTION_STOP", "true"
+        ).strip().lower() not in {"0", "false", "no", "off"}
+
+        parser = StreamingActionParser()
+        reasoning_parts: List[str] = []
+        usage_payload: Any = None
+        ttft_ms = 0
+        time_to_action_ms = 0
+        stopped_early = False
+        stream: Any = None
+        started = time.perf_counter()
+
+        def _elapsed_ms() -> int:
+            return max(round((time.perf_counter() - started) * 1000), 1)
+
+        try:
+            stream = await client.chat.completions.create(**stream_kwargs)
+            async for chunk in stream:
+                if getattr(chunk, "usage", None):
+                    usage_payload = chunk
+                choices = getattr(chunk, "choices", None) or []
+                delta = getattr(choices[0], "delta", None) if choices else None
+                if delta is None:
+                    continue
+                piece = getattr(delta, "content", None) or ""
+                reasoning_piece = getattr(delta, "reasoning_content", None) or ""
+                if (piece or reasoning_piece) and not ttft_ms:
+                    ttft_ms = _elapsed_ms()
+                if reasoning_piece:
+                    reasoning_parts.append(str(reasoning_piece))
+                if not piece:
+                    continue
+                if parser.feed(str(piece)) is not None and not time_to_action_ms:
+                    time_to_action_ms = _elapsed_ms()
+                    if stop_on_action:
+                        stopped_early = True
+                        break
+        except Exception:
+            self._record_llm_usage(
+                latency_ms=round((time.perf_counter() - started) * 1000),
+                success=False,
+                response_payload=usage_payload,
+                provider_override=effective_provider,
+                model_override=effective_model,
+                ttft_ms=ttft_ms,
+            )
+            raise
+        finally:
+            # Immer schliessen: bei Early-Stop bricht das die Generierung ab,
+            # sonst gibt es die HTTP-Verbindung auch bei Fehlern sofort frei.
+            if stream is not None:
+                await self._close_llm_stream(stream)
+
+        content = parser.action_text if stopped_early else parser.text
+        if stopped_early:
+            log.debug(
+                "LLM-Stream nach Action gestoppt (%s/%s, %sms)",
+                effective_provider.value,
+                effective_model,
+                time_to_action_ms,
+            )
+
+        # DeepSeek thinking models: reasoning_content als Fallback (siehe Sync-Pfad)
+        if not content.strip() and reasoning_parts:
+            log.warning("DeepSeek thinking: content leer — gebe reasoning_content zurück (Loop-Retry)")
+            text = self._strip_think_tags("".join(reasoning_parts).strip())
+            success = True
+        else:
+            text = self._strip_think_tags(content)
+            success = bool(text)
+
+        self._record_llm_usage(
+            latency_ms=round((time.perf_counter() - started) * 1000),
+            success=success,
+            response_payload=usage_payload or self._estimate_stream_usage(messages, content),
+            provider_override=effective_provider,
+            model_override=effective_model,
+            ttft_ms=ttft_ms,
+            time_to_action_ms=time_to_action_ms,
+            usage_estimated=usage_payload is None,
+        )
+        return text
+
     async def _call_anthropic(
         self,
         messages: List[Dict],
@@ -3317,18 +3568,22 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
         if budget_decision and budget_decision.max_tokens_cap:
             max_tokens = min(max_tokens, max(int(budget_decision.max_tokens_cap), 1))
 
-        system_content = ""
-        chat_messages = []
-        for msg in messages:
-            if msg["role"] == "system":
-                system_content = msg["content"]
-            else:
-                chat_messages.append(msg)
+        system_content, chat_messages = build_anthropic_cached_request(messages)
 
+        async_client = self._get_async_llm_client(ModelProvider.ANTHROPIC)
         started = time.perf_counter()
         response_payload: Any = None
         try:
-            if client:
+            if async_client:
+                resp = await async_client.messages.create(
+                    model=effective_model,
+                    max_tokens=max_tokens,
+                    system=system_content,
+                    messages=chat_messages,
+                )
+                response_payload = resp
+                text = resp.content[0].text.strip()
+            elif client:
                 resp = await asyncio.to_thread(
                     client.messages.create,
                     model=effective_model,
@@ -3855,15 +4110,18 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
             }
             return ""
 
-    def _inject_working_memory_into_task(self, task: str, working_memory_context: str) -> str:
-        if not working_memory_context:
-            return task
+    @staticmethod
+    def _format_current_request(task: str) -> str:
         return (
-            f"{working_memory_context}\n\n"
             f"AKTUELLE_NUTZERANFRAGE:\n{task}\n\n"
             "Bearbeite jetzt ausschließlich die aktuelle Nutzeranfrage."
         )
 
+    def _inject_working_memory_into_task(self, task: str, working_memory_context: str) -> str:
+        if not working_memory_context:
+            return task
+        return f"{working_memory_context}\n\n{self._format_current_request(task)}"
+
     def get_runtime_telemetry(self) -> Dict[str, Any]:
         run_duration = None
         if self._run_started_at > 0:
@@ -3882,6 +4140,30 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
             "context_budget": self._context_budget_last_meta,
         }
 
+    def reset_for_reuse(self) -> None:
+        """Setzt Run- und Delegationszustand zurueck, bevor der Agent-Pool die Instanz erneut verleiht.
+
+        Teure Ressourcen (Provider-Client, HTTP-Client, System-Prompt, Context-Guard)
+        bleiben erhalten — genau die sollen zwischen Delegationen warm bleiben.
+        """
+        self.recent_actions = []
+        self.last_skip_times = {}
+        self.action_call_counts = {}
+        self._task_action_history = []
+        self._run_started_at = 0.0
+        self._active_phase = "idle"
+        self._active_tool_name = None
+        self._memory_recall_last_meta = {}
+        self._working_memory_last_meta = {}
+        self._context_budget_last_meta = {}
+        self._current_task_text = ""
+        self.conversation_session_id = None
+        self.roi_stack = []
+        self.current_roi = None
+        self.cached_screen_state = None
+        for attr in ("_delegation_progress_callback", "_delegation_context"):
+            self.__dict__.pop(attr, None)
+
     # ------------------------------------------------------------------
     # Haupt-Loop
     # ------------------------------------------------------------------
@@ -4045,6 +4327,13 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
             metadata={"vision_enabled": self._vision_enabled},
         )
 
+        # Stabiler Prefix: Working-Memory als eigene System-Message hinter
+        # Prompt+Tools statt vor der Anfrage — Provider-Prefix-Caches treffen so
+        # ab dem zweiten Schritt (und bei gleichem Agent ueber Runs hinweg).
+        stable_prefix = prompt_cache_layout_enabled()
+        if stable_prefix and working_memory_context:
+            task_with_context = self._format_current_request(task)
+
         use_vision = is_navigation_task and self._vision_enabled
         if use_vision:
             log.info("Multimodal-Modus: Screenshots werden an LLM gesendet")
@@ -4055,10 +4344,13 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
         else:
             initial_msg = {"role": "user", "content": task_with_context}
 
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            initial_msg,
-        ]
+        if stable_prefix:
+            messages = build_prefix_messages(self.system_prompt, working_memory_context, initial_msg)
+        else:
+            messages = [
+                {"role": "system", "content": self.system_prompt},
+                initial_msg,
+            ]
         last_generate_text_output: str = ""
         empty_reply_streak = 0
 
@@ -4084,7 +4376,11 @@ Antworte NUR mit JSON (keine Markdown, keine Erklaerung):"""
                     "last_message_preview": self._preview_value(last_content, 400),
                 },
             )
-            reply = await self._call_llm(messages)
+            stop_on_action_token = _LLM_STOP_ON_ACTION.set(True)
+            try:
+                reply = await self._call_llm(messages)
+            finally:
+                _LLM_STOP_ON_ACTION.reset(stop_on_action_token)
             if not (reply or "").strip():
                 empty_reply_streak += 1
                 self._emit_step_trace(
@@ -893,14 +893,19 @@ WANN PARALLEL:
 - Code schreiben WAEHREND Daten analysiert werden
 - Bild analysieren WAEHREND Fakten recherchiert werden
 
+WANN MIT depends_on (Fan-Out/Fan-In in EINEM Aufruf):
+- Mehrere unabhaengige Vorarbeiten, deren Ergebnisse ein Folge-Task buendelt
+- Der Folge-Task bekommt die Ergebnisse automatisch; {{{{t1}}}} im Task-Text setzt ein Ergebnis direkt ein
+
 WANN SEQUENZIELL:
-- Wenn Schritt 2 Ergebnis, artifacts oder metadata aus Schritt 1 braucht
 - Bei Budgetdruck oder wenn die Policy Parallelitaet blockiert
+- Wenn du nach Schritt 1 erst selbst entscheiden musst, wie es weitergeht
 
 FORMAT fuer parallele Delegation:
 Action: {{"method": "delegate_multiple_agents", "params": {{"tasks": [
   {{"task_id": "t1", "agent": "research", "task": "Recherchiere X", "timeout": 120}},
-  {{"task_id": "t2", "agent": "developer", "task": "Schreibe Skript fuer Y"}}
+  {{"task_id": "t2", "agent": "developer", "task": "Schreibe Skript fuer Y"}},
+  {{"task_id": "t3", "agent": "document", "task": "Erstelle einen Bericht aus X und Y", "depends_on": ["t1", "t2"]}}
 ]}}}}
 
 Nach dem Aufruf erhaeltst du ein strukturiertes Ergebnis-Dict mit `results[]`.
@@ -2,7 +2,7 @@
 
 Enthaelt:
 - ModelProvider Enum
-- MultiProviderClient (Lazy Init)
+- MultiProviderClient (Lazy Init, sync + async Clients)
 - AgentModelConfig
 - get_provider_client() Factory
 """
@@ -81,6 +81,7 @@ class MultiProviderClient:
 
     def __init__(self):
         self._clients: Dict[ModelProvider, Any] = {}
+        self._async_clients: Dict[ModelProvider, Any] = {}
         self._api_keys: Dict[ModelProvider, str] = {}
         self._available_models_cache: Dict[ModelProvider, Set[str]] = {}
         self._validated_models: set[tuple[ModelProvider, str]] = set()
@@ -149,6 +150,38 @@ class MultiProviderClient:
         log.info(f"Client initialisiert: {provider.value}")
         return client
 
+    def get_async_client(self, provider: ModelProvider):
+        """Async-Client (AsyncOpenAI/AsyncAnthropic) fuer den Agent-Loop.
+
+        Gibt None zurueck, wenn fuer den Provider kein nativer Async-Client
+        verfuegbar ist — Aufrufer fallen dann auf get_client() zurueck.
+        """
+        if provider in self._async_clients:
+            return self._async_clients[provider]
+
+        api_key = self.get_api_key(provider)
+        if not api_key:
+            raise ValueError(
+                f"Kein API Key fuer Provider '{provider.value}' gefunden. "
+                f"Setze {self.API_KEY_ENV[provider]} in .env"
+            )
+
+        if provider in [
+            ModelProvider.OPENAI, ModelProvider.ZAI, ModelProvider.DASHSCOPE, ModelProvider.DEEPSEEK,
+            ModelProvider.MOONSHOT, ModelProvider.INCEPTION, ModelProvider.NVIDIA,
+            ModelProvider.OPENROUTER, ModelProvider.GOOGLE,
+        ]:
+            client = self._init_openai_compatible_async(provider)
+        elif provider == ModelProvider.ANTHROPIC:
+            client = self._init_anthropic_async()
+        else:
+            client = None
+
+        self._async_clients[provider] = client
+        if client is not None:
+            log.info(f"Async-Client initialisiert: {provider.value}")
+        return client
+
     def _provider_supports_model_listing(self, provider: ModelProvider) -> bool:
         return provider in {
             ModelProvider.OPENAI,
@@ -239,6 +272,21 @@ class MultiProviderClient:
             base_url=self.get_openai_compat_base_url(provider),
         )
 
+    def _init_openai_compatible_async(self, provider: ModelProvider):
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(
+            api_key=self.get_api_key(provider),
+            base_url=self.get_openai_compat_base_url(provider),
+        )
+
+    def _init_anthropic_async(self):
+        try:
+            from anthropic import AsyncAnthropic
+            return AsyncAnthropic(api_key=self.get_api_key(ModelProvider.ANTHROPIC))
+        except ImportError:
+            log.warning("anthropic Package nicht installiert, nutze httpx Fallback")
+            return None
+
     def _init_anthropic(self):
         try:
             from anthropic import Anthropic
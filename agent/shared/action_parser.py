@@ -4,6 +4,9 @@
   1. Direct JSON (ganzer Text)
   2. Zeilenweise Suche
   3. Regex Fallback
+
+StreamingActionParser erkennt waehrend eines LLM-Streams, sobald ein
+vollstaendiges Action-Objekt angekommen ist (fuer Early-Stop im Agent-Loop).
 """
 
 import json
@@ -88,3 +91,120 @@ def parse_action(text: str) -> Tuple[Optional[dict], Optional[str]]:
             pass
 
     return None, "Kein JSON gefunden"
+
+
+class StreamingActionParser:
+    """Inkrementeller Parser fuer gestreamte LLM-Antworten.
+
+    feed() bekommt die Text-Deltas und liefert das Action-Dict, sobald das
+    erste vollstaendige Top-Level-JSON-Objekt mit "action"/"method" geschlossen
+    wurde. <think>-Bloecke werden uebersprungen; sobald "Final Answer:" im Text
+    steht, wird nichts mehr gemeldet (die Antwort muss komplett gelesen werden).
+
+    USAGE:
+        parser = StreamingActionParser()
+        for delta in stream:
+            if parser.feed(delta) is not None:
+                break  # parser.action_text endet mit dem Action-JSON
+    """
+
+    _THINK_OPEN = "<think>"
+    _THINK_CLOSE = "</think>"
+
+    def __init__(self) -> None:
+        self._buffer: list[str] = []
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._obj_start = -1
+        self._in_string = False
+        self._escape = False
+        self._in_think = False
+        self.action: Optional[dict] = None
+        self.action_end: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """Bisher empfangener Text."""
+        return self._text
+
+    @property
+    def action_text(self) -> str:
+        """Text bis zum Ende der erkannten Action (ohne Nachlauf)."""
+        if self.action_end is not None:
+            return self._text[: self.action_end]
+        return self._text
+
+    @property
+    def final_answer_seen(self) -> bool:
+        return "Final Answer:" in self._text
+
+    def feed(self, delta: str) -> Optional[dict]:
+        if delta:
+            self._text += delta
+        if self.action is not None or not delta:
+            return self.action
+        if self.final_answer_seen:
+            return None
+        self._scan()
+        return self.action
+
+    def _scan(self) -> None:
+        text = self._text
+        i = self._pos
+        end = len(text)
+        while i < end:
+            if self._in_think:
+                close_at = text.find(self._THINK_CLOSE, i)
+                if close_at < 0:
+                    # Teil-Tag am Ende nicht verschlucken
+                    i = max(i, end - len(self._THINK_CLOSE) + 1)
+                    break
+                self._in_think = False
+                i = close_at + len(self._THINK_CLOSE)
+                continue
+
+            ch = text[i]
+            if self._depth > 0 and self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                i += 1
+                continue
+
+            if ch == "<" and self._depth == 0:
+                if text.startswith(self._THINK_OPEN, i):
+                    self._in_think = True
+                    i += len(self._THINK_OPEN)
+                    continue
+                if self._THINK_OPEN.startswith(text[i:end]):
+                    break  # Tag evtl. unvollstaendig — auf naechstes Delta warten
+            elif ch == '"' and self._depth > 0:
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._obj_start = i
+                self._depth += 1
+            elif ch == "}" and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0 and self._try_complete(self._obj_start, i + 1):
+                    self._pos = i + 1
+                    return
+            i += 1
+        self._pos = i
+
+    def _try_complete(self, start: int, stop: int) -> bool:
+        candidate = re.sub(r",\s*([\}\]])", r"\1", self._text[start:stop])
+        try:
+            data = json.loads(candidate)
+        except (json.JSONDecodeError, ValueError):
+            return False
+        action, _error = _normalize_parsed_action(data)
+        if action is None:
+            return False
+        self.action = action
+        self.action_end = stop
+        return True
@@ -0,0 +1,141 @@
+"""Prompt-Prefix-Caching fuer den ReAct-Loop.
+
+Jeder Loop-Schritt sendet System-Prompt, Tool-Manifest und Working-Memory
+erneut. Provider cachen identische Prefixe (OpenAI/DeepSeek/Moonshot
+automatisch, Anthropic ueber cache_control-Marker) — aber nur, wenn der
+Prefix byte-stabil bleibt. Dieses Modul baut die Nachrichten in fester
+Reihenfolge auf und setzt die Provider-Marker:
+
+    [system: Prompt + Tool-Manifest]  ← stabil pro Agent/Tag
+    [system: Working-Memory]          ← stabil pro Run
+    [user:   aktuelle Nutzeranfrage]
+    ... Verlauf (append-only) ...
+
+Konfiguration:
+    AGENT_PROMPT_CACHE_LAYOUT   (default: true)  stabiler Prefix im Loop
+    LLM_PROMPT_CACHE_MARKERS    (default: true)  cache_control / prompt_cache_key
+
+USAGE:
+    messages = build_prefix_messages(system_prompt, memory_context, task_msg)
+    system, chat = build_anthropic_cached_request(messages)
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+CACHE_CONTROL_EPHEMERAL = {"type": "ephemeral"}
+
+
+def _env_flag(name: str, default: str = "true") -> bool:
+    return os.getenv(name, default).strip().lower() not in {"0", "false", "no", "off"}
+
+
+def prompt_cache_layout_enabled() -> bool:
+    return _env_flag("AGENT_PROMPT_CACHE_LAYOUT")
+
+
+def prompt_cache_markers_enabled() -> bool:
+    return _env_flag("LLM_PROMPT_CACHE_MARKERS")
+
+
+def build_prefix_messages(
+    system_prompt: str,
+    memory_context: str,
+    task_message: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """System-Prompt → Working-Memory → Anfrage, immer in dieser Reihenfolge."""
+    messages: List[Dict[str, Any]] = [{"role": "system", "content": system_prompt}]
+    if memory_context:
+        messages.append({"role": "system", "content": memory_context})
+    messages.append(task_message)
+    return messages
+
+
+def leading_system_count(messages: List[Dict[str, Any]]) -> int:
+    count = 0
+    for message in messages:
+        if not isinstance(message, dict) or message.get("role") != "system":
+            break
+        count += 1
+    return count
+
+
+def _with_cache_control(content: Any) -> List[Dict[str, Any]]:
+    """Markiert den letzten Text-Block einer Message-Content als Cache-Breakpoint."""
+    if isinstance(content, list):
+        blocks = copy.deepcopy(content)
+    else:
+        blocks = [{"type": "text", "text": str(content or "")}]
+    for block in reversed(blocks):
+        if isinstance(block, dict) and block.get("type") == "text":
+            block["cache_control"] = dict(CACHE_CONTROL_EPHEMERAL)
+            break
+    return blocks
+
+
+def build_anthropic_cached_request(
+    messages: List[Dict[str, Any]],
+    *,
+    markers: Optional[bool] = None,
+) -> Tuple[Any, List[Dict[str, Any]]]:
+    """Teilt OpenAI-Style-Messages in Anthropic system + messages.
+
+    Alle System-Messages werden in Reihenfolge als Text-Bloecke uebernommen
+    (frueher gewann nur die letzte). Mit Markern bekommt der stabile Prefix
+    (letzter fuehrender System-Block) und die juengste Nachricht je einen
+    cache_control-Breakpoint — so liest jeder Loop-Schritt den bisherigen
+    Verlauf aus dem Cache.
+    """
+    use_markers = prompt_cache_markers_enabled() if markers is None else markers
+    system_blocks: List[Dict[str, Any]] = []
+    chat_messages: List[Dict[str, Any]] = []
+    prefix_len = leading_system_count(messages)
+    prefix_block_index = -1
+    for index, msg in enumerate(messages):
+        if msg.get("role") == "system":
+            system_blocks.append({"type": "text", "text": str(msg.get("content") or "")})
+            if index < prefix_len:
+                prefix_block_index = len(system_blocks) - 1
+        else:
+            chat_messages.append(msg)
+
+    if not use_markers:
+        return "\n\n".join(block["text"] for block in system_blocks), chat_messages
+
+    if prefix_block_index >= 0:
+        system_blocks[prefix_block_index]["cache_control"] = dict(CACHE_CONTROL_EPHEMERAL)
+    if chat_messages:
+        last = dict(chat_messages[-1])
+        last["content"] = _with_cache_control(last.get("content"))
+        chat_messages = chat_messages[:-1] + [last]
+    return system_blocks, chat_messages
+
+
+def supports_openrouter_cache_control(model: str) -> bool:
+    """OpenRouter reicht cache_control nur an Anthropic-/Gemini-Modelle durch."""
+    model_lower = str(model or "").lower()
+    return any(marker in model_lower for marker in ("anthropic/", "claude", "google/gemini"))
+
+
+def apply_openrouter_cache_control(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Setzt einen Breakpoint auf das Ende des fuehrenden System-Prefix."""
+    prefix_len = leading_system_count(messages)
+    if prefix_len == 0:
+        return messages
+    marked = list(messages)
+    anchor = dict(marked[prefix_len - 1])
+    anchor["content"] = _with_cache_control(anchor.get("content"))
+    marked[prefix_len - 1] = anchor
+    return marked
+
+
+def prompt_cache_key(agent_type: str, messages: List[Dict[str, Any]]) -> str:
+    """Routing-Key fuer OpenAIs automatisches Prefix-Caching (gleicher Prefix → gleicher Key)."""
+    first = messages[0] if messages and isinstance(messages[0], dict) else {}
+    system_text = str(first.get("content") or "") if first.get("role") == "system" else ""
+    digest = hashlib.sha1(system_text.encode("utf-8")).hexdigest()[:16]
+    return f"timus-{agent_type or 'agent'}-{digest}"
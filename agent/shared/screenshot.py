@@ -1,4 +1,11 @@
-"""Screenshot-Capture Utilities fuer alle Timus-Agenten."""
+"""Screenshot-Capture Utilities fuer alle Timus-Agenten.
+
+Die Frames kommen aus dem geteilten Screen-Frame-Service
+(utils.screen_frames). Diese Helfer dienen vor allem der Beobachtung nach
+einer Aktion und grabben daher standardmaessig frisch (``max_age_ms=0``);
+wer einen kurz zuvor gegrabbten Frame mitnutzen darf, uebergibt ein
+groesseres ``max_age_ms`` (None = Service-Default).
+"""
 
 import os
 import io
@@ -6,6 +13,8 @@ import base64
 import logging
 from typing import Optional
 
+from utils.screen_frames import get_frame_service
+
 log = logging.getLogger("screenshot")
 
 # Lazy-load mss + PIL
@@ -41,11 +50,17 @@ def _ensure_loaded() -> bool:
     return _available
 
 
+def _latest_frame(monitor_index: int, max_age_ms: Optional[float]):
+    max_age_s = None if max_age_ms is None else max(0.0, float(max_age_ms)) / 1000.0
+    return get_frame_service().latest(monitor_index, max_age_s=max_age_s)
+
+
 def capture_screenshot_base64(
     monitor_index: Optional[int] = None,
     max_size: tuple = (1280, 720),
     fmt: str = "JPEG",
     quality: int = 70,
+    max_age_ms: Optional[float] = 0,
 ) -> str:
     """Screenshot als Base64 mit konfigurierbarem Format.
 
@@ -54,6 +69,7 @@ def capture_screenshot_base64(
         max_size: Maximale Bildgroesse (Breite, Hoehe).
         fmt: Bildformat ("JPEG" oder "PNG").
         quality: JPEG-Qualitaet (nur bei fmt="JPEG").
+        max_age_ms: Hoechstalter eines wiederverwendeten Frames (0 = frisch grabben).
 
     Returns:
         Base64-kodierter String oder "" bei Fehler.
@@ -68,15 +84,7 @@ def capture_screenshot_base64(
         monitor_index = int(os.getenv("ACTIVE_MONITOR", "1"))
 
     try:
-        with _mss.mss() as sct:
-            monitors = sct.monitors
-            if monitor_index < len(monitors):
-                monitor = monitors[monitor_index]
-            else:
-                monitor = monitors[1] if len(monitors) > 1 else monitors[0]
-            raw = sct.grab(monitor)
-            img = _Image.frombytes("RGB", raw.size, raw.bgra, "raw", "BGRX")
-
+        img = _latest_frame(monitor_index, max_age_ms).to_pil()
         img.thumbnail(max_size)
         buf = io.BytesIO()
         save_kwargs = {"format": fmt}
@@ -90,9 +98,11 @@ def capture_screenshot_base64(
         return ""
 
 
-def capture_screenshot_image(monitor_index: Optional[int] = None):
+def capture_screenshot_image(monitor_index: Optional[int] = None, max_age_ms: Optional[float] = 0):
     """Screenshot als PIL Image (fuer DesktopController u.a.).
 
+    ``max_age_ms`` wie bei capture_screenshot_base64 (0 = frisch grabben).
+
     Returns:
         PIL.Image.Image oder None bei Fehler.
     """
@@ -105,14 +115,7 @@ def capture_screenshot_image(monitor_index: Optional[int] = None):
         monitor_index = int(os.getenv("ACTIVE_MONITOR", "1"))
 
     try:
-        with _mss.mss() as sct:
-            monitors = sct.monitors
-            if monitor_index < len(monitors):
-                monitor = monitors[monitor_index]
-            else:
-                monitor = monitors[1] if len(monitors) > 1 else monitors[0]
-            raw = sct.grab(monitor)
-            return _Image.frombytes("RGB", raw.size, raw.bgra, "raw", "BGRX")
+        return _latest_frame(monitor_index, max_age_ms).to_pil()
     except Exception as e:
         log.debug(f"Screenshot fehlgeschlagen: {e}")
         _set_last_error(str(e))
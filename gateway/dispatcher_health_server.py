@@ -7,7 +7,7 @@ import ipaddress
 import logging
 import os
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import httpx
 from fastapi import FastAPI
@@ -49,6 +49,8 @@ class DispatcherHealthState:
         self.tools_loaded = False
         self.tool_description_count = 0
         self.components: dict[str, dict[str, Any]] = {}
+        # Live-Statistiken (z.B. Worker-Pool), bei jedem Snapshot neu gelesen
+        self.stats_providers: dict[str, Callable[[], dict[str, Any]]] = {}
         self.mcp: dict[str, Any] = {
             "url": self.mcp_health_url,
             "reachable": False,
@@ -85,6 +87,22 @@ class DispatcherHealthState:
             "updated_at": _now_iso(),
         }
 
+    def set_stats_provider(self, name: str, provider: Optional[Callable[[], dict[str, Any]]]) -> None:
+        key = str(name or "").strip() or "unknown"
+        if provider is None:
+            self.stats_providers.pop(key, None)
+        else:
+            self.stats_providers[key] = provider
+
+    def _collect_stats(self) -> dict[str, Any]:
+        collected: dict[str, Any] = {}
+        for name, provider in sorted(self.stats_providers.items()):
+            try:
+                collected[name] = provider()
+            except Exception as e:
+                collected[name] = {"error": f"{type(e).__name__}:{str(e)[:120]}"}
+        return collected
+
     def set_mcp_status(
         self,
         *,
@@ -163,6 +181,7 @@ class DispatcherHealthState:
             "tool_description_count": self.tool_description_count,
             "mcp": dict(self.mcp),
             "components": {key: dict(value) for key, value in self.components.items()},
+            **self._collect_stats(),
         }
 
 
@@ -260,6 +279,9 @@ class DispatcherHealthServer:
     ) -> None:
         self.state.set_component(name, active=active, required=required, detail=detail)
 
+    def set_stats_provider(self, name: str, provider: Optional[Callable[[], dict[str, Any]]]) -> None:
+        self.state.set_stats_provider(name, provider)
+
     def mark_ready(self) -> None:
         self.state.mark_ready()
 
@@ -6,18 +6,29 @@ Strukturierte Status-Snapshots fuer Telegram /status:
 - systemd-Service-Status
 - Agent → Modell/Provider-Zuordnung
 - Live-Readiness fuer genutzte LLM-Provider/APIs
+
+collect_status_snapshot() sammelt alle Sektionen frisch. Fuer interaktive
+Abfragen (Telegram /status, GET /status/snapshot) haelt der
+StatusSnapshotCollector pro Sektion den letzten Stand vor, erneuert ihn im
+eigenen Takt im Hintergrund und meldet die Aktualitaet unter "freshness".
+
+USAGE:
+    snapshot = await get_cached_status_snapshot()   # Millisekunden, ggf. leicht veraltet
+    snapshot = await collect_status_snapshot()      # frisch, dauert Sekunden
 """
 
 from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import os
-import subprocess
 import time
+import weakref
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -32,6 +43,9 @@ from orchestration.self_hardening_runtime import get_self_hardening_runtime_summ
 from orchestration.self_stabilization_gate import evaluate_self_stabilization_gate
 from orchestration.self_improvement_engine import get_improvement_engine
 from orchestration.task_queue import SelfHealingCircuitBreakerState, SelfHealingIncidentStatus, get_queue
+from utils.http_client_pool import get_async_client
+
+log = logging.getLogger("StatusSnapshot")
 
 _DEFAULT_MCP_BASE_URL = os.getenv("MCP_URL", "http://127.0.0.1:5000").rstrip("/")
 _LOCAL_TIMEOUT_S = float(os.getenv("TELEGRAM_STATUS_LOCAL_TIMEOUT", "3"))
@@ -70,31 +84,38 @@ def _parse_snapshot_iso(value: Any) -> datetime | None:
         return None
 
 
-def _service_state(service_name: str) -> Dict[str, Any]:
+async def _run_systemctl(*args: str, timeout_s: float = 4.0) -> Tuple[str, str]:
+    proc = await asyncio.create_subprocess_exec(
+        "systemctl",
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout_s)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise TimeoutError(f"systemctl {' '.join(args)} timed out after {timeout_s}s")
+    return stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+
+async def _service_state(service_name: str) -> Dict[str, Any]:
     try:
-        show_proc = subprocess.run(
-            [
-                "systemctl",
+        (show_out, _), (active_out, active_err) = await asyncio.gather(
+            _run_systemctl(
                 "show",
                 service_name,
                 "--property=ActiveState",
                 "--property=SubState",
                 "--property=ActiveEnterTimestampMonotonic",
                 "--property=ExecMainPID",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=4,
-        )
-        proc = subprocess.run(
-            ["systemctl", "is-active", service_name],
-            capture_output=True,
-            text=True,
-            timeout=4,
+            ),
+            _run_systemctl("is-active", service_name),
         )
-        active = (proc.stdout or proc.stderr).strip() or "unknown"
+        active = (active_out or active_err).strip() or "unknown"
         show_values: Dict[str, str] = {}
-        for line in (show_proc.stdout or "").splitlines():
+        for line in (show_out or "").splitlines():
             if "=" not in line:
                 continue
             key, value = line.split("=", 1)
@@ -665,73 +686,102 @@ def _build_self_hardening_summary() -> Dict[str, Any]:
         }
 
 
-async def collect_status_snapshot(mcp_base_url: str | None = None) -> Dict[str, Any]:
-    base_url = (mcp_base_url or _DEFAULT_MCP_BASE_URL).rstrip("/")
+# ── Snapshot-Sektionen ───────────────────────────────────────────
+#
+# Jede Sektion wird unabhaengig gesammelt. collect_status_snapshot() holt alle
+# Sektionen parallel frisch; der StatusSnapshotCollector (weiter unten) haelt
+# je Sektion den letzten Stand vor und aktualisiert ihn im eigenen Takt.
+
+_EMPTY_USAGE_SUMMARY: Dict[str, Any] = {
+    "analysis_days": 1,
+    "session_id": "",
+    "total_requests": 0,
+    "successful_requests": 0,
+    "failed_requests": 0,
+    "success_rate": 0.0,
+    "input_tokens": 0,
+    "output_tokens": 0,
+    "cached_tokens": 0,
+    "total_cost_usd": 0.0,
+    "avg_latency_ms": 0.0,
+    "top_agents": [],
+    "top_models": [],
+}
+
+_EMPTY_REQUEST_RUNTIME: Dict[str, Any] = {
+    "state": "unknown",
+    "reason": "observation_unavailable",
+    "chat_requests_total": 0,
+    "chat_completed_total": 0,
+    "chat_failed_total": 0,
+    "dispatcher_routes_total": 0,
+    "request_routes_total": 0,
+    "task_routes_total": 0,
+    "task_started_total": 0,
+    "task_completed_total": 0,
+    "task_failed_total": 0,
+    "user_visible_failures_total": 0,
+    "last_request": {},
+    "last_route": {},
+    "last_outcome": {},
+    "last_correlated_failure": {},
+}
+
+
+async def _collect_local_section(base_url: str) -> Dict[str, Any]:
+    # Geteilter Keep-Alive-Client statt Neuaufbau pro Snapshot.
+    client = get_async_client("local")
+    local_tasks = {
+        "mcp_health": asyncio.create_task(_fetch_local_json(client, f"{base_url}/health")),
+        "agent_status": asyncio.create_task(_fetch_local_json(client, f"{base_url}/agent_status")),
+        "autonomy_health": asyncio.create_task(_fetch_local_json(client, f"{base_url}/autonomy/health")),
+        "location_status": asyncio.create_task(_fetch_local_json(client, f"{base_url}/location/status")),
+    }
+    if _qdrant_server_mode_enabled():
+        local_tasks["qdrant_ready"] = asyncio.create_task(
+            _fetch_local_json(client, resolve_qdrant_ready_url(os.getenv("QDRANT_URL")))
+        )
+    return {name: await task for name, task in local_tasks.items()}
+
+
+async def _collect_provider_section() -> Dict[str, Any]:
     provider_client = get_provider_client()
-    providers = _providers_to_check()
-    qdrant_server_mode = _qdrant_server_mode_enabled()
-
-    async with httpx.AsyncClient(trust_env=False) as client:
-        local_tasks = {
-            "mcp_health": asyncio.create_task(_fetch_local_json(client, f"{base_url}/health")),
-            "agent_status": asyncio.create_task(_fetch_local_json(client, f"{base_url}/agent_status")),
-            "autonomy_health": asyncio.create_task(_fetch_local_json(client, f"{base_url}/autonomy/health")),
-            "location_status": asyncio.create_task(_fetch_local_json(client, f"{base_url}/location/status")),
-        }
-        if qdrant_server_mode:
-            local_tasks["qdrant_ready"] = asyncio.create_task(
-                _fetch_local_json(client, resolve_qdrant_ready_url(os.getenv("QDRANT_URL")))
-            )
-        provider_tasks = {
-            provider.value: asyncio.create_task(
-                _check_provider_api(client, provider, provider_client=provider_client)
-            )
-            for provider in providers
-        }
+    client = get_async_client("local")
+    provider_tasks = {
+        provider.value: asyncio.create_task(
+            _check_provider_api(client, provider, provider_client=provider_client)
+        )
+        for provider in _providers_to_check()
+    }
+    return {name: await task for name, task in provider_tasks.items()}
 
-        local_results = {name: await task for name, task in local_tasks.items()}
-        provider_results = {name: await task for name, task in provider_tasks.items()}
 
-    runtime_agents = (local_results["agent_status"].get("data", {}) or {}).get("agents", {}) or {}
-    services = {
-        "mcp": _service_state("timus-mcp.service"),
-        "dispatcher": _service_state("timus-dispatcher.service"),
+async def _collect_service_section() -> Dict[str, Any]:
+    names = {
+        "mcp": "timus-mcp.service",
+        "dispatcher": "timus-dispatcher.service",
     }
-    if qdrant_server_mode:
-        qdrant_service = _service_state("qdrant.service")
-        qdrant_ready = local_results.get("qdrant_ready", {}) or {}
-        if qdrant_service.get("ok", False) and not bool(qdrant_ready.get("ok", False)):
-            qdrant_service = dict(qdrant_service)
-            qdrant_service["ok"] = False
-            qdrant_service["active"] = "degraded"
-            qdrant_service["detail"] = str(qdrant_ready.get("error", "") or "readyz failed")
-        services["qdrant"] = qdrant_service
+    if _qdrant_server_mode_enabled():
+        names["qdrant"] = "qdrant.service"
+    states = await asyncio.gather(*(_service_state(service) for service in names.values()))
+    return dict(zip(names.keys(), states))
 
+
+def _collect_usage_section() -> Dict[str, Any]:
     try:
         improvement_engine = get_improvement_engine()
         _safe_engine_stat(improvement_engine, "run_housekeeping", default={})
         usage_summary = improvement_engine.get_llm_usage_summary(days=1, limit=3)
     except Exception:
-        improvement_engine = get_improvement_engine()
-        usage_summary = {
-            "analysis_days": 1,
-            "session_id": "",
-            "total_requests": 0,
-            "successful_requests": 0,
-            "failed_requests": 0,
-            "success_rate": 0.0,
-            "input_tokens": 0,
-            "output_tokens": 0,
-            "cached_tokens": 0,
-            "total_cost_usd": 0.0,
-            "avg_latency_ms": 0.0,
-            "top_agents": [],
-            "top_models": [],
-        }
+        usage_summary = dict(_EMPTY_USAGE_SUMMARY)
     try:
         budget_status = get_public_budget_status()
     except Exception:
         budget_status = {"state": "unknown", "message": "", "scopes": [], "soft_max_tokens": 0, "window_days": 1}
+    return {"usage": usage_summary, "budget": budget_status}
+
+
+def _collect_health_section() -> Dict[str, Any]:
     try:
         queue = get_queue()
         housekeeping = getattr(queue, "run_self_healing_housekeeping", None)
@@ -739,38 +789,95 @@ async def collect_status_snapshot(mcp_base_url: str | None = None) -> Dict[str,
             housekeeping()
     except Exception:
         pass
-    self_healing_summary = _build_self_healing_summary()
-    self_hardening_summary = _build_self_hardening_summary()
-    stability_gate = evaluate_self_stabilization_gate(self_healing_summary)
-    restart = _read_restart_status()
+    return {
+        "self_healing": _build_self_healing_summary(),
+        "self_hardening": _build_self_hardening_summary(),
+        "restart": _read_restart_status(),
+    }
 
-    try:
-        live_tool_stats = _safe_engine_stat(
+
+def _collect_analytics_section() -> Dict[str, Any]:
+    improvement_engine = get_improvement_engine()
+    return {
+        "tool_stats": _safe_engine_stat(
             improvement_engine,
             "get_tool_stats",
             default=[],
             days=_OPS_ANALYTICS_LIVE_DAYS,
-        )
-        live_routing_stats = _safe_engine_stat(
+        ),
+        "routing_stats": _safe_engine_stat(
             improvement_engine,
             "get_routing_stats",
             default={"by_agent": {}, "days": _OPS_ANALYTICS_LIVE_DAYS},
             days=_OPS_ANALYTICS_LIVE_DAYS,
-        )
-        live_recall_stats = _safe_engine_stat(
+        ),
+        "recall_stats": _safe_engine_stat(
             improvement_engine,
             "get_conversation_recall_stats",
             default={"analysis_days": _OPS_ANALYTICS_LIVE_DAYS, "total_queries": 0},
             days=_OPS_ANALYTICS_LIVE_DAYS,
-        )
+        ),
+    }
+
+
+def _collect_request_section() -> Dict[str, Any]:
+    try:
+        return _build_request_runtime_correlation(build_autonomy_observation_summary())
+    except Exception:
+        return dict(_EMPTY_REQUEST_RUNTIME)
+
+
+def _snapshot_section_collectors(base_url: str) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    """Sektion → Coroutine-Factory. Blockierendes SQLite-/Datei-I/O laeuft im Thread."""
+    return {
+        "local": lambda: _collect_local_section(base_url),
+        "providers": _collect_provider_section,
+        "services": _collect_service_section,
+        "usage": lambda: asyncio.to_thread(_collect_usage_section),
+        "health": lambda: asyncio.to_thread(_collect_health_section),
+        "analytics": lambda: asyncio.to_thread(_collect_analytics_section),
+        "requests": lambda: asyncio.to_thread(_collect_request_section),
+    }
+
+
+def _assemble_status_snapshot(sections: Dict[str, Any]) -> Dict[str, Any]:
+    """Baut aus den Sektions-Rohdaten den Snapshot inkl. abgeleiteter Bewertungen."""
+    local_results = dict(sections.get("local") or {})
+    local_results.setdefault("agent_status", {})
+    provider_results = dict(sections.get("providers") or {})
+    services = dict(sections.get("services") or {})
+    usage = sections.get("usage") or {}
+    usage_summary = usage.get("usage") or dict(_EMPTY_USAGE_SUMMARY)
+    budget_status = usage.get("budget") or {"state": "unknown", "message": "", "scopes": [], "soft_max_tokens": 0, "window_days": 1}
+    health = sections.get("health") or {}
+    self_healing_summary = health.get("self_healing") or {}
+    self_hardening_summary = health.get("self_hardening") or {}
+    restart = health.get("restart") or {}
+    analytics = sections.get("analytics") or {}
+    request_runtime = sections.get("requests") or dict(_EMPTY_REQUEST_RUNTIME)
+
+    qdrant_service = services.get("qdrant")
+    if qdrant_service is not None:
+        qdrant_ready = local_results.get("qdrant_ready", {}) or {}
+        if qdrant_service.get("ok", False) and not bool(qdrant_ready.get("ok", False)):
+            qdrant_service = dict(qdrant_service)
+            qdrant_service["ok"] = False
+            qdrant_service["active"] = "degraded"
+            qdrant_service["detail"] = str(qdrant_ready.get("error", "") or "readyz failed")
+            services["qdrant"] = qdrant_service
+
+    runtime_agents = (local_results["agent_status"].get("data", {}) or {}).get("agents", {}) or {}
+    stability_gate = evaluate_self_stabilization_gate(self_healing_summary)
+
+    try:
         ops_summary = build_ops_observability_summary(
             services=services,
             providers=provider_results,
-            tool_stats=live_tool_stats,
-            routing_stats=live_routing_stats,
+            tool_stats=analytics.get("tool_stats", []),
+            routing_stats=analytics.get("routing_stats", {"by_agent": {}, "days": _OPS_ANALYTICS_LIVE_DAYS}),
             llm_usage=usage_summary,
             budget=budget_status,
-            recall_stats=live_recall_stats,
+            recall_stats=analytics.get("recall_stats", {"analysis_days": _OPS_ANALYTICS_LIVE_DAYS, "total_queries": 0}),
             self_healing=self_healing_summary,
             hardening=self_hardening_summary,
             live_window_days=_OPS_ANALYTICS_LIVE_DAYS,
@@ -797,28 +904,6 @@ async def collect_status_snapshot(mcp_base_url: str | None = None) -> Dict[str,
         self_healing=self_healing_summary,
         stability_gate=stability_gate,
     )
-    try:
-        observation_summary = build_autonomy_observation_summary()
-        request_runtime = _build_request_runtime_correlation(observation_summary)
-    except Exception:
-        request_runtime = {
-            "state": "unknown",
-            "reason": "observation_unavailable",
-            "chat_requests_total": 0,
-            "chat_completed_total": 0,
-            "chat_failed_total": 0,
-            "dispatcher_routes_total": 0,
-            "request_routes_total": 0,
-            "task_routes_total": 0,
-            "task_started_total": 0,
-            "task_completed_total": 0,
-            "task_failed_total": 0,
-            "user_visible_failures_total": 0,
-            "last_request": {},
-            "last_route": {},
-            "last_outcome": {},
-            "last_correlated_failure": {},
-        }
 
     return {
         "services": services,
@@ -841,6 +926,227 @@ async def collect_status_snapshot(mcp_base_url: str | None = None) -> Dict[str,
     }
 
 
+async def collect_status_snapshot(mcp_base_url: str | None = None) -> Dict[str, Any]:
+    """Sammelt alle Sektionen frisch (parallel) – fuer Gates, Doctor und Reports."""
+    base_url = (mcp_base_url or _DEFAULT_MCP_BASE_URL).rstrip("/")
+    collectors = _snapshot_section_collectors(base_url)
+    values = await asyncio.gather(*(factory() for factory in collectors.values()))
+    return _assemble_status_snapshot(dict(zip(collectors.keys(), values)))
+
+
+# ── Hintergrund-Collector (gecachter Snapshot) ───────────────────
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.5, float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+# Aktualisierungstakt je Sektion (Sekunden)
+_SECTION_INTERVALS_S: Dict[str, float] = {
+    "local": _env_float("STATUS_SNAPSHOT_LOCAL_INTERVAL_S", 10.0),
+    "services": _env_float("STATUS_SNAPSHOT_SERVICES_INTERVAL_S", 15.0),
+    "providers": _env_float("STATUS_SNAPSHOT_PROVIDERS_INTERVAL_S", 60.0),
+    "usage": _env_float("STATUS_SNAPSHOT_USAGE_INTERVAL_S", 60.0),
+    "health": _env_float("STATUS_SNAPSHOT_HEALTH_INTERVAL_S", 30.0),
+    "analytics": _env_float("STATUS_SNAPSHOT_ANALYTICS_INTERVAL_S", 120.0),
+    "requests": _env_float("STATUS_SNAPSHOT_REQUESTS_INTERVAL_S", 15.0),
+}
+# Ohne Leser schlaeft der Collector nach dieser Zeit ein (keine Dauer-API-Pings).
+_COLLECTOR_IDLE_S = _env_float("STATUS_SNAPSHOT_IDLE_S", 600.0)
+# Erster Aufruf wartet hoechstens so lange auf fehlende Sektionen.
+_COLLECTOR_FIRST_WAIT_S = _env_float("STATUS_SNAPSHOT_FIRST_WAIT_S", 8.0)
+
+
+@dataclass
+class _SectionState:
+    name: str
+    interval_s: float
+    value: Any = None
+    has_value: bool = False
+    # Letzter erfolgreicher Refresh — Grundlage fuer Alter/stale
+    updated_at: float = 0.0
+    updated_wall: str = ""
+    # Letzter Versuch (Erfolg oder Fehler) — Grundlage fuer den Takt
+    attempted_at: float = 0.0
+    duration_ms: int = 0
+    error: str = ""
+    failed_wall: str = ""
+    consecutive_failures: int = 0
+    refreshes: int = 0
+    task: Optional[asyncio.Task] = None
+
+    def age_s(self, now: float) -> Optional[float]:
+        return round(now - self.updated_at, 3) if self.has_value else None
+
+    def due(self, now: float) -> bool:
+        return not self.has_value or (now - self.attempted_at) >= self.interval_s
+
+
+class StatusSnapshotCollector:
+    """
+    Haelt den letzten Status-Snapshot vor und aktualisiert jede Sektion im eigenen Takt.
+
+    get_snapshot() antwortet sofort aus dem Cache; faellige Sektionen werden im
+    Hintergrund erneuert. Nur beim allerersten Aufruf wird (begrenzt) gewartet.
+    """
+
+    def __init__(
+        self,
+        mcp_base_url: str | None = None,
+        intervals_s: Optional[Dict[str, float]] = None,
+        idle_s: float = _COLLECTOR_IDLE_S,
+    ):
+        self.base_url = (mcp_base_url or _DEFAULT_MCP_BASE_URL).rstrip("/")
+        self._collectors = _snapshot_section_collectors(self.base_url)
+        merged = dict(_SECTION_INTERVALS_S)
+        merged.update(intervals_s or {})
+        self._sections = {
+            name: _SectionState(name=name, interval_s=float(merged.get(name, 30.0)))
+            for name in self._collectors
+        }
+        self.idle_s = float(idle_s)
+        self._last_read = time.monotonic()
+        self._loop_task: Optional[asyncio.Task] = None
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_version = -1
+        self._version = 0
+
+    # ── Refresh ──────────────────────────────────────────────────
+
+    async def _refresh_section(self, state: _SectionState) -> None:
+        started = time.perf_counter()
+        try:
+            value = await self._collectors[state.name]()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Letzten guten Wert (und dessen Alter) behalten, Fehler separat markieren.
+            state.error = str(exc)[:200]
+            state.failed_wall = datetime.now().isoformat(timespec="seconds")
+            state.consecutive_failures += 1
+            log.debug("Status-Sektion %s fehlgeschlagen: %s", state.name, exc)
+        else:
+            state.value = value
+            state.has_value = True
+            state.error = ""
+            state.consecutive_failures = 0
+            state.updated_at = time.monotonic()
+            state.updated_wall = datetime.now().isoformat(timespec="seconds")
+            self._version += 1
+        finally:
+            state.attempted_at = time.monotonic()
+            state.duration_ms = round((time.perf_counter() - started) * 1000)
+            state.refreshes += 1
+
+    def _kick_due_sections(self) -> List[asyncio.Task]:
+        now = time.monotonic()
+        tasks: List[asyncio.Task] = []
+        for state in self._sections.values():
+            if state.task is not None and not state.task.done():
+                tasks.append(state.task)
+                continue
+            if state.due(now):
+                state.task = asyncio.create_task(self._refresh_section(state))
+                tasks.append(state.task)
+        return tasks
+
+    async def _run(self) -> None:
+        tick_s = max(0.5, min(state.interval_s for state in self._sections.values()) / 2)
+        while time.monotonic() - self._last_read < self.idle_s:
+            self._kick_due_sections()
+            await asyncio.sleep(tick_s)
+        log.debug("Status-Collector pausiert (keine Leser seit %.0fs)", self.idle_s)
+
+    def _ensure_running(self) -> None:
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    # ── Lesen ────────────────────────────────────────────────────
+
+    async def get_snapshot(self, first_wait_s: float = _COLLECTOR_FIRST_WAIT_S) -> Dict[str, Any]:
+        self._last_read = time.monotonic()
+        self._kick_due_sections()
+        self._ensure_running()
+        missing = [
+            state.task for state in self._sections.values()
+            if not state.has_value and state.task is not None and not state.task.done()
+        ]
+        if missing:
+            await asyncio.wait(missing, timeout=first_wait_s)
+        if self._cached is None or self._cached_version != self._version:
+            self._cached = _assemble_status_snapshot(
+                {name: state.value for name, state in self._sections.items() if state.has_value}
+            )
+            self._cached_version = self._version
+        snapshot = dict(self._cached)
+        snapshot["freshness"] = self.freshness()
+        return snapshot
+
+    def freshness(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        sections: Dict[str, Any] = {}
+        for name, state in self._sections.items():
+            age = state.age_s(now)
+            sections[name] = {
+                "age_seconds": age,
+                "interval_seconds": state.interval_s,
+                # stale: zwei Takte verpasst oder noch nie erfolgreich
+                "stale": age is None or age > 2 * state.interval_s,
+                "updated_at": state.updated_wall,
+                "duration_ms": state.duration_ms,
+                "refreshing": state.task is not None and not state.task.done(),
+                "error": state.error,
+                "last_error_at": state.failed_wall,
+                "consecutive_failures": state.consecutive_failures,
+            }
+        return {
+            "cached": True,
+            "stale_sections": sorted(name for name, info in sections.items() if info["stale"]),
+            "sections": sections,
+        }
+
+    async def shutdown(self) -> None:
+        tasks = [t for t in [self._loop_task, *(s.task for s in self._sections.values())] if t is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+
+
+# Ein Collector pro Event-Loop und Basis-URL (Tasks sind loop-gebunden).
+_collectors: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, StatusSnapshotCollector]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_status_snapshot_collector(mcp_base_url: str | None = None) -> StatusSnapshotCollector:
+    loop = asyncio.get_running_loop()
+    base_url = (mcp_base_url or _DEFAULT_MCP_BASE_URL).rstrip("/")
+    per_loop = _collectors.setdefault(loop, {})
+    collector = per_loop.get(base_url)
+    if collector is None:
+        collector = StatusSnapshotCollector(base_url)
+        per_loop[base_url] = collector
+    return collector
+
+
+async def get_cached_status_snapshot(mcp_base_url: str | None = None) -> Dict[str, Any]:
+    """Sofortige Antwort aus dem Hintergrund-Collector (Telegram /status, /status/snapshot)."""
+    return await get_status_snapshot_collector(mcp_base_url).get_snapshot()
+
+
+async def shutdown_status_snapshot_collectors() -> None:
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    for collector in list((_collectors.pop(loop, None) or {}).values()):
+        await collector.shutdown()
+
+
 def _runtime_icon(status: str) -> str:
     normalized = (status or "").strip().lower()
     return {
@@ -43,7 +43,7 @@ from telegram.ext import (
     filters,
 )
 
-from gateway.status_snapshot import collect_status_snapshot, format_status_message
+from gateway.status_snapshot import format_status_message, get_cached_status_snapshot
 from orchestration.autonomy_observation import record_autonomy_observation
 from orchestration.pending_workflow_state import (
     is_pending_workflow_state,
@@ -456,40 +456,17 @@ async def _try_send_document(update: Update, result: str) -> bool:
 # Voice-System (Whisper STT + Inworld.AI TTS)
 # ──────────────────────────────────────────────────────────────────
 
-_whisper_model = None  # Lazy-Init beim ersten Voice-Message
-
-
-def _get_whisper():
-    """Lädt Whisper beim ersten Aufruf (CUDA wenn verfügbar, sonst CPU)."""
-    global _whisper_model
-    if _whisper_model is None:
-        from faster_whisper import WhisperModel
-        try:
-            _whisper_model = WhisperModel("medium", device="cuda", compute_type="float16")
-            log.info("Whisper geladen (CUDA)")
-        except Exception:
-            _whisper_model = WhisperModel("medium", device="cpu", compute_type="int8")
-            log.info("Whisper geladen (CPU Fallback)")
-    return _whisper_model
-
-
-def _transcribe_sync(ogg_bytes: bytes) -> str:
-    """OGG-Bytes → Text (synchron, für asyncio.to_thread)."""
-    import numpy as np
-    from pydub import AudioSegment
-
-    audio = AudioSegment.from_ogg(io.BytesIO(ogg_bytes))
-    audio = audio.set_channels(1).set_frame_rate(16000)
-    samples = np.array(audio.get_array_of_samples(), dtype=np.float32) / 32768.0
-
-    whisper = _get_whisper()
-    segments, _ = whisper.transcribe(samples, language="de", vad_filter=True)
-    return " ".join(s.text.strip() for s in segments)
-
-
 async def _transcribe_ogg(ogg_bytes: bytes) -> str:
-    """Async-Wrapper für Whisper-Transkription."""
-    return await asyncio.to_thread(_transcribe_sync, ogg_bytes)
+    """OGG-Bytes → Text ueber den geteilten STT-Service (ein Whisper-Modell pro Prozess)."""
+    from tools.engines.stt_service import PRIORITY_MESSAGE, decode_audio, get_stt_service
+
+    samples = await asyncio.to_thread(decode_audio, ogg_bytes, "ogg")
+    return await get_stt_service().transcribe_async(
+        samples,
+        language="de",
+        vad_filter=True,
+        priority=PRIORITY_MESSAGE,
+    )
 
 
 async def _synthesize_voice(text: str) -> Optional[bytes]:
@@ -589,7 +566,8 @@ async def cmd_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         try:
             from utils.policy_gate import get_policy_decision_metrics
 
-            policy_metrics = get_policy_decision_metrics(window_hours=24)
+            # flush() des Decision-Writers blockiert bis zu 2 s: nicht auf dem Loop.
+            policy_metrics = await asyncio.to_thread(get_policy_decision_metrics, window_hours=24)
         except Exception:
             policy_metrics = {
                 "decisions_total": 0,
@@ -601,7 +579,9 @@ async def cmd_tasks(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             from orchestration.autonomy_scorecard import build_autonomy_scorecard
 
             scorecard_window = max(1, int(os.getenv("AUTONOMY_SCORECARD_WINDOW_HOURS", "24")))
-            autonomy_scorecard = build_autonomy_scorecard(queue=queue, window_hours=scorecard_window)
+            autonomy_scorecard = await asyncio.to_thread(
+                build_autonomy_scorecard, queue=queue, window_hours=scorecard_window
+            )
         except Exception:
             autonomy_scorecard = {
                 "overall_score": 0.0,
@@ -845,7 +825,8 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
         try:
             from utils.policy_gate import get_policy_decision_metrics
 
-            policy_metrics = get_policy_decision_metrics(window_hours=24)
+            # flush() des Decision-Writers blockiert bis zu 2 s: nicht auf dem Loop.
+            policy_metrics = await asyncio.to_thread(get_policy_decision_metrics, window_hours=24)
         except Exception:
             policy_metrics = {
                 "decisions_total": 0,
@@ -857,7 +838,9 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
             from orchestration.autonomy_scorecard import build_autonomy_scorecard
 
             scorecard_window = max(1, int(os.getenv("AUTONOMY_SCORECARD_WINDOW_HOURS", "24")))
-            autonomy_scorecard = build_autonomy_scorecard(queue=queue, window_hours=scorecard_window)
+            autonomy_scorecard = await asyncio.to_thread(
+                build_autonomy_scorecard, queue=queue, window_hours=scorecard_window
+            )
         except Exception:
             autonomy_scorecard = {
                 "overall_score": 0.0,
@@ -977,7 +960,7 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
             f"Disk {sys_stats['disk_percent']}%"
         )
 
-        snapshot = await collect_status_snapshot()
+        snapshot = await get_cached_status_snapshot()
         summary_lines = [
             sched_line,
             queue_line,
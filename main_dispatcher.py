@@ -886,6 +886,7 @@ def _record_dispatcher_llm_usage(
                 input_tokens=int(usage["input_tokens"]),
                 output_tokens=int(usage["output_tokens"]),
                 cached_tokens=int(usage["cached_tokens"]),
+                cache_write_tokens=int(usage.get("cache_write_tokens", 0)),
                 cost_usd=float(usage["cost_usd"]),
                 latency_ms=max(int(latency_ms or 0), 0),
                 success=bool(success),
@@ -4135,7 +4136,7 @@ async def _cli_loop(tools_desc: str) -> None:
 
             # Task-Liste anzeigen
             if q_clean.lower() in {"/tasks", "tasks", "offene tasks"}:
-                _print_tasks()
+                await asyncio.to_thread(_print_tasks)
                 continue
 
             if q_clean.lower().startswith("/approvals"):
@@ -4450,6 +4451,8 @@ async def main_loop():
             required=True,
             detail={"interval_minutes": interval},
         )
+        # Warte- vs. Ausführungszeit je Lane live im Dispatcher-/health
+        dispatcher_health.set_stats_provider("autonomous_worker_pool", runner.get_worker_pool_stats)
         log.info(f"🤖 AutonomousRunner aktiv (alle {interval} min)")
 
         tg_token = os.getenv("TELEGRAM_BOT_TOKEN", "")
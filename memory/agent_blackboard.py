@@ -17,6 +17,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from memory.memory_db import get_memory_db
+
 log = logging.getLogger("AgentBlackboard")
 
 MEMORY_DB_PATH = Path(__file__).resolve().parents[1] / "data" / "timus_memory.db"
@@ -42,10 +44,7 @@ CREATE INDEX IF NOT EXISTS idx_bb_expires ON agent_blackboard(expires_at);
 
 
 def _ensure_tables(db_path: Path) -> None:
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    with sqlite3.connect(str(db_path)) as conn:
-        conn.executescript(_SCHEMA)
-        conn.commit()
+    get_memory_db(db_path).executescript(_SCHEMA)
 
 
 # ──────────────────────────────────────────────────────────────────
@@ -77,6 +76,7 @@ class AgentBlackboard:
 
     def __init__(self, db_path: Path = MEMORY_DB_PATH):
         self.db_path = db_path
+        self._db = get_memory_db(db_path)
         _ensure_tables(db_path)
 
     # ------------------------------------------------------------------
@@ -108,7 +108,7 @@ class AgentBlackboard:
             expires = now + timedelta(minutes=max(1, ttl_minutes))
             value_str = json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else value
 
-            with sqlite3.connect(str(self.db_path)) as conn:
+            def _write(conn: sqlite3.Connection) -> None:
                 # Bestehenden Eintrag ersetzen (gleicher agent+topic+key)
                 conn.execute(
                     """DELETE FROM agent_blackboard
@@ -130,7 +130,8 @@ class AgentBlackboard:
                         session_id,
                     ),
                 )
-                conn.commit()
+
+            self._db.write(_write)
             log.debug("Blackboard.write: [%s:%s] %s", agent, topic, key)
         except Exception as e:
             log.warning("Blackboard.write fehlgeschlagen: %s", e)
@@ -153,7 +154,7 @@ class AgentBlackboard:
         """
         try:
             now = datetime.now().isoformat()
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._db.read() as conn:
                 if key:
                     rows = conn.execute(
                         """SELECT agent, topic, key, value, expires_at, created_at
@@ -208,7 +209,7 @@ class AgentBlackboard:
         try:
             now = datetime.now().isoformat()
             like = f"%{query}%"
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._db.read() as conn:
                 rows = conn.execute(
                     """SELECT agent, topic, key, value, expires_at, created_at
                        FROM agent_blackboard
@@ -251,13 +252,12 @@ class AgentBlackboard:
         """
         try:
             now = datetime.now().isoformat()
-            with sqlite3.connect(str(self.db_path)) as conn:
-                cursor = conn.execute(
+            return self._db.write(
+                lambda conn: conn.execute(
                     "DELETE FROM agent_blackboard WHERE expires_at < ?",
                     (now,),
-                )
-                conn.commit()
-                return cursor.rowcount
+                ).rowcount
+            )
         except Exception as e:
             log.debug("Blackboard.clear_expired: %s", e)
             return 0
@@ -271,7 +271,7 @@ class AgentBlackboard:
         """
         try:
             now = datetime.now().isoformat()
-            with sqlite3.connect(str(self.db_path)) as conn:
+            with self._db.read() as conn:
                 total = conn.execute(
                     "SELECT COUNT(*) FROM agent_blackboard WHERE expires_at > ?",
                     (now,),
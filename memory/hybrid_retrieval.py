@@ -0,0 +1,349 @@
+# memory/hybrid_retrieval.py
+"""
+Hybrid-Retrieval (Vektor + FTS5) fuer ``MemoryManager.find_related_memories``.
+
+Bisher liefen Vektor-Suche (Qdrant/ChromaDB) und FTS5-Suche nacheinander auf
+dem aufrufenden Thread, und die gemischte Liste wurde nach ``1 - distance``
+bzw. dem unnormierten bm25-``rank`` sortiert — zwei nicht vergleichbare
+Skalen. ``build_working_memory_context`` laeuft vor fast jedem Agent-Task,
+die Suche liegt damit direkt auf der wahrgenommenen Latenz.
+
+Jetzt:
+- alle Backends laufen parallel in einem Thread-Pool des Retrievers (ein
+  Worker je Backend); ein Backend, das laenger als MEMORY_HYBRID_TIMEOUT_S
+  braucht, wird fuer diesen Aufruf verworfen statt den Turn zu blockieren.
+  Laeuft sein alter Job noch, wird es beim naechsten Aufruf uebersprungen
+  (``busy``) — haengende Backends stapeln so keine Threads auf
+- Fusion per Reciprocal Rank Fusion: Reihenfolge nur aus den Raengen je
+  Backend (``1 / (k + rank)``), unabhaengig von deren Score-Skalen; Treffer,
+  die mehrere Backends liefern, werden zusammengefuehrt und steigen auf
+- ``relevance`` bleibt je Backend auf 0..1 kalibriert (Vektor:
+  ``1 - distance``, bm25: ``s / (s + 1)``), damit bestehende Schwellwerte
+  der Aufrufer weiter gelten
+- Query-Embeddings werden pro normalisiertem Text gecacht
+  (``QueryEmbeddingCache``), wiederholte Recalls sparen den Embedding-Call
+- Latenz, Trefferzahl, Fehler, Timeouts und Skips je Backend in ``stats()``
+
+Konfiguration:
+    MEMORY_HYBRID_PARALLEL          (default: true)
+    MEMORY_HYBRID_TIMEOUT_S         (default: 4.0)
+    MEMORY_RRF_K                    (default: 60)
+    MEMORY_QUERY_EMBED_CACHE_SIZE   (default: 256)
+
+USAGE:
+    retriever = HybridRetriever()
+    results = retriever.search(
+        "json antworten",
+        n_results=5,
+        backends={
+            "semantic": lambda: semantic_candidates(...),
+            "keyword_fts5": lambda: keyword_candidates(...),
+        },
+    )
+    retriever.last_stats["backends"]["semantic"]["ms"]
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+log = logging.getLogger("hybrid_retrieval")
+
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def hybrid_parallel_enabled() -> bool:
+    return os.getenv("MEMORY_HYBRID_PARALLEL", "true").strip().lower() not in _FALSE_VALUES
+
+
+def normalize_query_text(text: str) -> str:
+    """Cache-Schluessel fuer Queries: klein, Whitespace zusammengefasst."""
+    return " ".join(str(text or "").lower().split())
+
+
+def calibrate_distance(distance: Any) -> float:
+    """Vektor-Distanz -> Relevanz 0..1 (wie bisher ``1 - distance``, aber geclippt)."""
+    try:
+        return max(0.0, min(1.0, 1.0 - float(distance)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def calibrate_bm25(rank: Any) -> float:
+    """bm25-Betrag (groesser = besser) -> Relevanz 0..1, monoton."""
+    try:
+        score = abs(float(rank))
+    except (TypeError, ValueError):
+        return 0.0
+    return score / (score + 1.0)
+
+
+_FTS_MARKERS = re.compile(r">>>|<<<|\.\.\.")
+
+
+def content_fingerprint(text: str, *, max_chars: int = 160) -> str:
+    """Backend-uebergreifender Schluessel: FTS-Snippet-Marker entfernt, normalisiert."""
+    return normalize_query_text(_FTS_MARKERS.sub(" ", str(text or "")))[:max_chars]
+
+
+# ── Query-Embedding-Cache ────────────────────────────────────────────────────
+
+
+class QueryEmbeddingCache:
+    """LRU-Cache fuer Query-Embeddings, Schluessel = normalisierter Text."""
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self.max_entries = max_entries or _env_int("MEMORY_QUERY_EMBED_CACHE_SIZE", 256)
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[str], Optional[Sequence[float]]],
+    ) -> Optional[List[float]]:
+        key = normalize_query_text(text)
+        if not key:
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        vector = compute(key)
+        if vector is None:
+            return None
+        stored = [float(value) for value in vector]
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return stored
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+# ── Fusion ───────────────────────────────────────────────────────────────────
+
+
+def reciprocal_rank_fusion(
+    ranked: Mapping[str, Sequence[Dict[str, Any]]],
+    *,
+    k: int = 60,
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Fusioniert Ergebnislisten mehrerer Backends per RRF.
+
+    Treffer werden ueber ``doc_id`` und den Inhalts-Fingerprint
+    zusammengefuehrt; der erste Eintrag (in Backend-Reihenfolge) liefert die
+    Felder, ``relevance`` ist das Maximum der kalibrierten Backend-Werte.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    aliases: Dict[str, str] = {}
+    for backend, items in ranked.items():
+        for rank, item in enumerate(items, start=1):
+            doc_id = str(item.get("doc_id") or "")
+            fingerprint = content_fingerprint(item.get("content", ""))
+            keys = [key for key in (f"id:{doc_id}" if doc_id else "", f"fp:{fingerprint}" if fingerprint else "") if key]
+            target = next((aliases[key] for key in keys if key in aliases), None)
+            if target is None:
+                target = keys[0] if keys else f"{backend}:{rank}"
+                entry = dict(item)
+                entry["fusion_score"] = 0.0
+                entry["backend_ranks"] = {}
+                fused[target] = entry
+            entry = fused[target]
+            if backend in entry["backend_ranks"]:
+                continue
+            entry["backend_ranks"][backend] = rank
+            entry["fusion_score"] += 1.0 / (k + rank)
+            entry["relevance"] = max(float(entry.get("relevance") or 0.0), float(item.get("relevance") or 0.0))
+            for key in keys:
+                aliases.setdefault(key, target)
+
+    results = sorted(
+        fused.values(),
+        key=lambda entry: (entry["fusion_score"], entry.get("relevance", 0.0)),
+        reverse=True,
+    )
+    for entry in results:
+        entry["fusion_score"] = round(entry["fusion_score"], 6)
+    return results[:limit] if limit is not None else results
+
+
+# ── Retriever ────────────────────────────────────────────────────────────────
+
+
+BACKEND_BUSY = "busy"
+
+
+class HybridRetriever:
+    """Fuehrt Such-Backends parallel aus und fusioniert sie per RRF."""
+
+    def __init__(
+        self,
+        *,
+        rrf_k: Optional[int] = None,
+        timeout_s: Optional[float] = None,
+        parallel: Optional[bool] = None,
+    ) -> None:
+        self.rrf_k = rrf_k or _env_int("MEMORY_RRF_K", 60)
+        self.timeout_s = _env_float("MEMORY_HYBRID_TIMEOUT_S", 4.0) if timeout_s is None else float(timeout_s)
+        self.parallel = hybrid_parallel_enabled() if parallel is None else bool(parallel)
+        self.last_stats: Dict[str, Any] = {}
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_workers = 0
+        # Nach Timeout verworfene, aber noch laufende Jobs je Backend
+        self._abandoned: Dict[str, Future] = {}
+
+    def _get_executor(self, workers: int) -> ThreadPoolExecutor:
+        """Pool mit einem Worker je Backend; waechst, wenn neue Backends dazukommen."""
+        with self._lock:
+            if self._executor is None or self._executor_workers < workers:
+                previous = self._executor
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="memory-retrieval")
+                self._executor_workers = workers
+                if previous is not None:
+                    previous.shutdown(wait=False)
+            return self._executor
+
+    def _busy_backends(self, names: Sequence[str]) -> set:
+        with self._lock:
+            for name in [n for n, future in self._abandoned.items() if future.done()]:
+                del self._abandoned[name]
+            return {name for name in names if name in self._abandoned}
+
+    def _run_backend(self, call: Callable[[], List[Dict[str, Any]]]) -> tuple:
+        started = time.perf_counter()
+        try:
+            return list(call() or []), None, (time.perf_counter() - started) * 1000.0
+        except Exception as e:  # Backend-Fehler duerfen die anderen nicht mitreissen
+            return [], str(e), (time.perf_counter() - started) * 1000.0
+
+    def search(
+        self,
+        query: str,
+        *,
+        n_results: int,
+        backends: Mapping[str, Callable[[], List[Dict[str, Any]]]],
+    ) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        outcomes: Dict[str, tuple] = {}
+        if self.parallel and len(backends) > 1:
+            busy = self._busy_backends(list(backends))
+            executor = self._get_executor(len(backends))
+            futures = {
+                name: executor.submit(self._run_backend, call) for name, call in backends.items() if name not in busy
+            }
+            deadline = started + self.timeout_s
+            for name in backends:
+                if name in busy:
+                    outcomes[name] = ([], BACKEND_BUSY, 0.0)
+                    continue
+                future = futures[name]
+                try:
+                    outcomes[name] = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+                except FutureTimeoutError:
+                    outcomes[name] = ([], "timeout", (time.perf_counter() - started) * 1000.0)
+                    with self._lock:
+                        self._abandoned[name] = future
+        else:
+            for name, call in backends.items():
+                outcomes[name] = self._run_backend(call)
+
+        ranked = {name: items for name, (items, _error, _ms) in outcomes.items()}
+        results = reciprocal_rank_fusion(ranked, k=self.rrf_k, limit=n_results)
+
+        backend_stats: Dict[str, Dict[str, Any]] = {}
+        for name, (items, error, ms) in outcomes.items():
+            backend_stats[name] = {"ms": round(ms, 2), "results": len(items)}
+            if error:
+                backend_stats[name]["error"] = error
+                log.debug("Hybrid-Retrieval Backend %s fehlgeschlagen: %s", name, error)
+        self.last_stats = {
+            "query_chars": len(str(query or "")),
+            "total_ms": round((time.perf_counter() - started) * 1000.0, 2),
+            "parallel": self.parallel,
+            "fused_results": len(results),
+            "backends": backend_stats,
+        }
+        self._record(backend_stats)
+        return results
+
+    def _record(self, backend_stats: Mapping[str, Mapping[str, Any]]) -> None:
+        with self._lock:
+            for name, info in backend_stats.items():
+                totals = self._totals.setdefault(
+                    name, {"calls": 0, "ms_total": 0.0, "ms_max": 0.0, "errors": 0, "timeouts": 0, "skipped": 0}
+                )
+                totals["calls"] += 1
+                totals["ms_total"] += float(info["ms"])
+                totals["ms_max"] = max(totals["ms_max"], float(info["ms"]))
+                if info.get("error") == "timeout":
+                    totals["timeouts"] += 1
+                elif info.get("error") == BACKEND_BUSY:
+                    totals["skipped"] += 1
+                elif info.get("error"):
+                    totals["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            backends = {
+                name: {
+                    "calls": int(totals["calls"]),
+                    "avg_ms": round(totals["ms_total"] / totals["calls"], 2) if totals["calls"] else 0.0,
+                    "max_ms": round(totals["ms_max"], 2),
+                    "errors": int(totals["errors"]),
+                    "timeouts": int(totals["timeouts"]),
+                    "skipped": int(totals["skipped"]),
+                }
+                for name, totals in self._totals.items()
+            }
+        return {
+            "parallel": self.parallel,
+            "rrf_k": self.rrf_k,
+            "timeout_s": self.timeout_s,
+            "backends": backends,
+            "last": dict(self.last_stats),
+        }
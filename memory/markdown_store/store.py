@@ -41,6 +41,7 @@ from dataclasses import dataclass, field, asdict
 import json
 import re
 from memory.markdown_store.query_utils import build_safe_fts_query
+from memory.memory_db import get_memory_db
 
 log = logging.getLogger("MarkdownStore")
 
@@ -721,12 +722,12 @@ class HybridSearchIndex:
 
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        self._db = get_memory_db(db_path)
         self._init_db()
 
     def _init_db(self):
         """Erstellt die FTS5-Tabelle falls nicht vorhanden."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript("""
+        self._db.executescript("""
                 CREATE VIRTUAL TABLE IF NOT EXISTS markdown_fts USING fts5(
                     source,
                     title,
@@ -750,7 +751,7 @@ class HybridSearchIndex:
     def _needs_sync(self, source: str, content: str) -> bool:
         """Prueft ob eine Quelle neu synchronisiert werden muss."""
         current_hash = self._file_hash(content)
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             row = conn.execute(
                 "SELECT file_hash FROM sync_state WHERE source = ?",
                 (source,)
@@ -761,8 +762,8 @@ class HybridSearchIndex:
 
     def _update_sync_state(self, source: str, content: str):
         """Aktualisiert den Sync-State fuer eine Quelle."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        self._db.write(
+            lambda conn: conn.execute(
                 """INSERT INTO sync_state (source, file_hash, synced_at)
                    VALUES (?, ?, ?)
                    ON CONFLICT(source) DO UPDATE SET
@@ -770,6 +771,7 @@ class HybridSearchIndex:
                      synced_at = excluded.synced_at""",
                 (source, self._file_hash(content), datetime.now().isoformat())
             )
+        )
 
     def index_document(self, source: str, title: str, content: str):
         """Indexiert ein einzelnes Dokument in FTS5."""
@@ -780,7 +782,8 @@ class HybridSearchIndex:
             return
 
         current_hash = self._file_hash(content)
-        with sqlite3.connect(self.db_path) as conn:
+
+        def _write(conn: sqlite3.Connection) -> int:
             # Altes Dokument entfernen
             conn.execute(
                 "DELETE FROM markdown_fts WHERE source = ? OR source LIKE ?",
@@ -805,8 +808,10 @@ class HybridSearchIndex:
                      synced_at = excluded.synced_at""",
                 (source, current_hash, datetime.now().isoformat())
             )
-            conn.commit()
-            log.debug(f"FTS5: {source} indexiert ({len(chunks)} Chunks)")
+            return len(chunks)
+
+        chunk_count = self._db.write(_write)
+        log.debug(f"FTS5: {source} indexiert ({chunk_count} Chunks)")
 
     def _chunk_text(self, text: str, max_chars: int = 500) -> List[str]:
         """Teilt Text in semantische Chunks auf."""
@@ -852,7 +857,7 @@ class HybridSearchIndex:
             return []
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._db.read() as conn:
                 rows = conn.execute(
                     """SELECT source, title, snippet(markdown_fts, 2, '>>>', '<<<', '...', 40),
                               rank
@@ -879,7 +884,7 @@ class HybridSearchIndex:
 
     def get_stats(self) -> Dict[str, Any]:
         """Gibt Statistiken ueber den Index zurueck."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             total = conn.execute(
                 "SELECT COUNT(*) FROM markdown_fts"
             ).fetchone()[0]
@@ -895,10 +900,12 @@ class HybridSearchIndex:
 
     def clear(self):
         """Loescht den gesamten Index."""
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> None:
             conn.execute("DELETE FROM markdown_fts")
             conn.execute("DELETE FROM sync_state")
 
+        self._db.write(_write)
+
 
 class MarkdownStoreWithSearch(MarkdownStore):
     """
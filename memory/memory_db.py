@@ -0,0 +1,357 @@
+# memory/memory_db.py
+"""
+Gemeinsame Zugriffsschicht fuer die Memory-SQLite-Dateien.
+
+Bisher oeffneten ``PersistentMemory``, ``AgentBlackboard`` und
+``HybridSearchIndex`` pro Methode eine neue Connection auf dieselbe Datei.
+Parallele Agenten, die gleichzeitig Interaktions-Events und Blackboard-
+Eintraege schreiben, konkurrierten damit um den Schreib-Lock und liefen in
+``database is locked``.
+
+Jetzt gibt es pro DB-Datei genau eine ``MemoryDB``:
+- Lesen ueber eine langlebige Connection pro Thread (``query_only``),
+  PRAGMAs werden einmalig beim Oeffnen gesetzt; WAL erlaubt Reads parallel
+  zum Writer
+- Schreiben ausschliesslich ueber einen Writer-Thread mit eigener
+  Connection: Jobs werden in eine Queue gestellt, der Writer sammelt alle
+  anstehenden Jobs und committet sie gemeinsam (Group Commit). Jeder Job
+  laeuft in einem eigenen SAVEPOINT, ein fehlschlagender Job wird einzeln
+  zurueckgerollt und bekommt seine Exception, die uebrigen werden committet
+- ``write()`` blockiert bis zum Commit (Read-your-writes bleibt erhalten),
+  ``submit()`` liefert stattdessen ein Future
+
+Konfiguration:
+    MEMORY_DB_GROUP_COMMIT_MAX   (default: 64)   max. Jobs pro Commit
+    MEMORY_DB_SYNCHRONOUS        (default: NORMAL)
+    MEMORY_DB_CACHE_KIB          (default: 65536)
+
+USAGE:
+    db = get_memory_db(MEMORY_DB_PATH)
+    db.write(lambda conn: conn.execute("INSERT ...", params))
+    with db.read() as conn:
+        rows = conn.execute("SELECT ...").fetchall()
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+log = logging.getLogger("memory_db")
+
+T = TypeVar("T")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+_GROUP_COMMIT_MAX = _env_int("MEMORY_DB_GROUP_COMMIT_MAX", 64)
+_CACHE_SIZE_KIB = _env_int("MEMORY_DB_CACHE_KIB", 65536)
+_SYNCHRONOUS = str(os.getenv("MEMORY_DB_SYNCHRONOUS", "NORMAL") or "NORMAL").strip().upper()
+if _SYNCHRONOUS not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+    _SYNCHRONOUS = "NORMAL"
+_BUSY_TIMEOUT_S = 30.0
+
+
+class _WriteJob:
+    __slots__ = ("fn", "future", "batch")
+
+    def __init__(self, fn: Callable[[sqlite3.Connection], Any], batch: bool):
+        self.fn = fn
+        self.future: Future = Future()
+        self.batch = batch
+
+
+class MemoryDB:
+    """Gepoolte Reader + ein serialisierter Writer fuer eine SQLite-Datei."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._readers: Dict[int, sqlite3.Connection] = {}
+        self._jobs: "queue.Queue[Optional[_WriteJob]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+        self._writer_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._commits = 0
+        self._jobs_written = 0
+        self._failed_jobs = 0
+        self._max_batch = 0
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+
+    def _open_connection(self, *, readonly: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=_BUSY_TIMEOUT_S,
+            # Transaktionen steuert der Writer selbst (BEGIN/SAVEPOINT/COMMIT).
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={_SYNCHRONOUS}")
+        conn.execute(f"PRAGMA cache_size=-{_CACHE_SIZE_KIB}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        if readonly:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+
+    def _reader_connection(self) -> sqlite3.Connection:
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None and getattr(local, "pid", None) == os.getpid():
+            return conn
+        # Nach fork() gehoert die geerbte Connection dem Elternprozess.
+        conn = self._open_connection(readonly=True)
+        local.conn = conn
+        local.pid = os.getpid()
+        with self._pool_lock:
+            self._prune_dead_readers()
+            self._readers[threading.get_ident()] = conn
+        return conn
+
+    def _prune_dead_readers(self) -> None:
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [i for i in self._readers if i not in alive]:
+            stale = self._readers.pop(ident)
+            try:
+                stale.close()
+            except sqlite3.Error:
+                pass
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Liefert die Lese-Connection des aktuellen Threads (nur SELECTs)."""
+        if self._on_writer_thread():
+            # Reads innerhalb eines Write-Jobs sehen dessen offene Transaktion.
+            yield self._local.writer_conn
+            return
+        yield self._reader_connection()
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    def _on_writer_thread(self) -> bool:
+        return threading.current_thread() is self._writer
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive() and self._writer_pid == os.getpid():
+            return
+        with self._writer_lock:
+            if self._writer is not None and self._writer.is_alive() and self._writer_pid == os.getpid():
+                return
+            if self._writer_pid != os.getpid():
+                # Jobs aus dem Elternprozess gehoeren nicht zu diesem Prozess.
+                self._jobs = queue.Queue()
+            self._writer_pid = os.getpid()
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name=f"memory-db-writer:{self.db_path.name}",
+                daemon=True,
+            )
+            self._writer.start()
+
+    def submit(
+        self,
+        fn: Callable[[sqlite3.Connection], T],
+        *,
+        batch: bool = True,
+    ) -> "Future[T]":
+        """
+        Stellt einen Schreib-Job in die Writer-Queue.
+
+        Jobs duerfen nicht selbst ``commit()`` aufrufen, das macht der Writer.
+        ``batch=False`` fuehrt den Job ausserhalb der Sammel-Transaktion aus
+        (noetig fuer ``executescript`` und Schema-Migrationen).
+        """
+        job = _WriteJob(fn, batch)
+        if self._on_writer_thread():
+            # Verschachtelter Write aus einem laufenden Job: direkt ausfuehren.
+            try:
+                job.future.set_result(fn(self._local.writer_conn))
+            except BaseException as e:
+                job.future.set_exception(e)
+            return job.future
+        self._ensure_writer()
+        self._jobs.put(job)
+        return job.future
+
+    def write(self, fn: Callable[[sqlite3.Connection], T], *, batch: bool = True) -> T:
+        """Fuehrt ``fn(conn)`` auf dem Writer aus und wartet bis zum Commit."""
+        return self.submit(fn, batch=batch).result()
+
+    def executescript(self, script: str) -> None:
+        self.write(lambda conn: conn.executescript(script), batch=False)
+
+    def _writer_loop(self) -> None:
+        conn = self._open_connection(readonly=False)
+        self._local.writer_conn = conn
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                pending: List[_WriteJob] = [job]
+                stop = False
+                while len(pending) < _GROUP_COMMIT_MAX:
+                    try:
+                        nxt = self._jobs.get_nowait()
+                    except queue.Empty:
+                        break
+                    if nxt is None:
+                        stop = True
+                        break
+                    pending.append(nxt)
+                self._run_jobs(conn, pending)
+                if stop:
+                    return
+        finally:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _run_jobs(self, conn: sqlite3.Connection, jobs: List[_WriteJob]) -> None:
+        batch: List[_WriteJob] = []
+        for job in jobs:
+            if job.batch:
+                batch.append(job)
+                continue
+            self._commit_batch(conn, batch)
+            batch = []
+            self._run_unbatched(conn, job)
+        self._commit_batch(conn, batch)
+
+    def _run_unbatched(self, conn: sqlite3.Connection, job: _WriteJob) -> None:
+        try:
+            result = job.fn(conn)
+            if conn.in_transaction:
+                conn.execute("COMMIT")
+        except BaseException as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._record(commits=0, jobs=0, failed=1)
+            job.future.set_exception(e)
+            return
+        self._record(commits=1, jobs=1, failed=0)
+        job.future.set_result(result)
+
+    def _commit_batch(self, conn: sqlite3.Connection, jobs: List[_WriteJob]) -> None:
+        if not jobs:
+            return
+        done: List[Tuple[_WriteJob, Any]] = []
+        failed: List[Tuple[_WriteJob, BaseException]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for job in jobs:
+                conn.execute("SAVEPOINT memory_db_job")
+                try:
+                    result = job.fn(conn)
+                except BaseException as e:
+                    conn.execute("ROLLBACK TO memory_db_job")
+                    conn.execute("RELEASE memory_db_job")
+                    failed.append((job, e))
+                    continue
+                conn.execute("RELEASE memory_db_job")
+                done.append((job, result))
+            conn.execute("COMMIT")
+        except BaseException as e:
+            # BEGIN/COMMIT selbst gescheitert: kein Job dieser Runde ist persistiert.
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            log.warning("MemoryDB Group-Commit fehlgeschlagen (%s): %s", self.db_path.name, e)
+            already_failed = {id(job) for job, _ in failed}
+            failed.extend((job, e) for job in jobs if id(job) not in already_failed)
+            done = []
+        self._record(commits=1 if done else 0, jobs=len(done), failed=len(failed), batch=len(jobs))
+        for job, result in done:
+            job.future.set_result(result)
+        for job, error in failed:
+            job.future.set_exception(error)
+
+    def _record(self, *, commits: int, jobs: int, failed: int, batch: int = 1) -> None:
+        with self._stats_lock:
+            self._commits += commits
+            self._jobs_written += jobs
+            self._failed_jobs += failed
+            self._max_batch = max(self._max_batch, batch)
+
+    # ------------------------------------------------------------------
+    # Verwaltung
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """Beendet den Writer (nach Abarbeitung der Queue) und schliesst alle Reader."""
+        writer = self._writer
+        if writer is not None and writer.is_alive() and not self._on_writer_thread():
+            self._jobs.put(None)
+            writer.join(timeout=_BUSY_TIMEOUT_S)
+        self._writer = None
+        with self._pool_lock:
+            readers = list(self._readers.values())
+            self._readers.clear()
+        for conn in readers:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._pool_lock:
+            readers = len(self._readers)
+        with self._stats_lock:
+            return {
+                "db_path": str(self.db_path),
+                "reader_connections": readers,
+                "writer_alive": bool(self._writer and self._writer.is_alive()),
+                "queued_jobs": self._jobs.qsize(),
+                "commits": self._commits,
+                "jobs_written": self._jobs_written,
+                "failed_jobs": self._failed_jobs,
+                "max_batch": self._max_batch,
+                "group_commit_max": _GROUP_COMMIT_MAX,
+            }
+
+
+# ── Registry: eine MemoryDB pro Datei ────────────────────────────────────────
+
+_registry: Dict[str, MemoryDB] = {}
+_registry_lock = threading.Lock()
+
+
+def get_memory_db(db_path: Path) -> MemoryDB:
+    """Gibt die prozessweite ``MemoryDB`` fuer ``db_path`` zurueck."""
+    key = str(Path(db_path).expanduser().resolve())
+    with _registry_lock:
+        db = _registry.get(key)
+        if db is None:
+            db = MemoryDB(Path(key))
+            _registry[key] = db
+        return db
+
+
+def close_memory_dbs() -> None:
+    """Schliesst alle registrierten Memory-DBs (Shutdown/Tests)."""
+    with _registry_lock:
+        dbs = list(_registry.values())
+        _registry.clear()
+    for db in dbs:
+        db.close()
@@ -30,13 +30,21 @@ import re
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple, Iterable, Mapping, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Tuple, Callable, Iterable, Mapping, TYPE_CHECKING
 from dataclasses import dataclass, field, asdict
 from openai import OpenAI
 from utils.chroma_runtime import build_chroma_settings, configure_chroma_runtime
 from utils.openai_compat import prepare_openai_params
 from utils.stable_hash import stable_text_digest
 from dotenv import load_dotenv
+from memory.hybrid_retrieval import (
+    HybridRetriever,
+    QueryEmbeddingCache,
+    calibrate_bm25,
+    calibrate_distance,
+)
+from memory.markdown_store.query_utils import build_safe_fts_query
+from memory.memory_db import get_memory_db
 from memory.semantic_backend_policy import (
     normalize_semantic_memory_backend,
     resolve_semantic_memory_backend,
@@ -63,6 +71,20 @@ WORKING_MEMORY_EVENT_HALF_LIFE_HOURS = 18
 WORKING_MEMORY_MEMORY_HALF_LIFE_DAYS = 21
 UNIFIED_RECALL_MAX_SCAN          = int(os.getenv("UNIFIED_RECALL_MAX_SCAN", "200"))   # war: 80
 
+# Konversationen liegen als JSON-Array vor: indiziert wird nur der Nachrichtentext.
+_CONVERSATION_FTS_TEXT_SQL = (
+    "CASE WHEN json_valid({col}) "
+    "THEN (SELECT group_concat(json_extract(value, '$.content'), ' ') FROM json_each({col})) "
+    "ELSE {col} END"
+)
+
+# Zeitabfall im SQL-Ranking: hyperbolisch statt exponentiell, damit keine
+# SQLite-Math-Extension noetig ist (bei age == half_life identisch: 0.5).
+_FTS_DECAY_SQL = (
+    "(1.0 / (1.0 + MAX(0.0, COALESCE("
+    "(julianday('now', 'localtime') - julianday({col})) * 24.0, ?)) / ?))"
+)
+
 
 @dataclass
 class Message:
@@ -136,9 +158,16 @@ class SemanticMemoryStore:
     kontextuelle Suche über bedeutungsähnliche Inhalte.
     """
     
-    def __init__(self, collection: Optional["chromadb.Collection"] = None):
+    def __init__(
+        self,
+        collection: Optional["chromadb.Collection"] = None,
+        embedding_function: Optional[Callable[[List[str]], Any]] = None,
+    ):
         self.collection = collection
+        # Chroma: dieselbe Funktion, mit der die Collection angelegt wurde
+        self.embedding_function = embedding_function
         self._initialized = collection is not None
+        self.query_embeddings = QueryEmbeddingCache()
     
     def is_available(self) -> bool:
         """Prüft ob ChromaDB verfügbar ist."""
@@ -203,6 +232,35 @@ class SemanticMemoryStore:
             log.warning(f"ChromaDB Delete fehlgeschlagen: {e}")
             return False
     
+    def _query_embedder(self) -> Optional[Any]:
+        """Embedding-Funktion fuer Queries (Qdrant: ``embed_texts``, Chroma: uebergebene Funktion)."""
+        if self.embedding_function is not None:
+            return self.embedding_function
+        embedder = getattr(self.collection, "embed_texts", None)
+        return embedder if callable(embedder) else None
+
+    def embed_query(self, query: str) -> Optional[List[float]]:
+        """Query-Embedding, gecacht pro normalisiertem Text; None = Backend embeddet selbst."""
+        embedder = self._query_embedder()
+        if embedder is None:
+            return None
+
+        def _compute(text: str) -> Optional[List[float]]:
+            vectors = embedder([text])
+            if vectors is None or len(vectors) != 1:
+                return None
+            vector = vectors[0]
+            if not hasattr(vector, "__len__") or not len(vector):
+                return None
+            # Qdrant liefert bei Provider-Fehlern Nullvektoren — die nicht cachen.
+            return vector if any(float(value) for value in vector) else None
+
+        try:
+            return self.query_embeddings.get_or_compute(query, _compute)
+        except Exception as e:
+            log.debug(f"Query-Embedding fehlgeschlagen, Backend embeddet selbst: {e}")
+            return None
+
     def find_related_memories(
         self, 
         query: str, 
@@ -223,11 +281,19 @@ class SemanticMemoryStore:
             if category_filter:
                 where_filter = {"category": category_filter}
             
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=n_results,
-                where=where_filter
-            )
+            embedding = self.embed_query(query)
+            if embedding is not None:
+                results = self.collection.query(
+                    query_embeddings=[embedding],
+                    n_results=n_results,
+                    where=where_filter
+                )
+            else:
+                results = self.collection.query(
+                    query_texts=[query],
+                    n_results=n_results,
+                    where=where_filter
+                )
             
             return self._format_results(results)
         except Exception as e:
@@ -550,6 +616,7 @@ class PersistentMemory:
     def __init__(self, db_path: Path = MEMORY_DB_PATH):
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = get_memory_db(db_path)
         self._init_db()
         
     def _safe_json(self, val):
@@ -570,12 +637,8 @@ class PersistentMemory:
             return datetime.now()   
     def _init_db(self):
         """Initialisiert die Datenbank-Tabellen."""
-        with sqlite3.connect(self.db_path) as conn:
-            # WAL-Modus: erlaubt gleichzeitige Reads + einen Writer (für parallele Agenten)
-            conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA synchronous=NORMAL;")
-            conn.execute("PRAGMA cache_size=-64000;")  # 64 MB Cache
-            conn.executescript("""
+        # WAL, synchronous und Cache setzt die gemeinsame MemoryDB beim Oeffnen.
+        self._db.executescript("""
                 CREATE TABLE IF NOT EXISTS facts (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     category TEXT NOT NULL,
@@ -661,6 +724,94 @@ class PersistentMemory:
 
                 CREATE INDEX IF NOT EXISTS idx_curiosity_sent_at ON curiosity_sent(sent_at);
             """)
+        self.fts_enabled = self._db.write(self._init_fts, batch=False)
+
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """
+        Legt FTS5-Indizes fuer interaction_events und conversations an.
+
+        Trigger halten beide Indizes synchron; bestehende Zeilen werden beim
+        ersten Anlegen einmalig nachindiziert. Ohne FTS5-Support faellt der
+        Recall auf die bisherigen Scans zurueck.
+        """
+        existing = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE name IN (?, ?)",
+                ("interaction_events_fts", "conversations_fts"),
+            ).fetchall()
+        }
+        try:
+            conn.executescript(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS interaction_events_fts USING fts5(
+                    user_input,
+                    assistant_response,
+                    content='interaction_events',
+                    content_rowid='id',
+                    tokenize='unicode61'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS interaction_events_fts_ai
+                AFTER INSERT ON interaction_events BEGIN
+                    INSERT INTO interaction_events_fts(rowid, user_input, assistant_response)
+                    VALUES (new.id, new.user_input, new.assistant_response);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS interaction_events_fts_ad
+                AFTER DELETE ON interaction_events BEGIN
+                    INSERT INTO interaction_events_fts(
+                        interaction_events_fts, rowid, user_input, assistant_response
+                    )
+                    VALUES ('delete', old.id, old.user_input, old.assistant_response);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS interaction_events_fts_au
+                AFTER UPDATE ON interaction_events BEGIN
+                    INSERT INTO interaction_events_fts(
+                        interaction_events_fts, rowid, user_input, assistant_response
+                    )
+                    VALUES ('delete', old.id, old.user_input, old.assistant_response);
+                    INSERT INTO interaction_events_fts(rowid, user_input, assistant_response)
+                    VALUES (new.id, new.user_input, new.assistant_response);
+                END;
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                    content,
+                    tokenize='unicode61'
+                );
+
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_ai
+                AFTER INSERT ON conversations BEGIN
+                    INSERT INTO conversations_fts(rowid, content)
+                    VALUES (new.id, {_CONVERSATION_FTS_TEXT_SQL.format(col="new.messages")});
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_ad
+                AFTER DELETE ON conversations BEGIN
+                    DELETE FROM conversations_fts WHERE rowid = old.id;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_au
+                AFTER UPDATE ON conversations BEGIN
+                    DELETE FROM conversations_fts WHERE rowid = old.id;
+                    INSERT INTO conversations_fts(rowid, content)
+                    VALUES (new.id, {_CONVERSATION_FTS_TEXT_SQL.format(col="new.messages")});
+                END;
+            """)
+            if "interaction_events_fts" not in existing:
+                conn.execute(
+                    "INSERT INTO interaction_events_fts(interaction_events_fts) VALUES ('rebuild')"
+                )
+            if "conversations_fts" not in existing:
+                conn.execute(
+                    "INSERT INTO conversations_fts(rowid, content) "
+                    f"SELECT id, {_CONVERSATION_FTS_TEXT_SQL.format(col='messages')} "
+                    "FROM conversations"
+                )
+            return True
+        except sqlite3.OperationalError as e:
+            log.warning(f"FTS5 fuer Episoden-Recall nicht verfuegbar: {e}")
+            return False
     
     # === FACTS ===
     
@@ -668,7 +819,7 @@ class PersistentMemory:
         """Speichert oder aktualisiert einen Fakt."""
         from memory.memory_guard import MemoryAccessGuard
         MemoryAccessGuard.check_write_permission()
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> None:
             conn.execute("""
                 INSERT INTO facts (category, key, value, confidence, source, created_at, last_used)
                 VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -685,10 +836,11 @@ class PersistentMemory:
                 fact.created_at.isoformat(),
                 fact.last_used.isoformat()
             ))
+        self._db.write(_write)
     
     def get_fact(self, category: str, key: str) -> Optional[Fact]:
         """Holt einen spezifischen Fakt."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             row = conn.execute(
                 "SELECT * FROM facts WHERE category = ? AND key = ?",
                 (category, key)
@@ -709,7 +861,7 @@ class PersistentMemory:
     def get_facts_by_category(self, category: str) -> List[Fact]:
         """Holt alle Fakten einer Kategorie."""
         facts = []
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             rows = conn.execute(
                 "SELECT * FROM facts WHERE category = ? ORDER BY last_used DESC",
                 (category,)
@@ -728,7 +880,7 @@ class PersistentMemory:
     def get_all_facts(self) -> List[Fact]:
         """Holt alle Fakten."""
         facts = []
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             rows = conn.execute(
                 "SELECT * FROM facts ORDER BY category, last_used DESC"
             ).fetchall()
@@ -749,7 +901,7 @@ class PersistentMemory:
         """Speichert oder aktualisiert ein MemoryItem."""
         from memory.memory_guard import MemoryAccessGuard
         MemoryAccessGuard.check_write_permission()
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> None:
             conn.execute("""
                 INSERT INTO memory_items (
                     category, key, value, importance, confidence, reason, source, created_at, last_used
@@ -773,11 +925,12 @@ class PersistentMemory:
                 item.created_at.isoformat(),
                 item.last_used.isoformat()
             ))
+        self._db.write(_write)
 
     def get_memory_items(self, category: str) -> List[MemoryItem]:
         """Holt MemoryItems einer Kategorie."""
         items = []
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             rows = conn.execute(
                 "SELECT * FROM memory_items WHERE category = ? ORDER BY last_used DESC",
                 (category,)
@@ -800,18 +953,19 @@ class PersistentMemory:
         """Loescht ein MemoryItem anhand von Kategorie und Schluessel."""
         from memory.memory_guard import MemoryAccessGuard
         MemoryAccessGuard.check_write_permission()
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> int:
             cursor = conn.execute(
                 "DELETE FROM memory_items WHERE category = ? AND key = ?",
                 (category, key),
             )
             return int(cursor.rowcount or 0)
+        return self._db.write(_write)
 
     def replace_all_memory_items(self, items: List[MemoryItem]) -> int:
         """Ersetzt den gesamten `memory_items`-Bestand atomar."""
         from memory.memory_guard import MemoryAccessGuard
         MemoryAccessGuard.check_write_permission()
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> None:
             conn.execute("DELETE FROM memory_items")
             for item in items:
                 conn.execute(
@@ -833,6 +987,7 @@ class PersistentMemory:
                         item.last_used.isoformat(),
                     ),
                 )
+        self._db.write(_write)
         return len(items)
 
     def _serialize_memory_item(self, item: MemoryItem) -> Dict[str, Any]:
@@ -876,7 +1031,7 @@ class PersistentMemory:
         from memory.memory_guard import MemoryAccessGuard
         MemoryAccessGuard.check_write_permission()
         timestamp = datetime.now().isoformat()
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> None:
             conn.execute(
                 """
                 INSERT INTO memory_curation_snapshots (
@@ -909,11 +1064,12 @@ class PersistentMemory:
                     timestamp,
                 ),
             )
+        self._db.write(_write)
         return snapshot_id
 
     def get_memory_curation_snapshot(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
         """Liest einen Snapshot fuer Memory-Curation inklusive deserialisierter Items."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             row = conn.execute(
                 """
                 SELECT snapshot_id, status, metadata, before_state, after_state, metrics_before, metrics_after, created_at, updated_at
@@ -946,7 +1102,7 @@ class PersistentMemory:
         """Listet die letzten Memory-Curation-Snapshots kompakt auf."""
         safe_limit = max(1, min(50, int(limit)))
         rows: List[Any] = []
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             rows = conn.execute(
                 """
                 SELECT snapshot_id, status, metadata, metrics_before, metrics_after, created_at, updated_at
@@ -977,7 +1133,7 @@ class PersistentMemory:
     def get_all_memory_items(self) -> List[MemoryItem]:
         """Holt alle MemoryItems."""
         items = []
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             rows = conn.execute(
                 "SELECT * FROM memory_items ORDER BY category, last_used DESC"
             ).fetchall()
@@ -997,11 +1153,12 @@ class PersistentMemory:
     
     def delete_fact(self, category: str, key: str):
         """Löscht einen Fakt."""
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> None:
             conn.execute(
                 "DELETE FROM facts WHERE category = ? AND key = ?",
                 (category, key)
             )
+        self._db.write(_write)
     
     # === SUMMARIES ===
     
@@ -1009,7 +1166,7 @@ class PersistentMemory:
         """Speichert eine Zusammenfassung."""
         from memory.memory_guard import MemoryAccessGuard
         MemoryAccessGuard.check_write_permission()
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> None:
             conn.execute("""
                 INSERT INTO summaries (summary, topics, facts_extracted, message_count, created_at)
                 VALUES (?, ?, ?, ?, ?)
@@ -1020,11 +1177,12 @@ class PersistentMemory:
                 summary.message_count,
                 summary.created_at.isoformat()
             ))
+        self._db.write(_write)
     
     def get_recent_summaries(self, n: int = 5) -> List[ConversationSummary]:
         """Holt die letzten N Zusammenfassungen."""
         summaries = []
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             rows = conn.execute(
                 "SELECT * FROM summaries ORDER BY created_at DESC LIMIT ?",
                 (n,)
@@ -1046,7 +1204,7 @@ class PersistentMemory:
         """Speichert eine komplette Konversation."""
         from memory.memory_guard import MemoryAccessGuard
         MemoryAccessGuard.check_write_permission()
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> None:
             conn.execute("""
                 INSERT INTO conversations (session_id, messages, created_at)
                 VALUES (?, ?, ?)
@@ -1055,16 +1213,40 @@ class PersistentMemory:
                 json.dumps([m.to_dict() for m in messages]),
                 datetime.now().isoformat()
             ))
+        self._db.write(_write)
     
-    def search_conversations(self, query: str, limit: int = 5) -> List[Dict]:
-        """Durchsucht Konversationen nach einem Begriff."""
+    def search_conversations(
+        self,
+        query: str,
+        limit: int = 5,
+        half_life_hours: float = WORKING_MEMORY_MEMORY_HALF_LIFE_DAYS * 24.0,
+    ) -> List[Dict]:
+        """
+        Durchsucht Konversationen nach einem Begriff.
+
+        Mit FTS5: bm25-Ranking mal Zeitabfall in einer indizierten Abfrage.
+        """
         results = []
-        with sqlite3.connect(self.db_path) as conn:
-            rows = conn.execute(
-                "SELECT * FROM conversations WHERE messages LIKE ? ORDER BY created_at DESC LIMIT ?",
-                (f"%{query}%", limit)
-            ).fetchall()
-            
+        fts_query = build_safe_fts_query(query) if self.fts_enabled else ""
+        with self._db.read() as conn:
+            if fts_query:
+                rows = conn.execute(
+                    f"""
+                    SELECT c.id, c.session_id, c.messages, c.created_at
+                    FROM conversations_fts
+                    JOIN conversations c ON c.id = conversations_fts.rowid
+                    WHERE conversations_fts MATCH ?
+                    ORDER BY -bm25(conversations_fts) * {_FTS_DECAY_SQL.format(col="c.created_at")} DESC
+                    LIMIT ?
+                    """,
+                    (fts_query, half_life_hours, half_life_hours, limit),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM conversations WHERE messages LIKE ? ORDER BY created_at DESC LIMIT ?",
+                    (f"%{query}%", limit)
+                ).fetchall()
+
             for row in rows:
                 results.append({
                     "session_id": row[1],
@@ -1083,7 +1265,7 @@ class PersistentMemory:
         metadata: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Speichert ein einzelnes Interaktions-Event deterministisch."""
-        with sqlite3.connect(self.db_path) as conn:
+        def _write(conn: sqlite3.Connection) -> None:
             conn.execute(
                 """
                 INSERT INTO interaction_events (
@@ -1101,10 +1283,57 @@ class PersistentMemory:
                     datetime.now().isoformat(),
                 ),
             )
+        self._db.write(_write)
+
+    def search_interaction_events(
+        self,
+        query: str,
+        limit: int = 20,
+        session_id: Optional[str] = None,
+        half_life_hours: float = WORKING_MEMORY_EVENT_HALF_LIFE_HOURS,
+    ) -> List[Dict[str, Any]]:
+        """
+        Volltextsuche ueber alle Interaktions-Events (beste zuerst).
+
+        Rangfolge = bm25 x Zeitabfall, komplett in SQL; liefert `fts_score`
+        zusaetzlich zu den Feldern von get_recent_interaction_events.
+        Ohne FTS5-Index oder ohne verwertbare Tokens: leere Liste.
+        """
+        fts_query = build_safe_fts_query(query) if self.fts_enabled else ""
+        if not fts_query:
+            return []
+
+        session_clause = "AND e.session_id = ?" if session_id else ""
+        params: List[Any] = [half_life_hours, half_life_hours, fts_query]
+        if session_id:
+            params.append(session_id)
+        params.append(limit)
+
+        events: List[Dict[str, Any]] = []
+        with self._db.read() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT e.session_id, e.agent_name, e.status, e.user_input,
+                       e.assistant_response, e.metadata, e.created_at,
+                       -bm25(interaction_events_fts) * {_FTS_DECAY_SQL.format(col="e.created_at")} AS fts_score
+                FROM interaction_events_fts
+                JOIN interaction_events e ON e.id = interaction_events_fts.rowid
+                WHERE interaction_events_fts MATCH ? {session_clause}
+                ORDER BY fts_score DESC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
+
+        for row in rows:
+            event = self._interaction_event_from_row(row)
+            event["fts_score"] = float(row[7] or 0.0)
+            events.append(event)
+        return events
 
     def count_interaction_events(self) -> int:
         """Anzahl aller gespeicherten Interaktions-Events."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             row = conn.execute("SELECT COUNT(*) FROM interaction_events").fetchone()
             return int(row[0]) if row else 0
 
@@ -1115,7 +1344,7 @@ class PersistentMemory:
     ) -> List[Dict[str, Any]]:
         """Holt die zuletzt persistierten Interaktions-Events (neueste zuerst)."""
         events: List[Dict[str, Any]] = []
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db.read() as conn:
             if session_id:
                 rows = conn.execute(
                     """
@@ -1139,30 +1368,31 @@ class PersistentMemory:
                 ).fetchall()
 
             for row in rows:
-                metadata_raw = row[5] or ""
-                metadata: Dict[str, Any] = {}
-                if metadata_raw:
-                    try:
-                        loaded = json.loads(metadata_raw)
-                        if isinstance(loaded, dict):
-                            metadata = loaded
-                    except Exception:
-                        metadata = {}
-
-                events.append(
-                    {
-                        "session_id": row[0],
-                        "agent_name": row[1] or "",
-                        "status": row[2] or "",
-                        "user_input": row[3] or "",
-                        "assistant_response": row[4] or "",
-                        "metadata": metadata,
-                        "created_at": row[6] or "",
-                    }
-                )
+                events.append(self._interaction_event_from_row(row))
 
         return events
 
+    def _interaction_event_from_row(self, row: Tuple[Any, ...]) -> Dict[str, Any]:
+        metadata_raw = row[5] or ""
+        metadata: Dict[str, Any] = {}
+        if metadata_raw:
+            try:
+                loaded = json.loads(metadata_raw)
+                if isinstance(loaded, dict):
+                    metadata = loaded
+            except Exception:
+                metadata = {}
+
+        return {
+            "session_id": row[0],
+            "agent_name": row[1] or "",
+            "status": row[2] or "",
+            "user_input": row[3] or "",
+            "assistant_response": row[4] or "",
+            "metadata": metadata,
+            "created_at": row[6] or "",
+        }
+
 
 class MemoryManager:
     """
@@ -1196,6 +1426,7 @@ class MemoryManager:
         
         # NEW: Markdown Store for bidirectional sync
         self._markdown_store = None
+        self._hybrid_retriever: Optional[HybridRetriever] = None
         
         self._load_self_model_state()
 
@@ -1256,7 +1487,10 @@ class MemoryManager:
             import tools.shared_context as sc
 
             if hasattr(sc, "memory_collection") and sc.memory_collection:
-                self.semantic_store = SemanticMemoryStore(sc.memory_collection)
+                self.semantic_store = SemanticMemoryStore(
+                    sc.memory_collection,
+                    embedding_function=getattr(sc, "memory_embedding_function", None),
+                )
                 active, reason = resolve_semantic_memory_backend(
                     requested,
                     qdrant_available=False,
@@ -1278,11 +1512,12 @@ class MemoryManager:
                 path=str(db_path),
                 settings=build_chroma_settings(chromadb_module=chromadb),
             )
+            embedding_function = get_embedding_function()
             collection = client.get_or_create_collection(
                 name="timus_long_term_memory",
-                embedding_function=get_embedding_function(),
+                embedding_function=embedding_function,
             )
-            self.semantic_store = SemanticMemoryStore(collection)
+            self.semantic_store = SemanticMemoryStore(collection, embedding_function=embedding_function)
             active, reason = resolve_semantic_memory_backend(
                 requested,
                 qdrant_available=False,
@@ -1630,6 +1865,10 @@ class MemoryManager:
         Liefert relevante Erinnerungen basierend auf:
         1. Semantischer Ähnlichkeit (Vektor-Distanz)
         2. Keyword-Matches (FTS5 Volltextsuche)
+
+        Beide Backends laufen parallel; die Reihenfolge kommt aus Reciprocal
+        Rank Fusion (siehe memory/hybrid_retrieval.py), ``relevance`` ist je
+        Backend auf 0..1 kalibriert.
         
         Args:
             query: Suchbegriff oder Frage
@@ -1639,53 +1878,68 @@ class MemoryManager:
         Returns:
             Liste von Dictionaries mit content, source, relevance
         """
-        results = []
-        seen_ids = set()
-        
-        # 1. Semantische Suche (ChromaDB)
+        backends = {}
         if self.semantic_store and self.semantic_store.is_available():
-            semantic_results = self.semantic_store.find_related_memories(
+            backends["semantic"] = lambda: self._semantic_candidates(query, n_results, category_filter)
+        backends["keyword_fts5"] = lambda: self._keyword_candidates(query, n_results)
+
+        return self._get_hybrid_retriever().search(query, n_results=n_results, backends=backends)
+
+    def _get_hybrid_retriever(self) -> HybridRetriever:
+        retriever = getattr(self, "_hybrid_retriever", None)
+        if retriever is None:
+            retriever = HybridRetriever()
+            self._hybrid_retriever = retriever
+        return retriever
+
+    def get_retrieval_stats(self) -> Dict[str, Any]:
+        """Latenz je Backend und Embedding-Cache der Hybrid-Suche."""
+        stats = self._get_hybrid_retriever().stats()
+        if self.semantic_store is not None:
+            stats["query_embedding_cache"] = self.semantic_store.query_embeddings.stats()
+        return stats
+
+    def _semantic_candidates(
+        self,
+        query: str,
+        n_results: int,
+        category_filter: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Vektor-Treffer (Qdrant/ChromaDB), Rangfolge des Backends."""
+        return [
+            {
+                "content": r.content,
+                "category": r.category,
+                "importance": r.importance,
+                "relevance": calibrate_distance(r.distance),
+                "source": "semantic",
+                "doc_id": r.doc_id,
+                "key": r.key,
+                "created_at": r.created_at,
+            }
+            for r in self.semantic_store.find_related_memories(
                 query, n_results=n_results, category_filter=category_filter
             )
-            for r in semantic_results:
-                if r.doc_id not in seen_ids:
-                    results.append({
-                        "content": r.content,
-                        "category": r.category,
-                        "importance": r.importance,
-                        "relevance": 1.0 - r.distance,  # Convert distance to relevance
-                        "source": "semantic",
-                        "doc_id": r.doc_id,
-                        "key": r.key,
-                        "created_at": r.created_at,
-                    })
-                    seen_ids.add(r.doc_id)
-        
-        # 2. Keyword-Suche (FTS5 via Markdown Store)
-        try:
-            md_store = self._get_markdown_store()
-            if md_store:
-                keyword_results = md_store.search(query, limit=n_results)
-                for r in keyword_results:
-                    result_key = f"{r.source}_{r.snippet[:20]}"
-                    if result_key not in seen_ids:
-                        results.append({
-                            "content": r.snippet,
-                            "category": r.source,
-                            "importance": 0.5,
-                            "relevance": r.rank,
-                            "source": "keyword_fts5",
-                            "doc_id": result_key,
-                            "key": "",
-                            "created_at": "",
-                        })
-                        seen_ids.add(result_key)
-        except Exception as e:
-            log.debug(f"FTS5 Suche fehlgeschlagen: {e}")
-        
-        # Nach Relevanz sortieren
-        results.sort(key=lambda x: x.get("relevance", 0), reverse=True)
-        return results[:n_results]
+        ]
+
+    def _keyword_candidates(self, query: str, n_results: int) -> List[Dict[str, Any]]:
+        """FTS5-Treffer (Markdown Store), Rangfolge nach bm25."""
+        md_store = self._get_markdown_store()
+        if not md_store:
+            return []
+        candidates = []
+        for r in md_store.search(query, limit=n_results):
+            candidates.append({
+                "content": r.snippet,
+                "category": r.source,
+                "importance": 0.5,
+                "relevance": calibrate_bm25(r.rank),
+                "source": "keyword_fts5",
+                "doc_id": f"{r.source}_{r.snippet[:20]}",
+                "key": "",
+                "created_at": "",
+            })
+        return candidates
     
     def get_enhanced_context(self, current_query: str, max_related: int = 3) -> str:
         """
@@ -1927,18 +2181,36 @@ class MemoryManager:
         event_limit = max(24, min(UNIFIED_RECALL_MAX_SCAN, n_results * 12))
         event_candidates: Dict[str, Dict[str, Any]] = {}
 
-        for event in self.persistent.get_recent_interaction_events(limit=event_limit):
-            key = (
-                f"{event.get('session_id','')}|{event.get('created_at','')}|"
-                f"{self._normalize_text_for_prompt(event.get('user_input',''))[:80]}"
+        # Inhaltliche Anfragen gehen ueber den FTS5-Index (gesamte Historie);
+        # zeitliche Anfragen ("eben", "vorhin") brauchen die juengsten Events.
+        use_fts = bool(query_terms) and not temporal_query and self.persistent.fts_enabled
+        recent_limit = n_results * 2 if use_fts else event_limit
+        fts_query = " ".join(query_terms)
+        event_sources: List[List[Dict[str, Any]]] = [
+            self.persistent.get_recent_interaction_events(limit=recent_limit)
+        ]
+        if use_fts:
+            event_sources.append(
+                self.persistent.search_interaction_events(fts_query, limit=event_limit)
             )
-            event_candidates[key] = event
-
         if session_id:
-            for event in self.persistent.get_recent_interaction_events(
-                limit=event_limit,
-                session_id=session_id,
-            ):
+            event_sources.append(
+                self.persistent.get_recent_interaction_events(
+                    limit=recent_limit,
+                    session_id=session_id,
+                )
+            )
+            if use_fts:
+                event_sources.append(
+                    self.persistent.search_interaction_events(
+                        fts_query,
+                        limit=event_limit,
+                        session_id=session_id,
+                    )
+                )
+
+        for events in event_sources:
+            for event in events:
                 key = (
                     f"{event.get('session_id','')}|{event.get('created_at','')}|"
                     f"{self._normalize_text_for_prompt(event.get('user_input',''))[:80]}"
@@ -2075,6 +2347,7 @@ class MemoryManager:
                 "temporal_query": temporal_query,
                 "session_id": session_id or "",
                 "event_candidates": len(event_memories),
+                "event_search": "fts5" if use_fts else "recent_scan",
                 "related_candidates": len(related_memories),
             },
         }
@@ -2357,6 +2630,7 @@ class MemoryManager:
             not allowed_sections_set or "LANGZEITKONTEXT" in allowed_sections_set
         ):
             related = self.find_related_memories(query, n_results=max(related_target * 4, 6))
+            stats["related_retrieval"] = dict(self._get_hybrid_retriever().last_stats)
             scored_related: List[Tuple[float, Dict[str, Any]]] = []
             for memory in related:
                 if not self._working_memory_related_allowed(memory, allowed_context_classes_tuple):
@@ -2995,6 +3269,7 @@ Antworte im JSON-Format:
             "semantic_backend_active": self.semantic_backend_active,
             "semantic_backend_reason": self.semantic_backend_reason,
             "semantic_memory_available": bool(self.semantic_store and self.semantic_store.is_available()),
+            "hybrid_retrieval": self.get_retrieval_stats(),
         }
 
     def get_runtime_memory_snapshot(
@@ -206,15 +206,25 @@ class QdrantProvider:
                 self._embedding_fn = None
         return self._embedding_fn
 
-    def _embed(self, texts: List[str]) -> List[List[float]]:
+    def embed_texts(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Embeddings mit der Funktion der Collection; None ohne Embedding-Provider.
+
+        Fehler des Providers werden durchgereicht (Aufrufer entscheiden ueber Fallback).
+        """
         fn = self._get_embedding_fn()
         if fn is None:
-            return [[0.0] * VECTOR_SIZE for _ in texts]
+            return None
+        return fn(texts)
+
+    def _embed(self, texts: List[str]) -> List[List[float]]:
         try:
-            return fn(texts)
+            embeddings = self.embed_texts(texts)
         except Exception as e:
             log.warning("Embedding fehlgeschlagen: %s", e)
+            embeddings = None
+        if embeddings is None:
             return [[0.0] * VECTOR_SIZE for _ in texts]
+        return embeddings
 
     def add(
         self,
@@ -11,12 +11,14 @@ import json
 import logging
 import os
 import threading
+import time
 import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
 from orchestration.scheduler import ProactiveScheduler, SchedulerEvent, init_scheduler
 from orchestration.autonomy_observation import record_autonomy_observation
+from orchestration.heartbeat_pipeline import HeartbeatPipeline, HeartbeatStage
 from orchestration.request_correlation import bind_request_correlation
 from orchestration.self_hardening_runtime import record_self_hardening_event
 from orchestration.task_queue import Priority, TaskType, get_queue
@@ -423,6 +425,23 @@ class AutonomousRunner:
         self._ambient_engine = None
         # M16
         self._feedback_engine = None
+        # Worker-Pool: parallele Task-Ausführung mit Lanes je Ressourcenklasse
+        self._max_workers = max(1, _env_int("AUTONOMY_WORKER_CONCURRENCY", 3))
+        heavy_limit = max(1, _env_int("AUTONOMY_HEAVY_LANE_CONCURRENCY", 1))
+        if self._max_workers > 1:
+            heavy_limit = min(heavy_limit, self._max_workers - 1)
+        self._lane_limits = {"heavy": heavy_limit, "light": self._max_workers}
+        self._agent_concurrency = max(1, _env_int("AUTONOMY_AGENT_CONCURRENCY", 1))
+        self._priority_reserved_slots = min(
+            max(0, _env_int("AUTONOMY_PRIORITY_RESERVED_SLOTS", 1)),
+            self._max_workers - 1,
+        )
+        self._inflight: dict[str, dict] = {}
+        self._worker_tasks: set[asyncio.Task] = set()
+        self._lane_stats: dict[str, dict] = {
+            lane: self._empty_lane_stats() for lane in self._lane_limits
+        }
+        self._heartbeat_pipeline = HeartbeatPipeline()
 
     def _incident_notification_context(self, task_id: str, description: str, metadata: dict) -> Optional[dict]:
         metadata_payload = metadata if isinstance(metadata, dict) else {}
@@ -667,7 +686,7 @@ class AutonomousRunner:
 
         self._scheduler = init_scheduler(
             interval_minutes=self.interval_minutes,
-            on_wake=self._on_wake_sync,
+            on_wake=self._on_wake,
         )
         await self._scheduler.start()
 
@@ -823,8 +842,38 @@ class AutonomousRunner:
         self._work_signal.set()  # Worker aus dem Warten wecken
         if self._scheduler:
             await self._scheduler.stop()
+        await self._stop_worker_pool()
+        self._heartbeat_pipeline.shutdown()
         log.info("AutonomousRunner gestoppt")
 
+    async def _stop_worker_pool(self) -> None:
+        """Bricht laufende Lane-Tasks ab und gibt ihre Claims an die Queue zurück."""
+        workers = list(self._worker_tasks)
+        claimed = list(self._inflight)
+        for worker in workers:
+            worker.cancel()
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        if not claimed:
+            return
+
+        def _release() -> int:
+            queue = get_queue()
+            released = 0
+            for task_id in claimed:
+                try:
+                    released += int(queue.release_claim(task_id))
+                except Exception as e:
+                    log.debug("Claim für Task [%s] nicht freigegeben: %s", task_id[:8], e)
+            return released
+
+        released = await asyncio.to_thread(_release)
+        log.info(
+            "Worker-Pool gestoppt: %d Task(s) abgebrochen, %d Claim(s) freigegeben",
+            len(workers),
+            released,
+        )
+
     async def trigger_now(self) -> None:
         """Manueller Heartbeat — sofort ausführen."""
         if self._scheduler:
@@ -848,286 +897,325 @@ class AutonomousRunner:
     # Scheduler-Callback
     # ------------------------------------------------------------------
 
-    def _on_wake_sync(self, event: SchedulerEvent) -> None:
-        """Wird vom Scheduler aufgerufen. Signalisiert dem Worker neue Arbeit."""
+    async def _on_wake(self, event: SchedulerEvent) -> None:
+        """
+        Wird vom Scheduler aufgerufen. Führt die Heartbeat-Pipeline aus und
+        signalisiert dem Worker neue Arbeit.
+
+        Die blockierenden Engine-Zyklen laufen als Stufen im Thread-Pool
+        (siehe orchestration/heartbeat_pipeline.py), damit ein Heartbeat den
+        Event-Loop nicht einfriert. Async-Jobs werden direkt eingeplant.
+        """
         self._heartbeat_count += 1
-        queue = get_queue()
+        self._schedule_async_heartbeat_jobs()
+        # Stufen laufen in Worker-Threads — Telegram-Pushes werden per
+        # run_coroutine_threadsafe auf diesen Loop eingeplant.
+        await self._heartbeat_pipeline.run(
+            self._build_heartbeat_stages(),
+            context={"loop": asyncio.get_running_loop()},
+        )
 
-        if self._self_healing_engine and _self_healing_feature_enabled():
-            try:
-                healing_summary = self._self_healing_engine.run_cycle()
-                if healing_summary.get("status") == "ok" and (
-                    healing_summary.get("incidents_opened", 0)
-                    or healing_summary.get("incidents_reopened", 0)
-                    or healing_summary.get("incidents_resolved", 0)
-                    or healing_summary.get("incidents_escalated", 0)
-                    or healing_summary.get("circuit_breaker_trips", 0)
-                    or healing_summary.get("playbooks_suppressed", 0)
-                    or healing_summary.get("playbook_attempts_blocked", 0)
-                    or healing_summary.get("degrade_mode_changed", False)
-                ):
-                    log.info(
-                        "🛠️ Heartbeat Self-Healing: opened=%s reopened=%s resolved=%s escalated=%s playbooks=%s suppressed=%s attempts_blocked=%s trips=%s degrade=%s reason=%s",
-                        healing_summary.get("incidents_opened", 0),
-                        healing_summary.get("incidents_reopened", 0),
-                        healing_summary.get("incidents_resolved", 0),
-                        healing_summary.get("incidents_escalated", 0),
-                        healing_summary.get("playbooks_triggered", 0),
-                        healing_summary.get("playbooks_suppressed", 0),
-                        healing_summary.get("playbook_attempts_blocked", 0),
-                        healing_summary.get("circuit_breaker_trips", 0),
-                        healing_summary.get("degrade_mode", "normal"),
-                        healing_summary.get("degrade_reason", ""),
-                    )
-            except Exception as e:
-                log.warning("Self-Healing-Zyklus fehlgeschlagen: %s", e)
+        pending = await asyncio.to_thread(get_queue().get_pending)
+        if not pending:
+            log.debug("Heartbeat: keine offenen Tasks")
+            return
+        log.info(f"Heartbeat: {len(pending)} offene Task(s) | Top-Priorität: {pending[0]['priority']}")
+        self._work_signal.set()
 
-        if self._goal_generator and _goals_feature_enabled():
+    def get_heartbeat_stats(self) -> dict:
+        """Dauer und Status der Heartbeat-Stufen des letzten Laufs."""
+        return {"heartbeat_count": self._heartbeat_count, **self._heartbeat_pipeline.stats()}
+
+    def _schedule_async_heartbeat_jobs(self) -> None:
+        """Plant die async Heartbeat-Jobs auf dem laufenden Event-Loop ein."""
+        # M8: Session Reflection Loop
+        if _reflection_feature_enabled() and self._reflection_loop:
             try:
-                generated = self._goal_generator.run_cycle(max_goals=3)
-                if generated:
-                    log.info("🎯 Heartbeat: %d Ziel-Signal(e) verarbeitet", len(generated))
+                asyncio.ensure_future(self._reflection_loop.check_and_reflect())
             except Exception as e:
-                log.warning("GoalGenerator-Zyklus fehlgeschlagen: %s", e)
+                log.debug("SessionReflectionLoop fehlgeschlagen: %s", e)
 
-        if self._long_term_planner and _planning_feature_enabled():
+        # M12: Self-Improvement Wochenanalyse
+        if _improvement_feature_enabled() and self._improvement_engine:
             try:
-                planning_summary = self._long_term_planner.run_cycle()
-                if planning_summary.get("status") == "ok":
-                    log.info(
-                        "🗓️ Heartbeat Planung: %s Planfenster | %s Commitments",
-                        planning_summary.get("plans_touched", 0),
-                        planning_summary.get("commitments_touched", 0),
-                    )
+                if self._improvement_engine._should_run_analysis():
+                    asyncio.ensure_future(self._improvement_engine.run_analysis_cycle())
             except Exception as e:
-                log.warning("LongTermPlanner-Zyklus fehlgeschlagen: %s", e)
+                log.debug("SelfImprovementEngine fehlgeschlagen: %s", e)
 
-        if self._commitment_review_engine and _planning_feature_enabled():
+        if _improvement_task_autonomy_feature_enabled() and not self._improvement_task_autonomy_running:
             try:
-                review_summary = self._commitment_review_engine.run_cycle()
-                if review_summary.get("status") == "ok" and review_summary.get("reviews_due", 0):
-                    log.info(
-                        "📋 Heartbeat Reviews: due=%s | escalated=%s | replan_events=%s",
-                        review_summary.get("reviews_due", 0),
-                        review_summary.get("reviews_escalated", 0),
-                        review_summary.get("replan_events_created", 0),
-                    )
+                asyncio.ensure_future(self._run_improvement_task_autonomy_cycle())
             except Exception as e:
-                log.warning("CommitmentReview-Zyklus fehlgeschlagen: %s", e)
+                log.debug("ImprovementTaskAutonomy fehlgeschlagen: %s", e)
 
-        if self._replanning_engine and _replanning_feature_enabled():
+        if _memory_curation_autonomy_feature_enabled() and not self._memory_curation_autonomy_running:
             try:
-                replanning_summary = self._replanning_engine.run_cycle()
-                if replanning_summary.get("status") == "ok" and replanning_summary.get("events_detected", 0):
-                    log.info(
-                        "🔁 Heartbeat Replanning: detected=%s | created=%s | actions=%s",
-                        replanning_summary.get("events_detected", 0),
-                        replanning_summary.get("events_created", 0),
-                        replanning_summary.get("actions_applied", 0),
-                    )
+                asyncio.ensure_future(self._run_memory_curation_autonomy_cycle())
             except Exception as e:
-                log.warning("Replanning-Zyklus fehlgeschlagen: %s", e)
+                log.debug("MemoryCurationAutonomy fehlgeschlagen: %s", e)
 
-        if _goals_feature_enabled():
+        # M15: Ambient Context Engine
+        if _ambient_context_feature_enabled() and self._ambient_engine:
             try:
-                conflict_summary = queue.sync_goal_conflicts(auto_block=False, max_pairs=60)
-                detected = int(conflict_summary.get("conflicts_detected", 0))
-                if detected:
-                    log.warning("⚠️ Goal-Konflikte erkannt: %d", detected)
+                asyncio.ensure_future(self._ambient_engine.run_cycle())
             except Exception as e:
-                log.warning("Goal-Konflikt-Sync fehlgeschlagen: %s", e)
+                log.debug("AmbientContextEngine fehlgeschlagen: %s", e)
 
-            self._export_goal_kpi_snapshot()
+    def _build_heartbeat_stages(self) -> list[HeartbeatStage]:
+        """
+        Stufen des aktuellen Heartbeats (nur aktivierte Features).
+
+        Abhängigkeiten bilden die fachliche Reihenfolge ab: Reviews nach der
+        Planung, Replanning nach den Reviews, KPI-Exporte nach ihren Engines,
+        Scorecard nach allen KPI-Exporten, Hardening/Audit nach der Scorecard.
+        """
+        stages: list[HeartbeatStage] = []
 
+        def add(name: str, fn, *depends_on: str, timeout_s: Optional[float] = None) -> None:
+            stages.append(HeartbeatStage(name, fn, tuple(depends_on), timeout_s))
+
+        if self._self_healing_engine and _self_healing_feature_enabled():
+            add("self_healing", self._stage_self_healing)
+        if self._goal_generator and _goals_feature_enabled():
+            add("goal_generator", self._stage_goal_generator)
+        if self._long_term_planner and _planning_feature_enabled():
+            add("long_term_planner", self._stage_long_term_planner)
+        if self._commitment_review_engine and _planning_feature_enabled():
+            add("commitment_review", self._stage_commitment_review, "long_term_planner")
+        if self._replanning_engine and _replanning_feature_enabled():
+            add("replanning", self._stage_replanning, "commitment_review")
+
+        kpi_stages: list[str] = []
+        if _goals_feature_enabled():
+            add("goal_kpi", self._stage_goal_conflicts_and_kpi, "goal_generator")
+            kpi_stages.append("goal_kpi")
         if _planning_feature_enabled():
-            self._export_planning_kpi_snapshot()
-            self._export_commitment_review_kpi_snapshot()
+            add("planning_kpi", self._stage_planning_kpi, "long_term_planner", "commitment_review")
+            kpi_stages.append("planning_kpi")
         if _replanning_feature_enabled():
-            self._export_replanning_kpi_snapshot()
+            add("replanning_kpi", lambda ctx: self._export_replanning_kpi_snapshot(), "replanning")
+            kpi_stages.append("replanning_kpi")
         if _self_healing_feature_enabled():
-            self._export_self_healing_kpi_snapshot()
+            add("self_healing_kpi", lambda ctx: self._export_self_healing_kpi_snapshot(), "self_healing")
+            kpi_stages.append("self_healing_kpi")
         if _policy_gates_feature_enabled():
-            self._apply_policy_rollout_guard()
-            self._export_policy_kpi_snapshot()
-        scorecard = None
+            add("policy", self._stage_policy)
+            kpi_stages.append("policy")
+
         if _scorecard_feature_enabled():
-            scorecard = self._export_autonomy_scorecard_snapshot()
-            e2e_gate = self._collect_e2e_release_gate_sync()
-            ops_gate = self._collect_ops_release_gate_sync()
-            self._apply_autonomy_scorecard_control(scorecard=scorecard, e2e_gate=e2e_gate, ops_gate=ops_gate)
+            add(
+                "scorecard",
+                self._stage_scorecard,
+                *kpi_stages,
+                timeout_s=max(90.0, self._heartbeat_pipeline.default_timeout_s),
+            )
         if _hardening_feature_enabled():
-            self._evaluate_rollout_hardening(scorecard=scorecard)
-        if _scorecard_feature_enabled():
-            if _audit_report_feature_enabled():
-                export_payload = self._export_autonomy_audit_report(scorecard=scorecard)
-                if _audit_change_requests_feature_enabled() and isinstance(export_payload, dict):
-                    self._apply_autonomy_audit_change_request(export_payload=export_payload)
+            add("rollout_hardening", lambda ctx: self._evaluate_rollout_hardening(scorecard=ctx.get("scorecard")), "scorecard")
+        if _scorecard_feature_enabled() and _audit_report_feature_enabled():
+            add("audit_report", self._stage_audit_report, "scorecard", "rollout_hardening")
         if _audit_change_requests_feature_enabled():
-            self._apply_pending_autonomy_audit_change_requests()
+            add(
+                "audit_change_requests",
+                lambda ctx: self._apply_pending_autonomy_audit_change_requests(),
+                "audit_report",
+            )
 
         if self._meta_analyzer and _meta_analysis_feature_enabled():
             meta_interval = max(1, _env_int("AUTONOMY_META_ANALYSIS_INTERVAL_HEARTBEATS", 12))
             if self._heartbeat_count % meta_interval == 0:
-                try:
-                    meta_result = self._meta_analyzer.run_analysis()
-                    insights = meta_result.get("insights") or {}
-                    log.info(
-                        "🔬 Meta-Analyse: trend=%s risk=%s insight=%s...",
-                        insights.get("trend", "?"),
-                        insights.get("risk_level", "?"),
-                        str(insights.get("key_insight", "?"))[:80],
-                    )
-                except Exception as e:
-                    log.warning("Meta-Analyse-Zyklus fehlgeschlagen: %s", e)
-
-        # M8: Session Reflection Loop
-        if _reflection_feature_enabled() and self._reflection_loop:
-            try:
-                _loop = asyncio.get_event_loop()
-                if _loop.is_running():
-                    asyncio.ensure_future(self._reflection_loop.check_and_reflect())
-            except RuntimeError:
-                pass
-            except Exception as e:
-                log.debug("SessionReflectionLoop fehlgeschlagen: %s", e)
+                add("meta_analysis", self._stage_meta_analysis)
 
         # M9: Blackboard — abgelaufene Einträge bereinigen
         if os.getenv("AUTONOMY_BLACKBOARD_ENABLED", "true").lower() == "true":
-            try:
-                from memory.agent_blackboard import get_blackboard
-                expired = get_blackboard().clear_expired()
-                if expired > 0:
-                    log.debug("Blackboard: %d abgelaufene Einträge gelöscht", expired)
-            except Exception as e:
-                log.debug("Blackboard clear_expired fehlgeschlagen: %s", e)
-
+            add("blackboard_cleanup", self._stage_blackboard_cleanup)
         # M10: Proactive Triggers
         if _trigger_feature_enabled() and self._trigger_engine:
-            try:
-                fired = self._trigger_engine.check_and_fire()
-                if fired:
-                    log.info("⏰ %d Trigger ausgelöst", len(fired))
-            except Exception as e:
-                log.debug("ProactiveTriggers fehlgeschlagen: %s", e)
-
+            add("triggers", self._stage_triggers)
         # M11: Goal Queue Progress Rollup
         if _goal_queue_feature_enabled() and self._goal_manager:
-            try:
-                self._goal_manager.run_progress_cycle()
-            except Exception as e:
-                log.debug("GoalQueueManager Rollup fehlgeschlagen: %s", e)
+            add("goal_queue_rollup", self._stage_goal_queue_rollup, "goal_generator")
+        if _self_modify_feature_enabled() and self._self_modifier_engine:
+            add("self_modify", self._stage_self_modify)
+        # M16: FeedbackEngine + Soul Hook Decay (täglich)
+        if _m16_feature_enabled():
+            add("feedback", self._stage_feedback)
+        # M14: E-Mail-Autonomie — pending Approvals loggen
+        if _m14_feature_enabled():
+            add("email_autonomy", self._stage_email_autonomy)
+        # M18: Self-Hardening Engine — alle 5 Heartbeats Log + Blackboard analysieren
+        if _self_hardening_feature_enabled() and self._heartbeat_count % 5 == 0:
+            add("self_hardening", self._stage_self_hardening)
+        return stages
 
-        # M12: Self-Improvement Wochenanalyse
-        if _improvement_feature_enabled() and self._improvement_engine:
-            if self._improvement_engine._should_run_analysis():
-                try:
-                    _loop = asyncio.get_event_loop()
-                    if _loop.is_running():
-                        asyncio.ensure_future(self._improvement_engine.run_analysis_cycle())
-                except RuntimeError:
-                    pass
-                except Exception as e:
-                    log.debug("SelfImprovementEngine fehlgeschlagen: %s", e)
+    # ------------------------------------------------------------------
+    # Heartbeat-Stufen (laufen im Thread-Pool der HeartbeatPipeline)
+    # ------------------------------------------------------------------
 
-        if _self_modify_feature_enabled() and self._self_modifier_engine:
-            try:
-                modify_summary = self._self_modifier_engine.run_cycle()
-                if modify_summary.get("status") == "enabled" and (
-                    modify_summary.get("applied", 0)
-                    or modify_summary.get("pending", 0)
-                ):
-                    log.info(
-                        "🛠️ Heartbeat Self-Modify: applied=%s pending=%s max_per_cycle=%s",
-                        modify_summary.get("applied", 0),
-                        modify_summary.get("pending", 0),
-                        modify_summary.get("max_per_cycle", 0),
-                    )
-            except Exception as e:
-                log.debug("SelfModifierEngine fehlgeschlagen: %s", e)
+    def _stage_self_healing(self, ctx: dict) -> None:
+        healing_summary = self._self_healing_engine.run_cycle()
+        if healing_summary.get("status") == "ok" and (
+            healing_summary.get("incidents_opened", 0)
+            or healing_summary.get("incidents_reopened", 0)
+            or healing_summary.get("incidents_resolved", 0)
+            or healing_summary.get("incidents_escalated", 0)
+            or healing_summary.get("circuit_breaker_trips", 0)
+            or healing_summary.get("playbooks_suppressed", 0)
+            or healing_summary.get("playbook_attempts_blocked", 0)
+            or healing_summary.get("degrade_mode_changed", False)
+        ):
+            log.info(
+                "🛠️ Heartbeat Self-Healing: opened=%s reopened=%s resolved=%s escalated=%s playbooks=%s suppressed=%s attempts_blocked=%s trips=%s degrade=%s reason=%s",
+                healing_summary.get("incidents_opened", 0),
+                healing_summary.get("incidents_reopened", 0),
+                healing_summary.get("incidents_resolved", 0),
+                healing_summary.get("incidents_escalated", 0),
+                healing_summary.get("playbooks_triggered", 0),
+                healing_summary.get("playbooks_suppressed", 0),
+                healing_summary.get("playbook_attempts_blocked", 0),
+                healing_summary.get("circuit_breaker_trips", 0),
+                healing_summary.get("degrade_mode", "normal"),
+                healing_summary.get("degrade_reason", ""),
+            )
 
-        if _improvement_task_autonomy_feature_enabled():
-            try:
-                _loop = asyncio.get_event_loop()
-                if _loop.is_running() and not self._improvement_task_autonomy_running:
-                    asyncio.ensure_future(self._run_improvement_task_autonomy_cycle())
-            except RuntimeError:
-                pass
-            except Exception as e:
-                log.debug("ImprovementTaskAutonomy fehlgeschlagen: %s", e)
+    def _stage_goal_generator(self, ctx: dict) -> None:
+        generated = self._goal_generator.run_cycle(max_goals=3)
+        if generated:
+            log.info("🎯 Heartbeat: %d Ziel-Signal(e) verarbeitet", len(generated))
 
-        if _memory_curation_autonomy_feature_enabled():
-            try:
-                _loop = asyncio.get_event_loop()
-                if _loop.is_running() and not self._memory_curation_autonomy_running:
-                    asyncio.ensure_future(self._run_memory_curation_autonomy_cycle())
-            except RuntimeError:
-                pass
-            except Exception as e:
-                log.debug("MemoryCurationAutonomy fehlgeschlagen: %s", e)
+    def _stage_long_term_planner(self, ctx: dict) -> None:
+        planning_summary = self._long_term_planner.run_cycle()
+        if planning_summary.get("status") == "ok":
+            log.info(
+                "🗓️ Heartbeat Planung: %s Planfenster | %s Commitments",
+                planning_summary.get("plans_touched", 0),
+                planning_summary.get("commitments_touched", 0),
+            )
 
-        # M15: Ambient Context Engine
-        if _ambient_context_feature_enabled() and self._ambient_engine:
-            try:
-                _loop = asyncio.get_event_loop()
-                if _loop.is_running():
-                    asyncio.ensure_future(self._ambient_engine.run_cycle())
-            except RuntimeError:
-                pass
-            except Exception as e:
-                log.debug("AmbientContextEngine fehlgeschlagen: %s", e)
+    def _stage_commitment_review(self, ctx: dict) -> None:
+        review_summary = self._commitment_review_engine.run_cycle()
+        if review_summary.get("status") == "ok" and review_summary.get("reviews_due", 0):
+            log.info(
+                "📋 Heartbeat Reviews: due=%s | escalated=%s | replan_events=%s",
+                review_summary.get("reviews_due", 0),
+                review_summary.get("reviews_escalated", 0),
+                review_summary.get("replan_events_created", 0),
+            )
 
-        # M16: FeedbackEngine + Soul Hook Decay (täglich)
-        if _m16_feature_enabled():
-            # process_pending: heute gesendete Feedbacks zählen
-            if self._feedback_engine:
-                try:
-                    count = self._feedback_engine.process_pending()
-                    if count > 0:
-                        log.debug("M16: %d Feedback-Events heute", count)
-                except Exception as e:
-                    log.debug("FeedbackEngine.process_pending fehlgeschlagen: %s", e)
+    def _stage_replanning(self, ctx: dict) -> None:
+        replanning_summary = self._replanning_engine.run_cycle()
+        if replanning_summary.get("status") == "ok" and replanning_summary.get("events_detected", 0):
+            log.info(
+                "🔁 Heartbeat Replanning: detected=%s | created=%s | actions=%s",
+                replanning_summary.get("events_detected", 0),
+                replanning_summary.get("events_created", 0),
+                replanning_summary.get("actions_applied", 0),
+            )
 
-            # Täglicher Hook-Decay (1× pro Tag)
-            _daily_ticks = max(1, round(24 * 60 / self.interval_minutes))
-            if self._heartbeat_count % _daily_ticks == 0:
-                try:
-                    from memory.soul_engine import get_soul_engine
-                    changed = get_soul_engine().decay_hooks()
-                    if changed > 0:
-                        log.info("M16: Hook-Decay: %d Hooks angepasst", changed)
-                except Exception as e:
-                    log.debug("Hook-Decay fehlgeschlagen: %s", e)
+    def _stage_goal_conflicts_and_kpi(self, ctx: dict) -> None:
+        try:
+            conflict_summary = get_queue().sync_goal_conflicts(auto_block=False, max_pairs=60)
+            detected = int(conflict_summary.get("conflicts_detected", 0))
+            if detected:
+                log.warning("⚠️ Goal-Konflikte erkannt: %d", detected)
+        except Exception as e:
+            log.warning("Goal-Konflikt-Sync fehlgeschlagen: %s", e)
+        self._export_goal_kpi_snapshot()
+
+    def _stage_planning_kpi(self, ctx: dict) -> None:
+        self._export_planning_kpi_snapshot()
+        self._export_commitment_review_kpi_snapshot()
+
+    def _stage_policy(self, ctx: dict) -> None:
+        self._apply_policy_rollout_guard()
+        self._export_policy_kpi_snapshot()
+
+    def _stage_scorecard(self, ctx: dict) -> Optional[dict]:
+        scorecard = self._export_autonomy_scorecard_snapshot()
+        e2e_gate = self._collect_e2e_release_gate_sync()
+        ops_gate = self._collect_ops_release_gate_sync()
+        self._apply_autonomy_scorecard_control(scorecard=scorecard, e2e_gate=e2e_gate, ops_gate=ops_gate)
+        return scorecard
 
-        # M14: E-Mail-Autonomie — pending Approvals loggen
-        if _m14_feature_enabled():
+    def _stage_audit_report(self, ctx: dict) -> None:
+        export_payload = self._export_autonomy_audit_report(scorecard=ctx.get("scorecard"))
+        if _audit_change_requests_feature_enabled() and isinstance(export_payload, dict):
+            self._apply_autonomy_audit_change_request(export_payload=export_payload)
+
+    def _stage_meta_analysis(self, ctx: dict) -> None:
+        meta_result = self._meta_analyzer.run_analysis()
+        insights = meta_result.get("insights") or {}
+        log.info(
+            "🔬 Meta-Analyse: trend=%s risk=%s insight=%s...",
+            insights.get("trend", "?"),
+            insights.get("risk_level", "?"),
+            str(insights.get("key_insight", "?"))[:80],
+        )
+
+    def _stage_blackboard_cleanup(self, ctx: dict) -> None:
+        from memory.agent_blackboard import get_blackboard
+
+        expired = get_blackboard().clear_expired()
+        if expired > 0:
+            log.debug("Blackboard: %d abgelaufene Einträge gelöscht", expired)
+
+    def _stage_triggers(self, ctx: dict) -> None:
+        fired = self._trigger_engine.check_and_fire(loop=ctx.get("loop"))
+        if fired:
+            log.info("⏰ %d Trigger ausgelöst", len(fired))
+
+    def _stage_goal_queue_rollup(self, ctx: dict) -> None:
+        self._goal_manager.run_progress_cycle()
+
+    def _stage_self_modify(self, ctx: dict) -> None:
+        modify_summary = self._self_modifier_engine.run_cycle()
+        if modify_summary.get("status") == "enabled" and (
+            modify_summary.get("applied", 0)
+            or modify_summary.get("pending", 0)
+        ):
+            log.info(
+                "🛠️ Heartbeat Self-Modify: applied=%s pending=%s max_per_cycle=%s",
+                modify_summary.get("applied", 0),
+                modify_summary.get("pending", 0),
+                modify_summary.get("max_per_cycle", 0),
+            )
+
+    def _stage_feedback(self, ctx: dict) -> None:
+        # process_pending: heute gesendete Feedbacks zählen
+        if self._feedback_engine:
             try:
-                from orchestration.email_autonomy_engine import get_email_autonomy_engine
-                count = get_email_autonomy_engine().process_pending()
+                count = self._feedback_engine.process_pending()
                 if count > 0:
-                    log.debug("M14: %d E-Mail-Approvals ausstehend", count)
+                    log.debug("M16: %d Feedback-Events heute", count)
             except Exception as e:
-                log.debug("EmailAutonomyEngine.process_pending fehlgeschlagen: %s", e)
+                log.debug("FeedbackEngine.process_pending fehlgeschlagen: %s", e)
 
-        # M18: Self-Hardening Engine — alle 5 Heartbeats Log + Blackboard analysieren
-        if _self_hardening_feature_enabled() and self._heartbeat_count % 5 == 0:
-            try:
-                from orchestration.self_hardening_engine import get_self_hardening_engine
-                hardening_summary = get_self_hardening_engine().run_cycle()
-                if hardening_summary.get("proposals", 0) > 0:
-                    log.info(
-                        "🔧 M18 Self-Hardening: %d neue Vorschläge, %d übersprungen",
-                        hardening_summary["proposals"],
-                        hardening_summary.get("skipped", 0),
-                    )
-            except Exception as e:
-                log.debug("SelfHardeningEngine fehlgeschlagen: %s", e)
+        # Täglicher Hook-Decay (1× pro Tag)
+        _daily_ticks = max(1, round(24 * 60 / self.interval_minutes))
+        if self._heartbeat_count % _daily_ticks == 0:
+            from memory.soul_engine import get_soul_engine
 
-        pending = queue.get_pending()
-        if not pending:
-            log.debug("Heartbeat: keine offenen Tasks")
-            return
-        log.info(f"Heartbeat: {len(pending)} offene Task(s) | Top-Priorität: {pending[0]['priority']}")
-        self._work_signal.set()
+            changed = get_soul_engine().decay_hooks()
+            if changed > 0:
+                log.info("M16: Hook-Decay: %d Hooks angepasst", changed)
+
+    def _stage_email_autonomy(self, ctx: dict) -> None:
+        from orchestration.email_autonomy_engine import get_email_autonomy_engine
+
+        count = get_email_autonomy_engine().process_pending()
+        if count > 0:
+            log.debug("M14: %d E-Mail-Approvals ausstehend", count)
+
+    def _stage_self_hardening(self, ctx: dict) -> None:
+        from orchestration.self_hardening_engine import get_self_hardening_engine
+
+        hardening_summary = get_self_hardening_engine().run_cycle(loop=ctx.get("loop"))
+        if hardening_summary.get("proposals", 0) > 0:
+            log.info(
+                "🔧 M18 Self-Hardening: %d neue Vorschläge, %d übersprungen",
+                hardening_summary["proposals"],
+                hardening_summary.get("skipped", 0),
+            )
 
     def _export_goal_kpi_snapshot(self) -> None:
         """Exportiert Goal-KPIs in Log + Canvas (falls vorhanden)."""
@@ -1789,9 +1877,9 @@ class AutonomousRunner:
     # ------------------------------------------------------------------
 
     async def _worker_loop(self) -> None:
-        """Wartet auf Signal, holt dann Tasks aus SQLite und führt sie aus."""
+        """Wartet auf Signal, holt dann Tasks aus SQLite und verteilt sie auf den Worker-Pool."""
         while self._running:
-            # Warten bis Heartbeat signalisiert oder Timeout
+            # Warten bis Heartbeat/fertiger Worker signalisiert oder Timeout
             try:
                 await asyncio.wait_for(self._work_signal.wait(), timeout=60.0)
             except asyncio.TimeoutError:
@@ -1801,13 +1889,141 @@ class AutonomousRunner:
             if not self._running:
                 break
 
-            # Alle verfügbaren Tasks sequenziell abarbeiten
-            queue = get_queue()
-            while self._running:
-                task = queue.claim_next()
-                if not task:
+            self._dispatch_ready_tasks()
+
+    @staticmethod
+    def _empty_lane_stats() -> dict:
+        return {
+            "started": 0,
+            "finished": 0,
+            "errors": 0,
+            "deferred": 0,
+            "queue_wait_total_s": 0.0,
+            "queue_wait_max_s": 0.0,
+            "execution_total_s": 0.0,
+            "execution_max_s": 0.0,
+        }
+
+    def _task_resource_class(self, task: dict) -> str:
+        """Ressourcenklasse eines Tasks: explizit via metadata.resource_class, sonst Heuristik."""
+        metadata = _parse_task_metadata(task.get("metadata"))
+        explicit = str(metadata.get("resource_class") or "").strip().lower()
+        if explicit in self._lane_limits:
+            return explicit
+        heavy = self._is_resource_heavy_task(
+            str(task.get("description") or ""), task.get("target_agent"), metadata
+        )
+        return "heavy" if heavy else "light"
+
+    def _lane_has_capacity(self, lane: str, agent: str, priority: int) -> bool:
+        busy = len(self._inflight)
+        if busy >= self._max_workers:
+            return False
+        # Reservierte Slots bleiben CRITICAL/HIGH-Tasks vorbehalten
+        if int(priority) > int(Priority.HIGH) and busy >= self._max_workers - self._priority_reserved_slots:
+            return False
+        lane_busy = sum(1 for slot in self._inflight.values() if slot["lane"] == lane)
+        if lane_busy >= self._lane_limits.get(lane, self._max_workers):
+            return False
+        if agent:
+            agent_busy = sum(1 for slot in self._inflight.values() if slot["agent"] == agent)
+            if agent_busy >= self._agent_concurrency:
+                return False
+        return True
+
+    def _dispatch_ready_tasks(self) -> int:
+        """
+        Claimt Tasks, solange Worker frei sind. Tasks, deren Lane oder Agent
+        gerade ausgelastet ist, gehen unverändert zurück in die Queue und
+        werden in dieser Runde übersprungen, damit nachrangige Tasks anderer
+        Lanes nicht blockiert werden.
+        """
+        queue = get_queue()
+        deferred: set[str] = set()
+        started = 0
+        scan_limit = max(1, _env_int("AUTONOMY_DISPATCH_SCAN_LIMIT", 25))
+        while self._running and len(self._inflight) < self._max_workers:
+            task = queue.claim_next(exclude_ids=deferred)
+            if not task:
+                break
+            task_id = str(task.get("id") or "")
+            lane = self._task_resource_class(task)
+            agent = str(task.get("target_agent") or "").strip().lower()
+            priority = task.get("priority", Priority.NORMAL)
+            if not self._lane_has_capacity(lane, agent, priority):
+                queue.release_claim(task_id)
+                deferred.add(task_id)
+                self._lane_stats.setdefault(lane, self._empty_lane_stats())["deferred"] += 1
+                if len(deferred) >= scan_limit:
                     break
-                await self._execute_task(task)
+                continue
+            self._start_lane_task(task, lane, agent)
+            started += 1
+        return started
+
+    def _start_lane_task(self, task: dict, lane: str, agent: str) -> None:
+        task_id = str(task.get("id") or "")
+        claimed_at = _parse_iso(task.get("started_at")) or datetime.now()
+        ready_at = max(
+            (ts for ts in (_parse_iso(task.get("created_at")), _parse_iso(task.get("run_at"))) if ts),
+            default=claimed_at,
+        )
+        queue_wait_s = max(0.0, (claimed_at - ready_at).total_seconds())
+        self._inflight[task_id] = {"lane": lane, "agent": agent, "claimed_at": claimed_at}
+        stats = self._lane_stats.setdefault(lane, self._empty_lane_stats())
+        stats["started"] += 1
+        stats["queue_wait_total_s"] += queue_wait_s
+        stats["queue_wait_max_s"] = max(stats["queue_wait_max_s"], queue_wait_s)
+
+        worker = asyncio.create_task(
+            self._run_lane_task(task, lane), name=f"autonomous-task-{task_id[:8]}"
+        )
+        self._worker_tasks.add(worker)
+        worker.add_done_callback(self._worker_tasks.discard)
+
+    async def _run_lane_task(self, task: dict, lane: str) -> None:
+        task_id = str(task.get("id") or "")
+        stats = self._lane_stats.setdefault(lane, self._empty_lane_stats())
+        started = time.monotonic()
+        try:
+            await self._execute_task(task)
+        except Exception as e:
+            stats["errors"] += 1
+            log.error("Task [%s] im Worker-Pool abgebrochen: %s", task_id[:8], e, exc_info=True)
+            try:
+                get_queue().fail(task_id, f"worker_error:{e}")
+            except Exception as fail_error:
+                log.debug("Task [%s] konnte nicht als fehlgeschlagen markiert werden: %s", task_id[:8], fail_error)
+        finally:
+            elapsed = time.monotonic() - started
+            stats["finished"] += 1
+            stats["execution_total_s"] += elapsed
+            stats["execution_max_s"] = max(stats["execution_max_s"], elapsed)
+            self._inflight.pop(task_id, None)
+            log.debug("Task [%s] Lane=%s fertig nach %.1fs", task_id[:8], lane, elapsed)
+            # Freier Slot → zurückgestellte Tasks erneut verteilen
+            self._work_signal.set()
+
+    def get_worker_pool_stats(self) -> dict:
+        """Lane-Statistik: Warte- vs. Ausführungszeit je Ressourcenklasse."""
+        lanes = {}
+        for lane, stats in self._lane_stats.items():
+            started = stats["started"] or 0
+            finished = stats["finished"] or 0
+            lanes[lane] = {
+                **{key: round(value, 3) if isinstance(value, float) else value for key, value in stats.items()},
+                "limit": self._lane_limits.get(lane, self._max_workers),
+                "in_flight": sum(1 for slot in self._inflight.values() if slot["lane"] == lane),
+                "queue_wait_avg_s": round(stats["queue_wait_total_s"] / started, 3) if started else 0.0,
+                "execution_avg_s": round(stats["execution_total_s"] / finished, 3) if finished else 0.0,
+            }
+        return {
+            "max_workers": self._max_workers,
+            "agent_concurrency": self._agent_concurrency,
+            "priority_reserved_slots": self._priority_reserved_slots,
+            "in_flight": len(self._inflight),
+            "lanes": lanes,
+        }
 
     # ------------------------------------------------------------------
     # Task-Ausführung
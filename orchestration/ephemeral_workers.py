@@ -159,6 +159,7 @@ def _record_worker_usage(
                 input_tokens=int(usage["input_tokens"]),
                 output_tokens=int(usage["output_tokens"]),
                 cached_tokens=int(usage["cached_tokens"]),
+                cache_write_tokens=int(usage.get("cache_write_tokens", 0)),
                 cost_usd=float(usage["cost_usd"]),
                 latency_ms=max(int(latency_ms or 0), 0),
                 success=bool(success),
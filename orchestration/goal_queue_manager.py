@@ -114,13 +114,15 @@ class GoalQueueManager:
     # Meilensteine
     # ------------------------------------------------------------------
 
-    def complete_milestone(self, goal_id: str, milestone_idx: int) -> float:
+    def complete_milestone(self, goal_id: str, milestone_idx: int, loop=None) -> float:
         """
         Markiert einen Meilenstein als erledigt.
 
         Args:
             goal_id: ID des Ziels
             milestone_idx: 0-basierter Index des Meilensteins
+            loop: Laufender Event-Loop für den Telegram-Push, falls aus einem
+                  Worker-Thread aufgerufen
 
         Returns:
             Neuer Fortschritt (0.0–1.0)
@@ -191,7 +193,7 @@ class GoalQueueManager:
 
             # Telegram-Push bei Abschluss
             if progress >= 1.0:
-                self._notify_goal_completed(goal_id)
+                self._notify_goal_completed(goal_id, loop=loop)
 
             return progress
 
@@ -416,11 +418,10 @@ class GoalQueueManager:
                 queue.append(child_id)
         return result
 
-    def _notify_goal_completed(self, goal_id: str) -> None:
+    def _notify_goal_completed(self, goal_id: str, loop=None) -> None:
         """Telegram-Push bei Ziel-Abschluss."""
         try:
-            import asyncio
-            from utils.telegram_notify import send_telegram
+            from utils.telegram_notify import schedule_telegram
 
             with sqlite3.connect(str(self.db_path)) as conn:
                 row = conn.execute(
@@ -429,15 +430,7 @@ class GoalQueueManager:
             title = row[0] if row else goal_id
 
             msg = f"🎯 *Ziel abgeschlossen!*\n{title}"
-
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.ensure_future(send_telegram(msg))
-                else:
-                    loop.run_until_complete(send_telegram(msg))
-            except RuntimeError:
-                pass  # Kein Event-Loop verfügbar
+            schedule_telegram(msg, loop=loop)
         except Exception:
             pass
 
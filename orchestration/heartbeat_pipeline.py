@@ -0,0 +1,228 @@
+"""
+orchestration/heartbeat_pipeline.py
+
+Gestufte Heartbeat-Pipeline für den AutonomousRunner.
+
+Die Heartbeat-Engines (Self-Healing, Planung, KPI-Exporte, Scorecard ...)
+machen blockierendes SQLite-I/O. Statt sie nacheinander im Scheduler-Callback
+auf dem Event-Loop auszuführen, läuft jede Stufe in einem Thread-Pool:
+
+- unabhängige Stufen laufen parallel
+- abhängige Stufen starten erst, wenn ihre deklarierten Abhängigkeiten fertig sind
+- jede Stufe hat ein Timeout und eine gemessene Dauer
+- eine Stufe, die beim letzten Heartbeat ins Timeout lief und noch arbeitet,
+  wird nicht erneut gestartet (kein Aufstauen von Threads)
+
+Ergebnisse von Stufen landen in einem gemeinsamen Kontext-Dict, aus dem
+nachfolgende Stufen lesen können (z.B. die Scorecard für das Hardening).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+log = logging.getLogger("HeartbeatPipeline")
+
+STAGE_OK = "ok"
+STAGE_ERROR = "error"
+STAGE_TIMEOUT = "timeout"
+STAGE_SKIPPED = "skipped"
+STAGE_STILL_RUNNING = "still_running"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.1, float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+DEFAULT_STAGE_TIMEOUT_S = _env_float("HEARTBEAT_STAGE_TIMEOUT_S", 30.0)
+PIPELINE_MAX_WORKERS = _env_int("HEARTBEAT_PIPELINE_MAX_WORKERS", 4)
+
+
+@dataclass(frozen=True)
+class HeartbeatStage:
+    """Eine Heartbeat-Stufe: blockierende Funktion ``fn(context)`` plus Abhängigkeiten."""
+
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]
+    depends_on: Tuple[str, ...] = ()
+    timeout_s: Optional[float] = None
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str
+    duration_s: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class PipelineRun:
+    started_at: float
+    duration_s: float = 0.0
+    stages: Dict[str, StageResult] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "duration_s": round(self.duration_s, 3),
+            "stages": {
+                name: {
+                    "status": result.status,
+                    "duration_s": round(result.duration_s, 3),
+                    **({"error": result.error} if result.error else {}),
+                }
+                for name, result in self.stages.items()
+            },
+        }
+
+
+class HeartbeatPipeline:
+    """Führt Heartbeat-Stufen dependency-geordnet in einem Thread-Pool aus."""
+
+    def __init__(
+        self,
+        max_workers: int = PIPELINE_MAX_WORKERS,
+        default_timeout_s: float = DEFAULT_STAGE_TIMEOUT_S,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.default_timeout_s = float(default_timeout_s)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, Future] = {}
+        self.last_run: Optional[PipelineRun] = None
+        self.runs = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="heartbeat-stage",
+            )
+        return self._executor
+
+    @staticmethod
+    def _validate(stages: Sequence[HeartbeatStage]) -> Dict[str, HeartbeatStage]:
+        by_name: Dict[str, HeartbeatStage] = {}
+        for stage in stages:
+            if stage.name in by_name:
+                raise ValueError(f"Doppelte Heartbeat-Stufe: {stage.name}")
+            by_name[stage.name] = stage
+        # Zyklen erkennen (Kahn); Abhängigkeiten auf fehlende Stufen gelten als erfüllt.
+        remaining = {
+            name: {dep for dep in stage.depends_on if dep in by_name}
+            for name, stage in by_name.items()
+        }
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Zyklische Heartbeat-Abhängigkeiten: {sorted(remaining)}")
+            for name in ready:
+                remaining.pop(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return by_name
+
+    async def run(
+        self,
+        stages: Sequence[HeartbeatStage],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> PipelineRun:
+        by_name = self._validate(stages)
+        ctx: Dict[str, Any] = context if context is not None else {}
+        run = PipelineRun(started_at=time.monotonic())
+        pending = {
+            name: {dep for dep in stage.depends_on if dep in by_name}
+            for name, stage in by_name.items()
+        }
+        running: Dict[asyncio.Task, str] = {}
+
+        def _finish(name: str, result: StageResult) -> None:
+            run.stages[name] = result
+            for deps in pending.values():
+                deps.discard(name)
+
+        while pending or running:
+            for name in [n for n, deps in pending.items() if not deps]:
+                pending.pop(name)
+                stage = by_name[name]
+                blocked = [
+                    dep for dep in stage.depends_on
+                    if run.stages.get(dep) and run.stages[dep].status in {STAGE_TIMEOUT, STAGE_SKIPPED, STAGE_STILL_RUNNING}
+                ]
+                if blocked:
+                    _finish(name, StageResult(name, STAGE_SKIPPED, error=f"abhängig von {','.join(blocked)}"))
+                    continue
+                previous = self._inflight.get(name)
+                if previous is not None and not previous.done():
+                    _finish(name, StageResult(name, STAGE_STILL_RUNNING))
+                    continue
+                running[asyncio.create_task(self._run_stage(stage, ctx))] = name
+
+            if not running:
+                continue
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = running.pop(task)
+                _finish(name, task.result())
+
+        run.duration_s = time.monotonic() - run.started_at
+        self.last_run = run
+        self.runs += 1
+        slow = [
+            f"{name}={result.duration_s:.1f}s"
+            for name, result in run.stages.items()
+            if result.status != STAGE_OK or result.duration_s >= 1.0
+        ]
+        if slow:
+            log.info("💓 Heartbeat-Pipeline %.1fs | %s", run.duration_s, " ".join(slow))
+        return run
+
+    async def _run_stage(self, stage: HeartbeatStage, ctx: Dict[str, Any]) -> StageResult:
+        timeout_s = stage.timeout_s or self.default_timeout_s
+        started = time.monotonic()
+
+        def _call() -> Any:
+            return stage.fn(ctx)
+
+        future = self._get_executor().submit(_call)
+        self._inflight[stage.name] = future
+        try:
+            value = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            log.warning("Heartbeat-Stufe %s nach %.0fs abgebrochen (läuft im Hintergrund weiter)", stage.name, timeout_s)
+            return StageResult(stage.name, STAGE_TIMEOUT, time.monotonic() - started)
+        except Exception as e:
+            log.warning("Heartbeat-Stufe %s fehlgeschlagen: %s", stage.name, e)
+            return StageResult(stage.name, STAGE_ERROR, time.monotonic() - started, str(e)[:200])
+        if value is not None:
+            ctx[stage.name] = value
+        return StageResult(stage.name, STAGE_OK, time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "max_workers": self.max_workers,
+            "default_timeout_s": self.default_timeout_s,
+            "still_running": sorted(name for name, fut in self._inflight.items() if not fut.done()),
+            "last_run": self.last_run.to_dict() if self.last_run else None,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
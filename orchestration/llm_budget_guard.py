@@ -132,16 +132,21 @@ def evaluate_llm_budget(
     soft_cap = _env_int("TIMUS_LLM_BUDGET_SOFT_MAX_TOKENS", 600)
     engine = get_improvement_engine()
 
-    global_summary = engine.get_llm_usage_summary(days=window_days, limit=3)
-    scopes = [_scope_state("global", global_summary.get("total_cost_usd", 0.0))]
+    def _scope_cost(**filters: str) -> float:
+        # Hotpath: In-Memory-Ledger statt drei Aggregat-Scans pro Scope.
+        get_spend = getattr(engine, "get_llm_spend", None)
+        if callable(get_spend):
+            return float(get_spend(days=window_days, **filters) or 0.0)
+        summary = engine.get_llm_usage_summary(days=window_days, limit=3, **filters)
+        return float(summary.get("total_cost_usd", 0.0) or 0.0)
+
+    scopes = [_scope_state("global", _scope_cost())]
 
     if agent:
-        agent_summary = engine.get_llm_usage_summary(days=window_days, agent=agent, limit=3)
-        scopes.append(_scope_state("agent", agent_summary.get("total_cost_usd", 0.0)))
+        scopes.append(_scope_state("agent", _scope_cost(agent=agent)))
 
     if session_id:
-        session_summary = engine.get_llm_usage_summary(days=window_days, session_id=session_id, limit=3)
-        scopes.append(_scope_state("session", session_summary.get("total_cost_usd", 0.0)))
+        scopes.append(_scope_state("session", _scope_cost(session_id=session_id)))
 
     states = [scope.state for scope in scopes]
     if "hard_limit" in states:
@@ -0,0 +1,82 @@
+"""Vorkompilierter Hint-Matcher fuer das Meta-Routing.
+
+``classify_meta_task`` und ``build_meta_context_bundle`` pruefen pro Turn
+dutzende Hint-Familien (Browser, Recherche, Dokument, ...). Frueher
+normalisierte jedes ``_looks_like_*``-Praedikat den Text neu und scannte
+seine Hint-Tupel linear per ``_has_any``.
+
+Der Matcher wird einmal beim Import gebaut:
+
+- Hints je Familie dedupliziert; Hints, die einen kuerzeren Hint derselben
+  Familie enthalten, fallen weg (der kuerzere trifft ohnehin zuerst)
+- ``match(text)`` normalisiert einmal (lower + Whitespace zusammenfassen) und
+  liefert alle getroffenen Familien als ``frozenset`` in einem Durchlauf
+- Ergebnis pro normalisiertem Text gecacht — Praedikate, die denselben Turn
+  erneut pruefen, bekommen den Treffer-Satz ohne neuen Scan
+
+Kombinierte Regex-Alternationen (je Familie oder als Lookahead-Scan ueber
+alle Hints) waren auf dem Eval-Korpus langsamer als CPythons Substring-Suche
+und werden deshalb nicht verwendet.
+
+USAGE:
+    matcher = MetaIntentMatcher({"browser": _BROWSER_HINTS, "document": _DOCUMENT_HINTS})
+    hits = matcher.match("Öffne den Browser und erstelle ein PDF")
+    if "browser" in hits: ...
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Mapping, Tuple
+
+
+def normalize_intent_text(text: str) -> str:
+    """Kanonische Form fuer alle Hint-Pruefungen: klein, Whitespace zusammengefasst."""
+    return " ".join(str(text or "").lower().split())
+
+
+def _prune_hints(hints: Iterable[str]) -> Tuple[str, ...]:
+    unique = list(dict.fromkeys(str(hint) for hint in hints if hint))
+    kept = [hint for hint in unique if not any(other != hint and other in hint for other in unique)]
+    return tuple(sorted(kept, key=len))
+
+
+class MetaIntentMatcher:
+    """Alle Hint-Familien eines Textes in einem Durchlauf."""
+
+    def __init__(self, families: Mapping[str, Iterable[str]], *, cache_size: int = 512) -> None:
+        self._families: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+            (name, _prune_hints(hints)) for name, hints in families.items()
+        )
+        self.family_names: FrozenSet[str] = frozenset(name for name, _hints in self._families)
+        self._match_normalized = lru_cache(maxsize=cache_size)(self._scan)
+
+    def _scan(self, normalized: str) -> FrozenSet[str]:
+        found = []
+        for name, hints in self._families:
+            for hint in hints:
+                if hint in normalized:
+                    found.append(name)
+                    break
+        return frozenset(found)
+
+    def match(self, text: str) -> FrozenSet[str]:
+        """Namen aller Familien, von denen mindestens ein Hint im Text vorkommt."""
+        normalized = normalize_intent_text(text)
+        if not normalized:
+            return frozenset()
+        return self._match_normalized(normalized)
+
+    def has(self, text: str, family: str) -> bool:
+        if family not in self.family_names:
+            raise KeyError(f"Unbekannte Hint-Familie: {family}")
+        return family in self.match(text)
+
+    def stats(self) -> Dict[str, int]:
+        info = self._match_normalized.cache_info()
+        return {
+            "families": len(self._families),
+            "hints": sum(len(hints) for _name, hints in self._families),
+            "cache_hits": info.hits,
+            "cache_misses": info.misses,
+        }
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import re
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 from typing import Any, Dict, Iterable, List, Mapping, Tuple
 
 from orchestration.adaptive_plan_memory import get_adaptive_plan_memory
@@ -18,6 +19,7 @@ from orchestration.general_decision_kernel import build_general_decision_kernel
 from orchestration.general_decision_kernel import resolve_low_confidence_controller
 from orchestration.meta_context_authority import build_meta_context_authority
 from orchestration.meta_context_authority import classify_meta_context_slot, summarize_meta_context_classes
+from orchestration.meta_intent_matcher import MetaIntentMatcher, normalize_intent_text
 from orchestration.meta_interaction_mode import MetaInteractionMode, build_meta_interaction_mode
 from orchestration.conversation_state import (
     derive_topic_state_transition,
@@ -1497,6 +1499,54 @@ _META_CONTEXT_LOCATION_MARKERS = (
     "longitude",
 )
 
+# Einmal beim Import gebaut; Praedikate und classify_meta_task lesen nur noch den Treffer-Satz.
+# Nur Familien, die pro Turn auf die aktuelle Anfrage geprueft werden — Marker, die je
+# Memory-Eintrag laufen (z.B. _META_CONTEXT_LOCATION_MARKERS), bleiben Einzelscans.
+_META_INTENT_MATCHER = MetaIntentMatcher(
+    {
+        "browser": _BROWSER_HINTS,
+        "extraction": _EXTRACTION_HINTS,
+        "broad_research": _BROAD_RESEARCH_HINTS,
+        "strict_research": _STRICT_RESEARCH_HINTS,
+        "claim_check": _CLAIM_CHECK_HINTS,
+        "legal_policy_research": _LEGAL_POLICY_RESEARCH_HINTS,
+        "simple_live_lookup_direct": _SIMPLE_LIVE_LOOKUP_DIRECT_HINTS,
+        "simple_live_lookup_freshness": _SIMPLE_LIVE_LOOKUP_FRESHNESS_HINTS,
+        "public_information_lookup_cues": _PUBLIC_INFORMATION_LOOKUP_CUES,
+        "public_information_lookup_topics": _PUBLIC_INFORMATION_LOOKUP_TOPICS,
+        "live_travel_discovery": _LIVE_TRAVEL_DISCOVERY_HINTS,
+        "live_travel_plan_output": _LIVE_TRAVEL_PLAN_OUTPUT_HINTS,
+        "live_travel_lookup_intent": _LIVE_TRAVEL_LOOKUP_INTENT_HINTS,
+        "local_document_analysis": _LOCAL_DOCUMENT_ANALYSIS_HINTS,
+        "email_send_action": _EMAIL_SEND_ACTION_HINTS,
+        "email_content_reference": _EMAIL_CONTENT_REFERENCE_HINTS,
+        "hard_research": _HARD_RESEARCH_HINTS,
+        "no_research": _NO_RESEARCH_HINTS,
+        "youtube_light": _YOUTUBE_LIGHT_HINTS,
+        "youtube_fact_check": _YOUTUBE_FACT_CHECK_HINTS,
+        "local_search": _LOCAL_SEARCH_HINTS,
+        "document": _DOCUMENT_HINTS,
+        "local_file_transform": _LOCAL_FILE_TRANSFORM_HINTS,
+        "local_file_operation": _LOCAL_FILE_OPERATION_HINTS,
+        "image_generation_action": _IMAGE_GENERATION_ACTION_HINTS,
+        "image_non_generation": _IMAGE_NON_GENERATION_HINTS,
+        "creative_text_optimization": _CREATIVE_TEXT_OPTIMIZATION_HINTS,
+        "developer_troubleshooting": _DEVELOPER_TROUBLESHOOTING_HINTS,
+        "delivery": _DELIVERY_HINTS,
+        "system": _SYSTEM_HINTS,
+        "semantic_business_strategy": _SEMANTIC_BUSINESS_STRATEGY_HINTS,
+        "semantic_wealth": _SEMANTIC_WEALTH_HINTS,
+        "semantic_personal_preference": _SEMANTIC_PERSONAL_PREFERENCE_HINTS,
+        "semantic_location_state_update": _SEMANTIC_LOCATION_STATE_UPDATE_HINTS,
+        "behavior_alignment_future": _SEMANTIC_BEHAVIOR_ALIGNMENT_FUTURE_HINTS,
+        "behavior_alignment_directive": _SEMANTIC_BEHAVIOR_ALIGNMENT_DIRECTIVE_HINTS,
+        "context_anchored_followup": _CONTEXT_ANCHORED_FOLLOWUP_HINTS,
+        "context_anchored_reference": _CONTEXT_ANCHORED_REFERENCE_TOKENS,
+        "compressed_followup": _META_COMPRESSED_FOLLOWUP_HINTS,
+        "context_dependent": _META_CONTEXT_DEPENDENT_MARKERS,
+    }
+)
+
 
 def get_agent_capability_map() -> Dict[str, Dict[str, Any]]:
     return {agent: profile.to_dict() for agent, profile in _AGENT_PROFILES.items()}
@@ -1883,23 +1933,23 @@ def _has_any(text: str, hints: Iterable[str]) -> bool:
 
 
 def _looks_like_simple_live_lookup_direct_query(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
-    if _has_any(normalized, _SIMPLE_LIVE_LOOKUP_DIRECT_HINTS):
+    if _META_INTENT_MATCHER.has(normalized, "simple_live_lookup_direct"):
         return True
     return any(pattern.search(normalized) for pattern in _SIMPLE_LIVE_LOOKUP_DIRECT_PATTERNS)
 
 
 def _looks_like_public_information_lookup_request(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
     has_question_shape = bool(_PUBLIC_INFORMATION_LOOKUP_QUESTION_PATTERN.search(normalized))
-    has_public_topic = _has_any(normalized, _PUBLIC_INFORMATION_LOOKUP_TOPICS)
+    has_public_topic = _META_INTENT_MATCHER.has(normalized, "public_information_lookup_topics")
     if not (has_question_shape and has_public_topic):
         return False
-    return _has_any(normalized, _PUBLIC_INFORMATION_LOOKUP_CUES) or any(
+    return _META_INTENT_MATCHER.has(normalized, "public_information_lookup_cues") or any(
         token in normalized
         for token in (
             "deutschland",
@@ -1918,26 +1968,26 @@ def _looks_like_public_information_lookup_request(text: str) -> bool:
 
 
 def _looks_like_live_travel_plan_document_request(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
     return (
-        _has_any(normalized, _LIVE_TRAVEL_LOOKUP_INTENT_HINTS)
-        and _has_any(normalized, _LIVE_TRAVEL_DISCOVERY_HINTS)
-        and _has_any(normalized, _LIVE_TRAVEL_PLAN_OUTPUT_HINTS)
+        _META_INTENT_MATCHER.has(normalized, "live_travel_lookup_intent")
+        and _META_INTENT_MATCHER.has(normalized, "live_travel_discovery")
+        and _META_INTENT_MATCHER.has(normalized, "live_travel_plan_output")
     )
 
 
 def _looks_like_local_document_analysis_request(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
     has_local_pdf_path = bool(re.search(r"(?:^|\s)(?:~|/)[^\s\"']+\.pdf(?:\b|$)", normalized))
-    return has_local_pdf_path and _has_any(normalized, _LOCAL_DOCUMENT_ANALYSIS_HINTS)
+    return has_local_pdf_path and _META_INTENT_MATCHER.has(normalized, "local_document_analysis")
 
 
 def _looks_like_email_send_request(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
     has_owner_email_reference = bool(_OWNER_EMAIL_REFERENCE_PATTERN.search(normalized))
@@ -1947,14 +1997,14 @@ def _looks_like_email_send_request(text: str) -> bool:
     if not has_mail_anchor:
         return False
     if _EMAIL_ADDRESS_PATTERN.search(normalized):
-        return _has_any(normalized, _EMAIL_SEND_ACTION_HINTS)
-    if has_owner_email_reference and _has_any(normalized, _EMAIL_CONTENT_REFERENCE_HINTS):
+        return _META_INTENT_MATCHER.has(normalized, "email_send_action")
+    if has_owner_email_reference and _META_INTENT_MATCHER.has(normalized, "email_content_reference"):
         return True
     return False
 
 
 def _looks_like_local_file_transform_request(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
 
@@ -1976,7 +2026,7 @@ def _looks_like_local_file_transform_request(text: str) -> bool:
     if not has_target_format:
         return False
 
-    if _has_any(normalized, _LOCAL_FILE_TRANSFORM_HINTS):
+    if _META_INTENT_MATCHER.has(normalized, "local_file_transform"):
         return True
     return bool(
         re.search(rf"\b(?:erstelle|erzeuge)\s+(?:eine\s+|ein\s+)?(?:{target_formats})\s+(?:aus|von)\b", normalized)
@@ -1985,7 +2035,7 @@ def _looks_like_local_file_transform_request(text: str) -> bool:
 
 
 def _looks_like_local_file_operation_request(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
 
@@ -1993,35 +2043,35 @@ def _looks_like_local_file_operation_request(text: str) -> bool:
     if not has_local_path:
         return False
 
-    return _has_any(normalized, _LOCAL_FILE_OPERATION_HINTS)
+    return _META_INTENT_MATCHER.has(normalized, "local_file_operation")
 
 
 def _looks_like_image_generation_request(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
-    if _has_any(normalized, _IMAGE_NON_GENERATION_HINTS):
+    if _META_INTENT_MATCHER.has(normalized, "image_non_generation"):
         return False
-    has_generation_action = _has_any(normalized, _IMAGE_GENERATION_ACTION_HINTS)
+    has_generation_action = _META_INTENT_MATCHER.has(normalized, "image_generation_action")
     if not has_generation_action:
         return False
     return any(pattern.search(normalized) for pattern in _IMAGE_GENERATION_OBJECT_PATTERNS)
 
 
 def _looks_like_creative_text_optimization_request(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
-    if not _has_any(normalized, _CREATIVE_TEXT_OPTIMIZATION_HINTS):
+    if not _META_INTENT_MATCHER.has(normalized, "creative_text_optimization"):
         return False
     return "prompt" in normalized or "kreativ-agent" in normalized or "creative agent" in normalized
 
 
 def _looks_like_developer_troubleshooting_request(text: str) -> bool:
-    normalized = " ".join(str(text or "").strip().lower().split())
+    normalized = normalize_intent_text(text)
     if not normalized:
         return False
-    if _has_any(normalized, _DEVELOPER_TROUBLESHOOTING_HINTS):
+    if _META_INTENT_MATCHER.has(normalized, "developer_troubleshooting"):
         return True
     has_error_anchor = any(token in normalized for token in ("fehler", "error", "exception", "traceback"))
     has_code_anchor = any(token in normalized for token in ("code", "datei", "repo", "repository", "stacktrace"))
@@ -2042,9 +2092,8 @@ def _looks_like_meta_behavior_alignment_turn(text: str) -> bool:
     normalized = re.sub(r"\s+", " ", str(text or "").strip().lower())
     if not normalized:
         return False
-    has_future_hint = any(token in normalized for token in _SEMANTIC_BEHAVIOR_ALIGNMENT_FUTURE_HINTS)
-    has_directive_hint = any(token in normalized for token in _SEMANTIC_BEHAVIOR_ALIGNMENT_DIRECTIVE_HINTS)
-    if has_future_hint and has_directive_hint:
+    hits = _META_INTENT_MATCHER.match(normalized)
+    if "behavior_alignment_future" in hits and "behavior_alignment_directive" in hits:
         return True
     if re.search(
         r"\b(?:vergiss|l[öo]sch(?:e)?|loesch(?:e)?)\b.*\b(?:letzte\s+)?(?:praeferenz|präferenz|praferenz|preference|vorgabe|regel)\b",
@@ -2070,7 +2119,7 @@ def _site_kind(text: str) -> str | None:
     if (
         "google maps" in text
         or "landkarte" in text
-        or _has_any(text, _LOCAL_SEARCH_HINTS)
+        or _META_INTENT_MATCHER.has(text, "local_search")
         or is_location_local_query(text)
         or is_location_route_query(text)
     ):
@@ -2101,11 +2150,12 @@ def _derive_semantic_review_payload(
 ) -> Dict[str, Any]:
     hints: List[str] = []
 
-    if _has_any(text, _SEMANTIC_PERSONAL_PREFERENCE_HINTS) and _has_any(text, _SEMANTIC_WEALTH_HINTS):
+    hits = _META_INTENT_MATCHER.match(text)
+    if "semantic_personal_preference" in hits and "semantic_wealth" in hits:
         hints.append("mixed_personal_preference_and_wealth_strategy")
 
     if (
-        _has_any(text, _SEMANTIC_BUSINESS_STRATEGY_HINTS)
+        "semantic_business_strategy" in hits
         and any(token in text for token in ("cafe", "cafes", "cafés", "restaurant", "bar"))
         and (has_local_search or has_simple_live_lookup)
     ):
@@ -2113,7 +2163,7 @@ def _derive_semantic_review_payload(
 
     if (
         "standort" in text
-        and _has_any(text, _SEMANTIC_LOCATION_STATE_UPDATE_HINTS)
+        and "semantic_location_state_update" in hits
     ):
         hints.append("user_reported_location_state_update")
 
@@ -2215,18 +2265,23 @@ def _apply_turn_understanding_override(
     }
 
 
-def _extract_meta_followup_field(raw: str, field_name: str) -> str:
-    source = str(raw or "")
-    key = str(field_name or "").strip()
-    if not source or not key:
-        return ""
+@lru_cache(maxsize=64)
+def _meta_followup_field_pattern(key: str) -> "re.Pattern[str]":
     other_fields = [name for name in _FOLLOWUP_CONTEXT_FIELD_NAMES if name != key]
     boundary = "|".join(re.escape(name) for name in other_fields)
     pattern = (
         rf"(?:^|\n|\s){re.escape(key)}:\s*(.*?)"
         rf"(?=(?:\n\s*(?:{boundary})\s*:)|(?:\s(?:{boundary})\s*:)|(?:\n?\s*#\s*CURRENT USER QUERY\b)|$)"
     )
-    match = re.search(pattern, source, flags=re.IGNORECASE | re.DOTALL)
+    return re.compile(pattern, re.IGNORECASE | re.DOTALL)
+
+
+def _extract_meta_followup_field(raw: str, field_name: str) -> str:
+    source = str(raw or "")
+    key = str(field_name or "").strip()
+    if not source or not key:
+        return ""
+    match = _meta_followup_field_pattern(key).search(source)
     if not match:
         return ""
     value = str(match.group(1) or "").strip()
@@ -2303,7 +2358,7 @@ def _looks_like_compressed_meta_followup(text: str) -> bool:
         return False
     has_compact_separator = any(sep in cleaned for sep in (",", ";", "/", "|"))
     has_constraint = bool(_extract_meta_constraints_from_text(cleaned))
-    has_hint = any(hint in lowered for hint in _META_COMPRESSED_FOLLOWUP_HINTS)
+    has_hint = _META_INTENT_MATCHER.has(lowered, "compressed_followup")
     return (has_compact_separator or has_constraint) and has_hint
 
 
@@ -2508,7 +2563,7 @@ def _is_context_dependent_meta_query(
         "auth_response",
     }:
         return True
-    if any(marker in lowered for marker in _META_CONTEXT_DEPENDENT_MARKERS):
+    if _META_INTENT_MATCHER.has(lowered, "context_dependent"):
         return True
 
     terms = _tokenize_meta_context_terms(lowered)
@@ -3814,9 +3869,10 @@ def _should_apply_meta_context_anchor(current_query: str, context_anchor: str) -
         return False
     if len(text.split()) > 18:
         return False
-    if any(hint in text for hint in _CONTEXT_ANCHORED_FOLLOWUP_HINTS):
+    hits = _META_INTENT_MATCHER.match(text)
+    if "context_anchored_followup" in hits:
         return True
-    has_reference_token = any(token in text for token in _CONTEXT_ANCHORED_REFERENCE_TOKENS)
+    has_reference_token = "context_anchored_reference" in hits
     asks_for_guidance = any(
         token in text for token in ("wie ", "womit ", "was ", "kannst du ", "hilf", "helfen", "behilflich")
     )
@@ -3909,27 +3965,28 @@ def classify_meta_task(
             normalized_source += f"\nconstraints: {' | '.join(dialog_constraints)}"
     normalized = normalized_source.lower()
     current_normalized = effective_query.lower()
+    intent_hits = _META_INTENT_MATCHER.match(current_normalized)
     site_kind = _site_kind(current_normalized)
     has_route_request = site_kind == "maps" and is_location_route_query(current_normalized)
-    has_browser = _has_any(current_normalized, _BROWSER_HINTS)
+    has_browser = "browser" in intent_hits
     has_summary_request = ("fasse" in current_normalized and "zusammen" in current_normalized) or "wichtigsten punkte" in current_normalized
-    has_extraction = _has_any(current_normalized, _EXTRACTION_HINTS) or has_summary_request
-    has_no_research_instruction = _has_any(current_normalized, _NO_RESEARCH_HINTS)
-    has_broad_research = _has_any(current_normalized, _BROAD_RESEARCH_HINTS) and not has_no_research_instruction
-    has_strict_research = _has_any(current_normalized, _STRICT_RESEARCH_HINTS) and not has_no_research_instruction
-    has_claim_check = _has_any(current_normalized, _CLAIM_CHECK_HINTS) and not has_no_research_instruction
-    has_legal_policy_research = _has_any(current_normalized, _LEGAL_POLICY_RESEARCH_HINTS)
+    has_extraction = "extraction" in intent_hits or has_summary_request
+    has_no_research_instruction = "no_research" in intent_hits
+    has_broad_research = "broad_research" in intent_hits and not has_no_research_instruction
+    has_strict_research = "strict_research" in intent_hits and not has_no_research_instruction
+    has_claim_check = "claim_check" in intent_hits and not has_no_research_instruction
+    has_legal_policy_research = "legal_policy_research" in intent_hits
     if has_claim_check and has_legal_policy_research:
         has_strict_research = True
-    has_hard_research = _has_any(current_normalized, _HARD_RESEARCH_HINTS) and not has_no_research_instruction
-    has_youtube_light = site_kind == "youtube" and _has_any(current_normalized, _YOUTUBE_LIGHT_HINTS)
+    has_hard_research = "hard_research" in intent_hits and not has_no_research_instruction
+    has_youtube_light = site_kind == "youtube" and "youtube_light" in intent_hits
     has_direct_youtube_url = site_kind == "youtube" and _has_direct_youtube_url(current_normalized)
     has_youtube_fact_check = site_kind == "youtube" and (
-        _has_any(current_normalized, _YOUTUBE_FACT_CHECK_HINTS)
+        "youtube_fact_check" in intent_hits
         or (has_direct_youtube_url and has_strict_research)
     )
     has_local_search = site_kind == "maps" and (
-        _has_any(current_normalized, _LOCAL_SEARCH_HINTS) or is_location_local_query(current_normalized)
+        "local_search" in intent_hits or is_location_local_query(current_normalized)
     ) and not has_route_request
     has_live_travel_plan_document = _looks_like_live_travel_plan_document_request(current_normalized)
     has_simple_live_lookup = (
@@ -3938,7 +3995,7 @@ def classify_meta_task(
             or _looks_like_public_information_lookup_request(current_normalized)
             or has_live_travel_plan_document
             or (
-                _has_any(current_normalized, _SIMPLE_LIVE_LOOKUP_FRESHNESS_HINTS)
+                "simple_live_lookup_freshness" in intent_hits
                 and any(
                     marker in current_normalized
                     for marker in (
@@ -3967,16 +4024,16 @@ def classify_meta_task(
         and not has_local_search
         and site_kind not in {"youtube", "booking", "x", "linkedin", "outlook", "github_login"}
     )
-    has_document = _has_any(current_normalized, _DOCUMENT_HINTS) or has_live_travel_plan_document
+    has_document = "document" in intent_hits or has_live_travel_plan_document
     has_local_file_transform = False
     has_local_document_analysis = False
     has_local_file_operation = False
     has_image_generation = _looks_like_image_generation_request(current_normalized)
     has_creative_text_optimization = _looks_like_creative_text_optimization_request(current_normalized)
     has_developer_troubleshooting = _looks_like_developer_troubleshooting_request(current_normalized)
-    has_delivery = _has_any(current_normalized, _DELIVERY_HINTS)
+    has_delivery = "delivery" in intent_hits
     has_email_send = _looks_like_email_send_request(current_normalized)
-    has_system = _has_any(current_normalized, _SYSTEM_HINTS)
+    has_system = "system" in intent_hits
     has_login = any(token in current_normalized for token in ("login", "log in", "sign in", "anmelden", "einloggen"))
     has_multistep_browser = has_browser and (
         action_count >= 2
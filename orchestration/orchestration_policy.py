@@ -259,25 +259,109 @@ def evaluate_query_orchestration(query: str) -> Dict[str, Any]:
     }
 
 
+def _declared_dependencies(task: Dict[str, Any]) -> List[str]:
+    raw = (task or {}).get("depends_on")
+    if raw is None:
+        return []
+    if isinstance(raw, str):
+        raw = [raw]
+    if not isinstance(raw, (list, tuple)):
+        return []
+    deps: List[str] = []
+    for item in raw:
+        dep = str(item or "").strip()
+        if dep and dep not in deps:
+            deps.append(dep)
+    return deps
+
+
+def build_task_dependency_graph(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Validiert deklarierte depends_on-Kanten und bildet Ausfuehrungsstufen.
+
+    Stufe n enthaelt alle Tasks, deren laengste Abhaengigkeitskette n lang ist —
+    die Anzahl Stufen ist damit die Laenge des kritischen Pfads.
+    """
+    safe_tasks = tasks or []
+    task_ids = [
+        str((task or {}).get("task_id") or f"task-{idx}")
+        for idx, task in enumerate(safe_tasks, start=1)
+    ]
+    dependencies = {
+        task_id: _declared_dependencies(task)
+        for task_id, task in zip(task_ids, safe_tasks)
+    }
+    graph: Dict[str, Any] = {
+        "task_ids": task_ids,
+        "dependencies": dependencies,
+        "has_dependencies": any(dependencies.values()),
+        "stages": [],
+        "error": "",
+        "invalid_task_ids": [],
+    }
+    if not graph["has_dependencies"]:
+        graph["stages"] = [list(task_ids)] if task_ids else []
+        return graph
+
+    duplicates = sorted({task_id for task_id in task_ids if task_ids.count(task_id) > 1})
+    if duplicates:
+        graph.update(error="duplicate_task_id", invalid_task_ids=duplicates)
+        return graph
+
+    known = set(task_ids)
+    invalid = [
+        task_id
+        for task_id, deps in dependencies.items()
+        if any(dep not in known or dep == task_id for dep in deps)
+    ]
+    if invalid:
+        graph.update(error="unknown_dependency", invalid_task_ids=invalid)
+        return graph
+
+    remaining = dict(dependencies)
+    done: set[str] = set()
+    stages: List[List[str]] = []
+    while remaining:
+        ready = [task_id for task_id, deps in remaining.items() if all(dep in done for dep in deps)]
+        if not ready:
+            graph.update(error="dependency_cycle", invalid_task_ids=list(remaining))
+            return graph
+        stages.append(ready)
+        done.update(ready)
+        for task_id in ready:
+            remaining.pop(task_id)
+    graph["stages"] = stages
+    return graph
+
+
 def evaluate_parallel_tasks(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
     dependent_task_ids: List[str] = []
     reasons: List[str] = []
     safe_tasks = tasks or []
-    if len(safe_tasks) < 2:
+    graph = build_task_dependency_graph(safe_tasks)
+    if len(safe_tasks) < 2 and not graph["has_dependencies"]:
         return {
             "allowed": True,
             "policy_state": "allowed",
             "reason": "single_task",
             "dependent_task_ids": [],
-            "independent_task_ids": [
-                str((task or {}).get("task_id") or f"task-{idx}")
-                for idx, task in enumerate(safe_tasks, start=1)
-            ],
+            "independent_task_ids": list(graph["task_ids"]),
+        }
+
+    if graph["error"]:
+        return {
+            "allowed": False,
+            "policy_state": "blocked",
+            "reason": graph["error"],
+            "dependent_task_ids": list(graph["invalid_task_ids"]),
+            "independent_task_ids": [],
         }
 
-    for idx, task in enumerate(safe_tasks, start=1):
+    # Deklarierte Abhaengigkeiten fuehrt der DAG-Scheduler aus. Nur implizite,
+    # im Text versteckte Abhaengigkeiten ohne depends_on bleiben blockiert.
+    for task_id, task in zip(graph["task_ids"], safe_tasks):
+        if graph["dependencies"].get(task_id):
+            continue
         text = str((task or {}).get("task", "")).strip().lower()
-        task_id = str((task or {}).get("task_id") or f"task-{idx}")
         if any(token in text for token in _WORKFLOW_CONNECTORS):
             dependent_task_ids.append(task_id)
             reasons.append("workflow_connector")
@@ -290,16 +374,29 @@ def evaluate_parallel_tasks(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
             dependent_task_ids.append(task_id)
             reasons.append("explicit_dependency")
 
-    independent_task_ids = [
-        str((task or {}).get("task_id") or f"task-{idx}")
-        for idx, task in enumerate(safe_tasks, start=1)
-        if str((task or {}).get("task_id") or f"task-{idx}") not in dependent_task_ids
-    ]
-    allowed = not dependent_task_ids
-    return {
-        "allowed": allowed,
-        "policy_state": "allowed" if allowed else "blocked",
-        "reason": "independent_tasks" if allowed else reasons[0],
-        "dependent_task_ids": dependent_task_ids,
-        "independent_task_ids": independent_task_ids,
+    if dependent_task_ids:
+        return {
+            "allowed": False,
+            "policy_state": "blocked",
+            "reason": reasons[0],
+            "dependent_task_ids": dependent_task_ids,
+            "independent_task_ids": [
+                task_id for task_id in graph["task_ids"] if task_id not in dependent_task_ids
+            ],
+        }
+
+    declared = [task_id for task_id in graph["task_ids"] if graph["dependencies"].get(task_id)]
+    decision = {
+        "allowed": True,
+        "policy_state": "allowed",
+        "reason": "dependency_graph" if declared else "independent_tasks",
+        "dependent_task_ids": declared,
+        "independent_task_ids": [task_id for task_id in graph["task_ids"] if task_id not in declared],
     }
+    if declared:
+        decision["dependency_graph"] = {
+            task_id: deps for task_id, deps in graph["dependencies"].items() if deps
+        }
+        decision["execution_stages"] = graph["stages"]
+        decision["critical_path_length"] = len(graph["stages"])
+    return decision
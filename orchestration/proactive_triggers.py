@@ -136,10 +136,14 @@ class ProactiveTriggerEngine:
     # Auslösen
     # ------------------------------------------------------------------
 
-    def check_and_fire(self) -> List[str]:
+    def check_and_fire(self, loop=None) -> List[str]:
         """
         Prüft alle Trigger und löst fällige aus.
 
+        Args:
+            loop: Laufender Event-Loop des Aufrufers — nötig, wenn aus einem
+                  Worker-Thread (Heartbeat-Stufe) aufgerufen wird.
+
         Returns:
             Liste der ausgelösten Trigger-IDs
         """
@@ -179,19 +183,12 @@ class ProactiveTriggerEngine:
 
             log.info("⏰ Trigger '%s' ausgelöst → %s", t.name, t.target_agent)
 
-            # Telegram-Benachrichtigung (Event-Loop-sicheres Pattern)
+            # Telegram-Benachrichtigung (auch aus Heartbeat-Worker-Threads)
             try:
-                import asyncio
-                from utils.telegram_notify import send_telegram
+                from utils.telegram_notify import schedule_telegram
 
                 msg = f"⏰ *Trigger '{t.name}' ausgelöst*\n→ Agent: `{t.target_agent}`"
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.ensure_future(send_telegram(msg))
-                else:
-                    loop.run_until_complete(send_telegram(msg))
-            except RuntimeError:
-                pass
+                schedule_telegram(msg, loop=loop)
             except Exception:
                 pass
 
@@ -610,22 +610,21 @@ class SelfHardeningEngine:
             log.warning("Härtungs-Task erstellen fehlgeschlagen: %s", e)
             return None
 
-    def _notify_telegram(self, proposal: HardeningProposal) -> None:
+    def _notify_telegram(self, proposal: HardeningProposal, loop=None) -> None:
         try:
-            import asyncio
-            from utils.telegram_notify import send_telegram
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.ensure_future(send_telegram(proposal.as_telegram_msg()))
-            else:
-                loop.run_until_complete(send_telegram(proposal.as_telegram_msg()))
+            from utils.telegram_notify import schedule_telegram
+
+            schedule_telegram(proposal.as_telegram_msg(), loop=loop)
         except Exception as e:
             log.debug("Telegram-Notify fehlgeschlagen: %s", e)
 
-    def run_cycle(self) -> Dict:
+    def run_cycle(self, loop=None) -> Dict:
         """
         Haupt-Analysezyklus: Logs lesen → Patterns matchen → Proposals erzeugen.
         Gibt Zusammenfassung zurück.
+
+        loop: Laufender Event-Loop des Aufrufers — die Heartbeat-Stufe läuft in
+        einem Worker-Thread und plant Telegram-Pushes darauf ein.
         """
         log_lines = self._read_journal()
         bb_lines = self._read_blackboard_incidents()
@@ -694,7 +693,7 @@ class SelfHardeningEngine:
             self._write_to_blackboard(proposal)
             goal_id = self._create_hardening_goal(proposal)
             self._create_hardening_task(proposal, goal_id=goal_id)
-            self._notify_telegram(proposal)
+            self._notify_telegram(proposal, loop=loop)
             self._known_proposals[proposal.pattern_name] = proposal.created_at
             new_count += 1
 
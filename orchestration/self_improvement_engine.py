@@ -13,6 +13,8 @@ import json
 import logging
 import os
 import sqlite3
+import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -41,6 +43,13 @@ _SUGGESTION_RETENTION_DAYS = max(
     1,
     int(os.getenv("SELF_IMPROVEMENT_SUGGESTION_RETENTION_DAYS", "30") or 30),
 )
+_LLM_LEDGER_RECONCILE_SECONDS = max(
+    10,
+    int(os.getenv("TIMUS_LLM_LEDGER_RECONCILE_SECONDS", "300") or 300),
+)
+# Ledger-Buckets sind 10-Minuten-Fenster: Praefix "YYYY-MM-DDTHH:M" des
+# ISO-Zeitstempels, damit SQLite und Python identisch gruppieren.
+_LLM_LEDGER_BUCKET_CHARS = 15
 _KNOWN_PRODUCTION_AGENTS = frozenset(
     {
         "executor",
@@ -119,7 +128,11 @@ CREATE TABLE IF NOT EXISTS llm_usage_analytics (
     cost_usd REAL NOT NULL DEFAULT 0,
     latency_ms INTEGER NOT NULL DEFAULT 0,
     success INTEGER NOT NULL DEFAULT 1,
-    timestamp TEXT NOT NULL
+    timestamp TEXT NOT NULL,
+    ttft_ms INTEGER NOT NULL DEFAULT 0,
+    time_to_action_ms INTEGER NOT NULL DEFAULT 0,
+    usage_estimated INTEGER NOT NULL DEFAULT 0,
+    cache_write_tokens INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE INDEX IF NOT EXISTS idx_llm_usage_session
@@ -184,6 +197,16 @@ def _migrate_self_improvement_schema(conn: sqlite3.Connection) -> None:
            WHERE source IS NULL OR source = ''"""
     )
 
+    llm_usage_columns = _table_columns(conn, "llm_usage_analytics")
+    if "ttft_ms" not in llm_usage_columns:
+        conn.execute("ALTER TABLE llm_usage_analytics ADD COLUMN ttft_ms INTEGER NOT NULL DEFAULT 0")
+    if "time_to_action_ms" not in llm_usage_columns:
+        conn.execute("ALTER TABLE llm_usage_analytics ADD COLUMN time_to_action_ms INTEGER NOT NULL DEFAULT 0")
+    if "usage_estimated" not in llm_usage_columns:
+        conn.execute("ALTER TABLE llm_usage_analytics ADD COLUMN usage_estimated INTEGER NOT NULL DEFAULT 0")
+    if "cache_write_tokens" not in llm_usage_columns:
+        conn.execute("ALTER TABLE llm_usage_analytics ADD COLUMN cache_write_tokens INTEGER NOT NULL DEFAULT 0")
+
 
 # ──────────────────────────────────────────────────────────────────
 # Dataclasses
@@ -234,7 +257,14 @@ class LLMUsageRecord:
     cost_usd: float = 0.0
     latency_ms: int = 0
     success: bool = True
+    # Cache-Writes (Anthropic cache_creation) — getrennt von Cache-Treffern
+    cache_write_tokens: int = 0
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+    # Nur bei Streaming-Calls gesetzt (0 = nicht gemessen)
+    ttft_ms: int = 0
+    time_to_action_ms: int = 0
+    # Token-Zahlen geschaetzt (Stream ohne Usage-Chunk, z.B. Early-Stop)
+    usage_estimated: bool = False
 
 
 @dataclass
@@ -251,6 +281,163 @@ class ConversationRecallRecord:
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
 
 
+# ──────────────────────────────────────────────────────────────────
+# LLM-Spend-Ledger
+# ──────────────────────────────────────────────────────────────────
+
+class LLMSpendLedger:
+    """
+    Rollierendes In-Memory-Kostenbuch fuer Budget-Entscheidungen.
+
+    Kosten werden beim Schreiben in 10-Minuten-Buckets pro Scope
+    (global / agent / session) aufsummiert. Budget-Abfragen summieren nur
+    die Buckets im Fenster statt llm_usage_analytics zu scannen. SQLite
+    bleibt die Quelle der Wahrheit: beim Start und periodisch wird das
+    Ledger aus der Tabelle neu aufgebaut (auch um Writes anderer Prozesse
+    zu uebernehmen).
+
+    Der Rebuild laeuft komplett unter dem Ledger-Lock und merkt sich die
+    hoechste gelesene Zeilen-ID. ``record()`` bekommt die ID der eben
+    geschriebenen Zeile: Buchungen, die der Rebuild schon gelesen hat,
+    werden nicht doppelt gezaehlt, spaetere gehen beim Tausch nicht verloren.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        *,
+        reconcile_interval_seconds: float = _LLM_LEDGER_RECONCILE_SECONDS,
+    ):
+        self.db_path = db_path
+        self.reconcile_interval_seconds = float(reconcile_interval_seconds)
+        self._lock = threading.Lock()
+        self._buckets: Dict[tuple[str, str], Dict[str, float]] = {}
+        self._horizon_days = 1
+        self._last_reconcile_monotonic: Optional[float] = None
+        self._reconcile_count = 0
+        self._reconciled_row_id = 0
+        self._estimated_records = 0
+
+    @staticmethod
+    def _bucket_key(timestamp: str) -> str:
+        return str(timestamp or "")[:_LLM_LEDGER_BUCKET_CHARS]
+
+    @staticmethod
+    def _scope_keys(agent: str, session_id: str) -> List[tuple[str, str]]:
+        keys = [("global", "")]
+        if agent:
+            keys.append(("agent", agent))
+        if session_id:
+            keys.append(("session", session_id))
+        return keys
+
+    def record(
+        self,
+        *,
+        agent: str,
+        session_id: str,
+        cost_usd: float,
+        timestamp: str,
+        estimated: bool = False,
+        row_id: Optional[int] = None,
+    ) -> None:
+        """Bucht Kosten; geschaetzte Kosten zaehlen fuers Budget konservativ mit.
+
+        ``row_id`` ist die ID der zugehoerigen llm_usage_analytics-Zeile
+        (None = nicht persistiert, wird immer gebucht).
+        """
+        cost = max(float(cost_usd or 0.0), 0.0)
+        if cost <= 0.0:
+            return
+        bucket = self._bucket_key(timestamp or datetime.now().isoformat())
+        with self._lock:
+            if estimated:
+                self._estimated_records += 1
+            if row_id is not None and int(row_id) <= self._reconciled_row_id:
+                return  # steckt schon im letzten Rebuild
+            for key in self._scope_keys(str(agent or ""), str(session_id or "")):
+                per_scope = self._buckets.setdefault(key, {})
+                per_scope[bucket] = per_scope.get(bucket, 0.0) + cost
+
+    def reconcile(self, *, days: Optional[int] = None) -> None:
+        """Baut das Ledger aus llm_usage_analytics neu auf."""
+        horizon = max(1, min(90, int(days or self._horizon_days)))
+        cutoff = (datetime.now() - timedelta(days=horizon)).isoformat()
+        rebuilt: Dict[tuple[str, str], Dict[str, float]] = {}
+        # Lock ueber Lesen + Tausch: parallele record()-Aufrufe warten und
+        # landen danach im neuen Stand statt vom Tausch ueberschrieben zu werden;
+        # bereits gelesene Zeilen filtert record() ueber _reconciled_row_id.
+        with self._lock:
+            try:
+                with sqlite3.connect(str(self.db_path)) as conn:
+                    max_row_id = int(conn.execute("SELECT COALESCE(MAX(id), 0) FROM llm_usage_analytics").fetchone()[0])
+                    rows = conn.execute(
+                        """SELECT agent, session_id, substr(timestamp, 1, ?) AS bucket,
+                                  SUM(cost_usd)
+                           FROM llm_usage_analytics
+                           WHERE timestamp >= ? AND id <= ?
+                           GROUP BY agent, session_id, bucket""",
+                        (_LLM_LEDGER_BUCKET_CHARS, cutoff, max_row_id),
+                    ).fetchall()
+            except Exception as e:
+                log.debug("LLMSpendLedger.reconcile: %s", e)
+                return
+            for agent, session_id, bucket, cost in rows:
+                amount = float(cost or 0.0)
+                if amount <= 0.0:
+                    continue
+                for key in self._scope_keys(str(agent or ""), str(session_id or "")):
+                    per_scope = rebuilt.setdefault(key, {})
+                    per_scope[bucket] = per_scope.get(bucket, 0.0) + amount
+            self._buckets = rebuilt
+            self._reconciled_row_id = max_row_id
+            self._horizon_days = max(self._horizon_days, horizon)
+            self._last_reconcile_monotonic = time.monotonic()
+            self._reconcile_count += 1
+
+    def _needs_reconcile(self, days: int) -> bool:
+        if self._last_reconcile_monotonic is None or days > self._horizon_days:
+            return True
+        return (time.monotonic() - self._last_reconcile_monotonic) >= self.reconcile_interval_seconds
+
+    def total_cost(self, *, days: int, agent: str = "", session_id: str = "") -> float:
+        safe_days = max(1, min(90, int(days)))
+        if self._needs_reconcile(safe_days):
+            self.reconcile(days=safe_days)
+        if session_id:
+            key = ("session", str(session_id))
+        elif agent:
+            key = ("agent", str(agent))
+        else:
+            key = ("global", "")
+        # Der angeschnittene Bucket an der Fenstergrenze zaehlt voll mit:
+        # konservativ fuer Budget-Entscheidungen.
+        cutoff = self._bucket_key((datetime.now() - timedelta(days=safe_days)).isoformat())
+        with self._lock:
+            per_scope = self._buckets.get(key) or {}
+            return round(sum(cost for bucket, cost in per_scope.items() if bucket >= cutoff), 6)
+
+    def prune(self) -> None:
+        cutoff = self._bucket_key((datetime.now() - timedelta(days=self._horizon_days)).isoformat())
+        with self._lock:
+            for key in list(self._buckets):
+                per_scope = self._buckets[key]
+                for bucket in [b for b in per_scope if b < cutoff]:
+                    del per_scope[bucket]
+                if not per_scope:
+                    del self._buckets[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "scopes": len(self._buckets),
+                "buckets": sum(len(v) for v in self._buckets.values()),
+                "horizon_days": self._horizon_days,
+                "reconcile_count": self._reconcile_count,
+                "estimated_records": self._estimated_records,
+            }
+
+
 # ──────────────────────────────────────────────────────────────────
 # SelfImprovementEngine
 # ──────────────────────────────────────────────────────────────────
@@ -266,6 +453,8 @@ class SelfImprovementEngine:
         self._last_analysis: Optional[datetime] = None
         self._last_housekeeping: Optional[datetime] = None
         self.run_housekeeping(force=True)
+        self.llm_spend_ledger = LLMSpendLedger(db_path)
+        self.llm_spend_ledger.reconcile()
 
     # ------------------------------------------------------------------
     # Aufzeichnung
@@ -349,6 +538,9 @@ class SelfImprovementEngine:
             }
 
         self._last_housekeeping = now
+        ledger = getattr(self, "llm_spend_ledger", None)
+        if ledger is not None:
+            ledger.prune()
         return {
             "skipped": False,
             "retention_days": _ANALYTICS_RETENTION_DAYS,
@@ -416,13 +608,15 @@ class SelfImprovementEngine:
 
     def record_llm_usage(self, record: LLMUsageRecord) -> None:
         """Speichert LLM-Nutzung fuer Kosten-/Token-Analysen."""
+        row_id: Optional[int] = None
         try:
             with sqlite3.connect(str(self.db_path)) as conn:
-                conn.execute(
+                cursor = conn.execute(
                     """INSERT INTO llm_usage_analytics
                        (trace_id, session_id, agent, provider, model, input_tokens,
-                        output_tokens, cached_tokens, cost_usd, latency_ms, success, timestamp)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                        output_tokens, cached_tokens, cost_usd, latency_ms, success, timestamp,
+                        ttft_ms, time_to_action_ms, usage_estimated, cache_write_tokens)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                     (
                         record.trace_id,
                         record.session_id,
@@ -436,11 +630,26 @@ class SelfImprovementEngine:
                         max(int(record.latency_ms or 0), 0),
                         int(record.success),
                         record.timestamp,
+                        max(int(record.ttft_ms or 0), 0),
+                        max(int(record.time_to_action_ms or 0), 0),
+                        int(bool(record.usage_estimated)),
+                        max(int(record.cache_write_tokens or 0), 0),
                     ),
                 )
                 conn.commit()
+                row_id = cursor.lastrowid
         except Exception as e:
             log.debug("record_llm_usage: %s", e)
+        # Erst nach dem Commit buchen: ein Reconcile sieht die Zeile dann
+        # entweder (row_id <= Rebuild-Stand) oder das Ledger bucht sie selbst.
+        self.llm_spend_ledger.record(
+            agent=record.agent,
+            session_id=record.session_id,
+            cost_usd=record.cost_usd,
+            timestamp=record.timestamp,
+            estimated=record.usage_estimated,
+            row_id=row_id,
+        )
 
     def record_conversation_recall(self, record: ConversationRecallRecord) -> None:
         """Speichert Recall-Telemetrie für Folge- und Rückfragen."""
@@ -774,6 +983,20 @@ class SelfImprovementEngine:
                 "analysis_days": days,
             }
 
+    def get_llm_spend(
+        self,
+        *,
+        days: int = 1,
+        session_id: Optional[str] = None,
+        agent: Optional[str] = None,
+    ) -> float:
+        """Kosten im Fenster aus dem In-Memory-Ledger (Budget-Hotpath)."""
+        return self.llm_spend_ledger.total_cost(
+            days=days,
+            agent=agent or "",
+            session_id=session_id or "",
+        )
+
     def get_llm_usage_summary(
         self,
         *,
@@ -796,7 +1019,9 @@ class SelfImprovementEngine:
                            SUM(output_tokens) as output_tokens,
                            SUM(cached_tokens) as cached_tokens,
                            SUM(cost_usd) as total_cost_usd,
-                           AVG(latency_ms) as avg_latency_ms
+                           AVG(latency_ms) as avg_latency_ms,
+                           AVG(NULLIF(ttft_ms, 0)) as avg_ttft_ms,
+                           AVG(NULLIF(time_to_action_ms, 0)) as avg_time_to_action_ms
                     FROM llm_usage_analytics
                     WHERE timestamp >= ? AND session_id = ? AND agent = ?
                 """
@@ -834,7 +1059,9 @@ class SelfImprovementEngine:
                            SUM(output_tokens) as output_tokens,
                            SUM(cached_tokens) as cached_tokens,
                            SUM(cost_usd) as total_cost_usd,
-                           AVG(latency_ms) as avg_latency_ms
+                           AVG(latency_ms) as avg_latency_ms,
+                           AVG(NULLIF(ttft_ms, 0)) as avg_ttft_ms,
+                           AVG(NULLIF(time_to_action_ms, 0)) as avg_time_to_action_ms
                     FROM llm_usage_analytics
                     WHERE timestamp >= ? AND session_id = ?
                 """
@@ -872,7 +1099,9 @@ class SelfImprovementEngine:
                            SUM(output_tokens) as output_tokens,
                            SUM(cached_tokens) as cached_tokens,
                            SUM(cost_usd) as total_cost_usd,
-                           AVG(latency_ms) as avg_latency_ms
+                           AVG(latency_ms) as avg_latency_ms,
+                           AVG(NULLIF(ttft_ms, 0)) as avg_ttft_ms,
+                           AVG(NULLIF(time_to_action_ms, 0)) as avg_time_to_action_ms
                     FROM llm_usage_analytics
                     WHERE timestamp >= ? AND agent = ?
                 """
@@ -910,7 +1139,9 @@ class SelfImprovementEngine:
                            SUM(output_tokens) as output_tokens,
                            SUM(cached_tokens) as cached_tokens,
                            SUM(cost_usd) as total_cost_usd,
-                           AVG(latency_ms) as avg_latency_ms
+                           AVG(latency_ms) as avg_latency_ms,
+                           AVG(NULLIF(ttft_ms, 0)) as avg_ttft_ms,
+                           AVG(NULLIF(time_to_action_ms, 0)) as avg_time_to_action_ms
                     FROM llm_usage_analytics
                     WHERE timestamp >= ?
                 """
@@ -965,6 +1196,8 @@ class SelfImprovementEngine:
                 "cached_tokens": int((totals[4] if totals else 0) or 0),
                 "total_cost_usd": round(float((totals[5] if totals else 0.0) or 0.0), 6),
                 "avg_latency_ms": round(float((totals[6] if totals else 0.0) or 0.0), 1),
+                "avg_ttft_ms": round(float((totals[7] if totals else 0.0) or 0.0), 1),
+                "avg_time_to_action_ms": round(float((totals[8] if totals else 0.0) or 0.0), 1),
                 "top_agents": [
                     {
                         "agent": row[0],
@@ -1026,11 +1259,139 @@ class SelfImprovementEngine:
                 "cached_tokens": 0,
                 "total_cost_usd": 0.0,
                 "avg_latency_ms": 0.0,
+                "avg_ttft_ms": 0.0,
+                "avg_time_to_action_ms": 0.0,
                 "top_agents": [],
                 "top_models": [],
                 "top_providers": [],
             }
 
+    def get_prompt_cache_report(
+        self,
+        *,
+        days: int = 7,
+        agent: Optional[str] = None,
+        limit: int = 10,
+    ) -> dict:
+        """Prompt-Cache-Trefferquote und eingesparte Input-Tokens je Agent.
+
+        Anthropic zaehlt gecachte Tokens nicht in input_tokens, alle
+        OpenAI-kompatiblen Provider schon — der Prompt-Umfang wird daher je
+        Provider normalisiert. Nur Cache-Reads zaehlen als Treffer; Cache-Writes
+        (``cache_write_tokens``) kosten einen Aufpreis, der von
+        ``saved_cost_usd`` abgezogen wird. Calls mit geschaetzter Usage kennen
+        keine gecachten Tokens und bleiben aussen vor (``estimated_requests_excluded``).
+        """
+        from agent.providers import ModelProvider
+        from utils.llm_usage import estimate_cache_savings_usd, estimate_cache_write_premium_usd
+
+        safe_days = max(1, min(90, int(days)))
+        safe_limit = max(1, min(50, int(limit)))
+        empty = {
+            "analysis_days": safe_days,
+            "agent_filter": agent or "",
+            "requests": 0,
+            "cached_requests": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "cache_write_tokens": 0,
+            "saved_tokens": 0,
+            "cache_write_premium_usd": 0.0,
+            "saved_cost_usd": 0.0,
+            "hit_ratio": 0.0,
+            "estimated_requests_excluded": 0,
+            "agents": [],
+        }
+        try:
+            cutoff = (datetime.now() - timedelta(days=safe_days)).isoformat()
+            sql = """
+                SELECT agent, provider, model,
+                       COUNT(*) as requests,
+                       SUM(CASE WHEN cached_tokens > 0 THEN 1 ELSE 0 END) as cached_requests,
+                       SUM(CASE WHEN provider = 'anthropic'
+                                THEN input_tokens + cached_tokens + cache_write_tokens
+                                ELSE input_tokens END) as prompt_tokens,
+                       SUM(cached_tokens) as cached_tokens,
+                       SUM(cache_write_tokens) as cache_write_tokens
+                FROM llm_usage_analytics
+                WHERE timestamp >= ? AND usage_estimated = 0
+            """
+            estimated_sql = """
+                SELECT COUNT(*) FROM llm_usage_analytics
+                WHERE timestamp >= ? AND usage_estimated = 1
+            """
+            params: List[Any] = [cutoff]
+            if agent:
+                sql += " AND agent = ?"
+                estimated_sql += " AND agent = ?"
+                params.append(agent)
+            sql += " GROUP BY agent, provider, model"
+            with sqlite3.connect(str(self.db_path)) as conn:
+                rows = conn.execute(sql, params).fetchall()
+                estimated_requests = int(conn.execute(estimated_sql, params).fetchone()[0] or 0)
+        except Exception as e:
+            log.debug("get_prompt_cache_report: %s", e)
+            return empty
+
+        by_agent: Dict[str, Dict[str, Any]] = {}
+        for agent_name, provider, model, requests, cached_requests, prompt_tokens, cached_tokens, write_tokens in rows:
+            entry = by_agent.setdefault(
+                agent_name,
+                {
+                    "agent": agent_name,
+                    "requests": 0,
+                    "cached_requests": 0,
+                    "prompt_tokens": 0,
+                    "cached_tokens": 0,
+                    "cache_write_tokens": 0,
+                    "cache_write_premium_usd": 0.0,
+                    "saved_cost_usd": 0.0,
+                },
+            )
+            entry["requests"] += int(requests or 0)
+            entry["cached_requests"] += int(cached_requests or 0)
+            entry["prompt_tokens"] += int(prompt_tokens or 0)
+            entry["cached_tokens"] += int(cached_tokens or 0)
+            entry["cache_write_tokens"] += int(write_tokens or 0)
+            try:
+                model_provider = ModelProvider(provider)
+            except ValueError:
+                continue
+            premium = estimate_cache_write_premium_usd(model_provider, model, int(write_tokens or 0))
+            entry["cache_write_premium_usd"] += premium
+            entry["saved_cost_usd"] += estimate_cache_savings_usd(model_provider, model, int(cached_tokens or 0)) - premium
+
+        def _finish(entry: Dict[str, Any]) -> Dict[str, Any]:
+            prompt_tokens = int(entry["prompt_tokens"])
+            entry["saved_tokens"] = int(entry["cached_tokens"])
+            entry["hit_ratio"] = round(min(entry["saved_tokens"] / prompt_tokens, 1.0), 3) if prompt_tokens else 0.0
+            entry["cache_write_premium_usd"] = round(float(entry["cache_write_premium_usd"]), 6)
+            entry["saved_cost_usd"] = round(float(entry["saved_cost_usd"]), 6)
+            return entry
+
+        agents = sorted(
+            (_finish(entry) for entry in by_agent.values()),
+            key=lambda item: (item["saved_tokens"], item["requests"]),
+            reverse=True,
+        )
+        totals = _finish(
+            {
+                "requests": sum(item["requests"] for item in agents),
+                "cached_requests": sum(item["cached_requests"] for item in agents),
+                "prompt_tokens": sum(item["prompt_tokens"] for item in agents),
+                "cached_tokens": sum(item["cached_tokens"] for item in agents),
+                "cache_write_tokens": sum(item["cache_write_tokens"] for item in agents),
+                "cache_write_premium_usd": sum(item["cache_write_premium_usd"] for item in agents),
+                "saved_cost_usd": sum(item["saved_cost_usd"] for item in agents),
+            }
+        )
+        return {
+            **empty,
+            **totals,
+            "estimated_requests_excluded": estimated_requests,
+            "agents": agents[:safe_limit],
+        }
+
     def get_conversation_recall_stats(self, days: int = 7) -> dict:
         """Aggregierte Recall-Telemetrie fuer längere Gespräche."""
         try:
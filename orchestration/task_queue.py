@@ -15,13 +15,14 @@ import json
 import math
 import re
 import sqlite3
+import threading
 import uuid
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from enum import IntEnum
 from itertools import combinations
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Set
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Set
 
 from orchestration.request_correlation import get_current_request_correlation
 
@@ -314,6 +315,27 @@ _SELF_HEALING_DELETE_AFTER_DAYS = max(
 )
 
 
+def _env_int(name: str, default: int, *, minimum: int = 0) -> int:
+    raw = str(os.getenv(name, str(default)) or str(default)).strip()
+    try:
+        value = int(raw)
+    except ValueError:
+        value = default
+    return max(minimum, value)
+
+
+# Verbindungs-Pool: eine langlebige Connection pro Thread und DB-Datei.
+# PRAGMAs werden einmalig beim Öffnen gesetzt, Prepared Statements bleiben
+# über den sqlite3-Statement-Cache der Connection erhalten.
+_CONNECTION_POOL_ENABLED = _env_bool("TASK_QUEUE_CONNECTION_POOL", True)
+_SQLITE_CACHED_STATEMENTS = _env_int("TASK_QUEUE_SQLITE_CACHED_STATEMENTS", 256, minimum=16)
+_SQLITE_CACHE_SIZE_KIB = _env_int("TASK_QUEUE_SQLITE_CACHE_KIB", 16384, minimum=0)
+_SQLITE_MMAP_SIZE_BYTES = _env_int("TASK_QUEUE_SQLITE_MMAP_BYTES", 64 * 1024 * 1024, minimum=0)
+_SQLITE_SYNCHRONOUS = str(os.getenv("TASK_QUEUE_SQLITE_SYNCHRONOUS", "NORMAL") or "NORMAL").strip().upper()
+if _SQLITE_SYNCHRONOUS not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+    _SQLITE_SYNCHRONOUS = "NORMAL"
+
+
 def _goals_feature_enabled() -> bool:
     if _env_bool("AUTONOMY_COMPAT_MODE", True):
         return False
@@ -425,6 +447,45 @@ def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
         return None
 
 
+# Policy-Runtime-Version je DB-Datei: Leser (utils.policy_gate) cachen den
+# Runtime-State und laden nur neu, wenn sich die Version aendert.
+_policy_runtime_versions: Dict[str, int] = {}
+_policy_runtime_versions_lock = threading.Lock()
+
+
+def _bump_policy_runtime_version(db_path: Path) -> None:
+    key = str(db_path)
+    with _policy_runtime_versions_lock:
+        _policy_runtime_versions[key] = _policy_runtime_versions.get(key, 0) + 1
+
+
+# Flush-Hook des Policy-Decision-Batch-Writers. utils.policy_gate registriert
+# ihn beim Anlegen des Writers; ohne Writer gibt es nichts zu flushen.
+_policy_decision_flush_hook: Optional[Callable[[float], Any]] = None
+
+
+def register_policy_decision_flush_hook(hook: Optional[Callable[[float], Any]]) -> None:
+    """Setzt (oder entfernt mit None) den Flush-Hook fuer ausstehende Policy-Entscheidungen."""
+    global _policy_decision_flush_hook
+    _policy_decision_flush_hook = hook
+
+
+def _flush_pending_policy_decisions(timeout_s: float = 2.0) -> None:
+    """
+    Read-your-writes fuer policy_decisions: wartet auf den Batch-Writer.
+
+    Blockiert bis zu timeout_s; async Aufrufer muessen die Leser daher per
+    asyncio.to_thread aufrufen.
+    """
+    hook = _policy_decision_flush_hook
+    if hook is None:
+        return
+    try:
+        hook(timeout_s)
+    except Exception as e:
+        log.debug("Policy-Decision-Flush fehlgeschlagen: %s", e)
+
+
 def _review_interval_for_horizon(horizon: str) -> timedelta:
     norm = _normalize_plan_horizon(horizon)
     if norm == PlanHorizon.DAILY:
@@ -792,9 +853,13 @@ class TaskQueue:
     Liefert Tasks in Reihenfolge: Priorität → Erstellungszeit.
     """
 
-    def __init__(self, db_path: Path = DB_PATH):
+    def __init__(self, db_path: Path = DB_PATH, *, pooled: Optional[bool] = None):
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pooled = _CONNECTION_POOL_ENABLED if pooled is None else bool(pooled)
+        self._local = threading.local()
+        self._pool_lock = threading.Lock()
+        self._pool_connections: Dict[int, sqlite3.Connection] = {}
         self._init_db()
         if _recover_stale_in_progress_on_startup():
             recovery = self.recover_stale_in_progress()
@@ -812,20 +877,105 @@ class TaskQueue:
     # DB-Verwaltung
     # ------------------------------------------------------------------
 
-    @contextmanager
-    def _conn(self) -> Generator[sqlite3.Connection, None, None]:
-        conn = sqlite3.connect(self.db_path, timeout=10)
+    def _open_connection(self, *, tuned: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=10,
+            # Jede gepoolte Connection wird nur von ihrem Thread benutzt;
+            # close() darf aber aus jedem Thread erfolgen.
+            check_same_thread=False,
+            cached_statements=_SQLITE_CACHED_STATEMENTS,
+        )
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA journal_mode=WAL")   # Parallele Reads
         conn.execute("PRAGMA foreign_keys=ON")
+        if tuned:
+            # WAL + synchronous=NORMAL ist crash-sicher (nur der letzte Commit
+            # kann bei Stromausfall verloren gehen) und spart fsync pro Commit.
+            conn.execute(f"PRAGMA synchronous={_SQLITE_SYNCHRONOUS}")
+            conn.execute(f"PRAGMA cache_size=-{_SQLITE_CACHE_SIZE_KIB}")
+            conn.execute(f"PRAGMA mmap_size={_SQLITE_MMAP_SIZE_BYTES}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _pooled_connection(self) -> sqlite3.Connection:
+        """Liefert die langlebige Connection des aktuellen Threads."""
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None and getattr(local, "pid", None) == os.getpid():
+            return conn
+        # Nach fork() gehört die geerbte Connection dem Elternprozess.
+        conn = self._open_connection(tuned=True)
+        local.conn = conn
+        local.pid = os.getpid()
+        local.depth = 0
+        with self._pool_lock:
+            self._prune_dead_thread_connections()
+            self._pool_connections[threading.get_ident()] = conn
+        return conn
+
+    def _prune_dead_thread_connections(self) -> None:
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [i for i in self._pool_connections if i not in alive]:
+            stale = self._pool_connections.pop(ident)
+            try:
+                stale.close()
+            except sqlite3.Error:
+                pass
+
+    @contextmanager
+    def _conn(self) -> Generator[sqlite3.Connection, None, None]:
+        if not self._pooled:
+            conn = self._open_connection(tuned=False)
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+            return
+
+        conn = self._pooled_connection()
+        local = self._local
+        local.depth += 1
         try:
             yield conn
-            conn.commit()
+            # Verschachtelte _conn()-Blöcke teilen sich die Transaktion;
+            # nur der äußerste Block committet.
+            if local.depth == 1:
+                conn.commit()
         except Exception:
-            conn.rollback()
+            if local.depth == 1:
+                conn.rollback()
             raise
         finally:
-            conn.close()
+            local.depth -= 1
+
+    def close(self) -> None:
+        """Schließt alle gepoolten Connections dieser Queue."""
+        with self._pool_lock:
+            connections = list(self._pool_connections.values())
+            self._pool_connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def connection_pool_stats(self) -> Dict[str, Any]:
+        with self._pool_lock:
+            open_connections = len(self._pool_connections)
+        return {
+            "pooled": self._pooled,
+            "open_connections": open_connections,
+            "cached_statements": _SQLITE_CACHED_STATEMENTS,
+            "synchronous": _SQLITE_SYNCHRONOUS,
+            "cache_size_kib": _SQLITE_CACHE_SIZE_KIB,
+            "mmap_size_bytes": _SQLITE_MMAP_SIZE_BYTES,
+        }
 
     def _init_db(self) -> None:
         with self._conn() as conn:
@@ -3295,6 +3445,9 @@ class TaskQueue:
                 )
             )
 
+        if deleted_runtime_state:
+            # Gecachte Snapshots duerfen geloeschte Runtime-States nicht ueberleben.
+            _bump_policy_runtime_version(self.db_path)
         self._last_self_healing_housekeeping = now
         return {
             "skipped": False,
@@ -3305,12 +3458,8 @@ class TaskQueue:
             "deleted_runtime_state": deleted_runtime_state,
         }
 
-    def record_policy_decision(
-        self,
-        decision: Dict[str, Any],
-        *,
-        observed_at: Optional[str] = None,
-    ) -> int:
+    @staticmethod
+    def _policy_decision_row(decision: Dict[str, Any], observed_at: Optional[str] = None) -> tuple:
         if not isinstance(decision, dict):
             raise ValueError("decision muss ein dict sein")
 
@@ -3350,30 +3499,52 @@ class TaskQueue:
             or datetime.now()
         ).isoformat()
 
-        with self._conn() as conn:
-            cursor = conn.execute(
-                """INSERT INTO policy_decisions
+        return (
+            gate,
+            source,
+            subject,
+            action,
+            blocked,
+            strict_mode,
+            reason,
+            violations_json,
+            payload_json,
+            canary_percent,
+            canary_bucket,
+            canary_enforced,
+            created_at,
+        )
+
+    _POLICY_DECISION_INSERT = """INSERT INTO policy_decisions
                    (gate, source, subject, action, blocked, strict_mode, reason, violations, payload,
                     canary_percent, canary_bucket, canary_enforced, created_at)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    gate,
-                    source,
-                    subject,
-                    action,
-                    blocked,
-                    strict_mode,
-                    reason,
-                    violations_json,
-                    payload_json,
-                    canary_percent,
-                    canary_bucket,
-                    canary_enforced,
-                    created_at,
-                ),
-            )
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+    def record_policy_decision(
+        self,
+        decision: Dict[str, Any],
+        *,
+        observed_at: Optional[str] = None,
+    ) -> int:
+        row = self._policy_decision_row(decision, observed_at)
+        with self._conn() as conn:
+            cursor = conn.execute(self._POLICY_DECISION_INSERT, row)
         return int(cursor.lastrowid)
 
+    def record_policy_decisions(self, decisions: Iterable[Dict[str, Any]]) -> int:
+        """Schreibt mehrere Policy-Entscheidungen in einer Transaktion (Batch-Writer)."""
+        rows = []
+        for decision in decisions:
+            try:
+                rows.append(self._policy_decision_row(decision, str(decision.get("timestamp") or "")))
+            except ValueError:
+                continue
+        if not rows:
+            return 0
+        with self._conn() as conn:
+            conn.executemany(self._POLICY_DECISION_INSERT, rows)
+        return len(rows)
+
     def list_policy_decisions(
         self,
         *,
@@ -3387,6 +3558,7 @@ class TaskQueue:
         limit_value = max(1, int(limit))
         gate_value = gate.strip().lower() if gate else None
         source_value = source.strip() if source else None
+        _flush_pending_policy_decisions()
         with self._conn() as conn:
             if gate_value and source_value:
                 rows = conn.execute(
@@ -3493,6 +3665,7 @@ class TaskQueue:
                        updated_at=excluded.updated_at""",
                 (key, value, metadata_json, now_iso),
             )
+        _bump_policy_runtime_version(self.db_path)
 
         return {
             "state_key": key,
@@ -3525,10 +3698,41 @@ class TaskQueue:
         payload["state_value"] = str(payload.get("state_value") or "")
         return payload
 
+    def get_policy_runtime_states(self, state_keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Liest mehrere Runtime-States in einer Abfrage (Key → Payload wie get_policy_runtime_state)."""
+        keys = sorted({(key or "").strip().lower() for key in state_keys if (key or "").strip()})
+        if not keys:
+            return {}
+        placeholders = ",".join("?" for _ in keys)
+        with self._conn() as conn:
+            rows = conn.execute(
+                f"""SELECT state_key, state_value, metadata, updated_at
+                    FROM policy_runtime_state WHERE state_key IN ({placeholders})""",
+                keys,
+            ).fetchall()
+        out: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            payload = dict(row)
+            raw_meta = payload.get("metadata")
+            try:
+                loaded = json.loads(raw_meta) if raw_meta else {}
+            except Exception:
+                loaded = {}
+            payload["metadata"] = loaded if isinstance(loaded, dict) else {}
+            payload["state_value"] = str(payload.get("state_value") or "")
+            out[str(payload["state_key"])] = payload
+        return out
+
+    @property
+    def policy_runtime_version(self) -> int:
+        """Prozesslokaler Zaehler, der bei jedem set_policy_runtime_state steigt."""
+        return _policy_runtime_versions.get(str(self.db_path), 0)
+
     def get_policy_decision_metrics(self, *, window_hours: int = 24) -> Dict[str, Any]:
         now = datetime.now()
         window = max(1, int(window_hours))
         since = (now - timedelta(hours=window)).isoformat()
+        _flush_pending_policy_decisions()
 
         with self._conn() as conn:
             total = int(
@@ -4096,6 +4300,7 @@ class TaskQueue:
                        updated_at=excluded.updated_at""",
                 (key, value, metadata_json, now_iso),
             )
+        _bump_policy_runtime_version(self.db_path)
 
         return {
             "state_key": key,
@@ -4599,30 +4804,48 @@ class TaskQueue:
             "failed": failed,
         }
 
-    def claim_next(self) -> Optional[dict]:
+    def claim_next(self, exclude_ids: Optional[Iterable[str]] = None) -> Optional[dict]:
         """
         Holt den nächsten pending Task (höchste Priorität, ältester zuerst)
         und markiert ihn atomar als in_progress.
         Gibt None zurück wenn keine Tasks verfügbar.
         Thread-safe durch EXCLUSIVE-Transaktion.
+
+        exclude_ids: Task-IDs, die bei dieser Abfrage übersprungen werden
+        (z.B. zurückgestellte Tasks, deren Worker-Lane gerade voll ist).
         """
+        excluded = [str(task_id) for task_id in (exclude_ids or ()) if task_id]
+        exclude_sql = f"AND id NOT IN ({','.join('?' for _ in excluded)})" if excluded else ""
         with self._conn() as conn:
             # Subquery-basiertes atomares UPDATE: kein SELECT → UPDATE Race
             now = datetime.now().isoformat()
             row = conn.execute(
-                """UPDATE tasks SET status='in_progress', started_at=?
+                f"""UPDATE tasks SET status='in_progress', started_at=?
                    WHERE id = (
                        SELECT id FROM tasks
                        WHERE status = 'pending'
                          AND (run_at IS NULL OR run_at <= ?)
+                         {exclude_sql}
                        ORDER BY priority ASC, created_at ASC
                        LIMIT 1
                    )
                    RETURNING *""",
-                (now, now),
+                (now, now, *excluded),
             ).fetchone()
             return dict(row) if row else None
 
+    def release_claim(self, task_id: str) -> bool:
+        """Gibt einen geclaimten, noch nicht gestarteten Task unverändert an pending zurück."""
+        if not task_id:
+            return False
+        with self._conn() as conn:
+            cur = conn.execute(
+                """UPDATE tasks SET status='pending', started_at=NULL
+                   WHERE id=? AND status='in_progress'""",
+                (task_id,),
+            )
+            return cur.rowcount > 0
+
     def complete(self, task_id: str, result: str) -> None:
         with self._conn() as conn:
             conn.execute(
@@ -32,60 +32,8 @@ from dotenv import load_dotenv
 from utils.chroma_runtime import build_chroma_settings, configure_chroma_runtime
 from utils.headless_service_guard import is_service_headless_context
 
-# --- NumPy JSON Encoder für numpy Typen ---
-class NumpyJSONEncoder(_json.JSONEncoder):
-    """JSON Encoder der NumPy Typen zu nativen Python Typen konvertiert."""
-    def default(self, obj):
-        # NumPy boolean
-        if hasattr(obj, 'dtype') and obj.dtype == bool:
-            return bool(obj)
-        # NumPy integer
-        if hasattr(obj, 'dtype') and 'int' in str(obj.dtype):
-            return int(obj)
-        # NumPy float
-        if hasattr(obj, 'dtype') and 'float' in str(obj.dtype):
-            return float(obj)
-        # NumPy ndarray
-        if hasattr(obj, 'tolist'):
-            return obj.tolist()
-        # Generischer Fallback
-        try:
-            return super().default(obj)
-        except TypeError:
-            return str(obj)
-
-def numpy_aware_serializer(response):
-    """Serializer der NumPy Typen behandeln kann.
-
-    Versucht zuerst native Konvertierung, dann Nemotron-Fallback bei komplexen Fällen.
-    """
-    if response is None:
-        return ""
-    try:
-        return _json.dumps(response, cls=NumpyJSONEncoder)
-    except (TypeError, ValueError) as e:
-        # Bei komplexen Fällen: Nemotron-Fallback (lazy import)
-        log.warning(f"Native JSON-Serialisierung fehlgeschlagen: {e}")
-        try:
-            import asyncio
-            from tools.json_nemotron_tool.json_nemotron_tool import sanitize_api_response
-            # Async-Funktion synchron aufrufen
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # Wir sind in einem async Kontext, nutze run_coroutine_threadsafe
-                future = asyncio.run_coroutine_threadsafe(
-                    sanitize_api_response(response), loop
-                )
-                return future.result(timeout=30)
-            else:
-                return loop.run_until_complete(sanitize_api_response(response))
-        except Exception as nemotron_error:
-            log.error(f"Nemotron-Fallback fehlgeschlagen: {nemotron_error}")
-            # Letzter Fallback: String-Repräsentation
-            try:
-                return _json.dumps({"_serialized": str(response), "_warning": "Nemotron-Fallback verwendet"})
-            except:
-                return '{"_error": "JSON-Serialisierung nicht möglich"}'
+# --- NumPy-faehige JSON-Serialisierung (geteilt mit dem In-Process-Dispatch) ---
+from utils.json_serialization import numpy_aware_serializer
 
 # --- Projekt-Setup ---
 project_root = Path(__file__).resolve().parent.parent
@@ -104,6 +52,7 @@ _RUNTIME_ROUTE_SNAPSHOT_PATH = project_root / "data" / "runtime_route_snapshot.j
 # --- Lokale Module und Kontext importieren ---
 import tools.shared_context as shared_context
 from tools.tool_registry_v2 import registry_v2, ValidationError
+from tools.tool_result_cache import get_tool_result_cache, tool_result_cache_enabled
 from utils.policy_gate import (
     audit_policy_decision,
     check_tool_policy,
@@ -114,7 +63,8 @@ from server.canvas_ui import build_canvas_ui_html
 from server.mobile_route_ui import build_mobile_route_ui_html
 from server.conversation_qdrant import recall_chat_turns as _semantic_recall_chat_turns
 from server.conversation_qdrant import store_chat_turn as _semantic_store_chat_turn
-from gateway.status_snapshot import collect_status_snapshot
+from gateway.status_snapshot import get_cached_status_snapshot, shutdown_status_snapshot_collectors
+from tools.web_fetch_tool.browser_pool import get_browser_pool_stats, shutdown_browser_pool
 from orchestration.autonomy_observation import record_autonomy_observation
 from orchestration.approval_auth_contract import normalize_phase_d_workflow_payload
 from orchestration.auth_session_state import (
@@ -292,6 +242,8 @@ def _build_health_payload(app: FastAPI) -> dict:
                 "health": {"ok": None, "detail": "n/a"},
             },
         ),
+        "web_fetch_browser_pool": get_browser_pool_stats(),
+        "tool_result_cache": get_tool_result_cache().stats(),
     }
 
 
@@ -3439,6 +3391,7 @@ def _initialize_shared_clients():
                         name="timus_long_term_memory", embedding_function=openai_ef
                     )
                 )
+                shared_context.memory_embedding_function = openai_ef
                 log.info(f"✅ Geteilte Memory-Collection ('{db_path}') initialisiert.")
             else:
                 log.warning(
@@ -3446,6 +3399,7 @@ def _initialize_shared_clients():
                 )
         else:
             shared_context.memory_collection = None
+            shared_context.memory_embedding_function = None
             log.info(
                 "ℹ️ Geteilte Chroma-Memory-Collection uebersprungen (MEMORY_BACKEND=%s).",
                 requested_memory_backend,
@@ -3757,6 +3711,22 @@ async def _run_post_startup_warmups(app: FastAPI) -> None:
             warmups["heartbeat_scheduler"] = {"ok": None, "detail": "disabled"}
             log.info("ℹ️ Heartbeat-Scheduler deaktiviert (HEARTBEAT_ENABLED=false)")
 
+        try:
+            from agent.agent_pool import agent_pool_enabled
+            from agent.agent_registry import agent_registry
+
+            if agent_pool_enabled():
+                # Manifest in-process uebergeben — kein HTTP-Loopback auf uns selbst.
+                agent_registry.set_tools_description(await _build_tools_description())
+                warmed = await agent_registry.prewarm_pool()
+                warmups["agent_pool"] = {"ok": True, "detail": warmed}
+                log.info("✅ Agent-Pool vorgewaermt (Post-Startup-Warmup): %s", warmed or "keine Mindestgroessen")
+            else:
+                warmups["agent_pool"] = {"ok": None, "detail": "disabled"}
+        except Exception as exc:
+            warmups["agent_pool"] = {"ok": False, "detail": str(exc)}
+            log.warning("⚠️ Agent-Pool konnte nicht vorgewaermt werden: %s", exc)
+
         app.state.realsense_stream_manager = None
         if os.getenv("REALSENSE_STREAM_AUTO_START", "false").lower() in {"1", "true", "yes", "on"}:
             try:
@@ -4027,9 +3997,14 @@ async def lifespan(app: FastAPI):
     )
     app.state.post_startup_warmup_task = asyncio.create_task(_run_post_startup_warmups(app))
 
+    # Agenten in diesem Prozess rufen Registry-Tools direkt auf (ohne HTTP-Loopback).
+    if _is_truthy_env(os.getenv("TIMUS_INPROCESS_TOOL_DISPATCH"), default=True):
+        registry_v2.enable_inprocess_dispatch(listener=_broadcast_sse)
+
     yield  # Server läuft
 
     log.info("🛑 TIMUS MCP SERVER SHUTDOWN beginnt...")
+    registry_v2.disable_inprocess_dispatch()
     _set_app_mcp_lifecycle(
         app,
         phase="shutdown",
@@ -4089,6 +4064,10 @@ async def lifespan(app: FastAPI):
     except Exception as exc:
         log.warning("⚠️ Legacy Browser-Tool Shutdown konnte nicht vorbereitet werden: %s", exc)
 
+    browser_shutdown_steps.append(
+        _shutdown_async_step("web_fetch_browser_pool", shutdown_browser_pool(), timeout_s=8.0)
+    )
+
     if browser_shutdown_steps:
         await asyncio.gather(*browser_shutdown_steps, return_exceptions=True)
 
@@ -4110,6 +4089,19 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             log.warning(f"⚠️ Fehler beim RealSense-Stream Shutdown: {e}")
 
+    # === SHUTDOWN: Screen-Capture-Handles (mss/X11) schließen ===
+    from utils.screen_frames import shutdown_frame_service
+
+    await _shutdown_async_step("screen_frame_service", asyncio.to_thread(shutdown_frame_service), timeout_s=3.0)
+
+    # === SHUTDOWN: Status-Snapshot-Collector stoppen ===
+    await _shutdown_async_step("status_snapshot_collector", shutdown_status_snapshot_collectors(), timeout_s=3.0)
+
+    # === SHUTDOWN: Geteilte HTTP-Clients schließen ===
+    from utils.http_client_pool import aclose_async_clients
+
+    await _shutdown_async_step("http_client_pool", aclose_async_clients(), timeout_s=3.0)
+
 
 # --- App-Initialisierung mit Lifespan ---
 app = FastAPI(title="Timus MCP Server", version="1.6.0 (Cleaned)", lifespan=lifespan)
@@ -4134,8 +4126,21 @@ async def _build_tools_description() -> str:
     """Erstellt vollständige Tool+Skills-Beschreibung.
 
     Zentrale Hilfsfunktion — genutzt von /get_tool_descriptions UND /chat,
-    damit beide exakt dieselbe Beschreibung erhalten.
+    damit beide exakt dieselbe Beschreibung erhalten. Das Ergebnis liegt im
+    Tool-Ergebnis-Cache, bis sich die Registry ändert oder die TTL abläuft.
     """
+    ttl_s = float(os.getenv("TOOL_DESCRIPTIONS_CACHE_TTL_S", "60") or 60)
+    if ttl_s <= 0 or not tool_result_cache_enabled():
+        return await _build_tools_description_uncached()
+    return await get_tool_result_cache().get_or_call(
+        "get_tool_descriptions",
+        f"get_tool_descriptions:{registry_v2.revision}",
+        ttl_s,
+        _build_tools_description_uncached,
+    )
+
+
+async def _build_tools_description_uncached() -> str:
     try:
         descriptions = registry_v2.get_tool_manifest()
     except Exception as e:
@@ -4471,17 +4476,24 @@ async def add_canvas_event(canvas_id: str, payload: dict):
 
 @app.get("/agent_status", summary="Agenten-Status & Thinking-LED")
 async def get_agent_status_endpoint():
+    try:
+        from agent.agent_registry import agent_registry
+
+        pool = agent_registry.pool_stats()
+    except Exception as e:
+        pool = {"error": str(e)}
     return {
         "status": "success",
         "agents": _agent_status,
         "thinking": _thinking_active,
+        "pool": pool,
     }
 
 
 @app.get("/status/snapshot", summary="Strukturierter Betriebs-/Kosten-Snapshot")
 async def status_snapshot_endpoint():
     try:
-        snapshot = await collect_status_snapshot()
+        snapshot = await get_cached_status_snapshot()
         return {"status": "success", "snapshot": snapshot}
     except Exception as e:
         log.error(f"Status-Snapshot Fehler: {e}", exc_info=True)
@@ -5070,7 +5082,8 @@ async def autonomy_scorecard_endpoint(window_hours: int = 24):
     """Liefert die aggregierte Autonomie-Scorecard aus M1-M5."""
     try:
         from orchestration.autonomy_scorecard import build_autonomy_scorecard
-        card = build_autonomy_scorecard(window_hours=max(1, window_hours))
+        # Liest Policy-Metriken (Flush des Decision-Writers blockiert): nicht auf dem Loop.
+        card = await asyncio.to_thread(build_autonomy_scorecard, window_hours=max(1, window_hours))
         return {"status": "success", "scorecard": card}
     except Exception as e:
         log.error(f"Autonomy scorecard Fehler: {e}", exc_info=True)
@@ -5706,6 +5719,8 @@ async def location_route_mobile_view_endpoint():
 async def voice_status_endpoint():
     """Gibt den aktuellen Status des Voice-Systems zurück."""
     try:
+        from tools.engines.stt_service import get_stt_service
+
         return {
             "status": "success",
             "voice": {
@@ -5714,6 +5729,7 @@ async def voice_status_endpoint():
                 "speaking": False,
                 "current_voice": os.getenv("INWORLD_VOICE", "Lennart"),
                 "available_voices": ["Lennart", "Ashley", "Derek"],
+                "stt": get_stt_service().stats(),
             },
         }
     except Exception as e:
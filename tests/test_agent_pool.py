@@ -0,0 +1,158 @@
+"""Agent-Instanz-Pool: Wiederverwendung, Reset, Ueberlauf, Vorwaermen."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from agent.agent_pool import AgentInstancePool, parse_pool_sizes
+from agent.agent_registry import AgentRegistry
+
+
+class _FakeAgent:
+    def __init__(self):
+        self.conversation_session_id = None
+        self.resets = 0
+        self.tasks = []
+
+    def reset_for_reuse(self):
+        self.resets += 1
+        self.conversation_session_id = None
+
+    async def run(self, task):
+        self.tasks.append((task, self.conversation_session_id))
+        return f"erledigt: {task}"
+
+
+def test_parse_pool_sizes():
+    assert parse_pool_sizes("executor=1:4, research=2, bad, x=a:b") == {
+        "executor": (1, 4),
+        "research": (2, 2),
+    }
+
+
+def test_pool_lends_exclusively_resets_and_discards_overflow():
+    pool = AgentInstancePool(sizes={"research": (0, 2)})
+    built = []
+
+    def build():
+        built.append(_FakeAgent())
+        return built[-1]
+
+    a = pool.acquire("research", build=build)
+    b = pool.acquire("research", build=build)
+    overflow = pool.acquire("research", build=build)
+    assert len({id(a), id(b), id(overflow)}) == 3
+    assert pool.stats()["agents"]["research"]["utilization"] == 1.5
+
+    for instance in (a, b, overflow):
+        pool.release("research", instance)
+    assert a.resets == 1 and overflow.resets == 0
+    stats = pool.stats()["agents"]["research"]
+    assert stats["size"] == 2 and stats["idle"] == 2 and stats["in_use"] == 0
+    assert stats["overflow_total"] == 1
+
+    again = pool.acquire("research", build=build)
+    assert again in (a, b)
+    assert len(built) == 3
+    assert pool.stats()["agents"]["research"]["reused"] == 1
+
+
+def test_broken_and_stale_instances_are_not_reused():
+    pool = AgentInstancePool(sizes={"executor": (0, 2)})
+    first = pool.acquire("executor", build=_FakeAgent)
+    pool.release("executor", first, reusable=False)
+    assert pool.stats()["agents"]["executor"]["size"] == 0
+
+    second = pool.acquire("executor", build=_FakeAgent)
+    pool.invalidate()
+    pool.release("executor", second)
+    assert pool.acquire("executor", build=_FakeAgent) is not second
+
+
+def _registry(factory_calls):
+    registry = AgentRegistry()
+    registry._pool = AgentInstancePool(sizes={"research": (1, 2)})
+    registry._tools_description = "TOOLS"
+
+    def _factory(tools_desc, **_kw):
+        factory_calls.append(tools_desc)
+        return _FakeAgent()
+
+    registry.register_spec("research", "research", ["research"], _factory)
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_sequential_delegations_reuse_a_reset_instance():
+    factory_calls = []
+    registry = _registry(factory_calls)
+
+    first = await registry.delegate("meta", "research", "Frage A", session_id="s1")
+    second = await registry.delegate("meta", "research", "Frage B", session_id="s2")
+
+    assert first["status"] == "success" and second["status"] == "success"
+    assert factory_calls == ["TOOLS"]
+    agent = registry._instances["research"]
+    assert [session for _task, session in agent.tasks] == ["s1", "s2"]
+    assert agent.resets == 2
+    assert agent.conversation_session_id is None
+    assert registry.pool_stats()["agents"]["research"]["reused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prewarm_builds_minimum_and_delegation_uses_it():
+    factory_calls = []
+    registry = _registry(factory_calls)
+
+    assert await registry.prewarm_pool() == {"research": 1}
+    assert await registry.prewarm_pool() == {}
+    await registry.delegate("meta", "research", "Kurzer Lookup")
+
+    assert len(factory_calls) == 1
+    stats = registry.pool_stats()["agents"]["research"]
+    assert stats == {**stats, "size": 1, "idle": 1, "in_use": 0, "reused": 1}
+
+    registry.set_tools_description("TOOLS v2")
+    await registry.delegate("meta", "research", "Nach Manifest-Update")
+    assert factory_calls[-1] == "TOOLS v2"
+
+
+@pytest.mark.asyncio
+async def test_session_is_resolved_from_the_instance_borrowed_by_this_delegation():
+    registry = _registry([])
+
+    async def _chain(session):
+        agent = await registry._acquire_instance("research", fetch_tools=False)
+        agent.conversation_session_id = session
+        await asyncio.sleep(0.01)
+        try:
+            return registry._resolve_effective_session_id("research", None)
+        finally:
+            registry._release_instance("research", agent, reusable=True)
+
+    assert await asyncio.gather(_chain("s1"), _chain("s2"), _chain("s3")) == ["s1", "s2", "s3"]
+    assert registry._borrowed_var.get() == ()
+    assert registry._lent == {}
+
+
+@pytest.mark.asyncio
+async def test_singleton_lent_outside_the_pool_is_not_adopted(monkeypatch):
+    registry = _registry([])
+    singleton = _FakeAgent()
+    registry._instances["research"] = singleton
+
+    monkeypatch.setenv("AGENT_POOL_ENABLED", "false")
+    outside = await registry._acquire_instance("research")
+    monkeypatch.setenv("AGENT_POOL_ENABLED", "true")
+    pooled = await registry._acquire_instance("research")
+
+    assert outside is singleton and pooled is not singleton
+    assert not registry._pool.owns("research", singleton)
+
+    registry._release_instance("research", pooled, reusable=True)
+    monkeypatch.setenv("AGENT_POOL_ENABLED", "false")
+    registry._release_instance("research", outside, reusable=True)
+    monkeypatch.setenv("AGENT_POOL_ENABLED", "true")
+    assert registry._lent == {}
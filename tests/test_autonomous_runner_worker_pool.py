@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from orchestration.autonomous_runner import AutonomousRunner
+from orchestration.task_queue import Priority, TaskQueue
+
+
+def _runner(monkeypatch, queue: TaskQueue, *, workers: int = 3) -> AutonomousRunner:
+    monkeypatch.setenv("AUTONOMY_WORKER_CONCURRENCY", str(workers))
+    monkeypatch.setenv("AUTONOMY_HEAVY_LANE_CONCURRENCY", "1")
+    monkeypatch.setenv("AUTONOMY_AGENT_CONCURRENCY", "1")
+    monkeypatch.setattr("orchestration.autonomous_runner.get_queue", lambda: queue)
+    runner = AutonomousRunner(interval_minutes=15)
+    runner._running = True
+    return runner
+
+
+def test_task_queue_claim_next_skips_excluded_and_release_keeps_task_pending(tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    first = queue.add(description="erster", priority=Priority.HIGH)
+    second = queue.add(description="zweiter", priority=Priority.NORMAL)
+
+    claimed = queue.claim_next(exclude_ids={first})
+    assert claimed is not None and claimed["id"] == second
+
+    assert queue.release_claim(second) is True
+    released = queue.get_by_id(second)
+    assert released["status"] == "pending"
+    assert released["retry_count"] == 0
+    assert queue.release_claim(second) is False
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_runs_light_tasks_while_heavy_task_is_in_flight(monkeypatch, tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    heavy_ids = [
+        queue.add(description=f"Deep Research Bericht {i}", target_agent="research", priority=Priority.NORMAL)
+        for i in range(2)
+    ]
+    reminder_id = queue.add(description="Erinnerung: Wasser trinken", target_agent="executor", priority=Priority.HIGH)
+
+    runner = _runner(monkeypatch, queue)
+    release_heavy = asyncio.Event()
+    finished: list[str] = []
+
+    async def _fake_execute(task: dict) -> None:
+        if task["target_agent"] == "research":
+            await release_heavy.wait()
+        queue.complete(task["id"], "ok")
+        finished.append(task["id"])
+
+    monkeypatch.setattr(runner, "_execute_task", _fake_execute)
+
+    assert runner._dispatch_ready_tasks() == 2
+    await asyncio.sleep(0.05)
+
+    # Reminder lief trotz laufendem Heavy-Task; zweiter Heavy-Task wartet in der Queue
+    assert finished == [reminder_id]
+    assert queue.get_by_id(heavy_ids[1])["status"] == "pending"
+    stats = runner.get_worker_pool_stats()
+    assert stats["lanes"]["heavy"]["in_flight"] == 1
+    assert stats["lanes"]["heavy"]["deferred"] >= 1
+
+    release_heavy.set()
+    await asyncio.sleep(0.05)
+    assert runner._dispatch_ready_tasks() == 1
+    await asyncio.sleep(0.05)
+
+    assert sorted(finished) == sorted([reminder_id, *heavy_ids])
+    stats = runner.get_worker_pool_stats()
+    assert stats["in_flight"] == 0
+    assert stats["lanes"]["heavy"]["finished"] == 2
+    assert stats["lanes"]["light"]["finished"] == 1
+    assert stats["lanes"]["heavy"]["execution_max_s"] >= stats["lanes"]["light"]["execution_max_s"]
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_limits_per_agent_and_reserves_slot_for_high_priority(monkeypatch, tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    for i in range(2):
+        queue.add(description=f"Notiz {i}", target_agent="executor", priority=Priority.NORMAL)
+    queue.add(description="Kalender sync", target_agent="communication", priority=Priority.NORMAL)
+    queue.add(description="Status melden", target_agent="meta", priority=Priority.LOW)
+
+    runner = _runner(monkeypatch, queue)
+    gate = asyncio.Event()
+
+    async def _fake_execute(task: dict) -> None:
+        await gate.wait()
+        queue.complete(task["id"], "ok")
+
+    monkeypatch.setattr(runner, "_execute_task", _fake_execute)
+
+    # executor nur 1x parallel, dritter Slot bleibt für HIGH/CRITICAL reserviert
+    assert runner._dispatch_ready_tasks() == 2
+    assert {slot["agent"] for slot in runner._inflight.values()} == {"executor", "communication"}
+
+    urgent = queue.add(description="Dringend: Server down", target_agent="system", priority=Priority.CRITICAL)
+    assert runner._dispatch_ready_tasks() == 1
+    assert urgent in runner._inflight
+
+    gate.set()
+    await asyncio.gather(*list(runner._worker_tasks))
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_records_queue_wait_and_survives_task_errors(monkeypatch, tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    task_id = queue.add(description="kaputt", target_agent="executor", priority=Priority.NORMAL)
+    runner = _runner(monkeypatch, queue, workers=1)
+
+    async def _boom(task: dict) -> None:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(runner, "_execute_task", _boom)
+
+    assert runner._dispatch_ready_tasks() == 1
+    await asyncio.gather(*list(runner._worker_tasks))
+
+    lane = runner.get_worker_pool_stats()["lanes"]["light"]
+    assert lane["errors"] == 1
+    assert lane["queue_wait_max_s"] >= 0.0
+    assert runner._inflight == {}
+    assert runner._work_signal.is_set()
+    failed = queue.get_by_id(task_id)
+    assert failed["status"] in {"pending", "failed"}
+    assert str(failed["error"]).startswith("worker_error:")
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_lane_tasks_and_releases_their_claims(monkeypatch, tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    task_id = queue.add(description="Erinnerung: Wasser trinken", target_agent="executor")
+    runner = _runner(monkeypatch, queue)
+    cancelled = asyncio.Event()
+
+    async def _hanging_execute(task: dict) -> None:
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    monkeypatch.setattr(runner, "_execute_task", _hanging_execute)
+    assert runner._dispatch_ready_tasks() == 1
+    await asyncio.sleep(0.01)
+    workers = list(runner._worker_tasks)
+    assert queue.get_by_id(task_id)["status"] == "in_progress"
+
+    await runner.stop()
+
+    assert cancelled.is_set()
+    assert all(worker.done() for worker in workers)
+    assert runner.get_worker_pool_stats()["in_flight"] == 0
+    assert queue.get_by_id(task_id)["status"] == "pending"
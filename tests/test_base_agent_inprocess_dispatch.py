@@ -0,0 +1,228 @@
+"""In-Process-Tool-Dispatch fuer Agenten im MCP-Server-Prozess."""
+
+from __future__ import annotations
+
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from jsonrpcserver import Error, async_dispatch
+from jsonrpcserver.methods import global_methods
+
+import agent.base_agent as base_agent_module
+from tests.test_base_agent_tool_envelope import _minimal_base_agent
+from tools.tool_registry_v2 import C, P, registry_v2, tool
+
+_TOOL_NAMES = ("inproc_echo_test", "inproc_sync_boom_test", "inproc_error_test", "inproc_numpy_test", "inproc_named_test")
+
+
+@pytest.fixture
+def inprocess_tools(monkeypatch):
+    @tool(
+        name="inproc_echo_test",
+        description="Echo fuer Dispatch-Tests",
+        parameters=[P("text", "string", "Text", required=True)],
+        capabilities=["test"],
+        category=C.SYSTEM,
+    )
+    async def _echo(text: str) -> dict:
+        return {"status": "success", "message": text, "filepath": "/tmp/echo.txt"}
+
+    @tool(
+        name="inproc_sync_boom_test",
+        description="Sync-Tool mit Exception",
+        parameters=[],
+        capabilities=["test"],
+        category=C.SYSTEM,
+    )
+    def _boom() -> dict:
+        raise RuntimeError("boom")
+
+    @tool(
+        name="inproc_error_test",
+        description="Tool mit JSON-RPC-Error",
+        parameters=[],
+        capabilities=["test"],
+        category=C.SYSTEM,
+    )
+    async def _error() -> dict:
+        return Error(code=-32001, message="nicht erlaubt")
+
+    @tool(
+        name="inproc_numpy_test",
+        description="Tool mit NumPy-Ergebnis",
+        parameters=[],
+        capabilities=["test"],
+        category=C.SYSTEM,
+    )
+    async def _numpy() -> dict:
+        import numpy as np
+
+        return {"status": "success", "score": np.float32(0.5), "found": np.bool_(True), "box": (np.int64(3), 4)}
+
+    @tool(
+        name="inproc_named_test",
+        description="Tool mit Parametern, die wie execute()-Argumente heissen",
+        parameters=[
+            P("name", "string", "Name", required=True),
+            P("validate", "boolean", "Flag", required=False, default=False),
+            P("normalize", "boolean", "Flag", required=False, default=False),
+        ],
+        capabilities=["test"],
+        category=C.SYSTEM,
+    )
+    async def _named(name: str, validate: bool = False, normalize: bool = False) -> dict:
+        return {"status": "success", "message": name, "flags": [validate, normalize]}
+
+    events: list[dict] = []
+    registry_v2.enable_inprocess_dispatch(listener=events.append)
+    monkeypatch.setattr(base_agent_module, "evaluate_policy_gate", lambda **kwargs: {"allowed": True, "blocked": False})
+    monkeypatch.setattr(base_agent_module, "audit_policy_decision", lambda decision: None)
+    monkeypatch.setattr(base_agent_module.BaseAgent, "_record_tool_usage_analytics", lambda self, **kwargs: None)
+    yield events
+    registry_v2.disable_inprocess_dispatch()
+    for name in _TOOL_NAMES:
+        registry_v2._tools.pop(name, None)
+        registry_v2._rpc_index.pop(name, None)
+        global_methods.pop(name, None)
+
+
+def _agent_without_http():
+    agent = _minimal_base_agent()
+    agent.http_client = SimpleNamespace(post=AsyncMock(side_effect=AssertionError("HTTP darf nicht genutzt werden")))
+    agent._current_task_type_for_analytics = lambda: "test"
+    agent._check_restart_tool_intent = lambda method, params: None
+    agent._check_meta_clarity_tool_intent = lambda method, params: None
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_call_tool_dispatches_registry_tool_in_process(inprocess_tools):
+    agent = _agent_without_http()
+
+    result = await agent._call_tool("inproc_echo_test", {"text": "hallo"})
+
+    assert result["status"] == "success"
+    assert result["summary"] == "hallo"
+    assert result["artifacts"][0]["path"] == "/tmp/echo.txt"
+    assert [event["type"] for event in inprocess_tools] == ["tool_start", "tool_done"]
+    agent.http_client.post.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_inprocess_errors_match_jsonrpc_error_format(inprocess_tools):
+    agent = _agent_without_http()
+
+    boom = await agent._call_tool("inproc_sync_boom_test", {})
+    denied = await agent._call_tool("inproc_error_test", {})
+
+    assert boom == {"error": "JSON-RPC Fehler: code=-32000 | boom"}
+    assert denied == {"error": "JSON-RPC Fehler: code=-32001 | nicht erlaubt"}
+
+
+@pytest.mark.asyncio
+async def test_inprocess_results_are_serialized_like_http_responses(inprocess_tools):
+    agent = _agent_without_http()
+
+    result = await agent._call_tool("inproc_numpy_test", {})
+
+    assert type(result["score"]) is float and result["score"] == 0.5
+    assert result["found"] is True
+    assert result["box"] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_inprocess_passes_params_named_like_execute_arguments(inprocess_tools):
+    agent = _agent_without_http()
+
+    result = await agent._call_tool("inproc_named_test", {"name": "x", "validate": True, "normalize": True})
+
+    assert result["status"] == "success"
+    assert result["message"] == "x"
+    assert result["flags"] == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_inprocess_applies_server_policy_gate(inprocess_tools, monkeypatch):
+    agent = _agent_without_http()
+
+    def _gate(**kwargs):
+        blocked = kwargs["source"] == "server.mcp_server.handle_jsonrpc"
+        return {"allowed": True, "blocked": blocked, "reason": "Server-Canary blockiert"}
+
+    monkeypatch.setattr(base_agent_module, "evaluate_policy_gate", _gate)
+    result = await agent._call_tool("inproc_echo_test", {"text": "x"})
+
+    assert result == {"error": "JSON-RPC Fehler: code=-32600 | Server-Canary blockiert"}
+    assert inprocess_tools == []
+
+
+@pytest.mark.asyncio
+async def test_unknown_or_disabled_tools_fall_back_to_http(inprocess_tools, monkeypatch):
+    agent = _agent_without_http()
+    agent.http_client = SimpleNamespace(
+        post=AsyncMock(return_value=SimpleNamespace(json=lambda: {"jsonrpc": "2.0", "result": {"status": "success"}}))
+    )
+
+    await agent._call_tool("remote_only_tool", {})
+    monkeypatch.setenv("TIMUS_INPROCESS_TOOL_DISPATCH", "false")
+    await agent._call_tool("inproc_echo_test", {"text": "x"})
+
+    assert agent.http_client.post.await_count == 2
+    registry_v2.disable_inprocess_dispatch()
+    assert registry_v2.can_dispatch_inprocess("inproc_echo_test") is False
+
+
+# ──────────────────────────────────────────────────────────────────
+# Benchmark: Overhead pro Tool-Call, HTTP/JSON-RPC vs. In-Process (RUN_BENCHMARKS=1)
+# ──────────────────────────────────────────────────────────────────
+
+_BENCH_CALLS = int(os.getenv("INPROCESS_DISPATCH_BENCH_CALLS", "500"))
+
+
+async def _jsonrpc_asgi_app(scope, receive, send):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    reply = await async_dispatch(body.decode("utf-8"))
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": reply.encode("utf-8")})
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_BENCHMARKS") != "1",
+    reason="Benchmarks deaktiviert (RUN_BENCHMARKS=1 zum Aktivieren).",
+)
+@pytest.mark.asyncio
+async def test_benchmark_inprocess_vs_http_dispatch(inprocess_tools):
+    agent = _agent_without_http()
+
+    started = time.perf_counter()
+    for i in range(_BENCH_CALLS):
+        await agent._call_tool("inproc_echo_test", {"text": f"t{i}"})
+    inprocess_us = (time.perf_counter() - started) / _BENCH_CALLS * 1e6
+
+    registry_v2.disable_inprocess_dispatch()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=_jsonrpc_asgi_app), base_url="http://mcp") as client:
+        agent.http_client = client
+        monkeypatch_url = base_agent_module.MCP_URL
+        base_agent_module.MCP_URL = "http://mcp/"
+        try:
+            started = time.perf_counter()
+            for i in range(_BENCH_CALLS):
+                await agent._call_tool("inproc_echo_test", {"text": f"t{i}"})
+            http_us = (time.perf_counter() - started) / _BENCH_CALLS * 1e6
+        finally:
+            base_agent_module.MCP_URL = monkeypatch_url
+
+    print(
+        f"\n_call_tool Overhead ({_BENCH_CALLS} Calls, ohne Netzwerk): "
+        f"http={http_us:.0f}us inprocess={inprocess_us:.0f}us speedup={http_us / max(inprocess_us, 1e-9):.1f}x"
+    )
+    assert inprocess_us < http_us
@@ -0,0 +1,220 @@
+"""Async-Streaming-LLM-Calls mit Early-Action-Parsing im BaseAgent."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from agent import base_agent as base_agent_mod
+from agent.providers import ModelProvider
+from agent.shared.action_parser import StreamingActionParser, parse_action
+from orchestration.self_improvement_engine import LLMUsageRecord, SelfImprovementEngine
+
+
+class _CaptureEngine:
+    def __init__(self):
+        self.records = []
+
+    def record_llm_usage(self, record):
+        self.records.append(record)
+
+
+def _chunk(content=None, reasoning=None, usage=None):
+    choices = []
+    if content is not None or reasoning is not None:
+        choices = [SimpleNamespace(delta=SimpleNamespace(content=content, reasoning_content=reasoning))]
+    return SimpleNamespace(choices=choices, usage=usage)
+
+
+class _FakeStream:
+    def __init__(self, chunks, delay_s=0.0):
+        self._chunks = list(chunks)
+        self._delay_s = delay_s
+        self.consumed = 0
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.consumed >= len(self._chunks):
+            raise StopAsyncIteration
+        await asyncio.sleep(self._delay_s)
+        self.consumed += 1
+        return self._chunks[self.consumed - 1]
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeAsyncOpenAI:
+    def __init__(self, stream):
+        self.stream = stream
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.stream
+
+
+def _agent(monkeypatch, stream):
+    capture = _CaptureEngine()
+    async_client = _FakeAsyncOpenAI(stream)
+
+    class _ProviderClient:
+        def get_client(self, _provider):
+            raise AssertionError("Sync-Client darf beim Streaming nicht genutzt werden")
+
+        def get_async_client(self, _provider):
+            return async_client
+
+    monkeypatch.setattr(base_agent_mod, "get_improvement_engine", lambda: capture)
+    agent = base_agent_mod.BaseAgent.__new__(base_agent_mod.BaseAgent)
+    agent.provider_client = _ProviderClient()
+    agent.provider = ModelProvider.OPENAI
+    agent.model = "gpt-5.4-mini"
+    agent.agent_type = "executor"
+    agent.conversation_session_id = "sess-stream"
+    return agent, async_client, capture
+
+
+_ACTION_REPLY = [
+    "Thought: Ich suche ",
+    "im Web.\nAction: {\"method\": \"search_web\", ",
+    "\"params\": {\"query\": \"wetter {berlin}\"}}",
+    "\nObservation: halluziniert",
+    " ... noch mehr Text",
+]
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_after_complete_action_in_react_loop(monkeypatch):
+    monkeypatch.setattr(base_agent_mod.BaseAgent, "_get_max_tokens_for_model", staticmethod(lambda model: 500))
+    stream = _FakeStream([_chunk(piece) for piece in _ACTION_REPLY], delay_s=0.01)
+    agent, async_client, capture = _agent(monkeypatch, stream)
+
+    token = base_agent_mod._LLM_STOP_ON_ACTION.set(True)
+    try:
+        reply = await base_agent_mod.BaseAgent._call_openai_compatible(agent, [{"role": "user", "content": "x" * 400}])
+    finally:
+        base_agent_mod._LLM_STOP_ON_ACTION.reset(token)
+
+    assert reply.endswith('"wetter {berlin}"}}')
+    assert parse_action(reply)[0] == {"method": "search_web", "params": {"query": "wetter {berlin}"}}
+    assert stream.consumed == 3
+    assert stream.closed is True
+    assert async_client.calls[0]["stream"] is True
+    record = capture.records[0]
+    assert 0 < record.ttft_ms <= record.time_to_action_ms <= record.latency_ms + 1
+    # Kein Usage-Chunk wegen Early-Stop → geschaetzte Tokens, als solche markiert
+    assert record.input_tokens == 100
+    assert record.output_tokens == len(reply) // 4
+    assert record.usage_estimated is True
+
+
+@pytest.mark.asyncio
+async def test_stream_reads_full_reply_outside_react_loop(monkeypatch):
+    usage = SimpleNamespace(prompt_tokens=50, completion_tokens=20, prompt_tokens_details=SimpleNamespace(cached_tokens=5))
+    stream = _FakeStream([_chunk(piece) for piece in _ACTION_REPLY] + [_chunk(usage=usage)])
+    agent, _client, capture = _agent(monkeypatch, stream)
+
+    reply = await base_agent_mod.BaseAgent._call_openai_compatible(agent, [{"role": "user", "content": "hi"}])
+
+    assert reply == "".join(_ACTION_REPLY)
+    assert stream.closed is True
+    record = capture.records[0]
+    assert (record.input_tokens, record.output_tokens, record.cached_tokens) == (50, 20, 5)
+    assert record.usage_estimated is False
+    assert record.time_to_action_ms > 0
+
+
+@pytest.mark.asyncio
+async def test_stream_falls_back_to_reasoning_content(monkeypatch):
+    stream = _FakeStream([_chunk(reasoning="Ich denke "), _chunk(reasoning="nach."), _chunk(content="")])
+    agent, _client, capture = _agent(monkeypatch, stream)
+
+    reply = await base_agent_mod.BaseAgent._call_openai_compatible(agent, [{"role": "user", "content": "hi"}])
+
+    assert reply == "Ich denke nach."
+    assert capture.records[0].success is True
+    assert capture.records[0].time_to_action_ms == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_requests_usage_only_from_supporting_providers(monkeypatch):
+    monkeypatch.delenv("LLM_STREAM_INCLUDE_USAGE_PROVIDERS", raising=False)
+    agent, client, _capture = _agent(monkeypatch, _FakeStream([_chunk("ok")]))
+    await base_agent_mod.BaseAgent._call_openai_compatible(agent, [{"role": "user", "content": "hi"}])
+
+    nvidia_stream = _FakeStream([_chunk("ok")])
+    agent.provider = ModelProvider.NVIDIA
+    agent.model = "meta/llama-3.3-70b-instruct"
+    client.stream = nvidia_stream
+    await base_agent_mod.BaseAgent._call_openai_compatible(agent, [{"role": "user", "content": "hi"}])
+
+    assert client.calls[0]["stream_options"] == {"include_usage": True}
+    assert "stream_options" not in client.calls[1]
+
+    monkeypatch.setenv("LLM_STREAM_INCLUDE_USAGE_PROVIDERS", "nvidia")
+    client.stream = _FakeStream([_chunk("ok")])
+    await base_agent_mod.BaseAgent._call_openai_compatible(agent, [{"role": "user", "content": "hi"}])
+    assert client.calls[2]["stream_options"] == {"include_usage": True}
+
+
+@pytest.mark.asyncio
+async def test_stream_is_closed_when_iteration_fails(monkeypatch):
+    class _BrokenStream(_FakeStream):
+        async def __anext__(self):
+            raise RuntimeError("Verbindung abgebrochen")
+
+    stream = _BrokenStream([])
+    agent, _client, capture = _agent(monkeypatch, stream)
+
+    with pytest.raises(RuntimeError):
+        await base_agent_mod.BaseAgent._call_openai_compatible(agent, [{"role": "user", "content": "hi"}])
+
+    assert stream.closed is True
+    assert capture.records[0].success is False
+
+
+def test_streaming_parser_waits_for_final_answer_and_skips_think_blocks():
+    parser = StreamingActionParser()
+    for piece in ["<thi", 'nk>{"method": "no"}</th', "ink>Final Answer: ", '{"method": "x"}']:
+        assert parser.feed(piece) is None
+    assert parser.text.endswith('{"method": "x"}')
+
+    parser = StreamingActionParser()
+    text = '<think>plan {</think>Action: {"action": {"method": "read_file", "params": {"path": "a\\"}b"}}}'
+    result = None
+    for ch in text:
+        result = parser.feed(ch) or result
+    assert result == {"method": "read_file", "params": {"path": 'a"}b'}}
+
+
+def test_llm_usage_persists_stream_timings_and_migrates_old_schema(tmp_path):
+    db_path = tmp_path / "usage.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """CREATE TABLE llm_usage_analytics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, trace_id TEXT NOT NULL, session_id TEXT DEFAULT '',
+                agent TEXT NOT NULL, provider TEXT NOT NULL, model TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL DEFAULT 0, output_tokens INTEGER NOT NULL DEFAULT 0,
+                cached_tokens INTEGER NOT NULL DEFAULT 0, cost_usd REAL NOT NULL DEFAULT 0,
+                latency_ms INTEGER NOT NULL DEFAULT 0, success INTEGER NOT NULL DEFAULT 1,
+                timestamp TEXT NOT NULL)"""
+        )
+    engine = SelfImprovementEngine(db_path=db_path)
+    engine.record_llm_usage(
+        LLMUsageRecord(trace_id="s1", agent="executor", provider="openai", model="m", latency_ms=900, ttft_ms=120, time_to_action_ms=600)
+    )
+    engine.record_llm_usage(LLMUsageRecord(trace_id="s2", agent="executor", provider="openai", model="m", latency_ms=300))
+
+    summary = engine.get_llm_usage_summary(days=1)
+
+    assert summary["avg_ttft_ms"] == 120.0
+    assert summary["avg_time_to_action_ms"] == 600.0
+    assert summary["avg_latency_ms"] == 600.0
@@ -398,3 +398,93 @@ class TestIntegration:
         report = large_guard.get_report()
         assert report["iteration_count"] == 4
         assert report["loops_detected"] == 0
+
+
+# === INKREMENTELLE TOKEN-ZAEHLUNG ===
+
+
+def _replay_agent_history(steps: int):
+    """Baut eine wachsende ReAct-Historie wie in BaseAgent.run auf."""
+    messages = [
+        {"role": "system", "content": "Du bist ein Agent mit vielen Tools. " * 400},
+        {"role": "user", "content": "Recherchiere aktuelle Entwicklungen zu Festkoerperbatterien."},
+    ]
+    for step in range(steps):
+        messages.append(
+            {
+                "role": "assistant",
+                "content": f'Thought: Schritt {step}\nAction: {{"method": "search_web", "params": {{"query": "q{step}"}}}}',
+            }
+        )
+        messages.append(
+            {"role": "user", "content": f"Observation {step}: " + "Ergebnistext mit Quellen. " * 120}
+        )
+        yield messages
+
+
+class TestIncrementalTokenAccounting:
+    def test_incremental_count_matches_full_recount(self):
+        incremental = ContextGuard(max_tokens=128000)
+        full = ContextGuard(max_tokens=128000, incremental=False)
+
+        for messages in _replay_agent_history(12):
+            assert incremental.count_messages_tokens(messages) == full.count_messages_tokens(messages)
+
+    def test_prefix_change_triggers_recount(self):
+        guard = ContextGuard(max_tokens=128000)
+        reference = ContextGuard(max_tokens=128000, incremental=False)
+        messages = [
+            {"role": "system", "content": "System"},
+            {"role": "user", "content": "kurz"},
+        ]
+        guard.count_messages_tokens(messages)
+
+        messages[1]["content"] = "deutlich laengerer Inhalt " * 30
+        assert guard.count_messages_tokens(messages) == reference.count_messages_tokens(messages)
+
+        messages[1] = {"role": "user", "content": "ersetzt"}
+        assert guard.count_messages_tokens(messages) == reference.count_messages_tokens(messages)
+
+        del messages[1]
+        assert guard.count_messages_tokens(messages) == reference.count_messages_tokens(messages)
+
+    def test_token_cache_is_lru_bounded(self):
+        from utils.context_guard import TokenCountCache
+
+        cache = TokenCountCache(max_entries=2)
+        cache.put("a" * 40, 1)
+        cache.put("b" * 40, 2)
+        assert cache.get("a" * 40) == 1
+        cache.put("c" * 40, 3)
+
+        assert len(cache) == 2
+        assert cache.get("b" * 40) is None
+        assert cache.get("a" * 40) == 1
+        assert cache.get("c" * 40) == 3
+
+
+@pytest.mark.skipif(
+    __import__("os").getenv("RUN_BENCHMARKS") != "1",
+    reason="Benchmarks deaktiviert (RUN_BENCHMARKS=1 zum Aktivieren).",
+)
+def test_benchmark_context_budget_replay_40_steps():
+    """Replay eines 40-Schritt-Agentenlaufs mit 4 get_status-Aufrufen pro Schritt."""
+    from utils import context_guard as context_guard_mod
+
+    def _replay(guard):
+        started = time.perf_counter()
+        for messages in _replay_agent_history(40):
+            for _ in range(4):
+                guard.get_status(messages)
+        return time.perf_counter() - started
+
+    context_guard_mod._token_cache.clear()
+    full_seconds = _replay(ContextGuard(max_tokens=128000, incremental=False))
+    incremental_seconds = _replay(ContextGuard(max_tokens=128000))
+
+    print(
+        f"\nContextGuard 40-Step-Replay: full={full_seconds * 1000:.1f}ms "
+        f"incremental={incremental_seconds * 1000:.1f}ms "
+        f"speedup={full_seconds / max(incremental_seconds, 1e-9):.1f}x"
+    )
+    assert incremental_seconds < full_seconds
@@ -0,0 +1,171 @@
+"""DAG-Ausfuehrung in AgentRegistry.delegate_parallel (depends_on)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from agent.agent_registry import AgentRegistry, AgentSpec
+from orchestration.orchestration_policy import evaluate_parallel_tasks
+
+
+def _registry(run_impl, factory_calls=None):
+    registry = AgentRegistry()
+
+    class _Agent:
+        async def run(self, task):
+            return await run_impl(task)
+
+    def _factory(_tools_desc, **_kw):
+        if factory_calls is not None:
+            factory_calls.append(1)
+        return _Agent()
+
+    for name in ("research", "document", "executor"):
+        registry._specs[name] = AgentSpec(
+            name=name, agent_type=name, capabilities=[name], factory=_factory
+        )
+    return registry
+
+
+_FAN_OUT_FAN_IN = [
+    {"task_id": "a", "agent": "research", "task": "Recherchiere OpenAI"},
+    {"task_id": "b", "agent": "research", "task": "Recherchiere Anthropic"},
+    {"task_id": "c", "agent": "research", "task": "Recherchiere Google"},
+    {"task_id": "d", "agent": "document", "task": "Fasse {{a}} zusammen", "depends_on": ["a", "b", "c"]},
+]
+
+
+def test_policy_allows_declared_graph_and_reports_stages():
+    decision = evaluate_parallel_tasks(_FAN_OUT_FAN_IN)
+
+    assert decision["allowed"] is True
+    assert decision["reason"] == "dependency_graph"
+    assert decision["execution_stages"] == [["a", "b", "c"], ["d"]]
+    assert decision["critical_path_length"] == 2
+    assert decision["dependent_task_ids"] == ["d"]
+
+
+@pytest.mark.parametrize(
+    ("tasks", "reason"),
+    [
+        (
+            [
+                {"task_id": "a", "agent": "research", "task": "X", "depends_on": ["b"]},
+                {"task_id": "b", "agent": "research", "task": "Y", "depends_on": ["a"]},
+            ],
+            "dependency_cycle",
+        ),
+        (
+            [
+                {"task_id": "a", "agent": "research", "task": "X"},
+                {"task_id": "b", "agent": "research", "task": "Y", "depends_on": ["zz"]},
+            ],
+            "unknown_dependency",
+        ),
+    ],
+)
+def test_policy_blocks_invalid_graphs(tasks, reason):
+    decision = evaluate_parallel_tasks(tasks)
+
+    assert decision["allowed"] is False
+    assert decision["reason"] == reason
+
+
+@pytest.mark.asyncio
+async def test_fan_out_fan_in_runs_in_critical_path_time_and_passes_results():
+    seen = {}
+
+    async def _run(task):
+        seen[task.split()[1] if task.startswith("Recherchiere") else "d"] = task
+        await asyncio.sleep(0.1)
+        return f"Fakten zu {task.split()[-1]}"
+
+    registry = _registry(_run)
+    started = time.perf_counter()
+    result = await registry.delegate_parallel(_FAN_OUT_FAN_IN, max_parallel=5)
+    elapsed = time.perf_counter() - started
+
+    assert result["success"] == 4
+    assert result["critical_path_length"] == 2
+    assert elapsed < 0.35  # seriell waeren es 0.4s
+    fan_in = seen["d"]
+    assert fan_in.startswith("Fasse Fakten zu OpenAI zusammen")
+    assert "# ERGEBNISSE VORHERIGER SCHRITTE" in fan_in
+    assert "Fakten zu Anthropic" in fan_in and "Fakten zu Google" in fan_in
+    assert [r["task_id"] for r in result["results"]] == ["a", "b", "c", "d"]
+    assert result["results"][3]["depends_on"] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_dependents_start_as_soon_as_their_own_inputs_finish():
+    order = []
+
+    async def _run(task):
+        delay = {"slow": 0.2, "fast": 0.02}.get(task.split()[0], 0.0)
+        await asyncio.sleep(delay)
+        order.append(task.split()[0])
+        return task
+
+    tasks = [
+        {"task_id": "s", "agent": "research", "task": "slow"},
+        {"task_id": "f", "agent": "research", "task": "fast"},
+        {"task_id": "f2", "agent": "executor", "task": "after-fast", "depends_on": ["f"]},
+    ]
+    result = await _registry(_run).delegate_parallel(tasks)
+
+    assert result["success"] == 3
+    assert order.index("after-fast") < order.index("slow")
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_skips_dependents():
+    calls = []
+
+    async def _run(task):
+        calls.append(task)
+        if task == "kaputt":
+            raise RuntimeError("boom")
+        return "ok"
+
+    tasks = [
+        {"task_id": "a", "agent": "research", "task": "kaputt"},
+        {"task_id": "b", "agent": "document", "task": "Bericht", "depends_on": ["a"]},
+    ]
+    result = await _registry(_run).delegate_parallel(tasks)
+
+    assert calls == ["kaputt"]
+    assert result["errors"] == 2
+    skipped = result["results"][1]
+    assert skipped["skipped"] is True
+    assert "Abhaengigkeit a" in skipped["error"]
+
+
+@pytest.mark.asyncio
+async def test_budget_cap_bounds_parallelism_and_instances_are_reused():
+    active = 0
+    peak = 0
+
+    async def _run(task):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.02)
+        active -= 1
+        return "ok"
+
+    factory_calls = []
+    registry = _registry(_run, factory_calls)
+    tasks = [{"task_id": f"t{i}", "agent": "research", "task": f"Thema {i}"} for i in range(4)]
+    tasks.append({"task_id": "sum", "agent": "research", "task": "Summe", "depends_on": ["t0", "t1"]})
+
+    result = await registry.delegate_parallel(tasks, max_parallel=2)
+
+    assert result["success"] == 5
+    assert peak <= 2
+    assert len(factory_calls) == 2  # hoechstens so viele Instanzen wie Slots
+
+    await registry.delegate_parallel(tasks[:1])
+    assert len(factory_calls) == 2
@@ -73,3 +73,24 @@ def test_dispatcher_health_endpoint_reports_degraded_state_for_required_componen
     assert "mcp_unreachable" in payload["degraded_reasons"]
     assert "autonomous_runner_inactive" in payload["degraded_reasons"]
     assert "telegram_gateway_inactive" in payload["degraded_reasons"]
+
+
+def test_dispatcher_health_endpoint_includes_live_stats_providers() -> None:
+    state = DispatcherHealthState(
+        host="127.0.0.1",
+        port=5010,
+        mcp_health_url="http://127.0.0.1:5000/health",
+    )
+    pool = {"in_flight": 0}
+    state.set_stats_provider("autonomous_worker_pool", lambda: dict(pool))
+    state.set_stats_provider("broken", lambda: 1 / 0)
+    client = TestClient(create_dispatcher_health_app(state))
+
+    pool["in_flight"] = 2
+    payload = client.get("/health").json()
+
+    assert payload["autonomous_worker_pool"] == {"in_flight": 2}
+    assert payload["broken"]["error"].startswith("ZeroDivisionError")
+
+    state.set_stats_provider("broken", None)
+    assert "broken" not in client.get("/health").json()
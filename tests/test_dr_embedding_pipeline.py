@@ -0,0 +1,191 @@
+"""Tests fuer die gebatchte Embedding-Pipeline und das blockweise Fakten-Grouping."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from tools.deep_research.embedding_pipeline import (
+    EmbeddingCache,
+    embed_texts,
+    group_by_similarity,
+)
+
+
+def _fake_vector(text: str) -> list:
+    # Texte "topic-<k>-..." landen auf derselben Achse → gleiche Gruppe.
+    topic = int(text.split("-")[1]) if text.startswith("topic-") else hash(text) % 7
+    vec = [0.0] * 16
+    vec[topic % 16] = 1.0
+    vec[(topic + 3) % 16] = 0.05
+    return vec
+
+
+def _dense_reference_groups(vectors, threshold):
+    arr = np.asarray(vectors, dtype=np.float32)
+    arr = arr / np.linalg.norm(arr, axis=1, keepdims=True)
+    sim = arr @ arr.T
+    groups, processed = [], set()
+    for i in range(len(vectors)):
+        if i in processed:
+            continue
+        members = [j for j in np.where(sim[i] >= threshold)[0].tolist() if j not in processed]
+        processed.update(np.where(sim[i] >= threshold)[0].tolist())
+        if members:
+            groups.append(members)
+    return groups
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_batches_all_texts_and_bounds_concurrency(tmp_path):
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+    calls = []
+
+    def _embed(batch):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.02)
+        calls.append(len(batch))
+        with lock:
+            active["now"] -= 1
+        return [_fake_vector(text) for text in batch]
+
+    texts = [f"topic-{i % 40}-fact-{i}" for i in range(230)] + ["topic-1-fact-1"]
+    cache = EmbeddingCache(tmp_path / "emb.db")
+    vectors = await embed_texts(texts, _embed, model="m", cache=cache, batch_size=50, max_concurrency=2)
+
+    assert len(vectors) == len(texts)
+    assert all(vec is not None for vec in vectors)
+    assert sum(calls) == 230  # Duplikat nur einmal angefragt
+    assert max(calls) <= 50
+    assert active["max"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_reuses_persistent_cache_across_sessions(tmp_path):
+    calls = []
+
+    def _embed(batch):
+        calls.append(list(batch))
+        return [_fake_vector(text) for text in batch]
+
+    texts = ["topic-1-a", "topic-2-b"]
+    await embed_texts(texts, _embed, model="m", cache=EmbeddingCache(tmp_path / "emb.db"))
+    fresh_session_cache = EmbeddingCache(tmp_path / "emb.db")
+    vectors = await embed_texts(texts, _embed, model="m", cache=fresh_session_cache)
+
+    assert len(calls) == 1
+    assert fresh_session_cache.hits == 2
+    assert vectors[0] == pytest.approx(_fake_vector("topic-1-a"))
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_marks_failed_batches_as_missing(tmp_path):
+    def _embed(batch):
+        if any("boom" in text for text in batch):
+            raise RuntimeError("rate limit")
+        return [_fake_vector(text) for text in batch]
+
+    vectors = await embed_texts(
+        ["topic-1-ok", "boom"],
+        _embed,
+        model="m",
+        cache=EmbeddingCache(None),
+        batch_size=1,
+    )
+
+    assert vectors[0] is not None
+    assert vectors[1] is None
+
+
+
+@pytest.mark.asyncio
+async def test_embed_texts_runs_cache_io_off_the_event_loop(tmp_path):
+    loop_thread = threading.get_ident()
+    io_threads = []
+
+    class _RecordingCache(EmbeddingCache):
+        def get_many(self, keys):
+            io_threads.append(threading.get_ident())
+            return super().get_many(keys)
+
+        def put_many(self, model, items):
+            io_threads.append(threading.get_ident())
+            super().put_many(model, items)
+
+    await embed_texts(
+        ["topic-1-a"], lambda batch: [_fake_vector(t) for t in batch], model="m",
+        cache=_RecordingCache(tmp_path / "emb.db"),
+    )
+
+    assert len(io_threads) == 2
+    assert loop_thread not in io_threads
+
+
+def test_embedding_cache_evicts_least_recently_used_rows(monkeypatch, tmp_path):
+    import sqlite3
+
+    from tools.deep_research import embedding_pipeline as pipeline
+
+    db_path = tmp_path / "emb.db"
+    # Alt-Schema ohne last_access wird beim Oeffnen migriert.
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE embedding_cache (key TEXT PRIMARY KEY, model TEXT NOT NULL,"
+            " dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO embedding_cache VALUES ('legacy', 'm', 1, ?)",
+            (np.asarray([1.0], dtype=np.float32).tobytes(),),
+        )
+    monkeypatch.setattr(pipeline, "EMBEDDING_CACHE_EVICT_EVERY", 1)
+
+    cache = EmbeddingCache(db_path, memory_entries=0, max_rows=3)
+    cache.put_many("m", {"a": [1.0], "b": [2.0]})
+    time.sleep(0.01)
+    assert set(cache.get_many(["legacy", "a"])) == {"legacy", "a"}  # Zugriff frischt auf
+    cache.put_many("m", {"c": [3.0]})
+
+    assert cache.evicted == 1
+    assert set(EmbeddingCache(db_path).get_many(["legacy", "a", "b", "c"])) == {"legacy", "a", "c"}
+
+
+def test_group_by_similarity_matches_dense_matrix_grouping():
+    rng = np.random.default_rng(7)
+    centers = rng.normal(size=(12, 32))
+    vectors = [
+        (centers[i % 12] + rng.normal(scale=0.15, size=32)).tolist()
+        for i in range(600)
+    ]
+
+    blocked = group_by_similarity(vectors, 0.8, block_size=64)
+
+    assert blocked == _dense_reference_groups(vectors, 0.8)
+    assert sorted(i for group in blocked for i in group) == list(range(600))
+
+
+def test_group_by_similarity_keeps_missing_vectors_as_singletons():
+    vectors = [[1.0, 0.0], None, [0.99, 0.01], [0.0, 1.0]]
+
+    assert group_by_similarity(vectors, 0.9) == [[0, 2], [1], [3]]
+
+
+@pytest.mark.asyncio
+async def test_group_similar_facts_handles_more_than_50_facts(monkeypatch, tmp_path):
+    import tools.deep_research.embedding_pipeline as pipeline
+    import tools.deep_research.tool as t
+
+    monkeypatch.setattr(pipeline, "_default_cache", EmbeddingCache(tmp_path / "emb.db"))
+    monkeypatch.setattr(t, "_embed_batch_sync", lambda batch: [_fake_vector(x) for x in batch])
+
+    facts = [{"fact": f"topic-{i % 5}-fact-{i}", "source_url": f"http://s{i}.com"} for i in range(120)]
+    groups = await t._group_similar_facts(facts, threshold=0.9)
+
+    assert len(groups) == 5
+    assert sum(len(group) for group in groups) == 120
+    assert groups[0][0]["fact"] == "topic-0-fact-0"
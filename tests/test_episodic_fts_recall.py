@@ -0,0 +1,81 @@
+"""FTS5-Index ueber interaction_events und conversations fuer Episoden-Recall."""
+
+from __future__ import annotations
+
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from memory.memory_system import Message, PersistentMemory
+
+
+def _backdate_events(db_path: Path, days: int) -> None:
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "UPDATE interaction_events SET created_at = ?",
+            ((datetime.now() - timedelta(days=days)).isoformat(),),
+        )
+
+
+def test_interaction_events_are_indexed_by_trigger_beyond_recent_window(tmp_path: Path):
+    memory = PersistentMemory(db_path=tmp_path / "fts.db")
+    memory.store_interaction_event("s_old", "Wie kalibriere ich den Drucker?", "Ueber das Wartungsmenue.")
+    _backdate_events(memory.db_path, days=90)
+    for i in range(30):
+        memory.store_interaction_event("s_new", f"Frage {i} zum Wetter", "sonnig")
+
+    assert all("Drucker" not in e["user_input"] for e in memory.get_recent_interaction_events(limit=20))
+
+    hits = memory.search_interaction_events("drucker kalibrieren", limit=5)
+    assert [hit["session_id"] for hit in hits] == ["s_old"]
+    assert hits[0]["fts_score"] > 0
+    assert memory.search_interaction_events("drucker", session_id="s_new") == []
+
+
+def test_fts_ranking_applies_time_decay(tmp_path: Path):
+    memory = PersistentMemory(db_path=tmp_path / "fts.db")
+    memory.store_interaction_event("s_old", "grafikkarten preise", "alt")
+    _backdate_events(memory.db_path, days=30)
+    memory.store_interaction_event("s_new", "grafikkarten preise", "neu")
+
+    hits = memory.search_interaction_events("grafikkarten", limit=5)
+
+    assert [hit["session_id"] for hit in hits] == ["s_new", "s_old"]
+    assert hits[0]["fts_score"] > hits[1]["fts_score"]
+
+
+def test_fts_index_follows_deletes_and_backfills_existing_rows(tmp_path: Path):
+    db_path = tmp_path / "fts.db"
+    memory = PersistentMemory(db_path=db_path)
+    memory.store_interaction_event("s1", "termin beim zahnarzt", "notiert")
+    memory.store_conversation("s1", [Message(role="user", content="Urlaub in Portugal planen")])
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM interaction_events")
+        conn.execute("INSERT INTO interaction_events (session_id, user_input, assistant_response) VALUES ('s2', 'steuererklaerung', 'ok')")
+        conn.executescript("DROP TABLE interaction_events_fts; DROP TABLE conversations_fts;")
+
+    reopened = PersistentMemory(db_path=db_path)
+
+    assert reopened.search_interaction_events("zahnarzt") == []
+    assert [hit["session_id"] for hit in reopened.search_interaction_events("steuererklaerung")] == ["s2"]
+    conversations = reopened.search_conversations("portugal")
+    assert conversations and conversations[0]["messages"][0]["content"] == "Urlaub in Portugal planen"
+    assert reopened.search_conversations("role") == []
+
+
+def test_unified_recall_finds_old_events_via_fts(tmp_path: Path, monkeypatch):
+    from memory.memory_system import MemoryManager
+
+    monkeypatch.setattr(MemoryManager, "_load_self_model_state", lambda self: None)
+    manager = MemoryManager()
+    manager.persistent = PersistentMemory(db_path=tmp_path / "fts.db")
+    monkeypatch.setattr(manager, "find_related_memories", lambda *_a, **_k: [])
+    manager.persistent.store_interaction_event("s_old", "Wie kalibriere ich den Drucker?", "Ueber das Wartungsmenue.")
+    _backdate_events(manager.persistent.db_path, days=120)
+    for i in range(40):
+        manager.persistent.store_interaction_event("s_new", f"Frage {i} zum Wetter", "sonnig")
+
+    result = manager.unified_recall("drucker wartungsmenue", n_results=3)
+
+    assert result["meta"]["event_search"] == "fts5"
+    assert "Drucker" in result["memories"][0]["text"]
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from orchestration.heartbeat_pipeline import HeartbeatPipeline, HeartbeatStage
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_independent_stages_concurrently_and_respects_dependencies() -> None:
+    pipeline = HeartbeatPipeline(max_workers=4, default_timeout_s=5)
+    order: list[str] = []
+    lock = threading.Lock()
+
+    def _stage(name: str, delay: float, value=None):
+        def _fn(ctx):
+            time.sleep(delay)
+            with lock:
+                order.append(name)
+            return value
+        return _fn
+
+    stages = [
+        HeartbeatStage("planner", _stage("planner", 0.1)),
+        HeartbeatStage("healing", _stage("healing", 0.1)),
+        HeartbeatStage("goals", _stage("goals", 0.1)),
+        HeartbeatStage("review", _stage("review", 0.01), ("planner",)),
+        HeartbeatStage("scorecard", _stage("scorecard", 0.01, {"score": 80}), ("review", "healing", "goals")),
+        HeartbeatStage("hardening", lambda ctx: order.append(f"hardening:{ctx['scorecard']['score']}"), ("scorecard",)),
+    ]
+
+    started = time.monotonic()
+    run = await pipeline.run(stages)
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 0.28  # 3 × 0.1s parallel statt sequenziell
+    assert order.index("review") > order.index("planner")
+    assert order[-2:] == ["scorecard", "hardening:80"]
+    assert {result.status for result in run.stages.values()} == {"ok"}
+    assert run.stages["planner"].duration_s >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_keeps_event_loop_responsive_during_blocking_stages() -> None:
+    pipeline = HeartbeatPipeline(max_workers=2, default_timeout_s=5)
+    ticks = 0
+
+    async def _ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(_ticker())
+    await pipeline.run([HeartbeatStage("slow_sqlite", lambda ctx: time.sleep(0.2))])
+    ticker.cancel()
+
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_pipeline_timeout_skips_dependents_and_does_not_restart_running_stage() -> None:
+    pipeline = HeartbeatPipeline(max_workers=2, default_timeout_s=5)
+    release = threading.Event()
+    calls = {"stuck": 0, "after": 0, "other": 0}
+
+    def _stuck(ctx):
+        calls["stuck"] += 1
+        release.wait(2)
+
+    def _count(name):
+        def _fn(ctx):
+            calls[name] += 1
+        return _fn
+
+    stages = [
+        HeartbeatStage("stuck", _stuck, timeout_s=0.05),
+        HeartbeatStage("after", _count("after"), ("stuck",)),
+        HeartbeatStage("other", _count("other")),
+    ]
+
+    first = await pipeline.run(stages)
+    second = await pipeline.run(stages)
+    release.set()
+
+    assert first.stages["stuck"].status == "timeout"
+    assert first.stages["after"].status == "skipped"
+    assert second.stages["stuck"].status == "still_running"
+    assert calls == {"stuck": 1, "after": 0, "other": 2}
+    assert pipeline.stats()["last_run"]["stages"]["other"]["status"] == "ok"
+    pipeline.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_isolates_stage_errors_and_rejects_cycles() -> None:
+    pipeline = HeartbeatPipeline(max_workers=2, default_timeout_s=5)
+
+    def _boom(ctx):
+        raise RuntimeError("db locked")
+
+    run = await pipeline.run(
+        [
+            HeartbeatStage("broken", _boom),
+            HeartbeatStage("dependent", lambda ctx: "ran", ("broken",)),
+        ]
+    )
+    assert run.stages["broken"].status == "error"
+    assert "db locked" in run.stages["broken"].error
+    assert run.stages["dependent"].status == "ok"
+
+    with pytest.raises(ValueError):
+        await pipeline.run(
+            [
+                HeartbeatStage("a", lambda ctx: None, ("b",)),
+                HeartbeatStage("b", lambda ctx: None, ("a",)),
+            ]
+        )
+
+
+@pytest.mark.asyncio
+async def test_autonomous_runner_heartbeat_builds_ordered_stages(monkeypatch, tmp_path) -> None:
+    from orchestration.autonomous_runner import AutonomousRunner
+    from orchestration.task_queue import TaskQueue
+
+    for flag in (
+        "AUTONOMY_GOALS_ENABLED",
+        "AUTONOMY_PLANNING_ENABLED",
+        "AUTONOMY_REPLANNING_ENABLED",
+        "AUTONOMY_SCORECARD_ENABLED",
+        "AUTONOMY_SELF_HEALING_ENABLED",
+    ):
+        monkeypatch.setenv(flag, "false")
+    monkeypatch.setenv("AUTONOMY_BLACKBOARD_ENABLED", "false")
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    queue.add(description="offener Task")
+    monkeypatch.setattr("orchestration.autonomous_runner.get_queue", lambda: queue)
+
+    runner = AutonomousRunner(interval_minutes=15)
+    calls: list[str] = []
+
+    class _Planner:
+        def run_cycle(self):
+            calls.append(f"planner:{threading.current_thread().name.split('_')[0]}")
+            return {"status": "ok"}
+
+    class _Review:
+        def run_cycle(self):
+            calls.append("review")
+            return {"status": "ok"}
+
+    runner._long_term_planner = _Planner()
+    runner._commitment_review_engine = _Review()
+    monkeypatch.setattr("orchestration.autonomous_runner._planning_feature_enabled", lambda: True)
+    monkeypatch.setattr(runner, "_export_planning_kpi_snapshot", lambda: calls.append("planning_kpi"))
+    monkeypatch.setattr(runner, "_export_commitment_review_kpi_snapshot", lambda: None)
+
+    stages = {stage.name: stage for stage in runner._build_heartbeat_stages()}
+    assert stages["commitment_review"].depends_on == ("long_term_planner",)
+    assert set(stages["planning_kpi"].depends_on) == {"long_term_planner", "commitment_review"}
+
+    await runner._on_wake(event=None)
+
+    assert calls[0] == "planner:heartbeat-stage"
+    assert calls.index("review") < calls.index("planning_kpi")
+    assert runner._work_signal.is_set()
+    assert runner.get_heartbeat_stats()["last_run"]["stages"]["long_term_planner"]["status"] == "ok"
+    runner._heartbeat_pipeline.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_trigger_stage_schedules_telegram_on_runner_loop(monkeypatch, tmp_path) -> None:
+    from datetime import datetime
+
+    from orchestration.autonomous_runner import AutonomousRunner
+    from orchestration.proactive_triggers import ProactiveTrigger, ProactiveTriggerEngine
+    from orchestration.task_queue import TaskQueue
+
+    monkeypatch.setenv("AUTONOMY_BLACKBOARD_ENABLED", "false")
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    monkeypatch.setattr("orchestration.autonomous_runner.get_queue", lambda: queue)
+    monkeypatch.setattr("orchestration.autonomous_runner._trigger_feature_enabled", lambda: True)
+
+    loop = asyncio.get_running_loop()
+    sent = asyncio.Event()
+    messages: list[tuple[str, bool]] = []
+
+    async def _fake_send(msg, parse_mode="Markdown", urgent=False):
+        messages.append((msg, asyncio.get_running_loop() is loop))
+        sent.set()
+        return True
+
+    monkeypatch.setattr("utils.telegram_notify.send_telegram", _fake_send)
+
+    engine = ProactiveTriggerEngine(db_path=tmp_path / "triggers.db")
+    monkeypatch.setattr(engine, "_enqueue_trigger_task", lambda trigger: None)
+    engine.add_trigger(ProactiveTrigger(
+        name="Jetzt-Check",
+        time_of_day=datetime.now().strftime("%H:%M"),
+        action_query="ping",
+    ))
+
+    runner = AutonomousRunner(interval_minutes=15)
+    runner._trigger_engine = engine
+    assert "triggers" in {stage.name for stage in runner._build_heartbeat_stages()}
+
+    await runner._on_wake(event=None)
+    await asyncio.wait_for(sent.wait(), timeout=2)
+
+    assert runner.get_heartbeat_stats()["last_run"]["stages"]["triggers"]["status"] == "ok"
+    assert [(msg.split("\n")[0], on_loop) for msg, on_loop in messages] == [
+        ("⏰ *Trigger 'Jetzt-Check' ausgelöst*", True)
+    ]
+    runner._heartbeat_pipeline.shutdown()
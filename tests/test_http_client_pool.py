@@ -0,0 +1,92 @@
+"""Tests fuer die geteilte HTTP-Client-Registry."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+import utils.http_client_pool as pool
+
+
+@pytest.mark.asyncio
+async def test_get_async_client_reuses_client_per_loop_and_profile():
+    first = pool.get_async_client()
+    second = pool.get_async_client()
+    local = pool.get_async_client("local")
+
+    try:
+        assert first is second
+        assert local is not first
+        assert local.trust_env is False
+        assert first.follow_redirects is True
+        assert set(pool.get_pool_stats()["profiles"]) >= {"default", "local"}
+    finally:
+        await pool.aclose_async_clients()
+
+    assert first.is_closed
+    assert pool.get_async_client() is not first
+    await pool.aclose_async_clients()
+
+
+def test_get_async_client_creates_separate_clients_per_event_loop():
+    async def _grab():
+        client = pool.get_async_client()
+        await pool.aclose_async_clients()
+        return client
+
+    assert asyncio.run(_grab()) is not asyncio.run(_grab())
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reuses_keepalive_connection(monkeypatch):
+    seen = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.host)
+        return httpx.Response(200, text="ok")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        pool.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(_handler), **kwargs),
+    )
+
+    client = pool.get_async_client()
+    for _ in range(3):
+        async with pool.host_slot("https://example.com/a"):
+            resp = await pool.get_async_client().get("https://example.com/a")
+        assert resp.text == "ok"
+
+    assert seen == ["example.com"] * 3
+    assert pool.get_pool_stats()["async_clients_created"] >= 1
+    assert pool.get_async_client() is client
+    await pool.aclose_async_clients()
+
+
+@pytest.mark.asyncio
+async def test_host_slot_limits_concurrency_per_host(monkeypatch):
+    monkeypatch.setattr(pool, "HTTP_POOL_MAX_PER_HOST", 2)
+    active = {"example.com": 0, "other.org": 0}
+    peak = dict(active)
+
+    async def _request(url: str, host: str):
+        async with pool.host_slot(url):
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    await asyncio.gather(
+        *(_request(f"https://example.com/{i}", "example.com") for i in range(6)),
+        *(_request(f"https://other.org/{i}", "other.org") for i in range(2)),
+    )
+
+    assert peak == {"example.com": 2, "other.org": 2}
+    await pool.aclose_async_clients()
+
+
+def test_get_sync_session_is_shared():
+    assert pool.get_sync_session() is pool.get_sync_session()
@@ -0,0 +1,185 @@
+"""Hybrid-Retrieval: parallele Backends, RRF-Fusion, Query-Embedding-Cache."""
+
+from __future__ import annotations
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import tools.shared_context as shared_context
+from memory.hybrid_retrieval import HybridRetriever, calibrate_bm25, reciprocal_rank_fusion
+from memory.memory_system import SemanticMemoryStore
+
+
+def _hit(doc_id, content, relevance):
+    return {"doc_id": doc_id, "content": content, "relevance": relevance}
+
+
+def test_rrf_promotes_hits_found_by_both_backends():
+    fused = reciprocal_rank_fusion(
+        {
+            "semantic": [_hit("a", "Nutzer mag JSON", 0.7), _hit("b", "Termin Montag", 0.9)],
+            "keyword_fts5": [_hit("kw1", ">>>Nutzer<<< mag JSON", 0.95), _hit("kw2", "Anderes", 0.4)],
+        },
+        k=60,
+    )
+
+    assert [item["doc_id"] for item in fused[:1]] == ["a"]
+    assert fused[0]["backend_ranks"] == {"semantic": 1, "keyword_fts5": 1}
+    assert fused[0]["relevance"] == 0.95
+    assert len(fused) == 3
+
+
+def test_bm25_calibration_is_bounded_and_monotonic():
+    assert calibrate_bm25(-0.5) < calibrate_bm25(-4.0) < calibrate_bm25(-20.0) < 1.0
+    assert calibrate_bm25(None) == 0.0
+
+
+def test_backends_run_concurrently_and_report_latency():
+    def slow(name):
+        def _call():
+            time.sleep(0.15)
+            return [_hit(name, f"inhalt {name}", 0.5)]
+
+        return _call
+
+    retriever = HybridRetriever(parallel=True, timeout_s=2.0)
+    started = time.perf_counter()
+    results = retriever.search("q", n_results=5, backends={"semantic": slow("s"), "keyword_fts5": slow("k")})
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.28
+    assert {item["doc_id"] for item in results} == {"s", "k"}
+    backends = retriever.last_stats["backends"]
+    assert backends["semantic"]["ms"] >= 140 and backends["keyword_fts5"]["results"] == 1
+    assert retriever.stats()["backends"]["semantic"]["calls"] == 1
+
+
+def test_failing_or_slow_backend_does_not_block_the_other():
+    def broken():
+        raise RuntimeError("qdrant down")
+
+    def hanging():
+        time.sleep(0.5)
+        return [_hit("late", "zu spaet", 0.9)]
+
+    retriever = HybridRetriever(parallel=True, timeout_s=0.1)
+    results = retriever.search(
+        "q",
+        n_results=5,
+        backends={"semantic": broken, "keyword_fts5": lambda: [_hit("k", "da", 0.3)], "slow": hanging},
+    )
+
+    assert [item["doc_id"] for item in results] == ["k"]
+    assert retriever.last_stats["backends"]["semantic"]["error"] == "qdrant down"
+    assert retriever.last_stats["backends"]["slow"]["error"] == "timeout"
+    assert retriever.stats()["backends"]["slow"]["timeouts"] == 1
+
+
+def test_backend_with_abandoned_job_is_skipped_until_it_finishes():
+    import threading
+
+    release = threading.Event()
+    calls = {"slow": 0}
+
+    def hanging():
+        calls["slow"] += 1
+        release.wait(2.0)
+        return [_hit("late", "zu spaet", 0.9)]
+
+    backends = {"slow": hanging, "keyword_fts5": lambda: [_hit("k", "da", 0.3)]}
+    retriever = HybridRetriever(parallel=True, timeout_s=0.05)
+    retriever.search("q", n_results=5, backends=backends)
+    second = retriever.search("q", n_results=5, backends=backends)
+
+    assert [item["doc_id"] for item in second] == ["k"]
+    assert retriever.last_stats["backends"]["slow"]["error"] == "busy"
+    assert calls["slow"] == 1
+    assert retriever._executor_workers == len(backends)
+
+    release.set()
+    deadline = time.monotonic() + 2.0
+    while retriever._busy_backends(["slow"]) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    retriever.search("q", n_results=5, backends=backends)
+    assert calls["slow"] == 2
+    assert retriever.stats()["backends"]["slow"]["skipped"] == 1
+
+
+class _EmbeddingChromaCollection:
+    name = "fake_chroma"
+
+    def __init__(self):
+        self.embed_calls = 0
+        self.queries = []
+
+    def embed(self, texts):
+        self.embed_calls += 1
+        return [[0.1, 0.2, 0.3] for _ in texts]
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        return {
+            "ids": [["user_profile_lang"]],
+            "documents": [["Antworte auf Deutsch"]],
+            "metadatas": [[{"category": "user_profile", "key": "lang"}]],
+            "distances": [[0.2]],
+        }
+
+
+def test_query_embeddings_are_cached_by_normalized_text():
+    collection = _EmbeddingChromaCollection()
+    store = SemanticMemoryStore(collection, embedding_function=collection.embed)
+
+    store.find_related_memories("Welche  Sprache?")
+    store.find_related_memories("welche sprache?")
+
+    assert collection.embed_calls == 1
+    assert all("query_embeddings" in query and "query_texts" not in query for query in collection.queries)
+    assert store.query_embeddings.stats()["hits"] == 1
+
+
+def test_memory_manager_fuses_semantic_and_fts5_results(monkeypatch):
+    from memory.memory_system import MemoryManager
+
+    monkeypatch.setenv("MEMORY_BACKEND", "chromadb")
+    collection = _EmbeddingChromaCollection()
+    monkeypatch.setattr(shared_context, "memory_collection", collection, raising=False)
+    monkeypatch.setattr(shared_context, "memory_embedding_function", collection.embed, raising=False)
+    monkeypatch.setattr(MemoryManager, "_load_self_model_state", lambda self: None)
+    manager = MemoryManager()
+    fts_hit = SimpleNamespace(source="memory", snippet="Nutzer bevorzugt >>>Deutsch<<<", rank=3.0)
+    monkeypatch.setattr(manager, "_get_markdown_store", lambda: SimpleNamespace(search=lambda q, limit: [fts_hit]))
+
+    results = manager.find_related_memories("Sprache Deutsch", n_results=5)
+
+    assert [item["source"] for item in results] == ["semantic", "keyword_fts5"]
+    assert results[0]["relevance"] == pytest.approx(0.8)
+    assert results[1]["relevance"] == pytest.approx(0.75)
+    stats = manager.get_retrieval_stats()
+    assert set(stats["last"]["backends"]) == {"semantic", "keyword_fts5"}
+    assert stats["query_embedding_cache"]["misses"] == 1
+
+
+@pytest.mark.skipif(os.getenv("RUN_BENCHMARKS") != "1", reason="Benchmarks deaktiviert (RUN_BENCHMARKS=1 zum Aktivieren).")
+def test_benchmark_parallel_vs_sequential_retrieval():
+    def backend(delay_s):
+        def _call():
+            time.sleep(delay_s)
+            return [_hit(str(delay_s), "x", 0.5)]
+
+        return _call
+
+    backends = {"semantic": backend(0.06), "keyword_fts5": backend(0.02)}
+    timings = {}
+    for parallel in (False, True):
+        retriever = HybridRetriever(parallel=parallel)
+        started = time.perf_counter()
+        for _ in range(10):
+            retriever.search("q", n_results=5, backends=backends)
+        timings[parallel] = (time.perf_counter() - started) / 10 * 1000.0
+
+    print(f"\nhybrid retrieval: sequential {timings[False]:.1f} ms, parallel {timings[True]:.1f} ms")
+    assert timings[True] < timings[False]
@@ -413,3 +413,98 @@ def test_cap_parallelism_for_budget_reduces_soft_limit(monkeypatch):
 
     assert capped == 2
     assert decision.state == "soft_limit"
+
+
+def test_llm_spend_ledger_tracks_writes_and_reconciles_with_sqlite(tmp_path):
+    import sqlite3
+    from datetime import datetime, timedelta
+
+    from orchestration.self_improvement_engine import LLMUsageRecord, SelfImprovementEngine
+
+    engine = SelfImprovementEngine(db_path=tmp_path / "usage.db")
+    engine.record_llm_usage(LLMUsageRecord(trace_id="a", session_id="s1", agent="meta", cost_usd=0.4))
+    engine.record_llm_usage(LLMUsageRecord(trace_id="b", session_id="s2", agent="research", cost_usd=0.1))
+    engine.record_llm_usage(
+        LLMUsageRecord(
+            trace_id="old",
+            session_id="s1",
+            agent="meta",
+            cost_usd=5.0,
+            timestamp=(datetime.now() - timedelta(days=3)).isoformat(),
+        )
+    )
+
+    assert engine.get_llm_spend(days=1) == pytest.approx(0.5)
+    assert engine.get_llm_spend(days=1, agent="meta") == pytest.approx(0.4)
+    assert engine.get_llm_spend(days=1, session_id="s2") == pytest.approx(0.1)
+    assert engine.get_llm_spend(days=1) == pytest.approx(
+        engine.get_llm_usage_summary(days=1)["total_cost_usd"]
+    )
+    assert engine.get_llm_spend(days=7, agent="meta") == pytest.approx(5.4)
+
+    # Writes aus anderen Prozessen landen erst nach dem Reconcile im Ledger.
+    with sqlite3.connect(str(engine.db_path)) as conn:
+        conn.execute(
+            """INSERT INTO llm_usage_analytics
+               (trace_id, session_id, agent, provider, model, cost_usd, timestamp)
+               VALUES ('ext', 's3', 'meta', 'openai', 'gpt', 0.25, ?)""",
+            (datetime.now().isoformat(),),
+        )
+        conn.commit()
+    engine.llm_spend_ledger.reconcile()
+    assert engine.get_llm_spend(days=1, agent="meta") == pytest.approx(0.65)
+
+
+def test_llm_spend_ledger_counts_records_around_reconcile_once(tmp_path):
+    import sqlite3
+    from datetime import datetime
+
+    from orchestration.self_improvement_engine import LLMUsageRecord, SelfImprovementEngine
+
+    engine = SelfImprovementEngine(db_path=tmp_path / "usage.db")
+    ledger = engine.llm_spend_ledger
+    engine.record_llm_usage(LLMUsageRecord(trace_id="a", session_id="s1", agent="meta", cost_usd=0.4))
+    with sqlite3.connect(str(engine.db_path)) as conn:
+        row_id = conn.execute(
+            """INSERT INTO llm_usage_analytics (trace_id, session_id, agent, provider, model, cost_usd, timestamp)
+               VALUES ('b', 's1', 'meta', 'openai', 'gpt', 0.1, ?)""",
+            (datetime.now().isoformat(),),
+        ).lastrowid
+        conn.commit()
+    ledger.reconcile()
+
+    now = datetime.now().isoformat()
+    # Zeile schon im Rebuild (record() kam nach dem Lesen) -> nicht doppelt buchen.
+    ledger.record(agent="meta", session_id="s1", cost_usd=0.1, timestamp=now, row_id=row_id)
+    # Neuere Zeile bzw. nicht persistierte Buchung -> zaehlt.
+    ledger.record(agent="meta", session_id="s1", cost_usd=0.2, timestamp=now, row_id=row_id + 1)
+    ledger.record(agent="meta", session_id="s1", cost_usd=0.05, timestamp=now)
+
+    assert ledger.total_cost(days=1, agent="meta") == pytest.approx(0.75)
+
+
+def test_evaluate_llm_budget_prefers_in_memory_ledger(monkeypatch):
+    class _LedgerEngine:
+        def get_llm_spend(self, *, days=1, session_id=None, agent=None):
+            del days
+            if session_id:
+                return 0.1
+            if agent:
+                return 0.2
+            return 3.5
+
+        def get_llm_usage_summary(self, **kwargs):
+            raise AssertionError("Budget-Hotpath darf keine SQL-Summary laden")
+
+    monkeypatch.setattr(llm_budget_guard, "get_improvement_engine", lambda: _LedgerEngine())
+    monkeypatch.setenv("TIMUS_LLM_BUDGET_GLOBAL_HARD_LIMIT_USD", "3.0")
+
+    decision = llm_budget_guard.evaluate_llm_budget(
+        agent="meta",
+        session_id="sess-1",
+        requested_max_tokens=100,
+    )
+
+    assert decision.blocked is True
+    assert [scope.scope for scope in decision.scopes] == ["global", "agent", "session"]
+    assert decision.scopes[1].current_cost_usd == pytest.approx(0.2)
@@ -0,0 +1,105 @@
+"""Gemeinsame Memory-DB: gepoolte Reader, ein Writer-Thread mit Group Commit."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from memory.agent_blackboard import AgentBlackboard
+from memory.memory_db import MemoryDB, get_memory_db
+
+
+def _make_db(tmp_path: Path) -> MemoryDB:
+    db = MemoryDB(tmp_path / "memory.db")
+    db.executescript("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT NOT NULL);")
+    return db
+
+
+def test_registry_returns_one_instance_per_file(tmp_path: Path):
+    first = get_memory_db(tmp_path / "shared.db")
+    second = get_memory_db(tmp_path / "sub" / ".." / "shared.db")
+
+    assert first is second
+    assert get_memory_db(tmp_path / "other.db") is not first
+
+
+def test_readers_are_pooled_per_thread_and_read_only(tmp_path: Path):
+    db = _make_db(tmp_path)
+    db.write(lambda conn: conn.execute("INSERT INTO items (name) VALUES ('a')"))
+
+    with db.read() as first:
+        count = first.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    with db.read() as second:
+        journal_mode = second.execute("PRAGMA journal_mode").fetchone()[0]
+        with pytest.raises(sqlite3.OperationalError):
+            second.execute("INSERT INTO items (name) VALUES ('b')")
+
+    assert first is second
+    assert count == 1
+    assert journal_mode == "wal"
+    db.close()
+
+
+def test_failing_job_is_rolled_back_without_losing_the_batch(tmp_path: Path):
+    db = _make_db(tmp_path)
+    started, gate = threading.Event(), threading.Event()
+    blocker = db.submit(lambda conn: started.set() or gate.wait(5))
+    assert started.wait(5)
+    ok = db.submit(lambda conn: conn.execute("INSERT INTO items (name) VALUES ('ok')").rowcount)
+
+    def _broken(conn: sqlite3.Connection) -> None:
+        conn.execute("INSERT INTO items (name) VALUES ('rolled back')")
+        conn.execute("INSERT INTO items (name) VALUES (NULL)")
+
+    broken = db.submit(_broken)
+    gate.set()
+
+    assert blocker.result(5) is True and ok.result(5) == 1
+    with pytest.raises(sqlite3.IntegrityError):
+        broken.result(5)
+    with db.read() as conn:
+        names = [row[0] for row in conn.execute("SELECT name FROM items").fetchall()]
+    assert names == ["ok"]
+    assert db.stats()["max_batch"] == 2
+    db.close()
+
+
+def test_concurrent_writers_are_group_committed(tmp_path: Path):
+    db = _make_db(tmp_path)
+    written_before = db.stats()["jobs_written"]
+    errors = []
+
+    def _worker(worker: int) -> None:
+        try:
+            for i in range(25):
+                db.write(lambda conn: conn.execute("INSERT INTO items (name) VALUES (?)", (f"{worker}:{i}",)))
+        except Exception as e:  # pragma: no cover - Fehlerpfad nur zur Diagnose
+            errors.append(e)
+
+    threads = [threading.Thread(target=_worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = db.stats()
+    assert errors == []
+    assert stats["jobs_written"] - written_before == 200
+    assert stats["commits"] <= 200
+    with db.read() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 200
+    db.close()
+
+
+def test_blackboard_and_external_writers_share_the_file(tmp_path: Path):
+    db_path = tmp_path / "memory.db"
+    board = AgentBlackboard(db_path)
+    board.write("research", "web_data", "k", {"v": 1})
+    board.write("research", "web_data", "k", {"v": 2})
+
+    assert [entry["value"] for entry in board.read("web_data")] == [{"v": 2}]
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM agent_blackboard").fetchone()[0] == 1
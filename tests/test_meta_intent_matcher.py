@@ -0,0 +1,114 @@
+"""Vorkompilierter Hint-Matcher: gleiche Treffer wie die alten Einzelscans, einmal pro Turn."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+import orchestration.meta_orchestration as meta
+from orchestration.general_decision_kernel_eval import GDK5_UNSEEN_EVAL_CASES
+from orchestration.meta_intent_matcher import MetaIntentMatcher, normalize_intent_text
+from orchestration.meta_orchestration_eval import META_ORCHESTRATION_EVAL_CASES
+
+_EXTRA_QUERIES = (
+    "Recherchiere aktuelle Studien zu Kreatin und erstelle ein PDF",
+    "Öffne booking.com und suche ein Hotel in Berlin",
+    "Wie ist das Wetter heute in   Frankfurt?",
+    "Ändere den Fehler im Code, der Traceback zeigt auf repo/main.py",
+    "Schick die Zusammenfassung an meine E-Mail",
+    "",
+)
+
+
+def _corpus() -> list[str]:
+    queries = [str(case["query"]) for case in META_ORCHESTRATION_EVAL_CASES]
+    queries += [str(case["query"]) for case in GDK5_UNSEEN_EVAL_CASES]
+    return queries + list(_EXTRA_QUERIES)
+
+
+def _family_hints() -> dict[str, tuple[str, ...]]:
+    import re
+
+    source = open(meta.__file__, encoding="utf-8").read()
+    block = re.search(r"_META_INTENT_MATCHER = MetaIntentMatcher\(\n    \{\n(.*?)\n    \}", source, re.S)
+    families = {}
+    for line in block.group(1).splitlines():
+        name, constant = line.strip().rstrip(",").split(": ")
+        families[name.strip('"')] = getattr(meta, constant)
+    return families
+
+
+def test_matcher_hits_equal_legacy_scans_on_eval_corpus():
+    families = _family_hints()
+    assert set(families) == meta._META_INTENT_MATCHER.family_names
+
+    for query in _corpus():
+        normalized = normalize_intent_text(query)
+        expected = {name for name, hints in families.items() if normalized and meta._has_any(normalized, hints)}
+        assert meta._META_INTENT_MATCHER.match(query) == expected, query
+
+
+def test_pruning_keeps_only_shortest_covering_hints():
+    matcher = MetaIntentMatcher({"research": ("recherchiere", "recherche", "recherche zu", "quelle", "quelle")})
+
+    assert matcher.stats()["hints"] == 3  # "recherche zu" und das Duplikat fallen weg
+    assert matcher.match("Bitte  RECHERCHIERE das") == frozenset({"research"})
+    assert matcher.match("Quellen bitte") == frozenset({"research"})
+    assert matcher.match("nichts davon") == frozenset()
+
+
+def test_match_is_memoized_per_normalized_text_and_rejects_unknown_family():
+    matcher = MetaIntentMatcher({"browser": ("öffne",)})
+
+    assert matcher.has("Öffne YouTube", "browser")
+    assert matcher.has("öffne   youtube", "browser")
+    assert matcher.stats()["cache_hits"] == 1
+    with pytest.raises(KeyError):
+        matcher.has("Öffne YouTube", "unknown")
+
+
+def test_followup_field_patterns_are_compiled_once():
+    meta._meta_followup_field_pattern.cache_clear()
+    raw = "last_user: Reiseplanung\nsession_summary: Hotel finden\n# CURRENT USER QUERY\nund weiter?"
+
+    assert meta._extract_meta_followup_field(raw, "last_user") == "Reiseplanung"
+    assert meta._extract_meta_followup_field(raw, "session_summary") == "Hotel finden"
+    assert meta._extract_meta_followup_field(raw, "last_user") == "Reiseplanung"
+    assert meta._meta_followup_field_pattern.cache_info().misses == 2
+
+
+@pytest.mark.skipif(os.getenv("RUN_BENCHMARKS") != "1", reason="Benchmarks deaktiviert (RUN_BENCHMARKS=1 zum Aktivieren).")
+def test_benchmark_meta_intent_matching():
+    families = _family_hints()
+    queries = [normalize_intent_text(q) for q in _corpus() if q]
+    rounds = 200
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            {name for name, hints in families.items() if meta._has_any(query, hints)}
+    legacy_us = (time.perf_counter() - started) / (rounds * len(queries)) * 1e6
+
+    matcher = MetaIntentMatcher(families, cache_size=1)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            matcher._scan(query)
+    matcher_us = (time.perf_counter() - started) / (rounds * len(queries)) * 1e6
+
+    eval_queries = [str(case["query"]) for case in META_ORCHESTRATION_EVAL_CASES]
+    for query in eval_queries:
+        meta.classify_meta_task(query)
+    started = time.perf_counter()
+    for _ in range(20):
+        for query in eval_queries:
+            meta.classify_meta_task(query)
+    classify_ms = (time.perf_counter() - started) / (20 * len(eval_queries)) * 1000.0
+
+    print(
+        f"\nhint scan: legacy {legacy_us:.1f} us/turn, matcher {matcher_us:.1f} us/turn"
+        f"\nclassify_meta_task: {classify_ms:.2f} ms/turn"
+    )
+    assert matcher_us < legacy_us
@@ -0,0 +1,166 @@
+"""Tests fuer den persistenten Seiten-Cache (Deep Research / fetch_url)."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import httpx
+import pytest
+
+from utils.page_cache import PageCache, domain_class, normalize_cache_url
+
+
+def test_normalize_cache_url_canonicalizes_host_query_and_fragment():
+    assert normalize_cache_url("HTTPS://Example.COM:443/a?b=2&utm_source=x&a=1#top") == (
+        "https://example.com/a?a=1&b=2"
+    )
+    assert normalize_cache_url("http://example.com") == "http://example.com/"
+    assert normalize_cache_url("http://example.com:8080/x") == "http://example.com:8080/x"
+
+
+def test_domain_class_drives_ttl():
+    assert domain_class("https://de.wikipedia.org/wiki/X") == "reference"
+    assert domain_class("https://www.tagesschau.de/inland") == "news"
+    assert domain_class("https://example.com") == "default"
+
+
+def test_page_cache_roundtrip_dedupes_bodies_and_tracks_freshness(tmp_path):
+    cache = PageCache(tmp_path / "pages.db", ttl_resolver=lambda url: 60.0)
+
+    first = cache.store("https://a.com/x?utm_medium=y", body="<p>same</p>", etag='"v1"')
+    second = cache.store("https://b.com/y", body="<p>same</p>")
+    entry = cache.lookup("https://A.com/x")
+
+    assert first.content_hash == second.content_hash
+    assert entry is not None and entry.fresh
+    assert entry.body == "<p>same</p>"
+    assert PageCache.revalidation_headers(entry) == {"If-None-Match": '"v1"'}
+    assert cache.lookup("https://c.com/") is None
+
+    expired = PageCache(tmp_path / "pages.db", ttl_resolver=lambda url: 0.0)
+    expired.store("https://a.com/x", body="<p>same</p>")
+    assert expired.lookup("https://a.com/x").fresh is False
+    assert expired.stats()["stale"] == 1
+
+
+def test_page_cache_derive_computes_once_per_content(tmp_path):
+    cache = PageCache(tmp_path / "pages.db")
+    calls = []
+
+    def _compute(body):
+        calls.append(body)
+        return {"text": body.upper()}
+
+    entry = cache.store("https://a.com/", body="hallo")
+    other = cache.store("https://mirror.a.com/", body="hallo")
+
+    assert cache.derive(entry, "upper", _compute) == {"text": "HALLO"}
+    assert cache.derive(other, "upper", _compute) == {"text": "HALLO"}
+    assert len(calls) == 1
+
+
+def test_page_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = PageCache(tmp_path / "pages.db", max_bytes=600)
+    cache.store("https://old.com/", body=os.urandom(400).hex())
+    time.sleep(0.01)
+    cache.store("https://new.com/", body=os.urandom(400).hex())
+
+    assert cache.evict() == 1
+    assert cache.lookup("https://old.com/") is None
+    assert cache.lookup("https://new.com/") is not None
+
+
+@pytest.mark.asyncio
+async def test_page_cache_reuses_one_connection_and_offloads_async_calls(tmp_path):
+    import threading
+
+    cache = PageCache(tmp_path / "pages.db")
+    loop_thread = threading.get_ident()
+    compute_threads = []
+
+    entry = await cache.astore("https://a.com/", body="hallo", etag='"e"')
+    conn = cache._conn
+    looked_up = await cache.alookup("https://a.com/")
+    await cache.arefresh(looked_up)
+    derived = await cache.aderive(
+        looked_up, "upper", lambda body: compute_threads.append(threading.get_ident()) or body.upper()
+    )
+
+    assert conn is not None and cache._conn is conn
+    assert looked_up.content_hash == entry.content_hash and derived == "HALLO"
+    assert compute_threads and compute_threads[0] != loop_thread
+    assert cache.stats()["revalidated"] == 1
+    cache.close()
+    assert cache._conn is None
+    assert cache.lookup("https://a.com/").body == "hallo"
+
+
+def test_web_fetch_parse_cache_is_keyed_by_final_url(monkeypatch, tmp_path):
+    from tools.web_fetch_tool import tool as wf_tool
+
+    cache = PageCache(tmp_path / "pages.db")
+    monkeypatch.setattr("utils.page_cache.get_page_cache", lambda: cache)
+    parsed_for = []
+
+    def _fake_parse(html, url, max_length):
+        parsed_for.append(url)
+        return {"title": url, "content": "", "markdown": "", "links": [], "content_length": 0}
+
+    monkeypatch.setattr(wf_tool, "_parse_html", _fake_parse)
+    monkeypatch.setattr(wf_tool, "_looks_like_spa", lambda html: False)
+    body = "<html><body><p>gleicher Inhalt</p></body></html>"
+    first = cache.store("https://a.com/", body=body)
+    mirror = cache.store("https://b.com/", body=body)
+
+    titles = [
+        wf_tool._http_result_from_body(body, "text/html", final_url, 1000, page)["title"]
+        for final_url, page in (
+            ("https://a.com/", first), ("https://b.com/", mirror), ("https://a.com/", first),
+        )
+    ]
+
+    assert titles == ["https://a.com/", "https://b.com/", "https://a.com/"]
+    assert parsed_for == ["https://a.com/", "https://b.com/"]
+
+
+@pytest.mark.asyncio
+async def test_deep_research_fetch_uses_cache_and_etag_revalidation(monkeypatch, tmp_path):
+    from tools.deep_research import tool as dr_tool
+    import utils.http_client_pool as pool
+
+    requests_seen = []
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"abc"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/html", "etag": '"abc"'},
+            text="<html><body><p>Inhalt der Seite</p></body></html>",
+        )
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        pool.httpx,
+        "AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.MockTransport(_handler), **kwargs),
+    )
+    ttl = {"value": 60.0}
+    cache = PageCache(tmp_path / "pages.db", ttl_resolver=lambda url: ttl["value"])
+    monkeypatch.setattr(dr_tool, "get_page_cache", lambda: cache)
+
+    first = await dr_tool._fetch_page_content("https://example.com/artikel")
+    second = await dr_tool._fetch_page_content("https://example.com/artikel#abschnitt")
+    assert first == second == "Inhalt der Seite"
+    assert len(requests_seen) == 1
+
+    ttl["value"] = 0.0
+    cache.store("https://example.com/artikel", body=cache.lookup("https://example.com/artikel").body, etag='"abc"')
+    third = await dr_tool._fetch_page_content("https://example.com/artikel")
+
+    assert third == "Inhalt der Seite"
+    assert len(requests_seen) == 2
+    assert cache.stats()["revalidated"] == 1
+    await pool.aclose_async_clients()
@@ -0,0 +1,118 @@
+"""Policy-Gate Hot-Path: gecachter Runtime-State + gebuendelter Decision-Writer."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from orchestration.task_queue import TaskQueue
+from utils import policy_gate
+
+
+def test_runtime_overrides_are_cached_until_version_changes(monkeypatch, tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    loads: list[int] = []
+    original = queue.get_policy_runtime_states
+
+    def _counting(keys):
+        loads.append(1)
+        return original(keys)
+
+    monkeypatch.setattr(queue, "get_policy_runtime_states", _counting)
+    monkeypatch.setattr("orchestration.task_queue.get_queue", lambda: queue)
+    monkeypatch.setenv("POLICY_RUNTIME_CACHE_TTL_S", "60")
+    policy_gate.invalidate_policy_runtime_cache()
+
+    for _ in range(50):
+        assert policy_gate._policy_runtime_overrides()["strict_force_off"] is False
+    assert len(loads) == 1
+
+    # Zweite Instanz auf derselben DB (z.B. Rollout-Guard) erhoeht die Version
+    TaskQueue(db_path=tmp_path / "task_queue.db").set_policy_runtime_state("strict_force_off", "true")
+    TaskQueue(db_path=tmp_path / "task_queue.db").set_policy_runtime_state("canary_percent_override", "0")
+    overrides = policy_gate._policy_runtime_overrides()
+
+    assert overrides["strict_force_off"] is True
+    assert overrides["canary_percent_override"] == 0
+    assert len(loads) == 2
+    policy_gate.invalidate_policy_runtime_cache()
+
+
+def test_decision_writer_batches_sqlite_and_jsonl(monkeypatch, tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    writer = policy_gate.PolicyDecisionWriter(batch_size=50, flush_interval_s=0.05, max_queue=500)
+    jsonl = tmp_path / "decisions.jsonl"
+
+    for i in range(120):
+        writer.submit(
+            {"gate": "tool", "action": "allow", "subject": f"t{i}", "timestamp": "2026-01-01T10:00:00"},
+            queue,
+            jsonl if i % 2 == 0 else None,
+        )
+    assert writer.flush(timeout_s=5.0) is True
+
+    stats = writer.stats()
+    assert stats["written"] == 120
+    assert stats["jsonl_written"] == 60
+    assert stats["pending"] == 0
+    assert stats["batches"] <= 10
+    assert len(queue.list_policy_decisions(window_hours=24 * 365 * 10, limit=500)) == 120
+    assert json.loads(jsonl.read_text(encoding="utf-8").splitlines()[0])["subject"] == "t0"
+    writer.close()
+
+
+def test_decision_writer_drops_when_queue_is_full() -> None:
+    release = threading.Event()
+    started = threading.Event()
+
+    class _SlowQueue:
+        def record_policy_decisions(self, decisions):
+            started.set()
+            release.wait(2)
+            return len(decisions)
+
+    writer = policy_gate.PolicyDecisionWriter(batch_size=1, flush_interval_s=0.01, max_queue=1)
+    slow = _SlowQueue()
+    assert writer.submit({"gate": "tool"}, slow, None) is True
+    started.wait(1)
+    assert writer.submit({"gate": "tool"}, slow, None) is True  # liegt in der Queue
+    assert writer.submit({"gate": "tool"}, slow, None) is False  # voll → verworfen
+
+    assert writer.stats()["dropped"] == 1
+    release.set()
+    assert writer.flush(timeout_s=2.0) is True
+    assert writer.stats()["written"] == 2
+    writer.close()
+
+
+def test_audit_policy_decision_is_non_blocking_and_metrics_read_own_writes(monkeypatch, tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    monkeypatch.setattr("orchestration.task_queue.get_queue", lambda: queue)
+    monkeypatch.setattr(policy_gate, "LOGS_DIR", tmp_path)
+
+    started = time.perf_counter()
+    for _ in range(20):
+        policy_gate.audit_policy_decision({"gate": "query", "action": "block", "blocked": True, "audit_enabled": True})
+    assert time.perf_counter() - started < 0.5
+
+    metrics = policy_gate.get_policy_decision_metrics(window_hours=1)
+    assert metrics["blocked_total"] == 20
+    assert len(next(tmp_path.glob("*_policy_decisions.jsonl")).read_text(encoding="utf-8").splitlines()) == 20
+
+
+def test_queue_readers_flush_pending_decisions_via_registered_hook(monkeypatch, tmp_path: Path) -> None:
+    from orchestration import task_queue as task_queue_module
+
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db")
+    monkeypatch.setattr("orchestration.task_queue.get_queue", lambda: queue)
+    monkeypatch.setattr(policy_gate, "LOGS_DIR", tmp_path)
+
+    for _ in range(5):
+        policy_gate.audit_policy_decision({"gate": "tool", "action": "block", "blocked": True})
+    assert task_queue_module._policy_decision_flush_hook is policy_gate.flush_policy_decisions
+
+    # Direkt ueber die TaskQueue, ohne den Flush in policy_gate.get_policy_decision_metrics.
+    assert queue.get_policy_decision_metrics(window_hours=1)["blocked_total"] == 5
+    assert len(queue.list_policy_decisions(window_hours=1, limit=50)) == 5
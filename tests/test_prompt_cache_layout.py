@@ -0,0 +1,187 @@
+"""Stabiler Prompt-Prefix, Provider-Cache-Marker und Cache-Hit-Accounting."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from agent import base_agent as base_agent_mod
+from agent.providers import ModelProvider
+from agent.shared.prompt_cache import (
+    build_anthropic_cached_request,
+    build_prefix_messages,
+    prompt_cache_key,
+)
+from orchestration.self_improvement_engine import LLMUsageRecord, SelfImprovementEngine
+from tests.test_base_agent_tool_envelope import _minimal_base_agent
+from utils.llm_usage import estimate_cost_usd, extract_normalized_usage
+
+_SYSTEM = "Du bist E.X.E.\n# VERFUEGBARE TOOLS\n## Verfuegbare Tools:\n- read_file"
+_MEMORY = "# WORKING_MEMORY\n- letzte Aufgabe: Bericht"
+
+
+def _task_msg(text: str = "AKTUELLE_NUTZERANFRAGE:\nLies README") -> dict:
+    return {"role": "user", "content": text}
+
+
+def test_prefix_layout_orders_system_tools_memory_then_request():
+    messages = build_prefix_messages(_SYSTEM, _MEMORY, _task_msg())
+
+    assert [m["role"] for m in messages] == ["system", "system", "user"]
+    assert messages[0]["content"] == _SYSTEM
+    assert messages[1]["content"] == _MEMORY
+    assert build_prefix_messages(_SYSTEM, "", _task_msg())[1]["role"] == "user"
+
+
+def test_anthropic_request_marks_prefix_and_latest_turn():
+    messages = build_prefix_messages(_SYSTEM, _MEMORY, _task_msg()) + [
+        {"role": "assistant", "content": 'Action: {"method": "read_file"}'},
+        {"role": "system", "content": "Verlauf (komprimiert)"},
+        {"role": "user", "content": "Observation: ok"},
+    ]
+
+    system, chat = build_anthropic_cached_request(messages, markers=True)
+
+    assert [block["text"] for block in system] == [_SYSTEM, _MEMORY, "Verlauf (komprimiert)"]
+    assert [("cache_control" in block) for block in system] == [False, True, False]
+    assert [m["role"] for m in chat] == ["user", "assistant", "user"]
+    assert chat[-1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert messages[-1]["content"] == "Observation: ok"  # Original unveraendert
+
+    plain_system, _ = build_anthropic_cached_request(messages, markers=False)
+    assert plain_system.startswith(_SYSTEM) and _MEMORY in plain_system
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(usage=None, choices=[SimpleNamespace(message=SimpleNamespace(content="ok"))])
+
+
+def _agent_for(monkeypatch, provider, model):
+    client = _RecordingClient()
+    monkeypatch.setattr(base_agent_mod, "get_improvement_engine", lambda: SimpleNamespace(record_llm_usage=lambda record: None))
+    agent = base_agent_mod.BaseAgent.__new__(base_agent_mod.BaseAgent)
+    agent.provider_client = SimpleNamespace(get_client=lambda _provider: client)
+    agent.provider = provider
+    agent.model = model
+    agent.agent_type = "executor"
+    agent.conversation_session_id = ""
+    return agent, client
+
+
+@pytest.mark.asyncio
+async def test_openai_gets_stable_prompt_cache_key_across_steps(monkeypatch):
+    agent, client = _agent_for(monkeypatch, ModelProvider.OPENAI, "gpt-5.4-mini")
+    step_1 = build_prefix_messages(_SYSTEM, _MEMORY, _task_msg())
+    step_2 = step_1 + [{"role": "assistant", "content": "Thought"}, {"role": "user", "content": "Observation: x"}]
+
+    await base_agent_mod.BaseAgent._call_openai_compatible(agent, step_1)
+    await base_agent_mod.BaseAgent._call_openai_compatible(agent, step_2)
+
+    keys = [call["prompt_cache_key"] for call in client.calls]
+    assert keys[0] == keys[1] == prompt_cache_key("executor", step_1)
+    assert all(isinstance(m["content"], str) for m in client.calls[0]["messages"])
+
+
+@pytest.mark.asyncio
+async def test_openrouter_claude_gets_cache_control_but_others_do_not(monkeypatch):
+    messages = build_prefix_messages(_SYSTEM, _MEMORY, _task_msg())
+
+    agent, client = _agent_for(monkeypatch, ModelProvider.OPENROUTER, "anthropic/claude-sonnet-4.5")
+    await base_agent_mod.BaseAgent._call_openai_compatible(agent, messages)
+    sent = client.calls[0]["messages"]
+    assert sent[1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert sent[0]["content"] == _SYSTEM
+    assert "prompt_cache_key" not in client.calls[0]
+
+    agent, client = _agent_for(monkeypatch, ModelProvider.OPENROUTER, "deepseek/deepseek-v3.2")
+    await base_agent_mod.BaseAgent._call_openai_compatible(agent, messages)
+    assert client.calls[0]["messages"][1]["content"] == _MEMORY
+
+
+def test_context_budget_keeps_cached_prefix_untouched():
+    agent = _minimal_base_agent()
+    long_memory = "Erinnerung " * 400
+    messages = build_prefix_messages(_SYSTEM, long_memory, _task_msg("Aufgabe " * 300))
+    for i in range(8):
+        messages.append({"role": "assistant", "content": f"Thought {i} " + "x " * 300})
+        messages.append({"role": "user", "content": f"Observation: {i} " + "y " * 300})
+
+    compacted = agent._enforce_context_budget(messages)
+
+    assert compacted[0]["content"] == _SYSTEM
+    assert compacted[1]["content"] == long_memory
+    assert compacted[2]["role"] == "user"  # Anfrage bleibt hinter dem Prefix
+    assert agent._context_budget_last_meta["actions"]
+
+
+def test_usage_extraction_reads_provider_specific_cache_fields():
+    deepseek = SimpleNamespace(usage={"prompt_tokens": 1000, "completion_tokens": 10, "prompt_cache_hit_tokens": 900})
+    moonshot = SimpleNamespace(usage={"prompt_tokens": 500, "completion_tokens": 5, "cached_tokens": 400})
+    google_compat = SimpleNamespace(
+        usage={"prompt_tokens": 300, "completion_tokens": 3, "prompt_tokens_details": {"cached_tokens": 100}}
+    )
+
+    assert extract_normalized_usage(ModelProvider.DEEPSEEK, deepseek).cached_tokens == 900
+    assert extract_normalized_usage(ModelProvider.MOONSHOT, moonshot).cached_tokens == 400
+    assert extract_normalized_usage(ModelProvider.GOOGLE, google_compat).input_tokens == 300
+    assert extract_normalized_usage(ModelProvider.GOOGLE, google_compat).cached_tokens == 100
+
+
+def test_anthropic_cache_writes_are_not_counted_as_hits(monkeypatch):
+    monkeypatch.setenv("TIMUS_LLM_PRICE_ANTHROPIC_INPUT_USD_PER_1M", "4.0")
+    monkeypatch.delenv("TIMUS_LLM_PRICE_ANTHROPIC_CACHE_WRITE_INPUT_USD_PER_1M", raising=False)
+    response = SimpleNamespace(
+        usage={"input_tokens": 50, "output_tokens": 5, "cache_read_input_tokens": 300, "cache_creation_input_tokens": 1000}
+    )
+
+    usage = extract_normalized_usage(ModelProvider.ANTHROPIC, response)
+
+    assert (usage.cached_tokens, usage.cache_write_tokens) == (300, 1000)
+    # Writes kosten 1.25x Input (ohne eigene Preis-Variable)
+    assert estimate_cost_usd(ModelProvider.ANTHROPIC, "claude", usage) == pytest.approx((50 * 4.0 + 1000 * 5.0) / 1_000_000)
+
+
+def test_prompt_cache_report_per_agent(tmp_path, monkeypatch):
+    monkeypatch.setenv("TIMUS_LLM_PRICE_OPENAI_INPUT_USD_PER_1M", "2.0")
+    monkeypatch.setenv("TIMUS_LLM_PRICE_OPENAI_CACHED_INPUT_USD_PER_1M", "0.5")
+    monkeypatch.setenv("TIMUS_LLM_PRICE_ANTHROPIC_INPUT_USD_PER_1M", "4.0")
+    monkeypatch.setenv("TIMUS_LLM_PRICE_ANTHROPIC_CACHED_INPUT_USD_PER_1M", "0.4")
+    monkeypatch.setenv("TIMUS_LLM_PRICE_ANTHROPIC_CACHE_WRITE_INPUT_USD_PER_1M", "5.0")
+    engine = SelfImprovementEngine(db_path=tmp_path / "usage.db")
+    for i, cached in enumerate((0, 8000, 9000)):
+        engine.record_llm_usage(
+            LLMUsageRecord(trace_id=f"e{i}", agent="executor", provider="openai", model="gpt-5.4-mini", input_tokens=10000, cached_tokens=cached)
+        )
+    engine.record_llm_usage(
+        LLMUsageRecord(trace_id="m1", agent="meta", provider="anthropic", model="claude", input_tokens=200, cached_tokens=1800)
+    )
+    # Cache-Write: kein Treffer, der Aufpreis mindert die Ersparnis
+    engine.record_llm_usage(
+        LLMUsageRecord(trace_id="m2", agent="meta", provider="anthropic", model="claude", input_tokens=200, cache_write_tokens=1800)
+    )
+    # Geschaetzte Usage (Stream-Early-Stop) kennt keine Cache-Tokens → nicht mitzaehlen
+    engine.record_llm_usage(
+        LLMUsageRecord(trace_id="e3", agent="executor", provider="openai", model="gpt-5.4-mini", input_tokens=10000, usage_estimated=True)
+    )
+
+    report = engine.get_prompt_cache_report(days=1)
+    executor = next(item for item in report["agents"] if item["agent"] == "executor")
+    meta = next(item for item in report["agents"] if item["agent"] == "meta")
+
+    assert executor["hit_ratio"] == round(17000 / 30000, 3)
+    assert executor["cached_requests"] == 2
+    assert executor["saved_tokens"] == 17000
+    assert executor["saved_cost_usd"] == pytest.approx(17000 / 1_000_000 * 1.5)
+    assert meta["prompt_tokens"] == 4000 and meta["hit_ratio"] == 0.45
+    assert meta["cached_requests"] == 1 and meta["cache_write_tokens"] == 1800
+    assert meta["saved_cost_usd"] == pytest.approx(1800 / 1_000_000 * (4.0 - 0.4) - 1800 / 1_000_000 * 1.0)
+    assert report["saved_tokens"] == 18800
+    assert report["requests"] == 5 and report["estimated_requests_excluded"] == 1
+    assert engine.get_prompt_cache_report(days=1, agent="meta")["requests"] == 2
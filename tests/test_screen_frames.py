@@ -0,0 +1,144 @@
+"""Geteilter Screen-Frame-Service: Ring-Buffer, Frame-IDs, Zero-Copy-ROIs."""
+
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from utils.screen_frames import ScreenFrameService
+
+
+class _FakeGrabber:
+    """Verhaelt sich wie mss.mss(): monitors + grab(region) mit BGRA-Puffer."""
+
+    instances = 0
+
+    def __init__(self):
+        type(self).instances += 1
+        self.closed = False
+        self.grabs = []
+        self.monitors = [
+            {"left": 0, "top": 0, "width": 64, "height": 32},
+            {"left": 0, "top": 0, "width": 64, "height": 32},
+        ]
+
+    def close(self):
+        self.closed = True
+
+    def grab(self, region):
+        self.grabs.append(dict(region))
+        width, height = region["width"], region["height"]
+        bgra = np.zeros((height, width, 4), dtype=np.uint8)
+        bgra[..., 0] = 10  # B
+        bgra[..., 1] = 20  # G
+        bgra[..., 2] = len(self.grabs)  # R = Grab-Zaehler
+        return SimpleNamespace(size=(width, height), raw=bytearray(bgra.tobytes()))
+
+
+@pytest.fixture
+def service():
+    _FakeGrabber.instances = 0
+    return ScreenFrameService(buffer_size=3, max_age_s=60.0, grabber_factory=_FakeGrabber)
+
+
+def test_latest_reuses_buffered_frame_until_newer_one_is_requested(service):
+    first = service.latest(1)
+    again = service.latest(1)
+    fresh = service.latest(1, newer_than=first.frame_id)
+
+    assert again is first
+    assert fresh.frame_id > first.frame_id
+    assert tuple(first.rgb[0, 0]) == (1, 20, 10)
+    assert tuple(fresh.rgb[0, 0]) == (2, 20, 10)
+    assert service.stats()["captures"] == 2 and service.stats()["buffer_hits"] == 1
+    assert _FakeGrabber.instances == 1  # persistenter Handle
+
+
+def test_ring_buffer_drops_oldest_frames(service):
+    frames = [service.capture(1) for _ in range(5)]
+
+    assert service.get_frame(frames[0].frame_id) is None
+    assert service.get_frame(frames[-1].frame_id) is frames[-1]
+    assert service.stats()["buffered_frames"] == 3
+    assert [f.frame_id for f in frames] == sorted({f.frame_id for f in frames})
+
+
+def test_roi_is_zero_copy_and_frames_are_read_only(service):
+    frame = service.latest(1)
+    roi = frame.roi(8, 4, 16, 8)
+
+    assert roi.shape == (8, 16, 3)
+    assert np.shares_memory(roi, frame.bgra)
+    with pytest.raises(ValueError):
+        roi[0, 0, 0] = 255
+    assert frame.roi(60, 30, 16, 8).shape == (2, 4, 3)  # am Rand geclippt
+    assert frame.to_pil({"x": 8, "y": 4, "width": 16, "height": 8}).size == (16, 8)
+
+
+def test_region_grab_prefers_buffer_and_falls_back_to_small_grab(service):
+    frame = service.latest(1)
+    from_buffer = service.grab_region(10, 10, 5, 5)
+    assert np.shares_memory(from_buffer, frame.bgra)
+
+    fresh = service.grab_region(10, 10, 5, 5, max_age_s=0)
+    assert fresh.shape == (5, 5, 3)
+    assert service.stats()["region_grabs"] == 1
+
+
+def test_concurrent_requests_share_one_capture(service):
+    barrier = threading.Barrier(6)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(service.latest(1).frame_id)
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(results)) == 1
+    assert service.stats()["captures"] == 1
+
+
+def test_stop_and_thread_exit_close_grabber_handles(service):
+    grabbers = []
+
+    def factory():
+        grabber = _FakeGrabber()
+        grabbers.append(grabber)
+        return grabber
+
+    service._grabber_factory = factory
+    worker = threading.Thread(target=lambda: service.capture(1))
+    worker.start()
+    worker.join()
+    assert grabbers[0].closed  # Thread-Ende schliesst seinen Handle
+
+    service.capture(1)
+    assert service.stats()["open_handles"] == 1
+    service.stop()
+    assert grabbers[1].closed and service.stats()["open_handles"] == 0
+
+    service.capture(1)  # nach stop() wird ein neuer Handle aufgebaut
+    assert len(grabbers) == 3 and not grabbers[2].closed
+
+
+def test_screenshot_helpers_grab_fresh_frames_after_actions(service, monkeypatch):
+    from agent.shared import screenshot
+
+    monkeypatch.setattr(screenshot, "get_frame_service", lambda: service)
+    monkeypatch.setattr(screenshot, "_ensure_loaded", lambda: True)
+    service.latest(1)
+
+    screenshot.capture_screenshot_base64(1)
+    screenshot.capture_screenshot_image(1)
+    assert service.stats()["captures"] == 3
+
+    screenshot.capture_screenshot_image(1, max_age_ms=60_000)
+    assert service.stats()["captures"] == 3
@@ -0,0 +1,121 @@
+"""Kachelbasierte Aenderungskarte: schmutzige Kacheln, Rechtecke, Benchmark."""
+
+from __future__ import annotations
+
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from utils.screen_tiles import compute_cell_signature, diff_cell_signatures
+
+
+def _frame(height=256, width=512, value=40):
+    frame = np.full((height, width, 4), value, dtype=np.uint8)
+    frame[..., 3] = 255
+    return frame
+
+
+def test_identical_frames_have_no_dirty_tiles():
+    frame = _frame()
+    change_map = diff_cell_signatures(
+        compute_cell_signature(frame, 8), compute_cell_signature(frame.copy(), 8), threshold=0.01, tile_size=64
+    )
+    assert change_map.total_tiles == 4 * 8
+    assert change_map.dirty_tiles == 0 and change_map.dirty_rects() == []
+
+
+def test_small_change_marks_only_its_tile():
+    before = _frame()
+    after = before.copy()
+    after[70:78, 200:208, :3] = 200  # 8x8-Spinner in Kachel (1, 3)
+
+    change_map = diff_cell_signatures(
+        compute_cell_signature(before, 8), compute_cell_signature(after, 8), threshold=0.01, tile_size=64
+    )
+
+    assert change_map.dirty_tiles == 1
+    assert change_map.dirty_rects(offset=(100, 10)) == [{"x": 292, "y": 74, "width": 64, "height": 64}]
+
+
+def test_adjacent_dirty_tiles_are_merged_into_one_rect():
+    before = _frame()
+    after = before.copy()
+    after[10:120, 10:100, :3] = 0  # Dialog ueber 2x2 Kacheln
+    after[200:210, 500:510, :3] = 255  # separater Bereich am Rand
+
+    change_map = diff_cell_signatures(
+        compute_cell_signature(before, 8), compute_cell_signature(after, 8), threshold=0.01, tile_size=64
+    )
+
+    assert change_map.dirty_tiles == 5
+    assert sorted(change_map.dirty_rects(), key=lambda r: r["x"]) == [
+        {"x": 0, "y": 0, "width": 128, "height": 128},
+        {"x": 448, "y": 192, "width": 64, "height": 64},
+    ]
+    assert len(change_map.dirty_tile_rects()) == 5
+
+
+def test_incompatible_geometry_raises():
+    with pytest.raises(ValueError):
+        diff_cell_signatures(
+            compute_cell_signature(_frame(), 8), compute_cell_signature(_frame(width=256), 8), threshold=0.01
+        )
+    with pytest.raises(ValueError):
+        signature = compute_cell_signature(_frame(), 8)
+        diff_cell_signatures(signature, signature, threshold=0.01, tile_size=60)
+
+
+def test_detector_reports_dirty_rects_for_roi(monkeypatch):
+    detector_module = pytest.importorskip("tools.screen_change_detector.tool")
+    frames = [_frame(), _frame()]
+    frames[1][130:140, 330:340, :3] = 220
+    served = iter(
+        SimpleNamespace(frame_id=i + 1, bgra=pixels, width=512, height=256) for i, pixels in enumerate(frames * 2)
+    )
+    service = SimpleNamespace(latest=lambda *_a, **_kw: next(served))
+    monkeypatch.setattr(detector_module, "get_frame_service", lambda: service)
+
+    detector = detector_module.ScreenChangeDetector(threshold=0.01)
+    roi = {"x": 256, "y": 64, "width": 256, "height": 192}
+    assert detector.has_changed(roi)[1]["reason"] == "first_check"
+
+    changed, info = detector.has_changed(roi)
+    assert changed and info["method"] == "tile_map"
+    assert info["dirty_rects"] == [{"x": 320, "y": 128, "width": 64, "height": 64}]
+    assert detector.last_dirty_rects == info["dirty_rects"]
+
+    changed, info = detector.has_changed(roi)  # zurueck auf den Ausgangsframe
+    assert changed and info["dirty_tiles"] == 1
+
+
+@pytest.mark.skipif(os.getenv("RUN_BENCHMARKS") != "1", reason="Benchmarks deaktiviert (RUN_BENCHMARKS=1 zum Aktivieren).")
+@pytest.mark.parametrize("width,height", [(1920, 1080), (3840, 2160)])
+def test_benchmark_tile_map_vs_full_frame_hash(width, height):
+    from utils.stable_hash import stable_hex_digest
+
+    rng = np.random.default_rng(0)
+    before = rng.integers(0, 256, size=(height, width, 4), dtype=np.uint8)
+    after = before.copy()
+    after[500:540, 900:1000] ^= 0x40
+    rounds = 10
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        stable_hex_digest(np.ascontiguousarray(after[..., 2::-1]).tobytes(), hex_chars=32)
+    hash_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    previous = compute_cell_signature(before)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        change_map = diff_cell_signatures(previous, compute_cell_signature(after), threshold=0.01)
+        change_map.dirty_rects()
+    tile_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    print(
+        f"\n{width}x{height}: Vollbild-Hash {hash_ms:.1f}ms, Kachelkarte {tile_ms:.1f}ms "
+        f"({change_map.dirty_tiles}/{change_map.total_tiles} Kacheln schmutzig)"
+    )
+    assert change_map.dirty_tiles >= 1
@@ -96,7 +96,7 @@ async def test_deep_research_http_403_uses_shared_scrapingant_fallback(monkeypat
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-        async def get(self, url):
+        async def get(self, url, **kwargs):
             request = httpx.Request("GET", url)
             response = httpx.Response(403, request=request)
             raise httpx.HTTPStatusError("403", request=request, response=response)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from gateway import status_snapshot
+from gateway.status_snapshot import StatusSnapshotCollector
+
+
+def _patch_sections(monkeypatch, calls: dict, *, slow_local: float = 0.0) -> None:
+    async def _local(base_url):
+        calls["local"] = calls.get("local", 0) + 1
+        await asyncio.sleep(slow_local)
+        return {
+            "mcp_health": {"ok": True, "status_code": 200, "data": {"status": "healthy"}},
+            "agent_status": {"ok": True, "data": {"agents": {}, "thinking": calls["local"] > 1}},
+        }
+
+    async def _services():
+        calls["services"] = calls.get("services", 0) + 1
+        return {"mcp": {"service": "timus-mcp.service", "active": "active", "ok": True, "uptime_seconds": 600.0}}
+
+    async def _providers():
+        return {}
+
+    def _usage():
+        calls["usage"] = calls.get("usage", 0) + 1
+        return {"usage": {"total_requests": calls["usage"]}, "budget": {"state": "ok"}}
+
+    def _health():
+        raise RuntimeError("db locked")
+
+    monkeypatch.setattr(status_snapshot, "_collect_local_section", _local)
+    monkeypatch.setattr(status_snapshot, "_collect_service_section", _services)
+    monkeypatch.setattr(status_snapshot, "_collect_provider_section", _providers)
+    monkeypatch.setattr(status_snapshot, "_collect_usage_section", _usage)
+    monkeypatch.setattr(status_snapshot, "_collect_health_section", _health)
+    monkeypatch.setattr(status_snapshot, "_collect_analytics_section", lambda: {})
+    monkeypatch.setattr(status_snapshot, "_collect_request_section", lambda: {"state": "idle"})
+
+
+@pytest.mark.asyncio
+async def test_collector_serves_cached_snapshot_and_tracks_staleness(monkeypatch):
+    calls: dict = {}
+    _patch_sections(monkeypatch, calls)
+    collector = StatusSnapshotCollector(
+        "http://mcp.test",
+        intervals_s={"local": 0.05, "usage": 3600.0},
+    )
+
+    first = await collector.get_snapshot()
+    assert first["services"]["mcp"]["active"] == "active"
+    assert first["usage"]["total_requests"] == 1
+    assert first["thinking"] is False
+    # Fehlerhafte Sektion: kein Wert, als stale markiert, Snapshot trotzdem vollstaendig
+    assert first["freshness"]["sections"]["health"]["error"] == "db locked"
+    assert "health" in first["freshness"]["stale_sections"]
+    assert first["self_healing"] == {}
+
+    await asyncio.sleep(0.1)
+    await collector.get_snapshot()  # stoesst faellige Sektionen an
+    await asyncio.sleep(0.02)
+    second = await collector.get_snapshot()
+
+    assert second["thinking"] is True  # "local" wurde im eigenen Takt erneuert
+    assert calls["usage"] == 1  # "usage" ist noch frisch
+    assert second["freshness"]["sections"]["usage"]["stale"] is False
+    await collector.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_collector_answers_from_cache_while_section_refreshes(monkeypatch):
+    calls: dict = {}
+    _patch_sections(monkeypatch, calls)
+    collector = StatusSnapshotCollector("http://mcp.test", intervals_s={"local": 0.01})
+    await collector.get_snapshot()
+
+    _patch_sections(monkeypatch, calls, slow_local=0.5)
+    await asyncio.sleep(0.02)
+    started = time.monotonic()
+    snapshot = await collector.get_snapshot()
+
+    assert time.monotonic() - started < 0.1
+    assert snapshot["freshness"]["sections"]["local"]["refreshing"] is True
+    assert snapshot["local"]["mcp_health"]["ok"] is True
+    await collector.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_last_good_age_and_records_error(monkeypatch):
+    calls: dict = {}
+    _patch_sections(monkeypatch, calls)
+    collector = StatusSnapshotCollector("http://mcp.test", intervals_s={"usage": 0.05})
+    await collector.get_snapshot()
+
+    def _broken_usage():
+        calls["usage"] += 1
+        raise RuntimeError("analytics db locked")
+
+    monkeypatch.setattr(status_snapshot, "_collect_usage_section", _broken_usage)
+    for _ in range(2):
+        await asyncio.sleep(0.08)
+        await collector.get_snapshot()
+        await asyncio.sleep(0.02)
+    snapshot = await collector.get_snapshot()
+    usage = snapshot["freshness"]["sections"]["usage"]
+
+    assert calls["usage"] >= 3  # trotz Fehler im eigenen Takt erneut versucht
+    assert usage["error"] == "analytics db locked"
+    assert usage["last_error_at"] and usage["consecutive_failures"] >= 2
+    assert usage["age_seconds"] >= 0.15  # Alter des letzten guten Werts, nicht des Fehlversuchs
+    assert usage["stale"] is True and "usage" in snapshot["freshness"]["stale_sections"]
+    assert snapshot["usage"]["total_requests"] == 1
+    await collector.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_service_state_uses_async_systemctl(monkeypatch):
+    seen: list[tuple] = []
+
+    async def _fake_systemctl(*args, timeout_s=4.0):
+        seen.append(args)
+        if args[0] == "is-active":
+            return "active\n", ""
+        return "ActiveState=active\nSubState=running\nExecMainPID=4242\nActiveEnterTimestampMonotonic=0\n", ""
+
+    monkeypatch.setattr(status_snapshot, "_run_systemctl", _fake_systemctl)
+    state = await status_snapshot._service_state("timus-mcp.service")
+
+    assert state["ok"] is True
+    assert state["main_pid"] == 4242
+    assert state["sub_state"] == "running"
+    assert {args[0] for args in seen} == {"show", "is-active"}
+
+
+@pytest.mark.asyncio
+async def test_service_state_reports_missing_systemctl(monkeypatch):
+    async def _missing(*args, timeout_s=4.0):
+        raise FileNotFoundError("systemctl")
+
+    monkeypatch.setattr(status_snapshot, "_run_systemctl", _missing)
+    state = await status_snapshot._service_state("qdrant.service")
+
+    assert state["ok"] is False
+    assert state["active"] == "unknown"
@@ -0,0 +1,170 @@
+"""Geteilter STT-Service: ein Modell, Prioritaeten, Micro-Batching, Streaming."""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from tools.engines.stt_service import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    SAMPLE_RATE,
+    SpeechToTextService,
+)
+
+
+def _clip(seconds: float, marker: float) -> np.ndarray:
+    return np.full(int(seconds * SAMPLE_RATE), marker, dtype=np.float32)
+
+
+class _FakeModel:
+    """transcribe() liefert ein Segment je Sekunde mit dem Marker-Wert des Clips."""
+
+    def __init__(self, gate: threading.Event | None = None):
+        self.gate = gate
+        self.calls = []
+
+    def transcribe(self, audio, **options):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.calls.append((float(audio[0]), options))
+        seconds = max(1, int(len(audio) / SAMPLE_RATE))
+        segments = (
+            SimpleNamespace(text=f" m{audio[0]:g}-{i} ", start=float(i), end=float(i + 1)) for i in range(seconds)
+        )
+        return segments, None
+
+
+class _FakeBatcher:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, *, clip_timestamps, batch_size, vad_filter, **options):
+        self.calls.append(batch_size)
+        assert vad_filter is False
+        segments = []
+        for clip in clip_timestamps:
+            marker = audio[int(clip["start"] * SAMPLE_RATE)]
+            segments.append(SimpleNamespace(text=f"clip{marker:g}", start=clip["start"], end=clip["end"]))
+        return iter(segments), None
+
+
+def _service(model, batcher=None, **kwargs):
+    built = []
+
+    def factory(name, device, compute_type):
+        built.append((name, device, compute_type))
+        return model
+
+    kwargs.setdefault("speech_spans", lambda samples: [(0.0, len(samples) / SAMPLE_RATE)])
+    service = SpeechToTextService(
+        model_name="tiny",
+        device="cpu",
+        model_factory=factory,
+        batch_factory=lambda _model: batcher,
+        **kwargs,
+    )
+    return service, built
+
+
+def test_single_model_and_cpu_int8_default():
+    service, built = _service(_FakeModel())
+    assert service.transcribe(_clip(2, 1)) == "m1-0 m1-1"
+    assert service.transcribe(_clip(1, 2)) == "m2-0"
+    assert built == [("tiny", "cpu", "int8")]
+    stats = service.stats()
+    assert stats["completed"] == 2 and stats["compute_type"] == "int8" and stats["rtf"] >= 0
+
+
+def test_cuda_failure_falls_back_to_cpu_int8():
+    calls = []
+
+    def factory(name, device, compute_type):
+        calls.append((device, compute_type))
+        if device == "cuda":
+            raise RuntimeError("no CUDA")
+        return _FakeModel()
+
+    service = SpeechToTextService(model_name="tiny", device="auto", model_factory=factory, batch_factory=lambda _m: None)
+    service.ensure_model()
+    assert calls == [("cuda", "float16"), ("cpu", "int8")]
+    assert service.stats()["device"] == "cpu"
+
+
+def test_priority_order_and_micro_batching_of_short_clips():
+    gate = threading.Event()
+    model, batcher = _FakeModel(gate), _FakeBatcher()
+    service, _ = _service(model, batcher, batch_max=4, batch_wait_s=0.0)
+
+    blocker = service.submit(_clip(1, 9))  # belegt den Worker
+    while service.stats()["queue_depth"]:
+        time.sleep(0.001)
+    background = service.submit(_clip(1, 3), priority=PRIORITY_BACKGROUND)
+    short = [service.submit(_clip(1, marker)) for marker in (4, 5)]
+    urgent = service.submit(_clip(1, 6), priority=PRIORITY_INTERACTIVE, vad_filter=False)
+    assert service.stats()["queue_depth"] == 4
+    gate.set()
+
+    assert blocker.result(5) == "m9-0"
+    assert urgent.result(5) == "m6-0"  # andere Optionen → nicht im Batch
+    assert [f.result(5) for f in short] == ["clip4", "clip5"]
+    assert background.result(5) == "clip3"  # faehrt im Batch der hoeheren Prioritaet mit
+    assert [marker for marker, _ in model.calls] == [9.0, 6.0]
+    assert batcher.calls == [3]
+    stats = service.stats()
+    assert stats["batches"] == 1 and stats["avg_batch_size"] == 3 and stats["max_queue_depth"] == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_async_yields_partials_then_final():
+    service, _ = _service(_FakeModel())
+    partials = [partial async for partial in service.stream_async(_clip(3, 7), language="de")]
+
+    assert [p["text"] for p in partials] == ["m7-0", "m7-0 m7-1", "m7-0 m7-1 m7-2", "m7-0 m7-1 m7-2"]
+    assert partials[-1]["final"] is True and not partials[0]["final"]
+    assert service.stats()["streams"] == 1
+
+
+def test_errors_propagate_to_all_waiters():
+    class _Broken:
+        def transcribe(self, *_a, **_kw):
+            raise ValueError("kaputt")
+
+    service, _ = _service(_Broken())
+    with pytest.raises(ValueError):
+        service.transcribe(_clip(1, 1))
+    assert service.stats()["errors"] == 1
+    assert service.transcribe(np.array([], dtype=np.float32)) == ""
+
+
+def test_batched_clips_apply_requested_vad_per_clip():
+    gate = threading.Event()
+    model, batcher = _FakeModel(gate), _FakeBatcher()
+    seen_chunks = []
+
+    def _speech_spans(samples):
+        marker = float(samples[0])
+        return [] if marker == 8 else [(0.25, 0.75)]  # Clip 8: nur Stille
+
+    original = batcher.transcribe
+
+    def _recording(audio, *, clip_timestamps, **options):
+        seen_chunks.extend(clip_timestamps)
+        return original(audio, clip_timestamps=clip_timestamps, **options)
+
+    batcher.transcribe = _recording
+    service, _ = _service(model, batcher, batch_max=4, batch_wait_s=0.0, speech_spans=_speech_spans)
+
+    blocker = service.submit(_clip(1, 9))
+    while service.stats()["queue_depth"]:
+        time.sleep(0.001)
+    vad = [service.submit(_clip(1, marker), vad_filter=True) for marker in (4, 8, 5)]
+    gate.set()
+
+    assert blocker.result(5) == "m9-0"
+    assert [f.result(5) for f in vad] == ["clip4", "", "clip5"]
+    assert seen_chunks == [{"start": 0.25, "end": 0.75}, {"start": 2.25, "end": 2.75}]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from orchestration.task_queue import TaskQueue
+
+
+def test_task_queue_reuses_thread_connection_with_tuned_pragmas(tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db", pooled=True)
+
+    with queue._conn() as first:
+        pass
+    with queue._conn() as second:
+        synchronous = second.execute("PRAGMA synchronous").fetchone()[0]
+        journal_mode = second.execute("PRAGMA journal_mode").fetchone()[0]
+        foreign_keys = second.execute("PRAGMA foreign_keys").fetchone()[0]
+
+    assert first is second
+    assert synchronous == 1  # NORMAL
+    assert journal_mode == "wal"
+    assert foreign_keys == 1
+    assert queue.connection_pool_stats()["open_connections"] == 1
+
+
+def test_task_queue_pool_uses_one_connection_per_thread(tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db", pooled=True)
+    seen = []
+
+    def _worker() -> None:
+        with queue._conn() as conn:
+            seen.append(conn)
+        queue.add(description=f"worker {threading.get_ident()}")
+
+    threads = [threading.Thread(target=_worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with queue._conn() as main_conn:
+        assert all(main_conn is not conn for conn in seen)
+    assert len({id(conn) for conn in seen}) == 3
+    assert len(queue.get_pending()) == 3
+
+
+def test_task_queue_nested_blocks_commit_only_at_outermost_level(tmp_path: Path) -> None:
+    db_path = tmp_path / "task_queue.db"
+    queue = TaskQueue(db_path=db_path, pooled=True)
+
+    with pytest.raises(RuntimeError):
+        with queue._conn() as outer:
+            outer.execute(
+                "INSERT INTO tasks (id, description, created_at) VALUES (?,?,?)",
+                ("outer", "outer", datetime.now().isoformat()),
+            )
+            with queue._conn() as inner:
+                inner.execute(
+                    "INSERT INTO tasks (id, description, created_at) VALUES (?,?,?)",
+                    ("inner", "inner", datetime.now().isoformat()),
+                )
+            raise RuntimeError("abort outer transaction")
+
+    assert queue.get_by_id("outer") is None
+    assert queue.get_by_id("inner") is None
+
+    task_id = queue.add(description="nach Rollback")
+    with sqlite3.connect(db_path) as external:
+        row = external.execute("SELECT status FROM tasks WHERE id=?", (task_id,)).fetchone()
+    assert row == ("pending",)
+
+
+def test_task_queue_close_reopens_connection_on_next_use(tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db", pooled=True)
+    task_id = queue.add(description="vor close")
+
+    queue.close()
+    assert queue.connection_pool_stats()["open_connections"] == 0
+
+    claimed = queue.claim_next()
+    assert claimed is not None and claimed["id"] == task_id
+    queue.complete(task_id, "ok")
+    assert queue.get_by_id(task_id)["status"] == "completed"
+
+
+def test_task_queue_unpooled_mode_keeps_per_call_connections(tmp_path: Path) -> None:
+    queue = TaskQueue(db_path=tmp_path / "task_queue.db", pooled=False)
+
+    with queue._conn() as first:
+        pass
+    with queue._conn() as second:
+        pass
+
+    assert first is not second
+    assert queue.connection_pool_stats()["open_connections"] == 0
+
+
+# ──────────────────────────────────────────────────────────────────
+# Benchmark: claim/complete-Durchsatz auf großer Queue (RUN_BENCHMARKS=1)
+# ──────────────────────────────────────────────────────────────────
+
+_BENCH_TASKS = int(os.getenv("TASK_QUEUE_BENCH_TASKS", "100000"))
+_BENCH_CYCLES = int(os.getenv("TASK_QUEUE_BENCH_CYCLES", "2000"))
+
+
+def _seed_bench_db(db_path: Path, total: int) -> None:
+    TaskQueue(db_path=db_path, pooled=False)
+    base = datetime(2026, 1, 1)
+    rows = [
+        (
+            str(uuid.uuid4()),
+            f"bench task {i}",
+            i % 4,
+            "manual",
+            "pending" if i % 10 == 0 else "completed",
+            (base + timedelta(seconds=i)).isoformat(),
+        )
+        for i in range(total)
+    ]
+    with sqlite3.connect(db_path) as conn:
+        conn.executemany(
+            """INSERT INTO tasks (id, description, priority, task_type, status, created_at)
+               VALUES (?,?,?,?,?,?)""",
+            rows,
+        )
+        conn.commit()
+
+
+def _claim_complete_throughput(queue: TaskQueue, cycles: int) -> float:
+    started = time.perf_counter()
+    done = 0
+    for _ in range(cycles):
+        task = queue.claim_next()
+        if task is None:
+            break
+        queue.complete(task["id"], "ok")
+        done += 1
+    elapsed = time.perf_counter() - started
+    return done / elapsed if elapsed > 0 else 0.0
+
+
+@pytest.mark.skipif(
+    os.getenv("RUN_BENCHMARKS") != "1",
+    reason="Benchmarks deaktiviert (RUN_BENCHMARKS=1 zum Aktivieren).",
+)
+def test_benchmark_task_queue_claim_complete_pooled_vs_per_call(tmp_path: Path) -> None:
+    seed_path = tmp_path / "seed.db"
+    _seed_bench_db(seed_path, _BENCH_TASKS)
+
+    legacy_path = tmp_path / "legacy.db"
+    pooled_path = tmp_path / "pooled.db"
+    shutil.copy(seed_path, legacy_path)
+    shutil.copy(seed_path, pooled_path)
+
+    legacy = _claim_complete_throughput(TaskQueue(db_path=legacy_path, pooled=False), _BENCH_CYCLES)
+    pooled = _claim_complete_throughput(TaskQueue(db_path=pooled_path, pooled=True), _BENCH_CYCLES)
+
+    print(
+        f"\nTaskQueue claim+complete ({_BENCH_TASKS} Tasks, {_BENCH_CYCLES} Zyklen): "
+        f"per-call={legacy:.0f}/s pooled={pooled:.0f}/s speedup={pooled / max(legacy, 1e-9):.1f}x"
+    )
+    assert pooled > legacy
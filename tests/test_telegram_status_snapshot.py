@@ -144,16 +144,15 @@ async def test_collect_status_snapshot_builds_agent_rows(monkeypatch):
 
     monkeypatch.setattr(status_snapshot, "_fetch_local_json", fake_fetch_local_json)
     monkeypatch.setattr(status_snapshot, "_check_provider_api", fake_check_provider_api)
-    monkeypatch.setattr(
-        status_snapshot,
-        "_service_state",
-        lambda svc: {
+    async def fake_service_state(svc):
+        return {
             "service": svc,
             "active": "active",
             "ok": True,
             "uptime_seconds": 120.0,
-        },
-    )
+        }
+
+    monkeypatch.setattr(status_snapshot, "_service_state", fake_service_state)
     monkeypatch.setattr(
         status_snapshot,
         "_read_restart_status",
@@ -0,0 +1,208 @@
+"""Deklarativer Ergebnis-Cache fuer idempotente Tools (ToolRegistryV2)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from jsonrpcserver.methods import global_methods
+
+from orchestration.request_correlation import bind_request_correlation
+from tools.tool_registry_v2 import C, P, registry_v2, tool
+from tools.tool_result_cache import ToolCachePolicy, ToolResultCache, get_tool_result_cache
+
+_TOOL_NAMES = ("cache_lookup_test", "cache_session_test", "cache_flaky_test")
+
+
+@pytest.fixture
+def cached_tools():
+    calls: dict[str, int] = {}
+
+    @tool(
+        name="cache_lookup_test",
+        description="Idempotenter Lookup",
+        parameters=[
+            P("query", "string", "Anfrage"),
+            P("limit", "integer", "Limit", required=False, default=5),
+            P("trace_id", "string", "Irrelevant fuer den Key", required=False, default=""),
+        ],
+        capabilities=["test"],
+        category=C.SEARCH,
+        cache_ttl=60,
+        cache_key_params=["query", "limit"],
+    )
+    async def _lookup(query: str, limit: int = 5, trace_id: str = "") -> dict:
+        calls["lookup"] = calls.get("lookup", 0) + 1
+        await asyncio.sleep(0.05)
+        return {"status": "success", "results": [query] * limit, "nested": {"n": 1}}
+
+    @tool(
+        name="cache_session_test",
+        description="Session-gebundener Lookup",
+        parameters=[P("query", "string", "Anfrage")],
+        capabilities=["test"],
+        category=C.SEARCH,
+        cache_ttl=60,
+        cache_scope="session",
+    )
+    def _session(query: str) -> dict:
+        calls["session"] = calls.get("session", 0) + 1
+        return {"status": "success", "query": query}
+
+    @tool(
+        name="cache_flaky_test",
+        description="Liefert Fehler",
+        parameters=[P("query", "string", "Anfrage")],
+        capabilities=["test"],
+        category=C.SEARCH,
+        cache_ttl=60,
+    )
+    async def _flaky(query: str) -> dict:
+        calls["flaky"] = calls.get("flaky", 0) + 1
+        return {"status": "error", "error": "rate limited"}
+
+    get_tool_result_cache().invalidate()
+    yield calls
+    get_tool_result_cache().invalidate()
+    for name in _TOOL_NAMES:
+        registry_v2._tools.pop(name, None)
+        registry_v2._rpc_index.pop(name, None)
+        global_methods.pop(name, None)
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_on_identical_key_params_and_returns_copies(cached_tools):
+    first = await registry_v2.execute("cache_lookup_test", query="wetter")
+    first["nested"]["n"] = 99  # Aufrufer mutiert sein Ergebnis
+    second = await registry_v2.execute("cache_lookup_test", query="wetter", limit=5, trace_id="abc")
+    third = await registry_v2.execute("cache_lookup_test", query="wetter", limit=2)
+
+    assert cached_tools["lookup"] == 2
+    assert second["nested"]["n"] == 1
+    assert len(third["results"]) == 2
+    stats = get_tool_result_cache().stats()["by_tool"]["cache_lookup_test"]
+    assert stats == {"hits": 1, "misses": 2, "coalesced": 0}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_are_single_flighted(cached_tools):
+    results = await asyncio.gather(
+        *(registry_v2.execute("cache_lookup_test", query="news") for _ in range(5))
+    )
+
+    assert cached_tools["lookup"] == 1
+    assert all(result["results"] == ["news"] * 5 for result in results)
+    assert get_tool_result_cache().stats()["by_tool"]["cache_lookup_test"]["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_jsonrpc_wrapper_shares_cache_and_skips_error_results(cached_tools):
+    wrapper = global_methods["cache_lookup_test"]
+    await wrapper(query="maps")
+    await registry_v2.execute("cache_lookup_test", query="maps")
+
+    await registry_v2.execute("cache_flaky_test", query="x")
+    await registry_v2.execute("cache_flaky_test", query="x")
+
+    assert cached_tools["lookup"] == 1
+    assert cached_tools["flaky"] == 2
+    assert get_tool_result_cache().stats()["uncacheable"] >= 2
+
+
+@pytest.mark.asyncio
+async def test_session_scope_separates_sessions_and_skips_without_session(cached_tools):
+    await registry_v2.execute("cache_session_test", query="q")
+    await registry_v2.execute("cache_session_test", query="q")
+    assert cached_tools["session"] == 2
+
+    with bind_request_correlation(session_id="s1"):
+        await registry_v2.execute("cache_session_test", query="q")
+        await registry_v2.execute("cache_session_test", query="q")
+    with bind_request_correlation(session_id="s2"):
+        await registry_v2.execute("cache_session_test", query="q")
+
+    assert cached_tools["session"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cache_expires_and_evicts_lru():
+    cache = ToolResultCache(max_entries=2)
+    policy = ToolCachePolicy.build(0.05)
+    calls = []
+
+    async def _call():
+        calls.append(1)
+        return {"ok": True}
+
+    keys = [cache.make_key("t", policy, {"q": i}) for i in range(3)]
+    for key in keys:
+        await cache.get_or_call("t", key, policy.ttl_s, _call)
+    assert cache.stats()["evictions"] == 1
+    assert cache.get(keys[0]) == (False, None)
+
+    await asyncio.sleep(0.06)
+    await cache.get_or_call("t", keys[2], policy.ttl_s, _call)
+    assert len(calls) == 4
+    assert cache.stats()["expired"] == 1
+
+    with pytest.raises(ValueError):
+        ToolCachePolicy.build(10, scope="tenant")
+
+
+@pytest.mark.asyncio
+async def test_read_file_cache_follows_file_changes(tmp_path):
+    from tools.file_system_tool.tool import read_file  # noqa: F401 - registriert das Tool
+
+    get_tool_result_cache().invalidate()
+    target = tmp_path / "notiz.txt"
+    target.write_text("eins", encoding="utf-8")
+
+    first = await registry_v2.execute("read_file", path=str(target))
+    cached = await registry_v2.execute("read_file", path=str(target))
+    time.sleep(0.01)
+    target.write_text("zwei!", encoding="utf-8")
+    changed = await registry_v2.execute("read_file", path=str(target))
+
+    assert first["content"] == cached["content"] == "eins"
+    assert changed["content"] == "zwei!"
+    assert get_tool_result_cache().stats()["by_tool"]["read_file"]["hits"] == 1
+    get_tool_result_cache().invalidate()
+
+
+@pytest.mark.asyncio
+async def test_maps_cache_follows_location_snapshot(tmp_path, monkeypatch):
+    import json
+
+    from tools.search_tool import tool as search_tool_module
+
+    snapshot_path = tmp_path / "runtime_location_snapshot.json"
+    monkeypatch.setattr(search_tool_module, "_RUNTIME_LOCATION_SNAPSHOT_PATH", snapshot_path)
+    monkeypatch.setattr(search_tool_module, "SERPAPI_API_KEY", "serp-test-key")
+    requested = []
+
+    def fake_serpapi(params, timeout=45):
+        requested.append(params["ll"])
+        return {"local_results": [{"title": "Cafe", "place_id": "p1"}]}
+
+    monkeypatch.setattr(search_tool_module, "_call_serpapi_json", fake_serpapi)
+    cache = ToolResultCache()
+    policy = ToolCachePolicy.build(120, fingerprint=search_tool_module._location_cache_fingerprint)
+
+    async def _search():
+        key = cache.make_key("search_google_maps_places", policy, {"query": "Cafe"})
+        return await cache.get_or_call(
+            "search_google_maps_places",
+            key,
+            policy.ttl_s,
+            lambda: search_tool_module.search_google_maps_places("Cafe"),
+        )
+
+    snapshot_path.write_text(json.dumps({"latitude": 52.52, "longitude": 13.40, "captured_at": "2026-01-01T10:00:00Z"}))
+    await _search()
+    await _search()
+    snapshot_path.write_text(json.dumps({"latitude": 48.14, "longitude": 11.58, "captured_at": "2026-01-01T10:05:00Z"}))
+    await _search()
+
+    assert len(requested) == 2
+    assert requested[1].startswith("@48.14,11.58,")
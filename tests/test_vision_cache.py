@@ -0,0 +1,91 @@
+"""Vision-Ergebnis-Cache: Inhalts-Schluessel, LRU-Budget, Regions-Invalidierung."""
+
+from __future__ import annotations
+
+import numpy as np
+from PIL import Image
+
+from utils.vision_cache import VisionResultCache, image_content_hash
+
+
+def _image(value=0):
+    return Image.new("RGB", (64, 32), (value, value, value))
+
+
+def test_same_content_hits_and_different_params_or_content_miss():
+    cache = VisionResultCache(max_bytes=1 << 20, enabled=True)
+    calls = []
+
+    def run(image, **params):
+        return cache.get_or_compute(
+            image,
+            engine="ocr:test",
+            task="process",
+            params=params,
+            compute=lambda: calls.append(1) or {"full_text": "Hallo", "extracted_text": []},
+        )
+
+    first = run(_image(), with_boxes=False)
+    first["full_text"] = "veraendert"  # Aufrufer duerfen Ergebnisse mutieren
+    assert run(_image(), with_boxes=False)["full_text"] == "Hallo"
+    run(_image(), with_boxes=True)
+    run(_image(1), with_boxes=False)
+
+    assert len(calls) == 3
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3 and stats["entries"] == 3
+
+
+def test_errors_are_not_cached():
+    cache = VisionResultCache(max_bytes=1 << 20, enabled=True)
+    calls = []
+    for _ in range(2):
+        cache.get_or_compute(
+            _image(),
+            engine="ocr:test",
+            task="process",
+            compute=lambda: calls.append(1) or {"error": "OOM"},
+            cacheable=lambda result: not result.get("error"),
+        )
+    assert len(calls) == 2
+
+
+def test_lru_eviction_respects_memory_budget():
+    cache = VisionResultCache(max_bytes=300, enabled=True)
+    for i in range(5):
+        cache.put(f"k{i}", {"text": "x" * 80})
+    cache.get("k3")
+    cache.put("k5", {"text": "y" * 80})
+
+    assert cache.stats()["bytes"] <= 300
+    assert cache.get("k0") is None and cache.get("k2") is None  # k3 wurde zuletzt gelesen
+    assert cache.get("k3") is not None and cache.get("k4") is not None
+    assert cache.stats()["evictions"] == 3
+
+
+def test_invalidate_regions_drops_only_overlapping_entries():
+    cache = VisionResultCache(max_bytes=1 << 20, enabled=True)
+    cache.put("toolbar", {"t": 1}, region={"x": 0, "y": 0, "width": 1920, "height": 40})
+    cache.put("dialog", {"t": 2}, region={"x": 800, "y": 400, "width": 300, "height": 200})
+    cache.put("file", {"t": 3})
+
+    dropped = cache.invalidate_regions([{"x": 832, "y": 448, "width": 64, "height": 64}])
+
+    assert dropped == 1
+    assert cache.get("dialog") is None
+    assert cache.get("toolbar") == {"t": 1} and cache.get("file") == {"t": 3}
+
+
+def test_content_hash_covers_geometry_and_array_views():
+    pixels = np.zeros((4, 8, 3), dtype=np.uint8)
+    assert image_content_hash(pixels) != image_content_hash(pixels.reshape(8, 4, 3))
+    assert image_content_hash(pixels[:, ::2]) == image_content_hash(np.zeros((4, 4, 3), dtype=np.uint8))
+    assert image_content_hash(Image.fromarray(pixels)) != image_content_hash(Image.fromarray(pixels).convert("L"))
+
+
+def test_disabled_cache_always_computes():
+    cache = VisionResultCache(enabled=False)
+    calls = []
+    for _ in range(2):
+        cache.get_or_compute(_image(), engine="e", task="t", compute=lambda: calls.append(1) or {"ok": True})
+    assert len(calls) == 2 and cache.stats()["entries"] == 0
@@ -0,0 +1,245 @@
+"""Tests fuer den warmen Browser-Pool des fetch_url-Playwright-Fallbacks."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from tools.web_fetch_tool.browser_pool import BrowserPool, wait_for_page_settled
+
+
+class _FakeRequest:
+    def __init__(self, resource_type: str):
+        self.resource_type = resource_type
+
+
+class _FakeRoute:
+    def __init__(self, resource_type: str):
+        self.request = _FakeRequest(resource_type)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "abort"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+class _FakePage:
+    def __init__(self, networkidle_ok: bool = True, sizes=None):
+        self.networkidle_ok = networkidle_ok
+        self.sizes = list(sizes or [])
+        self.evaluations = 0
+
+    async def wait_for_load_state(self, state, timeout=None):
+        if not self.networkidle_ok:
+            raise TimeoutError("networkidle")
+
+    async def evaluate(self, script):
+        self.evaluations += 1
+        return self.sizes.pop(0) if len(self.sizes) > 1 else self.sizes[0]
+
+
+class _FakeContext:
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.route_handler = None
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+    async def new_page(self):
+        return _FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        context = _FakeContext(self.tracker)
+        self.tracker["contexts"].append(context)
+        return context
+
+    async def close(self):
+        self.connected = False
+        self.tracker["closed"] += 1
+
+
+class _FakeChromium:
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    async def launch(self, **kwargs):
+        self.tracker["launches"] += 1
+        return _FakeBrowser(self.tracker)
+
+
+class _FakePlaywright:
+    def __init__(self, tracker):
+        self.chromium = _FakeChromium(tracker)
+
+    async def stop(self):
+        pass
+
+
+def _factory(tracker):
+    async def _start():
+        tracker["runtimes"] += 1
+        return _FakePlaywright(tracker)
+
+    return _start
+
+
+def _tracker():
+    return {"launches": 0, "runtimes": 0, "closed": 0, "contexts": []}
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_reuses_browser_with_fresh_context_per_request():
+    tracker = _tracker()
+    pool = BrowserPool(max_pages=2, idle_seconds=0, playwright_factory=_factory(tracker))
+
+    for _ in range(5):
+        async with pool.page() as page:
+            assert isinstance(page, _FakePage)
+
+    assert tracker["launches"] == 1
+    assert tracker["runtimes"] == 1
+    assert len(tracker["contexts"]) == 5
+    assert all(ctx.closed for ctx in tracker["contexts"])
+    assert pool.stats()["pages_served"] == 5
+    await pool.shutdown()
+    assert tracker["closed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_caps_concurrent_pages():
+    tracker = _tracker()
+    pool = BrowserPool(max_pages=2, idle_seconds=0, playwright_factory=_factory(tracker))
+    peak = {"now": 0, "max": 0}
+
+    async def _use():
+        async with pool.page():
+            peak["now"] += 1
+            peak["max"] = max(peak["max"], peak["now"])
+            await asyncio.sleep(0.01)
+            peak["now"] -= 1
+
+    await asyncio.gather(*(_use() for _ in range(10)))
+
+    assert peak["max"] == 2
+    assert tracker["launches"] == 1
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_blocks_heavy_resources_only_when_requested():
+    tracker = _tracker()
+    pool = BrowserPool(idle_seconds=0, playwright_factory=_factory(tracker))
+
+    async with pool.page(block_resources=True):
+        handler = tracker["contexts"][-1].route_handler
+    async with pool.page(block_resources=False):
+        assert tracker["contexts"][-1].route_handler is None
+
+    image, script = _FakeRoute("image"), _FakeRoute("script")
+    await handler(image)
+    await handler(script)
+
+    assert image.outcome == "abort"
+    assert script.outcome == "continue"
+    assert pool.stats()["blocked_requests"] == 1
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_reaps_idle_browser_and_relaunches_on_demand():
+    tracker = _tracker()
+    pool = BrowserPool(idle_seconds=0.1, playwright_factory=_factory(tracker))
+
+    async with pool.page():
+        pass
+    await asyncio.sleep(0.3)
+
+    assert tracker["closed"] == 1
+    assert pool.stats()["browser_running"] is False
+    assert pool.stats()["idle_closes"] == 1
+
+    async with pool.page():
+        pass
+    assert tracker["launches"] == 2
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_browser_pool_restarts_reaper_for_already_running_browser():
+    tracker = _tracker()
+    pool = BrowserPool(idle_seconds=0.1, playwright_factory=_factory(tracker))
+
+    async with pool.page():
+        pass
+    pool._state().reaper.cancel()  # z.B. abgestuerzter Reaper bei laufendem Browser
+    await asyncio.sleep(0)
+
+    async with pool.page():
+        pass
+    await asyncio.sleep(0.3)
+
+    assert tracker["launches"] == 1
+    assert tracker["closed"] == 1
+    assert pool.stats()["idle_closes"] == 1
+    await pool.shutdown()
+
+
+def test_browser_pool_keeps_state_per_loop_and_closes_foreign_browsers():
+    import threading
+
+    tracker = _tracker()
+    pool = BrowserPool(idle_seconds=0, playwright_factory=_factory(tracker))
+    other_loop = asyncio.new_event_loop()
+    worker = threading.Thread(target=other_loop.run_forever, daemon=True)
+    worker.start()
+
+    async def _use_page():
+        async with pool.page():
+            pass
+
+    try:
+        asyncio.run_coroutine_threadsafe(_use_page(), other_loop).result(5)
+
+        async def _main():
+            await _use_page()  # eigener Browser, der des anderen Loops bleibt offen
+            assert tracker["launches"] == 2 and tracker["closed"] == 0
+            assert pool.stats()["browsers_running"] == 2
+            await pool.shutdown()
+
+        asyncio.run(_main())
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        worker.join(5)
+        other_loop.close()
+
+    assert tracker["closed"] == 2
+    assert pool.stats()["foreign_loop_closes"] == 1
+    assert pool.stats()["browser_running"] is False
+
+
+@pytest.mark.asyncio
+async def test_wait_for_page_settled_falls_back_to_dom_stability():
+    idle_page = _FakePage(networkidle_ok=True, sizes=[1])
+    await wait_for_page_settled(idle_page, max_wait_ms=500, poll_ms=1)
+    assert idle_page.evaluations == 0
+
+    busy_page = _FakePage(networkidle_ok=False, sizes=[10, 50, 80, 80])
+    await wait_for_page_settled(busy_page, max_wait_ms=500, poll_ms=1)
+    assert busy_page.evaluations == 4
@@ -112,7 +112,7 @@ async def cli_loop(tools_desc: str) -> None:
                 continue
 
             if q_clean.lower() in {"/tasks", "tasks"}:
-                _print_tasks()
+                await asyncio.to_thread(_print_tasks)
                 continue
 
             print("   🤔 Timus denkt...")
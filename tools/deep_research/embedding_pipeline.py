@@ -0,0 +1,364 @@
+# tools/deep_research/embedding_pipeline.py
+"""
+Embedding-Pipeline fuer Deep Research Fakten-Gruppierung.
+
+- Batching aller Texte (keine 50er-Kappung mehr) mit begrenzter Parallelitaet
+- Persistenter Vektor-Cache nach Inhalts-Hash (sessionuebergreifend, SQLite),
+  begrenzt auf DR_EMBEDDING_CACHE_MAX_ROWS Zeilen (LRU-Eviction)
+- Blockweises Similarity-Grouping ohne dichte N×N-Matrix
+
+Das eigentliche Embedding-Backend wird als synchrone Batch-Funktion
+uebergeben (z.B. ``client.embeddings.create``), damit die Pipeline
+provider-unabhaengig und ohne Netzwerk testbar bleibt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+logger = logging.getLogger("dr_embedding_pipeline")
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / "data" / "deep_research_embeddings.db"
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+EMBEDDING_BATCH_SIZE = _env_int("DR_EMBEDDING_BATCH_SIZE", 64)
+EMBEDDING_MAX_CONCURRENCY = _env_int("DR_EMBEDDING_MAX_CONCURRENCY", 4)
+EMBEDDING_MEMORY_CACHE_SIZE = _env_int("DR_EMBEDDING_MEMORY_CACHE_SIZE", 8192, minimum=0)
+GROUPING_BLOCK_SIZE = _env_int("DR_EMBEDDING_GROUPING_BLOCK_SIZE", 256)
+EMBEDDING_CACHE_MAX_ROWS = _env_int("DR_EMBEDDING_CACHE_MAX_ROWS", 200_000, minimum=0)
+EMBEDDING_CACHE_EVICT_EVERY = _env_int("DR_EMBEDDING_CACHE_EVICT_EVERY", 20)
+
+EmbedBatchFn = Callable[[List[str]], List[List[float]]]
+
+
+def content_hash(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Zweistufiger Vektor-Cache: In-Memory-LRU vor einer SQLite-Tabelle.
+
+    Vektoren werden als float32-Bytes gespeichert; Schluessel ist der
+    SHA-256 aus Modellname und Text, damit Modellwechsel nicht kollidieren.
+    Die Tabelle ist auf ``max_rows`` begrenzt: alle ``EVICT_EVERY`` Writes
+    fallen die am laengsten ungenutzten Zeilen heraus (0 = unbegrenzt).
+    """
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS embedding_cache (
+        key TEXT PRIMARY KEY,
+        model TEXT NOT NULL,
+        dim INTEGER NOT NULL,
+        vector BLOB NOT NULL,
+        last_access REAL NOT NULL DEFAULT 0
+    );
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = DEFAULT_CACHE_PATH,
+        memory_entries: int = EMBEDDING_MEMORY_CACHE_SIZE,
+        max_rows: int = EMBEDDING_CACHE_MAX_ROWS,
+    ):
+        self.db_path = Path(db_path) if db_path else None
+        self.memory_entries = memory_entries
+        self.max_rows = max(0, int(max_rows))
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_ready = False
+        self._puts_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None or not HAS_NUMPY:
+            return None
+        try:
+            if not self._db_ready:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5)
+            if not self._db_ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(self._SCHEMA)
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(embedding_cache)")}
+                if "last_access" not in columns:
+                    # Alt-Datenbanken ohne Zugriffszeit: zuerst evictierbar.
+                    conn.execute("ALTER TABLE embedding_cache ADD COLUMN last_access REAL NOT NULL DEFAULT 0")
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_embedding_cache_access ON embedding_cache(last_access)"
+                )
+                self._db_ready = True
+            return conn
+        except Exception as e:
+            logger.debug("EmbeddingCache nicht verfuegbar: %s", e)
+            return None
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        if self.memory_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+
+        if missing:
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    loaded: List[str] = []
+                    for start in range(0, len(missing), 500):
+                        chunk = missing[start:start + 500]
+                        placeholders = ",".join("?" for _ in chunk)
+                        rows = conn.execute(
+                            f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})",
+                            chunk,
+                        ).fetchall()
+                        for key, blob in rows:
+                            vector = np.frombuffer(blob, dtype=np.float32).tolist()
+                            found[key] = vector
+                            loaded.append(key)
+                            self._remember(key, vector)
+                    if loaded:
+                        # Zugriffszeit fuer die LRU-Eviction; Treffer aus dem
+                        # In-Memory-LRU wurden in diesem Prozess bereits gestempelt.
+                        now = time.time()
+                        conn.executemany(
+                            "UPDATE embedding_cache SET last_access=? WHERE key=?",
+                            [(now, key) for key in loaded],
+                        )
+                        conn.commit()
+                except Exception as e:
+                    logger.debug("EmbeddingCache-Lookup fehlgeschlagen: %s", e)
+                finally:
+                    conn.close()
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, model: str, items: Dict[str, List[float]]) -> None:
+        for key, vector in items.items():
+            self._remember(key, vector)
+        conn = self._connect()
+        if conn is None:
+            return
+        now = time.time()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (key, model, dim, vector, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [
+                    (key, model, len(vector), np.asarray(vector, dtype=np.float32).tobytes(), now)
+                    for key, vector in items.items()
+                ],
+            )
+            conn.commit()
+            with self._lock:
+                self._puts_since_evict += 1
+                due = self._puts_since_evict >= EMBEDDING_CACHE_EVICT_EVERY
+                if due:
+                    self._puts_since_evict = 0
+            if due:
+                self._evict(conn)
+        except Exception as e:
+            logger.debug("EmbeddingCache-Write fehlgeschlagen: %s", e)
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """Entfernt die am laengsten ungenutzten Zeilen bis auf max_rows."""
+        if self.max_rows <= 0:
+            return 0
+        total = int(conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0])
+        excess = total - self.max_rows
+        if excess <= 0:
+            return 0
+        conn.execute(
+            "DELETE FROM embedding_cache WHERE key IN"
+            " (SELECT key FROM embedding_cache ORDER BY last_access ASC LIMIT ?)",
+            (excess,),
+        )
+        conn.commit()
+        self.evicted += excess
+        return excess
+
+    def evict(self) -> int:
+        conn = self._connect()
+        if conn is None:
+            return 0
+        try:
+            return self._evict(conn)
+        except Exception as e:
+            logger.debug("EmbeddingCache-Eviction fehlgeschlagen: %s", e)
+            return 0
+        finally:
+            conn.close()
+
+    # Async-Varianten: SQLite-I/O und BLOB-Dekodierung im Thread-Pool.
+
+    async def aget_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        return await asyncio.to_thread(self.get_many, keys)
+
+    async def aput_many(self, model: str, items: Dict[str, List[float]]) -> None:
+        await asyncio.to_thread(self.put_many, model, items)
+
+
+_default_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _default_cache
+    if _default_cache is None:
+        raw_path = os.getenv("DR_EMBEDDING_CACHE_PATH", "").strip()
+        _default_cache = EmbeddingCache(Path(raw_path) if raw_path else DEFAULT_CACHE_PATH)
+    return _default_cache
+
+
+async def embed_texts(
+    texts: Sequence[str],
+    embed_batch: EmbedBatchFn,
+    *,
+    model: str,
+    cache: Optional[EmbeddingCache] = None,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
+) -> List[Optional[List[float]]]:
+    """
+    Embedded alle Texte; Ergebnis ist indexgleich zu ``texts``.
+
+    Doppelte Texte werden nur einmal angefragt, gecachte Vektoren gar nicht.
+    Fehlgeschlagene Batches liefern ``None`` an den betroffenen Positionen,
+    statt die gesamte Gruppierung zu verwerfen.
+    """
+    if not texts:
+        return []
+
+    keys = [content_hash(model, text) for text in texts]
+    unique: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        unique.setdefault(key, text)
+
+    store = cache if cache is not None else get_embedding_cache()
+    vectors: Dict[str, List[float]] = await store.aget_many(list(unique))
+    pending = [(key, text) for key, text in unique.items() if key not in vectors]
+
+    if pending:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        size = max(1, batch_size)
+        batches = [pending[start:start + size] for start in range(0, len(pending), size)]
+
+        async def _run_batch(batch: List[tuple]) -> Dict[str, List[float]]:
+            async with semaphore:
+                try:
+                    result = await asyncio.to_thread(embed_batch, [text for _, text in batch])
+                except Exception as e:
+                    logger.warning(f"Embedding-Batch fehlgeschlagen ({len(batch)} Texte): {e}")
+                    return {}
+            if len(result) != len(batch):
+                logger.warning(
+                    f"Embedding-Batch lieferte {len(result)} statt {len(batch)} Vektoren"
+                )
+                return {}
+            return {key: list(vector) for (key, _), vector in zip(batch, result)}
+
+        fresh: Dict[str, List[float]] = {}
+        for batch_result in await asyncio.gather(*(_run_batch(b) for b in batches)):
+            fresh.update(batch_result)
+        if fresh:
+            await store.aput_many(model, fresh)
+            vectors.update(fresh)
+
+    return [vectors.get(key) for key in keys]
+
+
+def group_by_similarity(
+    vectors: Sequence[Optional[Sequence[float]]],
+    threshold: float,
+    *,
+    block_size: int = GROUPING_BLOCK_SIZE,
+) -> List[List[int]]:
+    """
+    Greedy-Gruppierung nach Kosinus-Aehnlichkeit, blockweise berechnet.
+
+    Semantik wie die bisherige Matrix-Variante: der erste noch freie Index
+    nimmt alle freien Indizes mit Aehnlichkeit >= threshold auf. Es wird
+    jedoch nur ein ``block_size × N``-Ausschnitt gleichzeitig gehalten.
+    Indizes ohne Vektor bilden Einzelgruppen.
+    """
+    n = len(vectors)
+    if n == 0:
+        return []
+
+    present = [i for i, vec in enumerate(vectors) if vec is not None and len(vec) > 0]
+    if not HAS_NUMPY or len(present) < 2:
+        return [[i] for i in range(n)]
+
+    arr = np.asarray([vectors[i] for i in present], dtype=np.float32)
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    normalized = arr / norms
+
+    m = len(present)
+    free = np.ones(m, dtype=bool)
+    grouped: Dict[int, List[int]] = {}
+    step = max(1, block_size)
+
+    for start in range(0, m, step):
+        stop = min(m, start + step)
+        if not free[start:stop].any():
+            continue
+        block_sims = normalized[start:stop] @ normalized.T
+        for offset in range(stop - start):
+            row = start + offset
+            if not free[row]:
+                continue
+            members = np.nonzero(free & (block_sims[offset] >= threshold))[0]
+            if row not in members:
+                members = np.append(members, row)
+            free[members] = False
+            grouped[present[row]] = sorted(present[j] for j in members.tolist())
+
+    groups: List[List[int]] = []
+    for i in range(n):
+        if i in grouped:
+            groups.append(grouped[i])
+        elif vectors[i] is None or len(vectors[i]) == 0:
+            groups.append([i])
+    return groups
@@ -34,6 +34,8 @@ from dotenv import load_dotenv
 import httpx
 from openai import OpenAI, RateLimitError
 from utils.openai_compat import prepare_openai_params
+from utils.http_client_pool import get_async_client, host_slot
+from utils.page_cache import get_page_cache
 from agent.shared.json_utils import extract_json_robust
 from orchestration.ephemeral_workers import WorkerTask, run_worker, run_worker_batch
 
@@ -48,6 +50,7 @@ from tools.tool_registry_v2 import tool, ToolParameter as P, ToolCategory as C
 
 # Interne Imports
 from tools.planner.planner_helpers import call_tool_internal
+from tools.deep_research.embedding_pipeline import embed_texts, group_by_similarity
 from tools.deep_research.research_contracts import (
     build_domain_scorecards,
     claim_is_on_topic,
@@ -3878,23 +3881,37 @@ async def _fetch_page_content(url: str) -> str:
         if _needs_scrapingant(url):
             return await _fetch_via_scrapingant(url)
 
-        # HTML-Seiten: direkt via httpx
-        async with httpx.AsyncClient(
-            timeout=25.0,
-            follow_redirects=True,
-            headers=_HTTP_HEADERS,
-        ) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-
-            # Encoding sicherstellen
-            content_type = resp.headers.get("content-type", "")
-            if "pdf" in content_type:
-                return ""  # PDF ohne .pdf-Endung → überspringen
-
-            text = _html_to_text(resp.text)
-            logger.debug(f"✅ Seite geladen: {url} ({len(text)} Zeichen)")
-            return text[:12000]  # Max 12k Zeichen pro Seite
+        # Seiten-Cache: frische Treffer sparen Netzwerk und Parsing
+        page_cache = get_page_cache()
+        cached = await page_cache.alookup(url)
+        if cached is not None and cached.fresh:
+            return (await page_cache.aderive(cached, "dr_text", _html_to_text))[:12000]
+
+        # HTML-Seiten: direkt via httpx (geteilter Keep-Alive-Pool, Per-Host-Limit)
+        headers = {**_HTTP_HEADERS, **page_cache.revalidation_headers(cached)}
+        async with host_slot(url):
+            resp = await get_async_client().get(url, headers=headers, timeout=25.0)
+        if resp.status_code == 304 and cached is not None:
+            await page_cache.arefresh(cached)
+            return (await page_cache.aderive(cached, "dr_text", _html_to_text))[:12000]
+        resp.raise_for_status()
+
+        # Encoding sicherstellen
+        content_type = resp.headers.get("content-type", "")
+        if "pdf" in content_type:
+            return ""  # PDF ohne .pdf-Endung → überspringen
+
+        entry = await page_cache.astore(
+            url,
+            body=resp.text,
+            final_url=str(resp.url),
+            content_type=content_type,
+            etag=resp.headers.get("etag", ""),
+            last_modified=resp.headers.get("last-modified", ""),
+        )
+        text = await page_cache.aderive(entry, "dr_text", _html_to_text)
+        logger.debug(f"✅ Seite geladen: {url} ({len(text)} Zeichen)")
+        return text[:12000]  # Max 12k Zeichen pro Seite
 
     except httpx.HTTPStatusError as e:
         status = e.response.status_code
@@ -4046,18 +4063,18 @@ async def _deep_dive_sources(
             logger.error(f"Fehler bei Quelle {i}: {result}")
 
 
-async def _get_embeddings(texts: List[str]) -> List[List[float]]:
-    """Holt Embeddings."""
+def _embed_batch_sync(batch: List[str]) -> List[List[float]]:
+    response = client.embeddings.create(input=batch, model=EMBEDDING_MODEL)
+    return [e.embedding for e in response.data]
+
+
+async def _get_embeddings(texts: List[str]) -> List[Optional[List[float]]]:
+    """Holt Embeddings für alle Texte (gebatcht, parallel, mit Inhalts-Cache)."""
     if not texts or not HAS_NUMPY:
         return []
 
     try:
-        response = await asyncio.to_thread(
-            client.embeddings.create,
-            input=texts[:50],
-            model=EMBEDDING_MODEL
-        )
-        return [e.embedding for e in response.data]
+        return await embed_texts(texts, _embed_batch_sync, model=EMBEDDING_MODEL)
     except Exception as e:
         logger.warning(f"Embedding-Fehler: {e}")
         return []
@@ -4105,25 +4122,11 @@ async def _group_similar_facts(
     if not embeddings or len(embeddings) != len(facts):
         return [[f] for f in facts]
 
-    arr = np.array(embeddings)
-    norms = np.linalg.norm(arr, axis=1, keepdims=True)
-    norms[norms == 0] = 1
-    normalized = arr / norms
-    sim_matrix = np.dot(normalized, normalized.T)
-
-    groups: List[List[Dict[str, Any]]] = []
-    processed: set = set()
-
-    for i in range(len(facts)):
-        if i in processed:
-            continue
-
-        sim_indices = np.where(sim_matrix[i] >= effective_threshold)[0]
-        group = [facts[idx] for idx in sim_indices if idx not in processed]
-        processed.update(sim_indices.tolist())
-
-        if group:
-            groups.append(group)
+    # Blockweise statt dichter N×N-Matrix; Fakten ohne Vektor bleiben einzeln.
+    groups: List[List[Dict[str, Any]]] = [
+        [facts[idx] for idx in indices]
+        for indices in group_by_similarity(embeddings, effective_threshold)
+    ]
 
     # Diagnostics
     try:
@@ -2,7 +2,8 @@
 Parallel-Delegation-Tool — Fan-Out für parallele Agent-Ausführung.
 
 Ermöglicht dem MetaAgent mehrere unabhängige Aufgaben gleichzeitig
-an verschiedene Agenten zu delegieren (Wide-Research-Pattern).
+an verschiedene Agenten zu delegieren (Wide-Research-Pattern). Über
+depends_on wird aus der Batch ein Abhängigkeitsgraph (Fan-Out/Fan-In).
 
 Registriert sich automatisch über @tool Decorator in tool_registry_v2.
 """
@@ -20,8 +21,10 @@ log = logging.getLogger("ParallelDelegationTool")
     description=(
         "Führt mehrere UNABHÄNGIGE Aufgaben PARALLEL an verschiedene Agenten aus (Wide-Research-Pattern). "
         "Jeder Worker läuft isoliert mit eigenem Speicher. Ergebnisse werden gebündelt zurückgeliefert. "
-        "NUR verwenden wenn Teilaufgaben wirklich voneinander unabhängig sind — "
-        "bei abhängigen Schritten weiterhin delegate_to_agent sequenziell nutzen. "
+        "Abhängige Schritte über depends_on deklarieren: ein Task startet, sobald seine "
+        "Abhängigkeiten fertig sind, und bekommt deren Ergebnisse (oder {{task_id}}-Platzhalter) "
+        "in den Task-Text — Fan-Out/Fan-In-Pläne laufen so in der Zeit des kritischen Pfads. "
+        "Abhängigkeiten NIE nur im Text andeuten ('danach', 'mit dem Ergebnis') — solche Batches werden blockiert. "
         "Verfügbare Agenten: executor, research, reasoning, creative, developer, "
         "visual, meta, image, data, document, communication, system, shell."
     ),
@@ -31,8 +34,9 @@ log = logging.getLogger("ParallelDelegationTool")
             "array",
             (
                 "JSON-Array von Tasks. Jeder Task: "
-                "{\"task_id\": \"t1\", \"agent\": \"research\", \"task\": \"Beschreibung\", \"timeout\": 120}. "
-                "task_id und timeout sind optional."
+                "{\"task_id\": \"t1\", \"agent\": \"research\", \"task\": \"Beschreibung\", \"timeout\": 120, "
+                "\"depends_on\": [\"t0\"]}. "
+                "timeout und depends_on sind optional; task_id ist Pflicht, sobald ein Task referenziert wird."
             ),
             required=True,
         ),
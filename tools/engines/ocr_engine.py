@@ -37,6 +37,7 @@ except Exception:
         msg = str(exc).lower()
         return isinstance(exc, RuntimeError) and "out of memory" in msg
 from utils.hf_model_pinning import resolve_pinned_revision
+from utils.vision_cache import get_vision_cache
 
 # ===== BACKEND IMPORTS =====
 # EasyOCR
@@ -226,13 +227,23 @@ class OCREngine:
         """Gibt zurück ob die Engine initialisiert ist."""
         return self.initialized
 
-    def process(self, image: Image.Image, with_boxes: bool = False) -> Dict[str, Any]:
+    def process(
+        self,
+        image: Image.Image,
+        with_boxes: bool = False,
+        region: Optional[Dict[str, int]] = None,
+    ) -> Dict[str, Any]:
         """
         Führt OCR auf einem Bild durch und gibt strukturierte Ergebnisse zurück.
 
+        Identische Bildinhalte werden aus dem Vision-Cache beantwortet
+        (utils/vision_cache.py); Fehlerergebnisse werden nicht gecacht.
+
         Args:
             image: PIL Image
             with_boxes: Wenn True, gibt auch Bounding Boxes zurück
+            region: Optional Bildschirmregion {x, y, width, height} des Bildes —
+                    ermöglicht gezielte Invalidierung bei Screen-Änderungen
 
         Returns:
             {
@@ -241,6 +252,20 @@ class OCREngine:
                 "backend": "easyocr"
             }
         """
+        if not self.initialized:
+            return self._process_uncached(image, with_boxes)
+        return get_vision_cache().get_or_compute(
+            image,
+            engine=f"ocr:{self.active_backend}",
+            task="process",
+            params={"with_boxes": bool(with_boxes), "languages": list(self.languages or [])},
+            region=region,
+            compute=lambda: self._process_uncached(image, with_boxes),
+            cacheable=lambda result: not result.get("error"),
+        )
+
+    def _process_uncached(self, image: Image.Image, with_boxes: bool = False) -> Dict[str, Any]:
+        """Eigentliche OCR-Inferenz inkl. Telemetrie und OOM-Guard."""
         if not self.initialized:
             log.warning("OCREngine nicht initialisiert!")
             return {"error": "OCR Engine nicht initialisiert", "extracted_text": [], "full_text": ""}
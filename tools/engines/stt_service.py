@@ -0,0 +1,474 @@
+# tools/engines/stt_service.py
+"""
+Prozessweiter Speech-to-Text-Service (faster-whisper).
+
+Bisher luden Telegram-Gateway und Voice-Tool je ein eigenes Whisper-Modell
+und transkribierten seriell per ``asyncio.to_thread``. Der Service haelt:
+
+- genau ein Modell pro Prozess (Lazy-Load, CUDA-Fehler → CPU int8)
+- einen Worker-Thread mit Prioritaets-Queue (Live-Mikrofon vor Nachrichten
+  vor Hintergrundjobs, FIFO innerhalb einer Prioritaet)
+- Micro-Batching: gleichzeitig wartende kurze Clips mit gleichen Optionen
+  laufen als ein Batch durch ``BatchedInferencePipeline`` (ein Clip je
+  ``clip_timestamps``-Chunk), sonst sequentiell. Mit ``vad_filter`` wird VAD
+  pro Clip vorab gerechnet und nur die Sprachabschnitte gehen als Chunks rein
+- Streaming: ``stream_async`` liefert Teiltranskripte, sobald Whisper
+  Segmente erzeugt — fuer lange Aufnahmen
+- Kennzahlen: Queue-Tiefe, Wartezeit, Batchgroessen, Real-Time-Factor
+  (Verarbeitungszeit / Audiodauer)
+
+Audio-Dekodierung (pydub) laeuft im Aufrufer-Thread, der Worker macht nur
+Inferenz.
+
+Konfiguration:
+    WHISPER_MODEL           (default: medium)
+    WHISPER_DEVICE          (default: cpu)    cpu | cuda | auto
+    WHISPER_COMPUTE_TYPE    (default: int8 auf CPU, float16 auf CUDA)
+    STT_BATCH_MAX           (default: 8)      Clips pro Batch
+    STT_BATCH_WAIT_MS       (default: 20)     Sammelfenster fuer weitere Clips
+    STT_BATCH_MAX_CLIP_S    (default: 20)     laengere Clips werden einzeln verarbeitet
+
+USAGE:
+    from tools.engines.stt_service import PRIORITY_MESSAGE, decode_audio, get_stt_service
+
+    samples = await asyncio.to_thread(decode_audio, ogg_bytes, "ogg")
+    text = await get_stt_service().transcribe_async(samples, language="de", priority=PRIORITY_MESSAGE)
+
+    async for partial in get_stt_service().stream_async(long_samples, language="de"):
+        print(partial["text"])
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+log = logging.getLogger("stt_service")
+
+SAMPLE_RATE = 16000
+
+# Niedriger Wert = hoehere Prioritaet
+PRIORITY_INTERACTIVE = 0  # Live-Mikrofon, Nutzer wartet aktiv
+PRIORITY_MESSAGE = 10  # Sprachnachrichten, Browser-Uploads
+PRIORITY_BACKGROUND = 20  # Nachtranskription, Archiv
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def decode_audio(audio_bytes: bytes, audio_format: Optional[str] = None) -> np.ndarray:
+    """Beliebiges Audioformat (ogg, webm, mp3, ...) → mono float32 @ 16 kHz."""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(io.BytesIO(audio_bytes), format=audio_format or None)
+    audio = audio.set_channels(1).set_frame_rate(SAMPLE_RATE)
+    return np.array(audio.get_array_of_samples(), dtype=np.float32) / 32768.0
+
+
+def _default_model_factory(model_name: str, device: str, compute_type: str) -> Any:
+    from faster_whisper import WhisperModel
+
+    return WhisperModel(model_name, device=device, compute_type=compute_type)
+
+
+def _default_batch_factory(model: Any) -> Optional[Any]:
+    try:
+        from faster_whisper import BatchedInferencePipeline
+    except ImportError:
+        return None
+    return BatchedInferencePipeline(model=model)
+
+
+def _default_speech_spans(samples: np.ndarray) -> List[Tuple[float, float]]:
+    """Silero-VAD von faster-whisper: Sprachabschnitte in Sekunden relativ zum Clip."""
+    from faster_whisper.vad import get_speech_timestamps
+
+    return [
+        (span["start"] / float(SAMPLE_RATE), span["end"] / float(SAMPLE_RATE))
+        for span in get_speech_timestamps(samples)
+    ]
+
+
+@dataclass
+class _SttRequest:
+    samples: np.ndarray
+    language: Optional[str]
+    beam_size: int
+    vad_filter: bool
+    priority: int
+    future: Future
+    on_segment: Optional[Callable[[Dict[str, Any]], None]] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.samples) / float(SAMPLE_RATE)
+
+    @property
+    def batch_key(self) -> Tuple[Optional[str], int, bool]:
+        return (self.language, self.beam_size, self.vad_filter)
+
+
+class SpeechToTextService:
+    """Ein Whisper-Modell, ein Worker, Prioritaets-Queue mit Micro-Batching."""
+
+    def __init__(
+        self,
+        *,
+        model_name: Optional[str] = None,
+        device: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        model_factory: Optional[Callable[[str, str, str], Any]] = None,
+        batch_factory: Optional[Callable[[Any], Optional[Any]]] = None,
+        batch_max: Optional[int] = None,
+        batch_wait_s: Optional[float] = None,
+        batch_max_clip_s: Optional[float] = None,
+        speech_spans: Optional[Callable[[np.ndarray], List[Tuple[float, float]]]] = None,
+    ) -> None:
+        self.model_name = model_name or os.getenv("WHISPER_MODEL", "medium")
+        self.device = (device or os.getenv("WHISPER_DEVICE", "cpu")).strip().lower()
+        self.compute_type = compute_type or os.getenv("WHISPER_COMPUTE_TYPE", "")
+        self.batch_max = batch_max or _env_int("STT_BATCH_MAX", 8)
+        self.batch_wait_s = (
+            batch_wait_s if batch_wait_s is not None else _env_float("STT_BATCH_WAIT_MS", 20.0) / 1000.0
+        )
+        self.batch_max_clip_s = (
+            batch_max_clip_s if batch_max_clip_s is not None else _env_float("STT_BATCH_MAX_CLIP_S", 20.0)
+        )
+        self._model_factory = model_factory or _default_model_factory
+        self._batch_factory = batch_factory or _default_batch_factory
+        self._speech_spans = speech_spans or _default_speech_spans
+        self._model: Any = None
+        self._batcher: Any = None
+        self._batcher_checked = False
+        self._loaded_device = ""
+        self._loaded_compute_type = ""
+        self._model_lock = threading.Lock()
+        self._queue: "queue.PriorityQueue[Tuple[int, int, _SttRequest]]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "requests": 0,
+            "completed": 0,
+            "errors": 0,
+            "batches": 0,
+            "batched_requests": 0,
+            "streams": 0,
+            "max_queue_depth": 0,
+            "audio_s_total": 0.0,
+            "processing_s_total": 0.0,
+            "wait_s_total": 0.0,
+            "last_rtf": 0.0,
+        }
+
+    # ── Modell ─────────────────────────────────────────────────────────────
+
+    def _compute_type_for(self, device: str) -> str:
+        if self.compute_type:
+            return self.compute_type
+        return "float16" if device == "cuda" else "int8"
+
+    def ensure_model(self) -> Any:
+        """Laedt das Modell einmalig (thread-safe) und gibt es zurueck."""
+        if self._model is not None:
+            return self._model
+        with self._model_lock:
+            if self._model is not None:
+                return self._model
+            device = "cuda" if self.device == "auto" else self.device
+            compute_type = self._compute_type_for(device)
+            log.info("🎤 Lade Whisper Modell '%s' auf %s (%s)...", self.model_name, device, compute_type)
+            try:
+                model = self._model_factory(self.model_name, device, compute_type)
+            except Exception as exc:
+                if device == "cpu":
+                    raise
+                log.warning("Whisper auf %s fehlgeschlagen (%s) — CPU int8 Fallback", device, exc)
+                device, compute_type = "cpu", "int8"
+                model = self._model_factory(self.model_name, device, compute_type)
+            self._loaded_device = device
+            self._loaded_compute_type = compute_type
+            self._model = model
+            log.info("✅ Whisper Modell geladen (%s, %s)", self._loaded_device, self._loaded_compute_type)
+        return self._model
+
+    def _batch_pipeline(self) -> Optional[Any]:
+        if not self._batcher_checked:
+            try:
+                self._batcher = self._batch_factory(self.ensure_model())
+            except Exception as exc:
+                log.warning("Batch-Pipeline nicht verfuegbar: %s", exc)
+                self._batcher = None
+            self._batcher_checked = True
+        return self._batcher
+
+    @property
+    def model_loaded(self) -> bool:
+        return self._model is not None
+
+    # ── Einreihen ──────────────────────────────────────────────────────────
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run_worker, name="stt-worker", daemon=True)
+                self._worker.start()
+
+    def submit(
+        self,
+        samples: np.ndarray,
+        *,
+        language: Optional[str] = "de",
+        beam_size: int = 5,
+        vad_filter: bool = True,
+        priority: int = PRIORITY_MESSAGE,
+        on_segment: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Future:
+        """Reiht eine Transkription ein; das Future liefert den Text."""
+        request = _SttRequest(
+            samples=np.asarray(samples, dtype=np.float32).reshape(-1),
+            language=language,
+            beam_size=int(beam_size),
+            vad_filter=bool(vad_filter),
+            priority=int(priority),
+            future=Future(),
+            on_segment=on_segment,
+        )
+        if len(request.samples) == 0:
+            request.future.set_result("")
+            return request.future
+        self._queue.put((request.priority, next(self._seq), request))
+        with self._stats_lock:
+            self._stats["requests"] += 1
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._queue.qsize())
+        self._ensure_worker()
+        return request.future
+
+    def transcribe(self, samples: np.ndarray, **options: Any) -> str:
+        """Blockierend: einreihen und auf das Ergebnis warten."""
+        return self.submit(samples, **options).result()
+
+    async def transcribe_async(self, samples: np.ndarray, **options: Any) -> str:
+        return await asyncio.wrap_future(self.submit(samples, **options))
+
+    async def stream_async(self, samples: np.ndarray, **options: Any) -> AsyncIterator[Dict[str, Any]]:
+        """Teiltranskripte waehrend der Verarbeitung; das letzte Element hat ``final=True``."""
+        loop = asyncio.get_running_loop()
+        partials: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+        def _on_segment(partial: Dict[str, Any]) -> None:
+            loop.call_soon_threadsafe(partials.put_nowait, partial)
+
+        future = asyncio.wrap_future(self.submit(samples, on_segment=_on_segment, **options))
+        while True:
+            getter = asyncio.ensure_future(partials.get())
+            done, _ = await asyncio.wait({getter, future}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                continue
+            getter.cancel()
+            text = await future  # Fehler des Workers hier weiterreichen
+            while not partials.empty():
+                yield partials.get_nowait()
+            yield {"text": text, "final": True}
+            return
+
+    # ── Worker ─────────────────────────────────────────────────────────────
+
+    def _batchable(self, request: _SttRequest) -> bool:
+        return request.on_segment is None and request.duration_s <= self.batch_max_clip_s
+
+    def _collect_batch(self, first: _SttRequest) -> List[_SttRequest]:
+        batch = [first]
+        if self.batch_max <= 1 or not self._batchable(first) or self._batch_pipeline() is None:
+            return batch
+        deferred: List[Tuple[int, int, _SttRequest]] = []
+        deadline = time.monotonic() + self.batch_wait_s
+        while len(batch) < self.batch_max:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            candidate = item[2]
+            if self._batchable(candidate) and candidate.batch_key == first.batch_key:
+                batch.append(candidate)
+            else:
+                deferred.append(item)
+        for item in deferred:
+            self._queue.put(item)
+        return batch
+
+    def _run_worker(self) -> None:
+        while True:
+            _priority, _seq, request = self._queue.get()
+            batch = self._collect_batch(request)
+            started = time.monotonic()
+            try:
+                if len(batch) > 1:
+                    texts = self._transcribe_batch(batch)
+                else:
+                    texts = [self._transcribe_single(request)]
+            except Exception as exc:
+                log.error("STT fehlgeschlagen (%d Clip(s)): %s", len(batch), exc, exc_info=True)
+                with self._stats_lock:
+                    self._stats["errors"] += len(batch)
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(exc)
+                continue
+            self._record(batch, started, time.monotonic())
+            for item, text in zip(batch, texts):
+                if not item.future.done():
+                    item.future.set_result(text)
+
+    def _transcribe_single(self, request: _SttRequest) -> str:
+        segments, _info = self.ensure_model().transcribe(
+            request.samples,
+            language=request.language,
+            beam_size=request.beam_size,
+            vad_filter=request.vad_filter,
+        )
+        parts: List[str] = []
+        for segment in segments:  # faster-whisper liefert Segmente lazy
+            text = segment.text.strip()
+            if not text:
+                continue
+            parts.append(text)
+            if request.on_segment is not None:
+                request.on_segment(
+                    {
+                        "text": " ".join(parts),
+                        "segment": text,
+                        "start": float(segment.start),
+                        "end": float(segment.end),
+                        "final": False,
+                    }
+                )
+        return " ".join(parts).strip()
+
+    def _request_chunks(self, request: _SttRequest, offset: float) -> List[Dict[str, float]]:
+        """``clip_timestamps``-Chunks eines Clips: ganzer Clip oder (vad_filter) seine Sprachabschnitte."""
+        if not request.vad_filter:
+            return [{"start": offset, "end": offset + request.duration_s}]
+        return [
+            {"start": offset + start, "end": offset + min(end, request.duration_s)}
+            for start, end in self._speech_spans(request.samples)
+            if end > start
+        ]
+
+    def _transcribe_batch(self, batch: List[_SttRequest]) -> List[str]:
+        """Clips aneinanderhaengen, Chunks je Clip uebergeben, Segmente zurueckordnen.
+
+        Die Pipeline laeuft immer mit ``vad_filter=False`` — sonst ignoriert sie
+        ``clip_timestamps`` und VAD-Chunks koennten Clip-Grenzen ueberspannen.
+        Angeforderte VAD wird deshalb pro Clip vorab angewandt.
+        """
+        offsets: List[float] = []
+        clips: List[Dict[str, float]] = []
+        position = 0.0
+        for request in batch:
+            offsets.append(position)
+            clips.extend(self._request_chunks(request, position))
+            position += request.duration_s
+        if not clips:
+            return ["" for _ in batch]  # nirgends Sprache erkannt
+        audio = np.concatenate([request.samples for request in batch])
+        first = batch[0]
+        segments, _info = self._batch_pipeline().transcribe(
+            audio,
+            language=first.language,
+            beam_size=first.beam_size,
+            vad_filter=False,
+            clip_timestamps=clips,
+            batch_size=min(len(clips), self.batch_max),
+        )
+        parts: List[List[str]] = [[] for _ in batch]
+        bounds = np.asarray(offsets[1:], dtype=np.float64)
+        for segment in segments:
+            text = segment.text.strip()
+            if text:
+                midpoint = (float(segment.start) + float(segment.end)) / 2.0
+                parts[int(np.searchsorted(bounds, midpoint, side="right"))].append(text)
+        return [" ".join(clip_parts).strip() for clip_parts in parts]
+
+    def _record(self, batch: List[_SttRequest], started: float, finished: float) -> None:
+        audio_s = sum(request.duration_s for request in batch)
+        processing_s = finished - started
+        with self._stats_lock:
+            self._stats["completed"] += len(batch)
+            self._stats["audio_s_total"] += audio_s
+            self._stats["processing_s_total"] += processing_s
+            self._stats["wait_s_total"] += sum(started - request.enqueued_at for request in batch)
+            self._stats["last_rtf"] = processing_s / audio_s if audio_s else 0.0
+            if len(batch) > 1:
+                self._stats["batches"] += 1
+                self._stats["batched_requests"] += len(batch)
+            if any(request.on_segment is not None for request in batch):
+                self._stats["streams"] += 1
+
+    # ── Kennzahlen ─────────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        completed = int(stats["completed"])
+        audio_s = stats["audio_s_total"]
+        return {
+            "model": self.model_name,
+            "model_loaded": self.model_loaded,
+            "device": self._loaded_device or self.device,
+            "compute_type": self._loaded_compute_type or self._compute_type_for(self.device),
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": int(stats["max_queue_depth"]),
+            "requests": int(stats["requests"]),
+            "completed": completed,
+            "errors": int(stats["errors"]),
+            "streams": int(stats["streams"]),
+            "batches": int(stats["batches"]),
+            "avg_batch_size": round(stats["batched_requests"] / stats["batches"], 2) if stats["batches"] else 0.0,
+            "audio_s_total": round(audio_s, 2),
+            "rtf": round(stats["processing_s_total"] / audio_s, 3) if audio_s else 0.0,
+            "last_rtf": round(stats["last_rtf"], 3),
+            "avg_wait_ms": round(stats["wait_s_total"] * 1000.0 / completed, 1) if completed else 0.0,
+        }
+
+
+_service: Optional[SpeechToTextService] = None
+_service_lock = threading.Lock()
+
+
+def get_stt_service() -> SpeechToTextService:
+    """Lazy-Singleton des prozessweiten STT-Service."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = SpeechToTextService()
+    return _service
@@ -62,6 +62,13 @@ def _check_write(full_path: Path):
         )
 
 
+def _path_cache_fingerprint(params: dict) -> list:
+    """Cache-Key-Zusatz: Pfad + mtime/Groesse, damit Aenderungen den Cache umgehen."""
+    full_path = _resolve_path(str(params.get("path") or ""))
+    stat = full_path.stat()
+    return [str(full_path), stat.st_mtime_ns, stat.st_size]
+
+
 # ── list_directory ────────────────────────────────────────────────────────────
 
 @tool(
@@ -75,7 +82,9 @@ def _check_write(full_path: Path):
         P("path", "string", "Pfad zum Verzeichnis (absolut oder relativ zu HOME)", required=True),
     ],
     capabilities=["file", "filesystem"],
-    category=C.FILE
+    category=C.FILE,
+    cache_ttl=10,
+    cache_fingerprint=_path_cache_fingerprint,
 )
 async def list_directory(path: str) -> dict:
     try:
@@ -315,7 +324,9 @@ async def search_in_files(path: str, text: str, file_pattern: str = "*", limit:
         P("path", "string", "Dateipfad (absolut oder relativ zu HOME)", required=True),
     ],
     capabilities=["file", "filesystem"],
-    category=C.FILE
+    category=C.FILE,
+    cache_ttl=30,
+    cache_fingerprint=_path_cache_fingerprint,
 )
 async def read_file(path: str) -> dict:
     try:
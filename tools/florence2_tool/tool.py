@@ -35,6 +35,7 @@ log.setLevel(logging.INFO)
 # ---------------------------------------------------------------------------
 from tools.tool_registry_v2 import tool, P, C, ToolCategory
 from utils.hf_model_pinning import resolve_pinned_revision
+from utils.vision_cache import get_vision_cache
 
 try:
     from tools.engines.vision_router import (
@@ -407,7 +408,25 @@ def _paddle_ocr_texts(image) -> tuple[list, str]:
     return filtered, "paddleocr"
 
 
+def _cached_analysis(image, task: str, compute) -> dict:
+    """Vollanalysen sind teuer (Caption + OD + OCR) — gleicher Bildinhalt wird aus dem Cache bedient."""
+    return get_vision_cache().get_or_compute(
+        image,
+        engine=f"florence2:{_model_path}",
+        task=task,
+        compute=compute,
+    )
+
+
 def _full_analysis(image) -> dict:
+    return _cached_analysis(image, "full_analysis", lambda: _compute_full_analysis(image))
+
+
+def _hybrid_analysis(image) -> dict:
+    return _cached_analysis(image, "hybrid_analysis", lambda: _compute_hybrid_analysis(image))
+
+
+def _compute_full_analysis(image) -> dict:
     caption = _caption(image)
     ui = _detect_ui(image)
     ocr = _ocr(image)
@@ -442,7 +461,7 @@ def _full_analysis(image) -> dict:
     }
 
 
-def _hybrid_analysis(image) -> dict:
+def _compute_hybrid_analysis(image) -> dict:
     caption = _caption(image)
     ui = _detect_ui(image)
     texts, ocr_backend = _paddle_ocr_texts(image)
@@ -576,6 +595,7 @@ async def florence2_health() -> dict:
         "model": _model_path,
         "device": _device,
         "enabled": _enabled,
+        "result_cache": get_vision_cache().stats(),
     }
 
 
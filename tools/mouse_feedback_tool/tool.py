@@ -48,7 +48,9 @@ except ImportError:
 
 try:
     import mss
+    import numpy as np
     from PIL import Image
+    from utils.screen_frames import get_frame_service
     MSS_AVAILABLE = True
 except ImportError:
     MSS_AVAILABLE = False
@@ -362,15 +364,15 @@ class ScreenshotCursorDetector(CursorDetector):
             return None
 
         try:
-            with mss.mss() as sct:
-                region = {
-                    "left": max(0, x - size // 2),
-                    "top": max(0, y - size // 2),
-                    "width": size,
-                    "height": size
-                }
-                sct_img = sct.grab(region)
-                return Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
+            # Vorher/Nachher-Vergleich braucht ein frisches Bild: max_age_s=0
+            pixels = get_frame_service().grab_region(
+                max(0, x - size // 2),
+                max(0, y - size // 2),
+                size,
+                size,
+                max_age_s=0,
+            )
+            return Image.fromarray(np.ascontiguousarray(pixels), "RGB")
         except:
             return None
 
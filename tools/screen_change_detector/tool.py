@@ -3,27 +3,35 @@
 Screen-Change-Gate: Reduziert Vision-Calls um 70-95%.
 
 Strategie:
-1. Hash-Vergleich (schnell) - identische Bilder erkennen
-2. Pixel-Diff (wenn Hash unterschiedlich) - feine Änderungen messen
-3. ROI-Support - nur bestimmte Bereiche überwachen
-
-Spart massiv Rechenzeit, indem Vision nur bei echter Änderung läuft.
+1. Zellsignatur (vektorisiert, NumPy) direkt auf dem BGRA-Frame des Frame-Service
+2. Kachelkarte: je Kachel die staerkste Zellaenderung gegen die letzte Signatur
+3. Ergebnis: geaendert ja/nein plus Liste schmutziger Rechtecke
+4. ROI-Support - nur bestimmte Bereiche ueberwachen
+
+Frueher wurde der ganze Screen gehasht und bei Abweichung ein 32x32-Thumbnail
+verglichen — kleine Aenderungen (Spinner, Button) verschwanden im Thumbnail,
+und Downstream-Tools wussten nicht, *wo* sich etwas geaendert hat. Die
+``dirty_rects`` erlauben OCR, SoM und Florence-2, nur diese Bereiche neu zu
+analysieren (siehe ``utils/screen_tiles.py``); gecachte Vision-Ergebnisse in
+diesen Bereichen werden verworfen (``utils/vision_cache.py``).
+
+Konfiguration:
+    DIFF_THRESHOLD            (default: 0.01)  Mindestaenderung einer Zelle (0..1)
+    SCREEN_TILE_SIZE          (default: 64)    Kachelkante in Pixeln
+    SCREEN_TILE_CELL_SIZE     (default: 8)     Zellkante in Pixeln
 """
 
 import logging
 import asyncio
 import os
 import time
-from typing import Optional, Dict, Tuple
-from dataclasses import dataclass, asdict
-
-import cv2
-import numpy as np
-from PIL import Image
-import mss
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
 
 from tools.tool_registry_v2 import tool, ToolParameter as P, ToolCategory as C
-from utils.stable_hash import stable_hex_digest
+from utils.screen_frames import get_frame_service
+from utils.screen_tiles import CellSignature, TileChangeMap, compute_cell_signature, diff_cell_signatures
+from utils.vision_cache import get_vision_cache
 from dotenv import load_dotenv
 
 # --- Setup ---
@@ -31,34 +39,34 @@ load_dotenv(override=True)
 log = logging.getLogger("screen_change_detector")
 
 # Konfiguration
-DIFF_THRESHOLD = float(os.getenv("DIFF_THRESHOLD", "0.001"))  # 0.1% Änderung
+DIFF_THRESHOLD = float(os.getenv("DIFF_THRESHOLD", "0.01"))  # 1% Intensitaetsaenderung einer 8x8-Zelle
 ACTIVE_MONITOR = int(os.getenv("ACTIVE_MONITOR", "1"))
-HASH_CACHE_SIZE = 10  # Anzahl der letzten Hashes im Cache
 
 
 @dataclass
 class ScreenSnapshot:
     """Snapshot eines Bildschirms zu einem Zeitpunkt."""
     timestamp: float
-    hash: str
+    frame_id: int
     size: Tuple[int, int]  # (width, height)
+    signature: CellSignature
     roi: Optional[Dict] = None
-    thumbnail: Optional[np.ndarray] = None  # Für schnellen Diff
 
 
 class ScreenChangeDetector:
     """
-    Erkennt Bildschirm-Änderungen mit Multi-Level-Ansatz.
+    Erkennt Bildschirm-Aenderungen ueber eine kachelbasierte Aenderungskarte.
 
-    Level 1: Hash-Vergleich (schnellste Methode, ~0.1ms)
-    Level 2: Pixel-Diff (wenn Hash unterschiedlich, ~5-10ms)
-    Level 3: Optional - Region-basierte Analyse
+    Signatur + Diff kosten ~7ms bei 1080p und ~27ms bei 4K (Vollbild, ohne
+    PIL-Konvertierung); mit ROI entsprechend weniger.
     """
 
     def __init__(self, threshold: float = DIFF_THRESHOLD):
         self.threshold = threshold
         self.last_snapshot: Optional[ScreenSnapshot] = None
-        self.hash_history = []  # Cache für mehrere Hashes
+        self.last_change_map: Optional[TileChangeMap] = None
+        self.last_dirty_rects: List[Dict[str, int]] = []
+        self._last_frame_id: Optional[int] = None
         self.stats = {
             "total_checks": 0,
             "changes_detected": 0,
@@ -66,128 +74,99 @@ class ScreenChangeDetector:
             "avg_check_time_ms": 0
         }
 
-    def _get_screenshot(self, roi: Optional[Dict] = None) -> Image.Image:
-        """Macht einen Screenshot vom konfigurierten Monitor."""
-        with mss.mss() as sct:
-            if ACTIVE_MONITOR < len(sct.monitors):
-                monitor = sct.monitors[ACTIVE_MONITOR]
-            else:
-                monitor = sct.monitors[1] if len(sct.monitors) > 1 else sct.monitors[0]
-
-            if roi:
-                grab_region = {
-                    "left": monitor["left"] + roi.get("x", 0),
-                    "top": monitor["top"] + roi.get("y", 0),
-                    "width": roi.get("width", monitor["width"]),
-                    "height": roi.get("height", monitor["height"])
-                }
-            else:
-                grab_region = monitor
-
-            sct_img = sct.grab(grab_region)
-            img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-
-            return img
-
-    def _calculate_hash(self, img: Image.Image) -> str:
-        """Berechnet stabilen Hash eines Bildes fuer Change-Detection."""
-        return stable_hex_digest(img.tobytes(), hex_chars=32)
-
-    def _create_thumbnail(self, img: Image.Image, size: int = 32) -> np.ndarray:
-        """Erstellt Thumbnail für schnellen Diff-Vergleich."""
-        img.thumbnail((size, size), Image.Resampling.NEAREST)
-        return np.array(img)
-
-    def _calculate_pixel_diff(self, img1: np.ndarray, img2: np.ndarray) -> float:
-        """Berechnet prozentuale Pixeldifferenz zwischen zwei Bildern."""
-        if img1.shape != img2.shape:
-            log.warning(f"Shape-Mismatch: {img1.shape} vs {img2.shape}")
-            return 1.0
-
-        diff = np.abs(img1.astype(int) - img2.astype(int))
-        max_diff = img1.shape[0] * img1.shape[1] * 255 * 3  # RGB
-        ratio = diff.sum() / max_diff
-
-        return ratio
+    def _get_frame_pixels(self, roi: Optional[Dict] = None) -> Tuple[Any, Any, Tuple[int, int]]:
+        """Holt einen Frame vom konfigurierten Monitor aus dem Frame-Service.
+
+        Der Frame muss neuer sein als der zuletzt geprüfte — ein Frame, den ein
+        anderes Tool seitdem gegrabbt hat, wird wiederverwendet. Zurueck kommen
+        der Frame, ein Zero-Copy-View auf den BGRA-Puffer (ggf. ROI) und der
+        ROI-Offset in Monitor-Koordinaten.
+        """
+        frame = get_frame_service().latest(ACTIVE_MONITOR, newer_than=self._last_frame_id)
+        self._last_frame_id = frame.frame_id
+        if not roi:
+            return frame, frame.bgra, (0, 0)
+        x0 = max(0, min(frame.width, int(roi.get("x", 0))))
+        y0 = max(0, min(frame.height, int(roi.get("y", 0))))
+        x1 = max(x0, min(frame.width, x0 + int(roi.get("width", frame.width))))
+        y1 = max(y0, min(frame.height, y0 + int(roi.get("height", frame.height))))
+        return frame, frame.bgra[y0:y1, x0:x1], (x0, y0)
 
     def has_changed(
         self,
         roi: Optional[Dict] = None,
         force_pixel_diff: bool = False
     ) -> Tuple[bool, Dict]:
-        """Prüft ob sich der Screen geändert hat."""
+        """Prüft ob sich der Screen geändert hat.
+
+        ``force_pixel_diff`` bleibt aus Kompatibilitaetsgruenden erhalten: die
+        Kachelkarte wird ohnehin bei jedem Check berechnet.
+        """
         start_time = time.perf_counter()
 
         self.stats["total_checks"] += 1
 
-        img = self._get_screenshot(roi)
-        current_hash = self._calculate_hash(img)
-
-        if self.last_snapshot is None:
-            thumbnail = self._create_thumbnail(img)
-            self.last_snapshot = ScreenSnapshot(
-                timestamp=time.time(),
-                hash=current_hash,
-                size=(img.width, img.height),
-                roi=roi,
-                thumbnail=thumbnail
-            )
-            self.hash_history.append(current_hash)
+        frame, pixels, offset = self._get_frame_pixels(roi)
+        signature = compute_cell_signature(pixels)
+        snapshot = ScreenSnapshot(
+            timestamp=time.time(),
+            frame_id=frame.frame_id,
+            size=(int(pixels.shape[1]), int(pixels.shape[0])),
+            signature=signature,
+            roi=roi,
+        )
+        previous = self.last_snapshot
+
+        if previous is None or not previous.signature.compatible_with(signature):
+            self.last_snapshot = snapshot
+            self.last_change_map = None
+            self.last_dirty_rects = [
+                {"x": offset[0], "y": offset[1], "width": snapshot.size[0], "height": snapshot.size[1]}
+            ]
+            if previous is not None:
+                self.stats["changes_detected"] += 1
+                get_vision_cache().invalidate_regions(self.last_dirty_rects)
 
             check_time = (time.perf_counter() - start_time) * 1000
             self._update_avg_time(check_time)
 
             return True, {
-                "reason": "first_check",
-                "method": "hash",
+                "reason": "first_check" if previous is None else "size_changed",
+                "method": "tile_map",
+                "dirty_rects": list(self.last_dirty_rects),
+                "frame_id": frame.frame_id,
                 "check_time_ms": round(check_time, 2)
             }
 
-        # Level 1: Hash-Vergleich
-        if not force_pixel_diff and current_hash == self.last_snapshot.hash:
-            self.stats["cache_hits"] += 1
-
-            check_time = (time.perf_counter() - start_time) * 1000
-            self._update_avg_time(check_time)
-
-            return False, {
-                "reason": "identical_hash",
-                "method": "hash",
-                "check_time_ms": round(check_time, 2)
-            }
-
-        # Level 2: Pixel-Diff
-        thumbnail = self._create_thumbnail(img)
-        diff_ratio = self._calculate_pixel_diff(
-            self.last_snapshot.thumbnail,
-            thumbnail
-        )
-
-        changed = diff_ratio >= self.threshold
+        change_map = diff_cell_signatures(previous.signature, signature, threshold=self.threshold)
+        changed = change_map.dirty_tiles > 0
+        dirty_rects = change_map.dirty_rects(offset=offset)
 
+        self.last_change_map = change_map
+        self.last_dirty_rects = dirty_rects
         if changed:
             self.stats["changes_detected"] += 1
-
-            self.last_snapshot = ScreenSnapshot(
-                timestamp=time.time(),
-                hash=current_hash,
-                size=(img.width, img.height),
-                roi=roi,
-                thumbnail=thumbnail
-            )
-
-            self.hash_history.append(current_hash)
-            if len(self.hash_history) > HASH_CACHE_SIZE:
-                self.hash_history.pop(0)
+            # Nur bei Aenderung weiterschieben: schleichende Aenderungen unterhalb
+            # der Schwelle summieren sich so gegen die letzte akzeptierte Basis.
+            self.last_snapshot = snapshot
+            get_vision_cache().invalidate_regions(dirty_rects)
+        else:
+            self.stats["cache_hits"] += 1
 
         check_time = (time.perf_counter() - start_time) * 1000
         self._update_avg_time(check_time)
 
         return changed, {
-            "reason": "changed" if changed else "below_threshold",
-            "method": "pixel_diff",
-            "diff_ratio": round(diff_ratio, 6),
+            "reason": "changed" if changed else "identical",
+            "method": "tile_map",
+            "dirty_rects": dirty_rects,
+            "dirty_tiles": change_map.dirty_tiles,
+            "total_tiles": change_map.total_tiles,
+            "dirty_ratio": round(change_map.dirty_ratio, 4),
+            "max_tile_diff": round(change_map.max_score, 6),
+            "tile_size": change_map.tile_size,
             "threshold": self.threshold,
+            "frame_id": frame.frame_id,
             "check_time_ms": round(check_time, 2)
         }
 
@@ -203,7 +182,8 @@ class ScreenChangeDetector:
     def reset(self):
         """Setzt Detector zurück."""
         self.last_snapshot = None
-        self.hash_history.clear()
+        self.last_change_map = None
+        self.last_dirty_rects = []
         log.info("Detector zurückgesetzt")
 
     def get_stats(self) -> Dict:
@@ -231,10 +211,10 @@ detector_instance = ScreenChangeDetector()
 
 @tool(
     name="should_analyze_screen",
-    description="Prüft ob eine Screen-Analyse nötig ist. Spart massiv Vision-Calls (70-95%), indem nur bei echter Änderung analysiert wird.",
+    description="Prüft ob eine Screen-Analyse nötig ist. Spart massiv Vision-Calls (70-95%), indem nur bei echter Änderung analysiert wird. info.dirty_rects nennt die geänderten Bereiche.",
     parameters=[
         P("roi", "object", "Region of Interest: {x, y, width, height}", required=False, default=None),
-        P("force_pixel_diff", "boolean", "Hash überspringen, direkt Pixel-Diff machen", required=False, default=False),
+        P("force_pixel_diff", "boolean", "Veraltet: die Kachelkarte wird immer berechnet", required=False, default=False),
     ],
     capabilities=["vision", "screen"],
     category=C.UI
@@ -326,9 +306,9 @@ async def get_screen_change_stats() -> dict:
 
 @tool(
     name="set_change_threshold",
-    description="Setzt den Schwellwert für Änderungserkennung (0.0 bis 1.0).",
+    description="Setzt den Schwellwert für Änderungserkennung (0.0 bis 1.0, mittlere Änderung einer 8x8-Zelle).",
     parameters=[
-        P("threshold", "number", "Schwellwert: 0.0001=sehr sensitiv, 0.001=normal, 0.01=weniger sensitiv"),
+        P("threshold", "number", "Schwellwert je Zelle: 0.003=sehr sensitiv, 0.01=normal, 0.05=weniger sensitiv"),
     ],
     capabilities=["vision", "screen"],
     category=C.UI
@@ -25,6 +25,7 @@ from urllib.parse import quote_plus
 import requests
 from dotenv import load_dotenv
 from tools.tool_registry_v2 import tool, ToolParameter as P, ToolCategory as C
+from utils.http_client_pool import get_sync_session
 from utils.location_presence import enrich_location_presence_snapshot
 from utils.location_route import (
     normalize_route_travel_mode,
@@ -440,7 +441,7 @@ def _search_sync(
     logger.info(f"🔍 Suche: '{query}' ({engine}/{vertical})")
 
     try:
-        response = requests.post(
+        response = get_sync_session().post(
             url,
             json=payload,
             headers=headers,
@@ -490,7 +491,8 @@ def _search_sync(
         P("device", "string", "desktop oder mobile", required=False, default="desktop"),
     ],
     capabilities=["search", "web"],
-    category=C.SEARCH
+    category=C.SEARCH,
+    cache_ttl=600,
 )
 async def search_web(
     query: str,
@@ -564,7 +566,8 @@ async def search_web(
         P("language_code", "string", "Sprache", required=False, default="de"),
     ],
     capabilities=["search", "web"],
-    category=C.SEARCH
+    category=C.SEARCH,
+    cache_ttl=300,
 )
 async def search_news(
     query: str,
@@ -674,6 +677,19 @@ async def get_current_location_context() -> dict:
     }
 
 
+def _location_cache_fingerprint(params: dict) -> list:
+    """Cache-Key-Zusatz: aktueller Standort-Snapshot, damit ein neuer GPS-Fix den Cache umgeht.
+
+    Auch bei expliziten Koordinaten relevant — das Ergebnis enthaelt die
+    Snapshot-Felder (Ortsname, Presence) im ``origin``.
+    """
+    snapshot = _load_runtime_location_snapshot() or {}
+    return [
+        snapshot.get(field_name)
+        for field_name in ("latitude", "longitude", "captured_at", "received_at", "presence_status", "usable_for_context")
+    ]
+
+
 @tool(
     name="search_google_maps_places",
     description=(
@@ -690,6 +706,8 @@ async def get_current_location_context() -> dict:
     ],
     capabilities=["search", "maps", "location"],
     category=C.SEARCH,
+    cache_ttl=120,
+    cache_fingerprint=_location_cache_fingerprint,
 )
 async def search_google_maps_places(
     query: str,
@@ -741,6 +759,8 @@ async def search_google_maps_places(
     ],
     capabilities=["search", "maps", "location"],
     category=C.SEARCH,
+    cache_ttl=3600,
+    cache_fingerprint=_location_cache_fingerprint,
 )
 async def get_google_maps_place(
     place_id: str = "",
@@ -789,6 +809,8 @@ async def get_google_maps_place(
     ],
     capabilities=["search", "maps", "location", "route"],
     category=C.SEARCH,
+    cache_ttl=60,
+    cache_fingerprint=_location_cache_fingerprint,
 )
 async def get_google_maps_route(
     destination_query: str,
@@ -886,7 +908,7 @@ def _call_google_routes_json(payload: dict[str, Any], timeout: float = DEFAULT_A
         "X-Goog-Api-Key": GOOGLE_ROUTES_API_KEY,
         "X-Goog-FieldMask": GOOGLE_ROUTES_FIELD_MASK,
     }
-    response = requests.post(
+    response = get_sync_session().post(
         GOOGLE_ROUTES_BASE_URL,
         headers=headers,
         json=payload,
@@ -924,7 +946,7 @@ def _call_serpapi_json(params: dict[str, Any], timeout: float = DEFAULT_API_TIME
 
     request_params = dict(params)
     request_params["api_key"] = SERPAPI_API_KEY
-    response = requests.get(SERPAPI_BASE_URL, params=request_params, timeout=timeout)
+    response = get_sync_session().get(SERPAPI_BASE_URL, params=request_params, timeout=timeout)
     response.raise_for_status()
     data = response.json()
     if data.get("error"):
@@ -1219,7 +1241,7 @@ def _call_dataforseo_json(
 ) -> dict:
     url = DATAFORSEO_BASE_URL + endpoint
     headers = _get_auth_header()
-    response = requests.request(method, url, json=payload, headers=headers, timeout=timeout)
+    response = get_sync_session().request(method, url, json=payload, headers=headers, timeout=timeout)
     response.raise_for_status()
     data = response.json()
     if data.get("status_code") != 20000:
@@ -1413,7 +1435,8 @@ def _dataforseo_video_info_result(data: dict, video_id: str) -> dict:
         P("mode", "string", "DataForSEO Modus: live oder standard", required=False, default="live"),
     ],
     capabilities=["search", "youtube"],
-    category=C.SEARCH
+    category=C.SEARCH,
+    cache_ttl=1800,
 )
 async def search_youtube(
     query: str,
@@ -1512,7 +1535,8 @@ async def search_youtube(
         P("mode", "string", "DataForSEO Modus: live oder standard", required=False, default="live"),
     ],
     capabilities=["search", "youtube"],
-    category=C.SEARCH
+    category=C.SEARCH,
+    cache_ttl=86400,
 )
 async def get_youtube_subtitles(
     video_id: str,
@@ -1616,7 +1640,8 @@ async def get_youtube_subtitles(
         P("mode", "string", "DataForSEO Modus: live oder standard", required=False, default="live"),
     ],
     capabilities=["search", "youtube"],
-    category=C.SEARCH
+    category=C.SEARCH,
+    cache_ttl=3600,
 )
 async def get_youtube_video_info(
     video_id: str,
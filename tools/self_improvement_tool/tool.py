@@ -5,6 +5,7 @@ tools/self_improvement_tool/tool.py — M12: Self-Improvement MCP-Tools
 - get_tool_analytics: Tool-Nutzungsstatistiken
 - get_routing_stats: Routing-Entscheidungsstatistiken
 - get_llm_usage_analytics: Token-/Kostenstatistiken fuer LLM-Calls
+- get_prompt_cache_report: Prompt-Cache-Trefferquote und eingesparte Tokens je Agent
 - get_llm_budget_status: Budget-Zustaende und Schwellwerte
 - get_ops_observability: zentrale Ops-Zusammenfassung
 - get_e2e_regression_matrix: produktionskritische Kernflows als Matrix
@@ -107,6 +108,32 @@ async def get_llm_usage_analytics(days: int = 7, session_id: str = "", limit: in
     return {"status": "ok", **stats}
 
 
+@tool(
+    name="get_prompt_cache_report",
+    description=(
+        "Gibt je Agent die Prompt-Cache-Trefferquote und die aus dem Provider-Cache "
+        "bedienten (eingesparten) Input-Tokens zurueck."
+    ),
+    parameters=[
+        P("days", "integer", "Analysezeitraum in Tagen (default: 7)", required=False, default=7),
+        P("agent", "string", "Optionaler Agent-Filter (z.B. executor)", required=False, default=""),
+        P("limit", "integer", "Maximale Anzahl Agenten (default: 10)", required=False, default=10),
+    ],
+    capabilities=["analysis", "system"],
+    category=C.SYSTEM,
+)
+async def get_prompt_cache_report(days: int = 7, agent: str = "", limit: int = 10) -> dict:
+    """Gibt Prompt-Cache-Statistiken je Agent zurueck."""
+    from orchestration.self_improvement_engine import get_improvement_engine
+
+    report = get_improvement_engine().get_prompt_cache_report(
+        days=max(1, min(90, days)),
+        agent=(agent or "").strip() or None,
+        limit=max(1, min(50, limit)),
+    )
+    return {"status": "ok", **report}
+
+
 @tool(
     name="get_llm_budget_status",
     description=(
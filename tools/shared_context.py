@@ -1,7 +1,7 @@
 # tools/shared_context.py
 
 import logging
-from typing import Optional, List
+from typing import Any, Optional, List
 
 # Wir importieren die Typen auf oberster Ebene
 from openai import OpenAI
@@ -21,6 +21,8 @@ inception_client: Optional[OpenAI] = None
 
 # --- Geteilte Datenbank-Verbindung ---
 memory_collection: Optional[chromadb.types.Collection] = None
+# Embedding-Funktion der memory_collection (fuer gecachte Query-Embeddings)
+memory_embedding_function: Optional[Any] = None
 
 # --- Geteilte Browser-Context-Manager (NEU: Phase A1) ---
 # Wird im mcp_server lifespan initialisiert
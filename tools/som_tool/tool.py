@@ -20,7 +20,6 @@ import asyncio
 import json
 import re
 import os
-import mss
 from PIL import Image, ImageDraw, ImageFont
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass, field
@@ -28,6 +27,8 @@ from dataclasses import dataclass, field
 from tools.tool_registry_v2 import tool, ToolParameter as P, ToolCategory as C
 from tools.engines.qwen_vl_engine import qwen_vl_engine_instance
 from dotenv import load_dotenv
+from utils.screen_frames import get_frame_service
+from utils.vision_cache import get_vision_cache
 from utils.coordinate_converter import (
     denormalize_point,
     normalize_point,
@@ -126,29 +127,22 @@ class SetOfMarkEngine:
         self._last_scan_types: List[str] = []
 
     def _capture_screenshot(self) -> Image.Image:
-        """Macht einen Screenshot des aktiven Monitors."""
-        with mss.mss() as sct:
-            # Monitor auswählen
-            if ACTIVE_MONITOR < len(sct.monitors):
-                monitor = sct.monitors[ACTIVE_MONITOR]
-            else:
-                monitor = sct.monitors[1] if len(sct.monitors) > 1 else sct.monitors[0]
-
-            # Dimensionen und Offset speichern
-            self.screen_width = monitor["width"]
-            self.screen_height = monitor["height"]
-            self.monitor_offset_x = monitor["left"]
-            self.monitor_offset_y = monitor["top"]
-
-            # Screenshot erstellen
-            sct_img = sct.grab(monitor)
-            img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-
-            log.debug(
-                f"Screenshot: {self.screen_width}x{self.screen_height} "
-                f"von Monitor {ACTIVE_MONITOR} (Offset: {self.monitor_offset_x}, {self.monitor_offset_y})"
-            )
-            return img
+        """Holt den aktuellen Frame des aktiven Monitors aus dem Frame-Service."""
+        frame = get_frame_service().latest(ACTIVE_MONITOR)
+        monitor = frame.monitor
+
+        # Dimensionen und Offset speichern
+        self.screen_width = monitor["width"]
+        self.screen_height = monitor["height"]
+        self.monitor_offset_x = monitor["left"]
+        self.monitor_offset_y = monitor["top"]
+
+        log.debug(
+            f"Screenshot: {self.screen_width}x{self.screen_height} "
+            f"von Monitor {ACTIVE_MONITOR} (Offset: {self.monitor_offset_x}, {self.monitor_offset_y}) "
+            f"frame={frame.frame_id}"
+        )
+        return frame.to_pil()
 
     def _detect_all_elements(
         self,
@@ -410,6 +404,14 @@ class SetOfMarkEngine:
 
         return relative_pixel_x, relative_pixel_y, width, height, pixel_center_x, pixel_center_y
 
+    def _detect_objects(self, element_types: List[str], use_zoom: bool) -> List[Dict]:
+        """Basis- und optionaler Zoom-Pass, dedupliziert und gefiltert (normierte Koordinaten)."""
+        detected = self._detect_all_elements(self.screenshot, element_types, source="base")
+        if use_zoom and len(detected) <= ZOOM_PASS_THRESHOLD:
+            detected.extend(self._run_zoom_pass(element_types))
+        detected = self._deduplicate_objects(detected)
+        return self._filter_oversized_boxes(detected)
+
     async def scan_screen(self, element_types: Optional[List[str]] = None, use_zoom: bool = True) -> List[UIElement]:
         """Scannt den Bildschirm nach UI-Elementen via Qwen-VL."""
         self.elements = []
@@ -426,11 +428,17 @@ class SetOfMarkEngine:
 
         log.info(f"Scanne nach {len(types_to_scan)} Element-Typen via Qwen-VL: {', '.join(types_to_scan[:3])}...")
 
-        detected = self._detect_all_elements(self.screenshot, types_to_scan, source="base")
-        if use_zoom and len(detected) <= ZOOM_PASS_THRESHOLD:
-            detected.extend(self._run_zoom_pass(types_to_scan))
-        detected = self._deduplicate_objects(detected)
-        detected = self._filter_oversized_boxes(detected)
+        # Gleicher Bildinhalt + gleiche Typen → Qwen-VL-Lauf aus dem Vision-Cache;
+        # schmutzige Kacheln des Screen-Change-Detectors verwerfen den Eintrag.
+        detected = get_vision_cache().get_or_compute(
+            self.screenshot,
+            engine=f"som:{getattr(qwen_vl_engine_instance, 'model_name', 'qwen-vl')}",
+            task="scan_screen",
+            params={"element_types": list(types_to_scan), "use_zoom": bool(use_zoom)},
+            region={"x": 0, "y": 0, "width": self.screenshot.width, "height": self.screenshot.height},
+            compute=lambda: self._detect_objects(types_to_scan, use_zoom),
+            cacheable=bool,
+        )
 
         element_id = 1
         for obj in detected:
@@ -26,7 +26,7 @@ import json
 import asyncio
 import os
 import re
-from typing import Dict, Callable, Any, List, Optional, TypedDict, get_type_hints, Union
+from typing import Awaitable, Dict, Callable, Any, List, Optional, TypedDict, get_type_hints, Union
 from dataclasses import dataclass, field
 from enum import Enum
 from functools import wraps
@@ -34,8 +34,11 @@ from functools import wraps
 # JSON-RPC Bridge Imports
 from jsonrpcserver import Success, Error
 from jsonrpcserver.methods import global_methods
+from jsonrpcserver.sentinels import Sentinel
 from oslash.either import Right, Left
 
+from tools.tool_result_cache import ToolCachePolicy, get_tool_result_cache, tool_result_cache_enabled
+
 log = logging.getLogger("ToolRegistryV2")
 
 
@@ -45,6 +48,22 @@ class ValidationError(Exception):
     pass
 
 
+class ToolDispatchError(Exception):
+    """Tool-Fehler beim In-Process-Dispatch (entspricht einem JSON-RPC-Error)."""
+
+    def __init__(self, code: int = -32000, message: str = "", data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.data = data
+
+    def to_jsonrpc_error(self) -> Dict[str, Any]:
+        error: Dict[str, Any] = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
 class ToolCategory(str, Enum):
     BROWSER = "browser"
     VISION = "vision"
@@ -203,6 +222,7 @@ class ToolMetadata:
     parallel_allowed: bool = False
     timeout: Optional[float] = None
     priority: int = 0
+    cache: Optional[ToolCachePolicy] = None
 
     def to_openai_schema(self) -> Dict[str, Any]:
         properties = {}
@@ -284,6 +304,11 @@ class ToolRegistryV2:
     _tools: Dict[str, ToolMetadata] = {}
     _capability_index: Dict[str, List[str]] = {}
     _category_index: Dict[str, List[str]] = {}
+    _rpc_index: Dict[str, str] = {}
+    _revision: int = 0
+    # In-Process-Dispatch: nur aktiv, wenn dieser Prozess der Tool-Host ist (MCP-Server)
+    _inprocess_host: bool = False
+    _dispatch_listeners: List[Callable[[Dict[str, Any]], None]] = []
 
     def __new__(cls):
         if cls._instance is None:
@@ -291,6 +316,8 @@ class ToolRegistryV2:
             cls._tools = {}
             cls._capability_index = {}
             cls._category_index = {}
+            cls._rpc_index = {}
+            cls._dispatch_listeners = []
         return cls._instance
 
     def register(
@@ -306,6 +333,10 @@ class ToolRegistryV2:
         parallel_allowed: bool = False,
         timeout: Optional[float] = None,
         priority: int = 0,
+        cache_ttl: Optional[float] = None,
+        cache_key_params: Optional[List[str]] = None,
+        cache_scope: str = "global",
+        cache_fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None,
     ) -> Callable:
         """
         Registriert ein Tool in V2 Registry UND jsonrpcserver global_methods.
@@ -323,8 +354,13 @@ class ToolRegistryV2:
             parallel_allowed: Ob Tool parallel zu anderen ausgefuehrt werden darf
             timeout: Optionaler Timeout in Sekunden
             priority: Prioritaet fuer Queue (hoeher = wichtiger)
+            cache_ttl: Ergebnis-Cache in Sekunden fuer idempotente Tools (None = kein Cache)
+            cache_key_params: Parameter, die den Cache-Key bilden (None = alle)
+            cache_scope: "global" oder "session" (Key enthaelt die Session-ID)
+            cache_fingerprint: Optionaler Zusatz zum Key, z.B. mtime einer Datei
         """
         rpc_name = jsonrpc_name or name
+        cache_policy = ToolCachePolicy.build(cache_ttl, cache_key_params, cache_scope, cache_fingerprint)
 
         def decorator(fn: Callable) -> Callable:
             is_async = inspect.iscoroutinefunction(fn)
@@ -343,9 +379,12 @@ class ToolRegistryV2:
                 parallel_allowed=parallel_allowed,
                 timeout=timeout,
                 priority=priority,
+                cache=cache_policy,
             )
 
             self._tools[name] = metadata
+            self._rpc_index[rpc_name] = name
+            type(self)._revision += 1
 
             # Capability Index
             for cap in capabilities:
@@ -368,7 +407,9 @@ class ToolRegistryV2:
                 @wraps(fn)
                 async def jsonrpc_wrapper(*args, **kwargs):
                     try:
-                        result = await fn(*args, **kwargs)
+                        result = await self._call_with_cache(
+                            metadata, None if args else kwargs, lambda: fn(*args, **kwargs)
+                        )
                         # Bereits ein Success/Error (Right/Left) Objekt
                         if isinstance(result, (Right, Left)):
                             return result
@@ -381,7 +422,9 @@ class ToolRegistryV2:
                 @wraps(fn)
                 async def jsonrpc_wrapper(*args, **kwargs):
                     try:
-                        result = await asyncio.to_thread(fn, *args, **kwargs)
+                        result = await self._call_with_cache(
+                            metadata, None if args else kwargs, lambda: asyncio.to_thread(fn, *args, **kwargs)
+                        )
                         if isinstance(result, (Right, Left)):
                             return result
                         return Success(self.normalize_tool_result(name, result))
@@ -608,7 +651,14 @@ class ToolRegistryV2:
         normalized["error"] = str(payload.get("error") or "")
         return normalized
 
-    async def execute(self, name: str, validate: bool = True, normalize: bool = False, **kwargs) -> Any:
+    async def execute(
+        self,
+        name: str,
+        validate: bool = True,
+        normalize: bool = False,
+        offload_sync: bool = False,
+        **kwargs,
+    ) -> Any:
         """
         Fuehrt ein Tool aus mit vollstaendiger Parameter-Validierung.
 
@@ -616,6 +666,7 @@ class ToolRegistryV2:
             name: Name des Tools
             validate: Ob Parameter validiert werden sollen (default: True)
             normalize: Ob Dict-Rueckgaben in den Tool-Envelope normalisiert werden sollen
+            offload_sync: Sync-Tools im Thread ausfuehren (wie der JSON-RPC-Wrapper)
             **kwargs: Parameter fuer das Tool
 
         Returns:
@@ -625,6 +676,21 @@ class ToolRegistryV2:
             ValueError: Wenn das Tool nicht existiert
             ValidationError: Wenn die Parameter-Validierung fehlschlaegt
         """
+        return await self._execute(
+            name, kwargs, validate=validate, normalize=normalize, offload_sync=offload_sync
+        )
+
+    async def _execute(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        *,
+        validate: bool,
+        normalize: bool,
+        offload_sync: bool,
+    ) -> Any:
+        """Tool-Argumente als ein Dict — Parameter wie ``name``/``validate`` kollidieren so nicht."""
+        kwargs = dict(params or {})
         metadata = self.get_tool(name)
 
         if validate:
@@ -645,21 +711,114 @@ class ToolRegistryV2:
 
         log.debug(f"Fuehre Tool aus: {name}({list(validated_kwargs.keys())})")
 
-        if metadata.is_async:
-            result = await metadata.function(**validated_kwargs)
-        else:
+        async def _run() -> Any:
+            if metadata.is_async:
+                return await metadata.function(**validated_kwargs)
             # In einigen Laufumgebungen kann run_in_executor/to_thread haengen.
             # Default: direkte Ausfuehrung; optional per Env wieder in Threadpool.
-            use_threadpool = os.getenv("TIMUS_SYNC_TOOL_USE_THREADPOOL", "0") == "1"
+            use_threadpool = offload_sync or os.getenv("TIMUS_SYNC_TOOL_USE_THREADPOOL", "0") == "1"
             if use_threadpool:
-                result = await asyncio.to_thread(metadata.function, **validated_kwargs)
-            else:
-                result = metadata.function(**validated_kwargs)
+                return await asyncio.to_thread(metadata.function, **validated_kwargs)
+            return metadata.function(**validated_kwargs)
+
+        result = await self._call_with_cache(metadata, validated_kwargs, _run)
 
         if normalize:
             return self.normalize_tool_result(name, result)
         return result
 
+    # ── Ergebnis-Cache ───────────────────────────────────────────
+
+    async def _call_with_cache(
+        self,
+        metadata: ToolMetadata,
+        params: Optional[Dict[str, Any]],
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        policy = metadata.cache
+        # params=None: positionaler JSON-RPC-Aufruf, kein stabiler Key
+        if policy is None or params is None or not tool_result_cache_enabled():
+            return await call()
+        defaults = {p.name: p.default for p in metadata.parameters if not p.required}
+        cache = get_tool_result_cache()
+        key = cache.make_key(metadata.name, policy, params, defaults)
+        if key is None:
+            return await call()
+        return await cache.get_or_call(metadata.name, key, policy.ttl_s, call)
+
+    @property
+    def revision(self) -> int:
+        """Steigt bei jeder Registrierung (z.B. fuer gecachte Tool-Beschreibungen)."""
+        return self._revision
+
+    def invalidate_tool_cache(self, tool_name: Optional[str] = None) -> int:
+        """Verwirft gecachte Ergebnisse eines Tools (oder aller Tools)."""
+        return get_tool_result_cache().invalidate(tool_name)
+
+    # ── In-Process-Dispatch ──────────────────────────────────────
+
+    def enable_inprocess_dispatch(self, listener: Optional[Callable[[Dict[str, Any]], None]] = None) -> None:
+        """Markiert diesen Prozess als Tool-Host; Agenten im selben Prozess umgehen HTTP."""
+        type(self)._inprocess_host = True
+        if listener is not None and listener not in self._dispatch_listeners:
+            self._dispatch_listeners.append(listener)
+
+    def disable_inprocess_dispatch(self) -> None:
+        type(self)._inprocess_host = False
+        self._dispatch_listeners.clear()
+
+    def resolve_rpc_name(self, rpc_name: str) -> Optional[str]:
+        """JSON-RPC-Methodenname → V2-Toolname (None, wenn nicht in der Registry)."""
+        name = self._rpc_index.get(rpc_name)
+        if name is None and rpc_name in self._tools:
+            name = rpc_name
+        # Ein spaeter direkt in global_methods registrierter Handler gewinnt im Server.
+        if name is None or getattr(global_methods.get(rpc_name), "__wrapped__", None) is not self._tools[name].function:
+            return None
+        return name
+
+    def can_dispatch_inprocess(self, rpc_name: str) -> bool:
+        return self._inprocess_host and self.resolve_rpc_name(rpc_name) is not None
+
+    def _notify_dispatch(self, event: Dict[str, Any]) -> None:
+        for listener in list(self._dispatch_listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                log.debug(f"Dispatch-Listener fehlgeschlagen: {e}")
+
+    async def dispatch(self, rpc_name: str, params: Dict[str, Any]) -> Any:
+        """
+        In-Process-Gegenstueck zum JSON-RPC-Wrapper: gleiche Ausfuehrung
+        (sync Tools im Thread), gleiche Normalisierung, ohne HTTP/JSON.
+
+        Raises:
+            ToolDispatchError: Tool lieferte Error() oder warf eine Exception
+        """
+        name = self.resolve_rpc_name(rpc_name)
+        if name is None:
+            raise ValueError(f"Tool '{rpc_name}' ist nicht in-process verfuegbar")
+        event_id = os.urandom(4).hex()
+        self._notify_dispatch({"type": "tool_start", "tool": rpc_name, "id": event_id})
+        try:
+            result = await self._execute(name, params, validate=False, normalize=False, offload_sync=True)
+        except Exception as e:
+            log.error(f"Tool {name} error: {e}")
+            raise ToolDispatchError(code=-32000, message=str(e)) from e
+        finally:
+            self._notify_dispatch({"type": "tool_done", "tool": rpc_name, "id": event_id})
+
+        if isinstance(result, Left):
+            error = getattr(result, "_error", None)
+            raise ToolDispatchError(
+                code=getattr(error, "code", -32000),
+                message=str(getattr(error, "message", "") or ""),
+                data=None if isinstance(getattr(error, "data", None), Sentinel) else error.data,
+            )
+        if isinstance(result, Right):
+            result = getattr(getattr(result, "_value", None), "result", None)
+        return self.normalize_tool_result(name, result)
+
     def validate_tool_call(self, tool_name: str, /, **kwargs) -> Dict[str, Any]:
         """
         Validiert einen Tool-Aufruf ohne ihn auszufuehren.
@@ -719,6 +878,10 @@ def tool(
     parallel_allowed: bool = False,
     timeout: Optional[float] = None,
     priority: int = 0,
+    cache_ttl: Optional[float] = None,
+    cache_key_params: Optional[List[str]] = None,
+    cache_scope: str = "global",
+    cache_fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None,
 ):
     """
     Decorator fuer Tool-Registrierung mit V2 Metadata + JSON-RPC Bridge.
@@ -731,6 +894,7 @@ def tool(
             capabilities=["search"],
             category=C.SEARCH,
             parallel_allowed=True,  # Erlaubt parallele Ausfuehrung
+            cache_ttl=600,          # Idempotent: Ergebnis 10 Min. wiederverwenden
         )
         async def search_web(query: str) -> dict:
             return {"results": [...]}
@@ -747,6 +911,10 @@ def tool(
         parallel_allowed=parallel_allowed,
         timeout=timeout,
         priority=priority,
+        cache_ttl=cache_ttl,
+        cache_key_params=cache_key_params,
+        cache_scope=cache_scope,
+        cache_fingerprint=cache_fingerprint,
     )
 
 
@@ -0,0 +1,292 @@
+"""
+tools/tool_result_cache.py
+
+Gemeinsamer LRU+TTL-Ergebnis-Cache fuer idempotente Tools der ToolRegistryV2.
+
+Tools melden ihre Cache-Faehigkeit deklarativ beim Registrieren an:
+
+    @tool(
+        name="search_web",
+        ...,
+        cache_ttl=600,                         # Sekunden
+        cache_key_params=["query", "engine"],  # None = alle Parameter
+        cache_scope="global",                  # oder "session"
+    )
+
+Die Registry prueft vor jedem Aufruf (JSON-RPC-Wrapper und execute) den
+Cache. Gleichzeitige identische Aufrufe werden per Single-Flight
+zusammengefasst: nur der erste fuehrt das Tool aus, die anderen warten auf
+dessen Ergebnis. Fehler-Ergebnisse werden nie gecacht.
+
+Konfiguration:
+    TOOL_RESULT_CACHE_ENABLED      (default: true)
+    TOOL_RESULT_CACHE_MAX_ENTRIES  (default: 1024)
+
+USAGE:
+    cache = get_tool_result_cache()
+    cache.stats()                 # Treffer/Fehlschlaege je Tool (/health)
+    cache.invalidate("read_file") # z.B. nach Schreibzugriffen
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+log = logging.getLogger("ToolResultCache")
+
+CACHE_SCOPE_GLOBAL = "global"
+CACHE_SCOPE_SESSION = "session"
+_CACHE_SCOPES = {CACHE_SCOPE_GLOBAL, CACHE_SCOPE_SESSION}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def tool_result_cache_enabled() -> bool:
+    return os.getenv("TOOL_RESULT_CACHE_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+@dataclass(frozen=True)
+class ToolCachePolicy:
+    """Cache-Metadaten eines Tools (aus @tool(cache_ttl=..., ...))."""
+
+    ttl_s: float
+    key_params: Optional[Tuple[str, ...]] = None
+    scope: str = CACHE_SCOPE_GLOBAL
+    # Optionaler Zusatz zum Key, z.B. mtime/Groesse einer Datei
+    fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+    @classmethod
+    def build(
+        cls,
+        ttl_s: Optional[float],
+        key_params: Optional[Iterable[str]] = None,
+        scope: str = CACHE_SCOPE_GLOBAL,
+        fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Optional["ToolCachePolicy"]:
+        if not ttl_s or float(ttl_s) <= 0:
+            return None
+        scope_value = (scope or CACHE_SCOPE_GLOBAL).strip().lower()
+        if scope_value not in _CACHE_SCOPES:
+            raise ValueError(f"Unbekannter cache_scope '{scope}' (erlaubt: {sorted(_CACHE_SCOPES)})")
+        return cls(
+            ttl_s=float(ttl_s),
+            key_params=tuple(key_params) if key_params is not None else None,
+            scope=scope_value,
+            fingerprint=fingerprint,
+        )
+
+
+def is_cacheable_tool_result(result: Any) -> bool:
+    """Nur erfolgreiche, plain Ergebnisse cachen (keine Fehler, keine Success/Error-Objekte)."""
+    if result is None:
+        return False
+    if isinstance(result, dict):
+        if result.get("error"):
+            return False
+        if result.get("success") is False:
+            return False
+        if str(result.get("status") or "").strip().lower() == "error":
+            return False
+        return True
+    return isinstance(result, (list, str, int, float, bool))
+
+
+def _current_session_id() -> str:
+    try:
+        from orchestration.request_correlation import get_current_session_id
+
+        return get_current_session_id()
+    except Exception:
+        return ""
+
+
+class ToolResultCache:
+    """Thread-sicherer LRU+TTL-Cache mit Single-Flight je Event-Loop."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "stores": 0, "evictions": 0, "expired": 0, "uncacheable": 0}
+        self._by_tool: Dict[str, Dict[str, int]] = {}
+
+    # ── Keys ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def make_key(
+        tool_name: str,
+        policy: ToolCachePolicy,
+        params: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """Stabiler Key aus Toolname, relevanten Parametern (inkl. Defaults) und Scope."""
+        merged = dict(defaults or {})
+        merged.update(params or {})
+        if policy.key_params is not None:
+            merged = {name: merged.get(name) for name in policy.key_params}
+
+        scope_part = ""
+        if policy.scope == CACHE_SCOPE_SESSION:
+            scope_part = _current_session_id()
+            if not scope_part:
+                # Ohne Session-Kontext lieber nicht cachen als Sessions zu vermischen.
+                return None
+
+        fingerprint: Any = None
+        if policy.fingerprint is not None:
+            try:
+                fingerprint = policy.fingerprint(dict(merged))
+            except Exception:
+                return None
+
+        raw = json.dumps(
+            {"p": merged, "s": scope_part, "f": fingerprint},
+            sort_keys=True,
+            ensure_ascii=True,
+            default=str,
+        )
+        return f"{tool_name}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+    # ── Lookup/Store ─────────────────────────────────────────────
+
+    def _count(self, tool_name: str, field_name: str) -> None:
+        self._stats[field_name] += 1
+        per_tool = self._by_tool.setdefault(tool_name, {"hits": 0, "misses": 0, "coalesced": 0})
+        if field_name in per_tool:
+            per_tool[field_name] += 1
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, tool_name, value = entry
+            if expires_at <= now:
+                self._entries.pop(key, None)
+                self._stats["expired"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._count(tool_name, "hits")
+        return True, copy.deepcopy(value)
+
+    def put(self, key: str, tool_name: str, value: Any, ttl_s: float) -> None:
+        stored = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + float(ttl_s), tool_name, stored)
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    async def get_or_call(
+        self,
+        tool_name: str,
+        key: str,
+        ttl_s: float,
+        call: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool] = is_cacheable_tool_result,
+    ) -> Any:
+        hit, value = self.get(key)
+        if hit:
+            return value
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            leader_future = self._inflight.get(key)
+            if leader_future is not None and leader_future.get_loop() is loop and not leader_future.done():
+                self._count(tool_name, "coalesced")
+            else:
+                leader_future = None
+                self._count(tool_name, "misses")
+                own_future: asyncio.Future = loop.create_future()
+                self._inflight[key] = own_future
+
+        if leader_future is not None:
+            try:
+                return copy.deepcopy(await asyncio.shield(leader_future))
+            except asyncio.CancelledError:
+                if not leader_future.cancelled():
+                    raise
+                # Leader wurde abgebrochen: selbst ausfuehren statt mitzufallen.
+                return await call()
+
+        try:
+            result = await call()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            if isinstance(exc, asyncio.CancelledError):
+                own_future.cancel()
+            else:
+                own_future.set_exception(exc)
+                # Exception nicht als "never retrieved" melden, wenn kein Follower wartet.
+                own_future.exception()
+            raise
+
+        if cacheable(result):
+            self.put(key, tool_name, result, ttl_s)
+        else:
+            with self._lock:
+                self._stats["uncacheable"] += 1
+        with self._lock:
+            self._inflight.pop(key, None)
+        own_future.set_result(result)
+        return result
+
+    # ── Verwaltung ───────────────────────────────────────────────
+
+    def invalidate(self, tool_name: Optional[str] = None) -> int:
+        with self._lock:
+            if tool_name is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            prefix = f"{tool_name}:"
+            victims = [key for key in self._entries if key.startswith(prefix)]
+            for key in victims:
+                self._entries.pop(key, None)
+            return len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"] + self._stats["coalesced"]
+            return {
+                "enabled": tool_result_cache_enabled(),
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "in_flight": len(self._inflight),
+                "hit_rate": round((self._stats["hits"] + self._stats["coalesced"]) / lookups, 3) if lookups else 0.0,
+                **self._stats,
+                "by_tool": {name: dict(counts) for name, counts in sorted(self._by_tool.items())},
+            }
+
+
+_cache: Optional[ToolResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tool_result_cache() -> ToolResultCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ToolResultCache(max_entries=_env_int("TOOL_RESULT_CACHE_MAX_ENTRIES", 1024))
+    return _cache
@@ -4,7 +4,8 @@ from __future__ import annotations
 """
 Timus Voice Tool v2.0
 
-Spracheingabe: Faster-Whisper (lokal, GPU)
+Spracheingabe: Faster-Whisper (lokal) ueber den geteilten STT-Service
+(tools/engines/stt_service.py — ein Modell pro Prozess, auch fuer Telegram)
 Sprachausgabe: Inworld.AI TTS
 """
 
@@ -16,12 +17,18 @@ import os
 import queue
 import time
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 import numpy as np
 import requests
 from dotenv import load_dotenv
 
+from tools.engines.stt_service import (
+    PRIORITY_INTERACTIVE,
+    PRIORITY_MESSAGE,
+    decode_audio,
+    get_stt_service,
+)
 from tools.tool_registry_v2 import ToolCategory as C
 from tools.tool_registry_v2 import ToolParameter as P
 from tools.tool_registry_v2 import tool
@@ -30,8 +37,6 @@ from utils.voice_text import normalize_tts_text
 load_dotenv(override=True)
 log = logging.getLogger("voice_tool")
 
-WHISPER_MODEL = os.getenv("WHISPER_MODEL", "medium")
-WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
 SAMPLE_RATE = 16000
 VOICE_TRANSCRIBE_BACKEND = os.getenv("VOICE_TRANSCRIBE_BACKEND", "openai_api")
 OPENAI_TRANSCRIBE_MODEL = os.getenv("OPENAI_TRANSCRIBE_MODEL", "whisper-1")
@@ -77,23 +82,10 @@ class VoiceEngine:
         self._initialized = True
 
     def ensure_whisper_model(self) -> None:
+        """Laedt das geteilte Whisper-Modell des STT-Service (einmal pro Prozess)."""
         if self.whisper_model is not None:
             return
-
-        from faster_whisper import WhisperModel
-
-        log.info("🎤 Lade Whisper Modell '%s' auf %s...", WHISPER_MODEL, WHISPER_DEVICE)
-        try:
-            self.whisper_model = WhisperModel(
-                WHISPER_MODEL,
-                device=WHISPER_DEVICE,
-                compute_type="float16" if WHISPER_DEVICE == "cuda" else "int8",
-            )
-            log.info("✅ Whisper Modell geladen")
-        except Exception as exc:
-            log.error("❌ Whisper Fehler: %s", exc)
-            log.info("Versuche CPU-Fallback...")
-            self.whisper_model = WhisperModel(WHISPER_MODEL, device="cpu", compute_type="int8")
+        self.whisper_model = get_stt_service().ensure_model()
 
     def _device_rate(self) -> int:
         try:
@@ -177,13 +169,13 @@ class VoiceEngine:
             log.warning("Keine Audio-Daten aufgenommen")
             return ""
 
-        segments, _ = self.whisper_model.transcribe(
+        text = get_stt_service().transcribe(
             audio,
             language=self.config.language,
             vad_filter=False,
             beam_size=5,
+            priority=PRIORITY_INTERACTIVE,
         )
-        text = " ".join(segment.text.strip() for segment in segments).strip()
         log.info("📝 Erkannt: '%s'", text)
         return text
 
@@ -222,22 +214,14 @@ class VoiceEngine:
             if text is not None:
                 return text
 
-        self.ensure_whisper_model()
-
-        from pydub import AudioSegment
-
-        source = io.BytesIO(audio_bytes)
-        audio = AudioSegment.from_file(source, format=audio_format or None)
-        audio = audio.set_channels(1).set_frame_rate(16000)
-        samples = np.array(audio.get_array_of_samples(), dtype=np.float32) / 32768.0
-
-        segments, _ = self.whisper_model.transcribe(
+        samples = decode_audio(audio_bytes, audio_format)
+        text = get_stt_service().transcribe(
             samples,
             language=self.config.language,
             vad_filter=True,
             beam_size=5,
+            priority=PRIORITY_MESSAGE,
         )
-        text = " ".join(segment.text.strip() for segment in segments).strip()
         log.info("📝 Browser-Audio erkannt: '%s'", text)
         return text
 
@@ -324,6 +308,22 @@ class VoiceEngine:
     ) -> str:
         return await asyncio.to_thread(self.transcribe_audio_bytes, audio_bytes, audio_format)
 
+    async def stream_transcription_async(
+        self,
+        audio_bytes: bytes,
+        audio_format: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """Teiltranskripte fuer lange Aufnahmen (immer lokales Whisper); letztes Element hat final=True."""
+        samples = await asyncio.to_thread(decode_audio, audio_bytes, audio_format)
+        async for partial in get_stt_service().stream_async(
+            samples,
+            language=self.config.language,
+            vad_filter=True,
+            beam_size=5,
+            priority=PRIORITY_MESSAGE,
+        ):
+            yield partial
+
     def set_voice(self, voice_name: str) -> bool:
         self.config.inworld_voice = voice_name
         return True
@@ -465,10 +465,13 @@ async def voice_chat_turn(timeout: float = 10.0) -> dict:
 )
 async def voice_initialize() -> dict:
     await asyncio.to_thread(voice_engine.initialize)
+    stt_stats = get_stt_service().stats()
     return {
         "initialized": True,
-        "whisper_model": WHISPER_MODEL,
-        "whisper_device": WHISPER_DEVICE,
+        # Tatsaechlich geladenes Modell/Device (CUDA-Fehler → CPU-Fallback)
+        "whisper_model": stt_stats["model"],
+        "whisper_device": stt_stats["device"],
+        "stt": stt_stats,
         "inworld_tts": bool(INWORLD_API_KEY),
         "inworld_voice": voice_engine.config.inworld_voice,
         "message": "Voice-System bereit",
@@ -0,0 +1,313 @@
+"""
+tools/web_fetch_tool/browser_pool.py
+
+Warmer Headless-Browser-Pool für den Playwright-Fallback von fetch_url.
+
+Statt pro URL eine eigene Playwright-Runtime samt Chromium zu starten,
+hält der Pool einen Browser offen und vergibt pro Request einen frischen
+BrowserContext (isolierte Cookies/Storage, danach sofort geschlossen).
+
+- Maximal WEB_FETCH_BROWSER_MAX_PAGES gleichzeitige Seiten (Semaphore)
+- Idle-Reaper schließt den Browser nach WEB_FETCH_BROWSER_IDLE_SECONDS
+- Zustand je Event-Loop: Loops in anderen Threads bekommen eigene Browser
+- Optionales Blockieren von Bildern, Fonts und Medien für Text-Fetches
+- Stats für den MCP-/health-Endpoint
+
+USAGE:
+    from tools.web_fetch_tool.browser_pool import get_browser_pool
+
+    async with get_browser_pool().page(block_resources=True) as page:
+        await page.goto(url)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+log = logging.getLogger("WebFetchBrowserPool")
+
+
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+BROWSER_MAX_PAGES = _env_int("WEB_FETCH_BROWSER_MAX_PAGES", 4)
+BROWSER_IDLE_SECONDS = _env_float("WEB_FETCH_BROWSER_IDLE_SECONDS", 120.0)
+BROWSER_STABILITY_MAX_MS = _env_int("WEB_FETCH_BROWSER_STABILITY_MAX_MS", 3000, minimum=0)
+BROWSER_STABILITY_POLL_MS = _env_int("WEB_FETCH_BROWSER_STABILITY_POLL_MS", 250)
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+_LAUNCH_ARGS = ["--disable-dev-shm-usage", "--disable-gpu"]
+
+PlaywrightFactory = Callable[[], Awaitable[Any]]
+
+
+async def _start_playwright() -> Any:
+    from playwright.async_api import async_playwright
+
+    return await async_playwright().start()
+
+
+async def wait_for_page_settled(
+    page: Any,
+    *,
+    max_wait_ms: int = BROWSER_STABILITY_MAX_MS,
+    poll_ms: int = BROWSER_STABILITY_POLL_MS,
+) -> None:
+    """
+    Wartet auf Network-Idle bzw. stabilen DOM statt fester Wartezeit.
+
+    Network-Idle wird nur bis ``max_wait_ms`` abgewartet (Seiten mit
+    Long-Polling werden nie idle). Danach gilt die Seite als stabil, sobald
+    die Textlänge des Body zwei Polls in Folge unverändert bleibt.
+    """
+    if max_wait_ms <= 0:
+        return
+    deadline = time.monotonic() + max_wait_ms / 1000
+    try:
+        await page.wait_for_load_state("networkidle", timeout=max_wait_ms)
+        return
+    except Exception:
+        pass
+
+    last_size = -1
+    while time.monotonic() < deadline:
+        try:
+            size = await page.evaluate("document.body ? document.body.innerText.length : 0")
+        except Exception:
+            return
+        if size == last_size:
+            return
+        last_size = size
+        await asyncio.sleep(poll_ms / 1000)
+
+
+class _LoopState:
+    """Browser-Zustand eines Event-Loops (Playwright-Objekte sind an ihren Loop gebunden)."""
+
+    def __init__(self, max_pages: int) -> None:
+        self.playwright: Any = None
+        self.browser: Any = None
+        self.launch_lock = asyncio.Lock()
+        self.slots = asyncio.Semaphore(max_pages)
+        self.reaper: Optional[asyncio.Task] = None
+        self.active_pages = 0
+        self.last_used = time.monotonic()
+
+
+class BrowserPool:
+    """Ein warmer Chromium pro Event-Loop, ein Context pro Request.
+
+    Der Zustand liegt je Loop in einer WeakKeyDictionary (wie der
+    HTTP-Client-Pool): ein zweiter Loop in einem anderen Thread bekommt
+    einen eigenen Browser, statt den des ersten zu verwerfen.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = BROWSER_MAX_PAGES,
+        idle_seconds: float = BROWSER_IDLE_SECONDS,
+        playwright_factory: Optional[PlaywrightFactory] = None,
+        user_agent: Optional[str] = None,
+    ):
+        self.max_pages = max(1, int(max_pages))
+        self.idle_seconds = float(idle_seconds)
+        self._playwright_factory = playwright_factory or _start_playwright
+        self._user_agent = user_agent
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+        self._states_lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "launches": 0,
+            "pages_served": 0,
+            "idle_closes": 0,
+            "blocked_requests": 0,
+            "foreign_loop_closes": 0,
+            "orphaned_browsers": 0,
+        }
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._states_lock:
+            state = self._states.get(loop)
+            if state is None:
+                self._prune_closed_loops()
+                state = _LoopState(self.max_pages)
+                self._states[loop] = state
+            return state
+
+    def _prune_closed_loops(self) -> None:
+        """Entfernt Zustaende beendeter Loops (Aufruf unter _states_lock)."""
+        for loop in [loop for loop in self._states if loop.is_closed()]:
+            state = self._states.pop(loop)
+            if state.browser is not None:
+                # Loop ohne shutdown() beendet — schliessen geht ohne ihn nicht mehr.
+                self._stats["orphaned_browsers"] += 1
+                log.warning("Browser-Pool: Browser eines beendeten Event-Loops nicht geschlossen")
+
+    async def _ensure_browser(self, state: _LoopState) -> Any:
+        if state.browser is None or not state.browser.is_connected():
+            async with state.launch_lock:
+                if state.browser is None or not state.browser.is_connected():
+                    if state.playwright is None:
+                        state.playwright = await self._playwright_factory()
+                    state.browser = await state.playwright.chromium.launch(headless=True, args=_LAUNCH_ARGS)
+                    self._stats["launches"] += 1
+                    log.info("🌐 Browser-Pool: Chromium gestartet (max %d Seiten)", self.max_pages)
+        # Auf jedem Pfad pruefen: ein beendeter/abgestuerzter Reaper darf den
+        # laufenden Browser nicht ohne Idle-Close zuruecklassen.
+        self._ensure_reaper(state)
+        return state.browser
+
+    def _ensure_reaper(self, state: _LoopState) -> None:
+        if self.idle_seconds <= 0 or state.browser is None:
+            return
+        if state.reaper is not None and not state.reaper.done():
+            return
+        if state.reaper is not None and not state.reaper.cancelled() and state.reaper.exception() is not None:
+            log.warning("Browser-Pool: Idle-Reaper abgebrochen: %s", state.reaper.exception())
+        state.reaper = asyncio.create_task(self._reap_idle(state))
+
+    async def _reap_idle(self, state: _LoopState) -> None:
+        interval = max(0.05, min(self.idle_seconds / 2, 30.0))
+        try:
+            while state.browser is not None:
+                await asyncio.sleep(interval)
+                idle_for = time.monotonic() - state.last_used
+                if state.active_pages == 0 and idle_for >= self.idle_seconds:
+                    log.info("🌐 Browser-Pool: Chromium nach %.0fs Leerlauf geschlossen", idle_for)
+                    self._stats["idle_closes"] += 1
+                    await self._close_state(state)
+                    return
+        finally:
+            # Erledigte Tasks halten ihren Loop fest — nicht im Zustand liegen lassen.
+            if state.reaper is asyncio.current_task():
+                state.reaper = None
+
+    async def _close_state(self, state: _LoopState) -> None:
+        reaper = state.reaper
+        state.reaper = None
+        if reaper is not None and not reaper.done() and reaper is not asyncio.current_task():
+            reaper.cancel()
+        browser, playwright = state.browser, state.playwright
+        state.browser = None
+        state.playwright = None
+        for closer in (getattr(browser, "close", None), getattr(playwright, "stop", None)):
+            if closer is None:
+                continue
+            try:
+                await closer()
+            except Exception as e:
+                log.debug("Browser-Pool: Schließen fehlgeschlagen: %s", e)
+
+    async def shutdown(self) -> None:
+        """Schliesst den Browser des aktuellen Loops.
+
+        Browser anderer, noch laufender Loops werden per
+        run_coroutine_threadsafe auf ihrem eigenen Loop geschlossen.
+        """
+        current = asyncio.get_running_loop()
+        with self._states_lock:
+            states = list(self._states.items())
+        foreign = []
+        for loop, state in states:
+            if loop is current:
+                await self._close_state(state)
+            elif state.browser is not None and loop.is_running() and not loop.is_closed():
+                future = asyncio.run_coroutine_threadsafe(self._close_state(state), loop)
+                foreign.append(asyncio.wrap_future(future))
+                self._stats["foreign_loop_closes"] += 1
+        if foreign:
+            await asyncio.gather(*foreign, return_exceptions=True)
+
+    # ── Seiten-Vergabe ────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def page(self, *, block_resources: bool = True, locale: str = "de-DE") -> AsyncIterator[Any]:
+        """Frische Seite in eigenem Context; Context wird danach geschlossen."""
+        state = self._state()
+        async with state.slots:
+            browser = await self._ensure_browser(state)
+            state.active_pages += 1
+            context = None
+            try:
+                context_kwargs: Dict[str, Any] = {"locale": locale}
+                if self._user_agent:
+                    context_kwargs["user_agent"] = self._user_agent
+                context = await browser.new_context(**context_kwargs)
+                if block_resources:
+                    await context.route("**/*", self._route_handler)
+                page = await context.new_page()
+                self._stats["pages_served"] += 1
+                yield page
+            finally:
+                state.active_pages -= 1
+                state.last_used = time.monotonic()
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception as e:
+                        log.debug("Browser-Pool: Context schließen fehlgeschlagen: %s", e)
+
+    async def _route_handler(self, route: Any) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            self._stats["blocked_requests"] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._states_lock:
+            states = list(self._states.values())
+        return {
+            "browser_running": any(state.browser is not None for state in states),
+            "browsers_running": sum(1 for state in states if state.browser is not None),
+            "event_loops": len(states),
+            "max_pages": self.max_pages,
+            "active_pages": sum(state.active_pages for state in states),
+            "idle_seconds": self.idle_seconds,
+            **self._stats,
+        }
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    if _pool is None:
+        from tools.web_fetch_tool.tool import _HEADERS
+
+        _pool = BrowserPool(user_agent=_HEADERS.get("User-Agent"))
+    return _pool
+
+
+def get_browser_pool_stats() -> Dict[str, Any]:
+    """Stats ohne den Pool (und damit Playwright) anzulegen."""
+    if _pool is None:
+        return {"browser_running": False, "max_pages": BROWSER_MAX_PAGES, "active_pages": 0}
+    return _pool.stats()
+
+
+async def shutdown_browser_pool() -> None:
+    if _pool is not None:
+        await _pool.shutdown()
@@ -3,8 +3,8 @@ tools/web_fetch_tool/tool.py
 
 Hybrid-Web-Fetch: URL-Inhalte abrufen und für LLM aufbereiten.
 
-Methode 1: requests + BeautifulSoup (schnell, ~1s, 90% der Seiten)
-Methode 2: Playwright Chromium (JavaScript-SPAs, Google-Redirects, ~5s)
+Methode 1: HTTP (geteilter httpx-Pool) + BeautifulSoup (schnell, ~1s, 90% der Seiten)
+Methode 2: Playwright Chromium aus warmem Browser-Pool (JavaScript-SPAs, Google-Redirects)
 
 Fallback-Chain (auto): requests → Playwright bei 401/403/SPA-Erkennung
 
@@ -139,14 +139,78 @@ def _looks_like_spa(html: str) -> bool:
 # ── Fetch-Engines ─────────────────────────────────────────────────────────────
 
 
-def _fetch_with_requests(url: str, max_length: int, timeout: int) -> Dict[str, Any]:
-    """Schneller HTTP-Fetch via requests. Kein JavaScript-Rendering."""
-    import requests as req
+def _http_result_from_body(body: str, content_type: str, final_url: str, max_length: int, page: Any) -> Dict[str, Any]:
+    """
+    Bewertet einen HTTP-Body; Parsing-Ergebnisse kommen aus dem Seiten-Cache.
+
+    Blockiert (SQLite, BeautifulSoup) — aus async-Code per asyncio.to_thread aufrufen.
+    """
+    from utils.page_cache import get_page_cache
+
+    # JSON direkt zurückgeben
+    if "application/json" in content_type:
+        return {
+            "status": "success",
+            "url": final_url,
+            "title": "",
+            "content": body[:max_length],
+            "markdown": body[:max_length],
+            "links": [],
+            "method": "requests",
+            "content_type": content_type,
+            "content_length": len(body),
+        }
+
+    if "text/html" not in content_type and "application/xhtml" not in content_type:
+        return {
+            "status": "error",
+            "message": f"Kein HTML-Inhalt ({content_type})",
+            "retry_with_playwright": False,
+        }
+
+    page_cache = get_page_cache()
+
+    # JavaScript-SPA erkennen → Playwright-Fallback empfehlen
+    if page_cache.derive(page, "web_fetch_spa", _looks_like_spa):
+        return {"status": "error", "message": "JavaScript-SPA erkannt", "retry_with_playwright": True}
+
+    # final_url gehört in den Schlüssel: er ist Eingabe von _parse_html, ein
+    # gleicher Body unter anderer URL darf nicht dessen Ergebnis wiederverwenden.
+    parsed = page_cache.derive(
+        page,
+        f"web_fetch_parse:{max_length}:{final_url}",
+        lambda html: _parse_html(html, final_url, max_length),
+    )
+    return {"status": "success", "url": final_url, "method": "requests", **parsed}
+
+
+async def _fetch_with_http(url: str, max_length: int, timeout: int) -> Dict[str, Any]:
+    """Schneller HTTP-Fetch über den geteilten httpx-Pool. Kein JavaScript-Rendering."""
+    import httpx
+
+    from utils.http_client_pool import get_async_client, host_slot
+    from utils.page_cache import get_page_cache
 
     try:
-        resp = req.get(url, headers=_HEADERS, timeout=timeout, allow_redirects=True)
-        final_url = resp.url
+        page_cache = get_page_cache()
+        cached = await page_cache.alookup(url)
+        if cached is not None and cached.fresh:
+            return await asyncio.to_thread(
+                _http_result_from_body,
+                cached.body, cached.content_type, cached.final_url, max_length, cached,
+            )
+
+        headers = {**_HEADERS, **page_cache.revalidation_headers(cached)}
+        async with host_slot(url):
+            resp = await get_async_client().get(url, headers=headers, timeout=timeout)
+        final_url = str(resp.url)
 
+        if resp.status_code == 304 and cached is not None:
+            await page_cache.arefresh(cached)
+            return await asyncio.to_thread(
+                _http_result_from_body,
+                cached.body, cached.content_type, cached.final_url, max_length, cached,
+            )
         if resp.status_code == 429:
             return {"status": "error", "message": "Rate limited (429)", "retry_with_playwright": False}
         if resp.status_code in (401, 403):
@@ -159,63 +223,40 @@ def _fetch_with_requests(url: str, max_length: int, timeout: int) -> Dict[str, A
             return {"status": "error", "message": f"HTTP {resp.status_code}", "retry_with_playwright": False}
 
         content_type = resp.headers.get("content-type", "")
-
-        # JSON direkt zurückgeben
-        if "application/json" in content_type:
-            return {
-                "status": "success",
-                "url": final_url,
-                "title": "",
-                "content": resp.text[:max_length],
-                "markdown": resp.text[:max_length],
-                "links": [],
-                "method": "requests",
-                "content_type": content_type,
-                "content_length": len(resp.text),
-            }
-
-        if "text/html" not in content_type and "application/xhtml" not in content_type:
-            return {
-                "status": "error",
-                "message": f"Kein HTML-Inhalt ({content_type})",
-                "retry_with_playwright": False,
-            }
-
-        # JavaScript-SPA erkennen → Playwright-Fallback empfehlen
-        if _looks_like_spa(resp.text):
-            return {"status": "error", "message": "JavaScript-SPA erkannt", "retry_with_playwright": True}
-
-        parsed = _parse_html(resp.text, final_url, max_length)
-        return {"status": "success", "url": final_url, "method": "requests", **parsed}
-
-    except req.Timeout:
+        if not any(kind in content_type for kind in ("text/html", "application/xhtml", "application/json")):
+            return _http_result_from_body("", content_type, final_url, max_length, None)
+
+        page = await page_cache.astore(
+            url,
+            body=resp.text,
+            final_url=final_url,
+            content_type=content_type,
+            etag=resp.headers.get("etag", ""),
+            last_modified=resp.headers.get("last-modified", ""),
+        )
+        return await asyncio.to_thread(
+            _http_result_from_body, resp.text, content_type, final_url, max_length, page
+        )
+
+    except httpx.TimeoutException:
         return {"status": "error", "message": f"Timeout nach {timeout}s", "retry_with_playwright": False}
-    except req.ConnectionError as e:
+    except httpx.TransportError as e:
         return {"status": "error", "message": f"Verbindungsfehler: {e}", "retry_with_playwright": False}
     except Exception as e:
         return {"status": "error", "message": str(e), "retry_with_playwright": True}
 
 
 async def _fetch_with_playwright(url: str, max_length: int, timeout_ms: int) -> Dict[str, Any]:
-    """Browser-Fetch via Playwright — rendert JavaScript, folgt Redirects."""
+    """Browser-Fetch über den warmen Browser-Pool — rendert JavaScript, folgt Redirects."""
     try:
-        from playwright.async_api import async_playwright
+        from tools.web_fetch_tool.browser_pool import get_browser_pool, wait_for_page_settled
 
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=True)
-            ctx = await browser.new_context(
-                user_agent=_HEADERS["User-Agent"],
-                locale="de-DE",
-            )
-            page = await ctx.new_page()
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
-                await page.wait_for_timeout(1500)  # Lazy-Load abwarten
-                title = await page.title()
-                html = await page.content()
-                final_url = page.url
-            finally:
-                await browser.close()
+        async with get_browser_pool().page(block_resources=True) as page:
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+            await wait_for_page_settled(page)  # Lazy-Load abwarten
+            title = await page.title()
+            html = await page.content()
+            final_url = page.url
 
         parsed = _parse_html(html, final_url, max_length)
         parsed["title"] = parsed["title"] or title
@@ -233,12 +274,12 @@ async def _fetch_hybrid(url: str, method: str, max_length: int, timeout: int) ->
         return await _fetch_with_playwright(url, max_length, timeout * 1000)
 
     if method == "requests":
-        result = _fetch_with_requests(url, max_length, timeout)
+        result = await _fetch_with_http(url, max_length, timeout)
         result.pop("retry_with_playwright", None)
         return result
 
     # auto: requests zuerst
-    result = _fetch_with_requests(url, max_length, timeout)
+    result = await _fetch_with_http(url, max_length, timeout)
     if result.get("status") == "success":
         return result
 
@@ -288,6 +329,8 @@ async def _fetch_hybrid(url: str, method: str, max_length: int, timeout: int) ->
     ],
     capabilities=["fetch", "web", "http"],
     category=C.BROWSER,
+    cache_ttl=300,
+    cache_key_params=["url", "method", "max_content_length"],
 )
 async def fetch_url(
     url: str,
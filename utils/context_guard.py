@@ -20,16 +20,19 @@ USAGE:
     # In Agent-Loop
     guard.check_iteration(step, max_iterations)
 
-    # Token-Zaehlung
-    tokens = guard.count_tokens(messages)
+    # Token-Zaehlung (inkrementell: gecachte Message-Counts + laufende Summe)
+    tokens = guard.count_messages_tokens(messages)
 
 AUTOR: Timus Development
 DATUM: Februar 2026
 """
 
 import logging
+import os
 import re
+import threading
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional, Tuple
 from enum import Enum
@@ -46,6 +49,58 @@ except ImportError:
     log.warning("tiktoken nicht verfuegbar - nutze Heuristik (4 chars/token)")
 
 
+# Token-Count-Cache: Inhalts-Hash -> Token-Anzahl (LRU, prozessweit geteilt,
+# damit System-Prompts und Tool-Beschreibungen ueber Agenten hinweg nur
+# einmal encodiert werden).
+_TOKEN_CACHE_MAX_ENTRIES = max(0, int(os.getenv("CONTEXT_GUARD_TOKEN_CACHE_SIZE", "4096") or 0))
+_TOKEN_CACHE_MIN_CHARS = 32
+_MAX_TRACKED_CONVERSATIONS = 8
+
+
+class TokenCountCache:
+    """LRU-Cache fuer Token-Counts, geschluesselt nach Laenge + Inhalts-Hash."""
+
+    def __init__(self, max_entries: int = _TOKEN_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[int, int], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text: str) -> Optional[int]:
+        key = (len(text), hash(text))
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, text: str, tokens: int) -> None:
+        if self.max_entries <= 0:
+            return
+        key = (len(text), hash(text))
+        with self._lock:
+            self._entries[key] = tokens
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_token_cache = TokenCountCache()
+
+
 class ContextStatus(str, Enum):
     OK = "ok"
     WARNING = "warning"
@@ -63,6 +118,16 @@ class GuardStats:
     hard_stops: int = 0
 
 
+@dataclass
+class _RunningTotal:
+    """Laufende Token-Summe einer wachsenden Message-Liste."""
+
+    messages: List[Dict]
+    # (Message-Objekt, Content-Objekt, Tokens) fuer den bereits gezaehlten Praefix
+    entries: List[Tuple[Any, Any, int]] = field(default_factory=list)
+    total: int = 0
+
+
 @dataclass
 class LoopState:
     action_history: List[str] = field(default_factory=list)
@@ -94,6 +159,7 @@ class ContextGuard:
         max_repeated_actions: int = DEFAULT_MAX_REPEATED_ACTIONS,
         loop_window: int = DEFAULT_LOOP_WINDOW,
         model_prefix: str = "gpt",
+        incremental: bool = True,
     ):
         self.max_tokens = max_tokens
         self.max_output_tokens = max_output_tokens
@@ -101,7 +167,9 @@ class ContextGuard:
         self.max_repeated_actions = max_repeated_actions
         self.loop_window = loop_window
         self.model_prefix = model_prefix
+        self.incremental = incremental
 
+        self._running: "OrderedDict[int, _RunningTotal]" = OrderedDict()
         self._stats = GuardStats()
         self._loop_state = LoopState()
         self._iteration_count = 0
@@ -121,6 +189,19 @@ class ContextGuard:
         if not text:
             return 0
 
+        cacheable = self.incremental and len(text) >= _TOKEN_CACHE_MIN_CHARS
+        if cacheable:
+            cached = _token_cache.get(text)
+            if cached is not None:
+                return cached
+
+        tokens = self._encode_tokens(text)
+        if cacheable:
+            _token_cache.put(text, tokens)
+        return tokens
+
+    @staticmethod
+    def _encode_tokens(text: str) -> int:
         if _tiktoken_encoder is not None:
             return len(_tiktoken_encoder.encode(text))
 
@@ -130,25 +211,56 @@ class ContextGuard:
         estimated = max(chars // 4, words * 1.3)
         return int(estimated)
 
-    def count_messages_tokens(self, messages: List[Dict]) -> int:
-        """Zaehlt Token in einer Message-List."""
+    def _message_tokens(self, msg: Dict) -> int:
         total = 0
+        content = msg.get("content", "")
+        if isinstance(content, str):
+            total += self.estimate_tokens(content)
+        elif isinstance(content, list):
+            for item in content:
+                if isinstance(item, dict) and "text" in item:
+                    total += self.estimate_tokens(item["text"])
+
+        total += 4
+        return total
 
-        for msg in messages:
-            content = msg.get("content", "")
-            if isinstance(content, str):
-                total += self.estimate_tokens(content)
-            elif isinstance(content, list):
-                for item in content:
-                    if isinstance(item, dict) and "text" in item:
-                        total += self.estimate_tokens(item["text"])
-
-            role = msg.get("role", "")
-            total += 4
-
-        total += 3
+    def count_messages_tokens(self, messages: List[Dict]) -> int:
+        """
+        Zaehlt Token in einer Message-List.
 
-        return total
+        Im inkrementellen Modus wird pro Message-Liste eine laufende Summe
+        gehalten: haengt der Agent nur neue Messages an, werden nur diese
+        gezaehlt. Der bereits gezaehlte Praefix wird per Objekt-Identitaet
+        (Message + Content) validiert; bei Abweichung wird neu gezaehlt,
+        wobei unveraenderte Inhalte aus dem Token-Cache kommen.
+        """
+        if not self.incremental:
+            return sum(self._message_tokens(msg) for msg in messages) + 3
+
+        running = self._running.get(id(messages))
+        if running is None or running.messages is not messages or not self._prefix_intact(running):
+            running = _RunningTotal(messages=messages)
+        for msg in messages[len(running.entries):]:
+            tokens = self._message_tokens(msg)
+            running.entries.append((msg, msg.get("content", ""), tokens))
+            running.total += tokens
+
+        self._running[id(messages)] = running
+        self._running.move_to_end(id(messages))
+        while len(self._running) > _MAX_TRACKED_CONVERSATIONS:
+            self._running.popitem(last=False)
+
+        return running.total + 3
+
+    @staticmethod
+    def _prefix_intact(running: _RunningTotal) -> bool:
+        messages = running.messages
+        if len(messages) < len(running.entries):
+            return False
+        for msg, (known_msg, known_content, _tokens) in zip(messages, running.entries):
+            if msg is not known_msg or msg.get("content", "") is not known_content:
+                return False
+        return True
 
     def get_status(self, messages: List[Dict]) -> ContextStatus:
         """Prueft den Context-Status."""
@@ -350,6 +462,9 @@ class ContextGuard:
             "loops_detected": self._stats.loops_detected,
             "hard_stops": self._stats.hard_stops,
             "max_tokens_limit": self.max_tokens,
+            "token_cache_entries": len(_token_cache),
+            "token_cache_hits": _token_cache.hits,
+            "token_cache_misses": _token_cache.misses,
             "utilization_percent": round(
                 self._stats.total_tokens_used / self.max_tokens * 100, 1
             )
@@ -0,0 +1,188 @@
+# utils/http_client_pool.py
+"""
+Prozessweite HTTP-Client-Registry fuer ausgehende Requests.
+
+Statt pro URL einen neuen ``httpx.AsyncClient`` (bzw. ``requests.get``)
+aufzubauen, teilen sich Deep Research, Web-Fetch, Search und Gateway
+langlebige Clients mit Keep-Alive-Pools. Dadurch entfallen wiederholte
+TCP/TLS-Handshakes und DNS-Lookups pro Request.
+
+- Async: ein ``httpx.AsyncClient`` pro Profil und Event-Loop
+  (httpx-Verbindungen sind an den Loop gebunden)
+- HTTP/2, wenn das ``h2``-Paket installiert ist (sonst HTTP/1.1)
+- Per-Host-Limit ueber Semaphoren (``host_slot``), damit parallele
+  Quellenanalyse einzelne Hosts nicht flutet
+- Sync: geteilte ``requests.Session`` fuer Thread-basierte Aufrufer
+
+USAGE:
+    from utils.http_client_pool import get_async_client, host_slot
+
+    client = get_async_client()
+    async with host_slot(url):
+        resp = await client.get(url, timeout=20.0)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+log = logging.getLogger("HttpClientPool")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def _http2_available() -> bool:
+    if os.getenv("HTTP_POOL_HTTP2", "true").strip().lower() not in {"1", "true", "yes", "on"}:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+HTTP_POOL_MAX_CONNECTIONS = _env_int("HTTP_POOL_MAX_CONNECTIONS", 100)
+HTTP_POOL_MAX_KEEPALIVE = _env_int("HTTP_POOL_MAX_KEEPALIVE", 20)
+HTTP_POOL_KEEPALIVE_EXPIRY_S = _env_float("HTTP_POOL_KEEPALIVE_EXPIRY_S", 30.0)
+HTTP_POOL_MAX_PER_HOST = _env_int("HTTP_POOL_MAX_PER_HOST", 6)
+HTTP_POOL_DEFAULT_TIMEOUT_S = _env_float("HTTP_POOL_DEFAULT_TIMEOUT_S", 30.0)
+
+# Profile: "default" fuer externe Quellen, "local" fuer Loopback-Dienste
+# (kein Proxy aus der Umgebung, kein HTTP/2).
+_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {"trust_env": True, "follow_redirects": True, "http2": True},
+    "local": {"trust_env": False, "follow_redirects": False, "http2": False},
+}
+
+_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+_sync_session: Optional[Any] = None
+_stats: Dict[str, int] = {"async_clients_created": 0, "host_waits": 0}
+
+
+def _build_async_client(profile: str) -> httpx.AsyncClient:
+    options = _PROFILES.get(profile, _PROFILES["default"])
+    kwargs: Dict[str, Any] = {
+        "timeout": httpx.Timeout(HTTP_POOL_DEFAULT_TIMEOUT_S),
+        "limits": httpx.Limits(
+            max_connections=HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_POOL_KEEPALIVE_EXPIRY_S,
+        ),
+        "trust_env": options["trust_env"],
+        "follow_redirects": options["follow_redirects"],
+    }
+    if options["http2"] and _http2_available():
+        kwargs["http2"] = True
+    return httpx.AsyncClient(**kwargs)
+
+
+def get_async_client(profile: str = "default") -> httpx.AsyncClient:
+    """Liefert den geteilten AsyncClient des aktuellen Event-Loops."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        per_loop = _async_clients.setdefault(loop, {})
+        client = per_loop.get(profile)
+        if client is None or getattr(client, "is_closed", False):
+            client = _build_async_client(profile)
+            per_loop[profile] = client
+            _stats["async_clients_created"] += 1
+        return client
+
+
+def _host_key(url: str) -> str:
+    parsed = urlparse(str(url or ""))
+    return f"{parsed.scheme}://{(parsed.hostname or '').lower()}:{parsed.port or ''}"
+
+
+@asynccontextmanager
+async def host_slot(url: str) -> AsyncIterator[None]:
+    """Begrenzt gleichzeitige Requests pro Host auf HTTP_POOL_MAX_PER_HOST."""
+    loop = asyncio.get_running_loop()
+    key = _host_key(url)
+    with _lock:
+        per_loop = _host_semaphores.setdefault(loop, {})
+        semaphore = per_loop.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(HTTP_POOL_MAX_PER_HOST)
+            per_loop[key] = semaphore
+    if semaphore.locked():
+        _stats["host_waits"] += 1
+    async with semaphore:
+        yield
+
+
+def get_sync_session() -> Any:
+    """Geteilte requests.Session mit Keep-Alive fuer Thread-basierte Aufrufer."""
+    global _sync_session
+    with _lock:
+        if _sync_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_MAX_KEEPALIVE,
+                pool_maxsize=HTTP_POOL_MAX_CONNECTIONS,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sync_session = session
+        return _sync_session
+
+
+async def aclose_async_clients() -> None:
+    """Schliesst die Clients des aktuellen Event-Loops (Server-Shutdown)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = list((_async_clients.pop(loop, None) or {}).values())
+        _host_semaphores.pop(loop, None)
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception as exc:
+            log.debug("HTTP-Client schliessen fehlgeschlagen: %s", exc)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    with _lock:
+        loops = len(_async_clients)
+        profiles = sorted({name for per_loop in _async_clients.values() for name in per_loop})
+        hosts = sum(len(per_loop) for per_loop in _host_semaphores.values())
+    return {
+        "event_loops": loops,
+        "profiles": profiles,
+        "tracked_hosts": hosts,
+        "http2": _http2_available(),
+        "max_connections": HTTP_POOL_MAX_CONNECTIONS,
+        "max_keepalive": HTTP_POOL_MAX_KEEPALIVE,
+        "max_per_host": HTTP_POOL_MAX_PER_HOST,
+        "sync_session": _sync_session is not None,
+        **_stats,
+    }
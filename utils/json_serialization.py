@@ -0,0 +1,73 @@
+# utils/json_serialization.py
+"""
+JSON-Serialisierung von Tool-Ergebnissen mit NumPy-Typen.
+
+Gemeinsam genutzt vom JSON-RPC-Server (``async_dispatch(serializer=...)``)
+und vom In-Process-Dispatch in ``BaseAgent`` — beide Pfade liefern dem
+Agenten dadurch dieselben JSON-kompatiblen Ergebnisse.
+"""
+
+import json as _json
+import logging
+
+log = logging.getLogger("json_serialization")
+
+
+class NumpyJSONEncoder(_json.JSONEncoder):
+    """JSON Encoder der NumPy Typen zu nativen Python Typen konvertiert."""
+    def default(self, obj):
+        # NumPy boolean
+        if hasattr(obj, 'dtype') and obj.dtype == bool:
+            return bool(obj)
+        # NumPy integer
+        if hasattr(obj, 'dtype') and 'int' in str(obj.dtype):
+            return int(obj)
+        # NumPy float
+        if hasattr(obj, 'dtype') and 'float' in str(obj.dtype):
+            return float(obj)
+        # NumPy ndarray
+        if hasattr(obj, 'tolist'):
+            return obj.tolist()
+        # Generischer Fallback
+        try:
+            return super().default(obj)
+        except TypeError:
+            return str(obj)
+
+def numpy_aware_serializer(response):
+    """Serializer der NumPy Typen behandeln kann.
+
+    Versucht zuerst native Konvertierung, dann Nemotron-Fallback bei komplexen Fällen.
+    """
+    if response is None:
+        return ""
+    try:
+        return _json.dumps(response, cls=NumpyJSONEncoder)
+    except (TypeError, ValueError) as e:
+        # Bei komplexen Fällen: Nemotron-Fallback (lazy import)
+        log.warning(f"Native JSON-Serialisierung fehlgeschlagen: {e}")
+        try:
+            import asyncio
+            from tools.json_nemotron_tool.json_nemotron_tool import sanitize_api_response
+            # Async-Funktion synchron aufrufen
+            loop = asyncio.get_event_loop()
+            if loop.is_running():
+                # Wir sind in einem async Kontext, nutze run_coroutine_threadsafe
+                future = asyncio.run_coroutine_threadsafe(
+                    sanitize_api_response(response), loop
+                )
+                return future.result(timeout=30)
+            else:
+                return loop.run_until_complete(sanitize_api_response(response))
+        except Exception as nemotron_error:
+            log.error(f"Nemotron-Fallback fehlgeschlagen: {nemotron_error}")
+            # Letzter Fallback: String-Repräsentation
+            try:
+                return _json.dumps({"_serialized": str(response), "_warning": "Nemotron-Fallback verwendet"})
+            except:
+                return '{"_error": "JSON-Serialisierung nicht möglich"}'
+
+
+def to_jsonable(response):
+    """Roundtrip durch numpy_aware_serializer: liefert, was ein HTTP-Client nach ``resp.json()`` saehe."""
+    return _json.loads(numpy_aware_serializer(response) or "null")
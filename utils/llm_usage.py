@@ -43,41 +43,63 @@ def _model_env_slug(model: str) -> str:
     return re.sub(r"_+", "_", slug).strip("_") or "DEFAULT"
 
 
+# Anthropic berechnet Cache-Writes mit ~1.25x des Input-Preises.
+_DEFAULT_CACHE_WRITE_PREMIUM = 1.25
+
+
 @dataclass(frozen=True)
 class NormalizedLLMUsage:
     input_tokens: int = 0
     output_tokens: int = 0
+    # Aus dem Cache gelesene Tokens (Treffer)
     cached_tokens: int = 0
+    # In den Cache geschriebene Tokens (Anthropic cache_creation) — kein Treffer
+    cache_write_tokens: int = 0
 
     @property
     def total_tokens(self) -> int:
         return self.input_tokens + self.output_tokens
 
 
+# Provider mit OpenAI-kompatiblem usage-Block (inkl. Google OpenAI-Compat-Endpunkt)
+_OPENAI_USAGE_PROVIDERS = {
+    ModelProvider.OPENAI,
+    ModelProvider.ZAI,
+    ModelProvider.DASHSCOPE,
+    ModelProvider.DEEPSEEK,
+    ModelProvider.MOONSHOT,
+    ModelProvider.INCEPTION,
+    ModelProvider.NVIDIA,
+    ModelProvider.OPENROUTER,
+}
+
+
+def _openai_style_usage(usage: Any) -> NormalizedLLMUsage:
+    # Cache-Treffer melden die Provider unterschiedlich:
+    # OpenAI/OpenRouter/DashScope prompt_tokens_details.cached_tokens,
+    # DeepSeek prompt_cache_hit_tokens, Moonshot usage.cached_tokens.
+    cached_tokens = _as_non_negative_int(_read_field(usage, "prompt_tokens_details", "cached_tokens"))
+    if not cached_tokens:
+        cached_tokens = _as_non_negative_int(_read_field(usage, "prompt_cache_hit_tokens"))
+    if not cached_tokens:
+        cached_tokens = _as_non_negative_int(_read_field(usage, "cached_tokens"))
+    return NormalizedLLMUsage(
+        input_tokens=_as_non_negative_int(_read_field(usage, "prompt_tokens")),
+        output_tokens=_as_non_negative_int(_read_field(usage, "completion_tokens")),
+        cached_tokens=cached_tokens,
+    )
+
+
 def extract_normalized_usage(provider: ModelProvider, response_or_payload: Any) -> NormalizedLLMUsage:
     """Best-effort extraction of token counters from provider responses."""
     usage = _read_field(response_or_payload, "usage")
     if usage is None and isinstance(response_or_payload, dict):
         usage = response_or_payload.get("usageMetadata")
 
-    if provider in {
-        ModelProvider.OPENAI,
-        ModelProvider.ZAI,
-        ModelProvider.DEEPSEEK,
-        ModelProvider.INCEPTION,
-        ModelProvider.NVIDIA,
-        ModelProvider.OPENROUTER,
-    }:
-        input_tokens = _as_non_negative_int(_read_field(usage, "prompt_tokens"))
-        output_tokens = _as_non_negative_int(_read_field(usage, "completion_tokens"))
-        cached_tokens = _as_non_negative_int(
-            _read_field(usage, "prompt_tokens_details", "cached_tokens")
-        )
-        return NormalizedLLMUsage(
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            cached_tokens=cached_tokens,
-        )
+    if provider in _OPENAI_USAGE_PROVIDERS or (
+        provider == ModelProvider.GOOGLE and _read_field(usage, "prompt_tokens") is not None
+    ):
+        return _openai_style_usage(usage)
 
     if provider == ModelProvider.DASHSCOPE_NATIVE:
         input_tokens = _as_non_negative_int(_read_field(usage, "input_tokens"))
@@ -97,12 +119,11 @@ def extract_normalized_usage(provider: ModelProvider, response_or_payload: Any)
     if provider == ModelProvider.ANTHROPIC:
         input_tokens = _as_non_negative_int(_read_field(usage, "input_tokens"))
         output_tokens = _as_non_negative_int(_read_field(usage, "output_tokens"))
-        cached_tokens = _as_non_negative_int(_read_field(usage, "cache_read_input_tokens"))
-        cached_tokens += _as_non_negative_int(_read_field(usage, "cache_creation_input_tokens"))
         return NormalizedLLMUsage(
             input_tokens=input_tokens,
             output_tokens=output_tokens,
-            cached_tokens=cached_tokens,
+            cached_tokens=_as_non_negative_int(_read_field(usage, "cache_read_input_tokens")),
+            cache_write_tokens=_as_non_negative_int(_read_field(usage, "cache_creation_input_tokens")),
         )
 
     if provider == ModelProvider.GOOGLE:
@@ -124,18 +145,23 @@ def compute_cost_usd_from_rates(
     input_rate_usd_per_1m: float,
     output_rate_usd_per_1m: float,
     cached_rate_usd_per_1m: float,
+    cache_write_tokens: int = 0,
+    cache_write_rate_usd_per_1m: float = 0.0,
 ) -> float:
     """Computes cost in USD from token counters and per-1M-token rates."""
     safe_input_tokens = max(int(input_tokens or 0), 0)
     safe_output_tokens = max(int(output_tokens or 0), 0)
     safe_cached_tokens = max(int(cached_tokens or 0), 0)
+    safe_write_tokens = max(int(cache_write_tokens or 0), 0)
     safe_input_rate = max(float(input_rate_usd_per_1m or 0.0), 0.0)
     safe_output_rate = max(float(output_rate_usd_per_1m or 0.0), 0.0)
     safe_cached_rate = max(float(cached_rate_usd_per_1m or 0.0), 0.0)
+    safe_write_rate = max(float(cache_write_rate_usd_per_1m or 0.0), 0.0)
     total = (
         (safe_input_tokens / 1_000_000.0) * safe_input_rate
         + (safe_output_tokens / 1_000_000.0) * safe_output_rate
         + (safe_cached_tokens / 1_000_000.0) * safe_cached_rate
+        + (safe_write_tokens / 1_000_000.0) * safe_write_rate
     )
     return round(total, 8)
 
@@ -159,6 +185,14 @@ def _read_price_rate(provider: ModelProvider, model: str, kind: str) -> float:
     return 0.0
 
 
+def _cache_write_rate(provider: ModelProvider, model: str) -> float:
+    """Preis fuer Cache-Writes; ohne eigene Env-Variable 1.25x des Input-Preises."""
+    rate = _read_price_rate(provider, model, "CACHE_WRITE_INPUT")
+    if rate > 0.0:
+        return rate
+    return _read_price_rate(provider, model, "INPUT") * _DEFAULT_CACHE_WRITE_PREMIUM
+
+
 def estimate_cost_usd(provider: ModelProvider, model: str, usage: NormalizedLLMUsage) -> float:
     return compute_cost_usd_from_rates(
         input_tokens=usage.input_tokens,
@@ -167,15 +201,33 @@ def estimate_cost_usd(provider: ModelProvider, model: str, usage: NormalizedLLMU
         input_rate_usd_per_1m=_read_price_rate(provider, model, "INPUT"),
         output_rate_usd_per_1m=_read_price_rate(provider, model, "OUTPUT"),
         cached_rate_usd_per_1m=_read_price_rate(provider, model, "CACHED_INPUT"),
+        cache_write_tokens=usage.cache_write_tokens,
+        cache_write_rate_usd_per_1m=_cache_write_rate(provider, model) if usage.cache_write_tokens else 0.0,
     )
 
 
+def estimate_cache_savings_usd(provider: ModelProvider, model: str, cached_tokens: int) -> float:
+    """Differenz regulaerer vs. gecachter Input-Preis fuer aus dem Cache bediente Tokens."""
+    saved_rate = max(
+        _read_price_rate(provider, model, "INPUT") - _read_price_rate(provider, model, "CACHED_INPUT"),
+        0.0,
+    )
+    return round((max(int(cached_tokens or 0), 0) / 1_000_000.0) * saved_rate, 8)
+
+
+def estimate_cache_write_premium_usd(provider: ModelProvider, model: str, cache_write_tokens: int) -> float:
+    """Aufpreis von Cache-Writes gegenueber normalem Input (mindert die Ersparnis)."""
+    premium_rate = max(_cache_write_rate(provider, model) - _read_price_rate(provider, model, "INPUT"), 0.0)
+    return round((max(int(cache_write_tokens or 0), 0) / 1_000_000.0) * premium_rate, 8)
+
+
 def build_usage_payload(provider: ModelProvider, model: str, response_or_payload: Any) -> Dict[str, Any]:
     usage = extract_normalized_usage(provider, response_or_payload)
     return {
         "input_tokens": usage.input_tokens,
         "output_tokens": usage.output_tokens,
         "cached_tokens": usage.cached_tokens,
+        "cache_write_tokens": usage.cache_write_tokens,
         "total_tokens": usage.total_tokens,
         "cost_usd": estimate_cost_usd(provider, model, usage),
     }
@@ -0,0 +1,446 @@
+# utils/page_cache.py
+"""
+Persistenter, inhaltsadressierter Seiten-Cache für Deep Research und fetch_url.
+
+- Schlüssel: normalisierte URL (Host klein, ohne Fragment/Tracking-Parameter,
+  sortierte Query); Bodies werden per SHA-256 dedupliziert und komprimiert
+- Revalidierung über ETag / Last-Modified (If-None-Match / If-Modified-Since)
+- TTL pro Domain-Klasse (News kurz, Doku/Wissenschaft lang)
+- Größenbegrenzte LRU-Eviction (PAGE_CACHE_MAX_MB)
+- Abgeleitete Ergebnisse (z.B. ``_html_to_text``/``_parse_html``) werden pro
+  Inhalts-Hash mitgecacht, damit Wiederholungen auch das Parsing sparen
+
+USAGE:
+    from utils.page_cache import get_page_cache
+
+    cache = get_page_cache()
+    entry = await cache.alookup(url)      # async-Code: SQLite/zlib im Thread
+    if entry is None or not entry.fresh:
+        headers = cache.revalidation_headers(entry)
+        ...
+
+Eine langlebige SQLite-Verbindung pro Cache; die ``a*``-Varianten
+(alookup/arefresh/astore/aderive) halten SQLite, zlib und das Parsing vom
+Event-Loop fern.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+logger = logging.getLogger("page_cache")
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / "data" / "page_cache.db"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}
+PAGE_CACHE_MAX_BYTES = int(_env_float("PAGE_CACHE_MAX_MB", 256.0) * 1024 * 1024)
+PAGE_CACHE_EVICT_EVERY = max(1, int(_env_float("PAGE_CACHE_EVICT_EVERY", 50)))
+
+# TTL pro Domain-Klasse (Sekunden)
+DOMAIN_CLASS_TTLS: Dict[str, float] = {
+    "news": _env_float("PAGE_CACHE_TTL_NEWS_S", 3600.0),
+    "reference": _env_float("PAGE_CACHE_TTL_REFERENCE_S", 7 * 86400.0),
+    "default": _env_float("PAGE_CACHE_TTL_DEFAULT_S", 86400.0),
+}
+
+_NEWS_MARKERS = (
+    "news", "spiegel.", "zeit.de", "faz.net", "tagesschau.", "heise.de", "reuters.",
+    "bbc.", "cnn.", "nytimes.", "theguardian.", "bloomberg.", "techcrunch.", "theverge.",
+)
+_REFERENCE_MARKERS = (
+    "wikipedia.org", "arxiv.org", "docs.", "readthedocs.", "developer.", "ncbi.nlm.nih.gov",
+    "doi.org", "acm.org", "ieee.org", "springer.", "nature.com", "python.org", "github.com",
+)
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref_src", "igshid"}
+
+
+def normalize_cache_url(url: str) -> str:
+    """Kanonische Cache-Form einer URL."""
+    parsed = urlparse(str(url or "").strip())
+    scheme = (parsed.scheme or "https").lower()
+    host = (parsed.hostname or "").lower()
+    port = parsed.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    path = parsed.path or "/"
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+        )
+    )
+    return urlunparse((scheme, host, path, "", query, ""))
+
+
+def domain_class(url: str) -> str:
+    host = (urlparse(str(url or "")).hostname or "").lower()
+    if any(marker in host for marker in _REFERENCE_MARKERS):
+        return "reference"
+    if any(marker in host for marker in _NEWS_MARKERS):
+        return "news"
+    return "default"
+
+
+def ttl_for_url(url: str) -> float:
+    return DOMAIN_CLASS_TTLS.get(domain_class(url), DOMAIN_CLASS_TTLS["default"])
+
+
+@dataclass
+class CachedPage:
+    url: str
+    final_url: str
+    content_type: str
+    body: str
+    content_hash: str
+    etag: str
+    last_modified: str
+    fetched_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class PageCache:
+    """SQLite-gestützter Seiten-Cache (URL-Einträge → deduplizierte Bodies)."""
+
+    _SCHEMA = """
+    CREATE TABLE IF NOT EXISTS page_bodies (
+        content_hash TEXT PRIMARY KEY,
+        body BLOB NOT NULL,
+        size INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS page_entries (
+        url_key TEXT PRIMARY KEY,
+        final_url TEXT NOT NULL,
+        content_type TEXT NOT NULL DEFAULT '',
+        content_hash TEXT NOT NULL,
+        etag TEXT NOT NULL DEFAULT '',
+        last_modified TEXT NOT NULL DEFAULT '',
+        fetched_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_page_entries_access ON page_entries(last_access);
+    CREATE TABLE IF NOT EXISTS page_derived (
+        content_hash TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        PRIMARY KEY (content_hash, kind)
+    );
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = DEFAULT_CACHE_PATH,
+        max_bytes: int = PAGE_CACHE_MAX_BYTES,
+        ttl_resolver: Callable[[str], float] = ttl_for_url,
+    ):
+        self.db_path = Path(db_path) if db_path else None
+        self.max_bytes = max(0, int(max_bytes))
+        self._ttl_resolver = ttl_resolver
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stores_since_evict = 0
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "stale": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stores": 0,
+            "derived_hits": 0,
+            "evicted": 0,
+        }
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Langlebige Verbindung (unter self._lock aufrufen)."""
+        if self.db_path is None:
+            return None
+        if self._conn is not None:
+            return self._conn
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._SCHEMA)
+            self._conn = conn
+            return conn
+        except Exception as e:
+            logger.debug("PageCache nicht verfügbar: %s", e)
+            return None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ── Seiten ────────────────────────────────────────────────────────────────
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """Eintrag zur URL (auch abgelaufen, für Revalidierung) oder None."""
+        key = normalize_cache_url(url)
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    """SELECT e.final_url, e.content_type, e.content_hash, e.etag, e.last_modified,
+                              e.fetched_at, e.expires_at, b.body
+                       FROM page_entries e JOIN page_bodies b ON b.content_hash = e.content_hash
+                       WHERE e.url_key = ?""",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    self._stats["misses"] += 1
+                    return None
+                conn.execute("UPDATE page_entries SET last_access=? WHERE url_key=?", (time.time(), key))
+                conn.commit()
+            except Exception as e:
+                logger.debug("PageCache-Lookup fehlgeschlagen: %s", e)
+                return None
+
+        entry = CachedPage(
+            url=key,
+            final_url=row[0],
+            content_type=row[1],
+            content_hash=row[2],
+            etag=row[3],
+            last_modified=row[4],
+            fetched_at=row[5],
+            expires_at=row[6],
+            body=zlib.decompress(row[7]).decode("utf-8"),
+        )
+        self._stats["hits" if entry.fresh else "stale"] += 1
+        return entry
+
+    @staticmethod
+    def revalidation_headers(entry: Optional[CachedPage]) -> Dict[str, str]:
+        if entry is None:
+            return {}
+        headers: Dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def refresh(self, entry: CachedPage) -> CachedPage:
+        """Nach 304 Not Modified: TTL verlängern, Body unverändert."""
+        now = time.time()
+        entry.fetched_at = now
+        entry.expires_at = now + self._ttl_resolver(entry.url)
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    conn.execute(
+                        "UPDATE page_entries SET fetched_at=?, expires_at=?, last_access=? WHERE url_key=?",
+                        (entry.fetched_at, entry.expires_at, now, entry.url),
+                    )
+                    conn.commit()
+                except Exception as e:
+                    logger.debug("PageCache-Refresh fehlgeschlagen: %s", e)
+        self._stats["revalidated"] += 1
+        return entry
+
+    def store(
+        self,
+        url: str,
+        *,
+        body: str,
+        final_url: str = "",
+        content_type: str = "",
+        etag: str = "",
+        last_modified: str = "",
+    ) -> CachedPage:
+        key = normalize_cache_url(url)
+        now = time.time()
+        raw = body.encode("utf-8")
+        entry = CachedPage(
+            url=key,
+            final_url=final_url or url,
+            content_type=content_type or "",
+            body=body,
+            content_hash=hashlib.sha256(raw).hexdigest(),
+            etag=etag or "",
+            last_modified=last_modified or "",
+            fetched_at=now,
+            expires_at=now + self._ttl_resolver(key),
+        )
+        if self.db_path is None:
+            return entry
+        compressed = zlib.compress(raw, 6)
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return entry
+            try:
+                conn.execute(
+                    "INSERT OR IGNORE INTO page_bodies (content_hash, body, size) VALUES (?, ?, ?)",
+                    (entry.content_hash, compressed, len(compressed)),
+                )
+                conn.execute(
+                    """INSERT OR REPLACE INTO page_entries
+                       (url_key, final_url, content_type, content_hash, etag, last_modified,
+                        fetched_at, expires_at, last_access)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (
+                        key, entry.final_url, entry.content_type, entry.content_hash,
+                        entry.etag, entry.last_modified, entry.fetched_at, entry.expires_at, now,
+                    ),
+                )
+                conn.commit()
+                self._stats["stores"] += 1
+                self._stores_since_evict += 1
+                if self._stores_since_evict >= PAGE_CACHE_EVICT_EVERY:
+                    self._stores_since_evict = 0
+                    self._evict(conn)
+            except Exception as e:
+                logger.debug("PageCache-Write fehlgeschlagen: %s", e)
+        return entry
+
+    # ── Abgeleitete Ergebnisse ────────────────────────────────────────────────
+
+    def get_derived(self, content_hash: str, kind: str) -> Optional[Any]:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT payload FROM page_derived WHERE content_hash=? AND kind=?",
+                    (content_hash, kind),
+                ).fetchone()
+            except Exception as e:
+                logger.debug("PageCache-Derived-Lookup fehlgeschlagen: %s", e)
+                return None
+        if row is None:
+            return None
+        self._stats["derived_hits"] += 1
+        return json.loads(row[0])
+
+    def put_derived(self, content_hash: str, kind: str, value: Any) -> None:
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO page_derived (content_hash, kind, payload, size) VALUES (?, ?, ?, ?)",
+                    (content_hash, kind, payload, len(payload)),
+                )
+                conn.commit()
+            except Exception as e:
+                logger.debug("PageCache-Derived-Write fehlgeschlagen: %s", e)
+
+    def derive(self, entry: CachedPage, kind: str, compute: Callable[[str], Any]) -> Any:
+        """Liefert ``compute(entry.body)`` aus dem Cache oder berechnet und speichert es."""
+        cached = self.get_derived(entry.content_hash, kind)
+        if cached is not None:
+            return cached
+        value = compute(entry.body)
+        self.put_derived(entry.content_hash, kind, value)
+        return value
+
+    # ── Async-Varianten (SQLite, zlib und Parsing im Thread-Pool) ─────────────
+
+    async def alookup(self, url: str) -> Optional[CachedPage]:
+        return await asyncio.to_thread(self.lookup, url)
+
+    async def arefresh(self, entry: CachedPage) -> CachedPage:
+        return await asyncio.to_thread(self.refresh, entry)
+
+    async def astore(self, url: str, **kwargs: Any) -> CachedPage:
+        return await asyncio.to_thread(lambda: self.store(url, **kwargs))
+
+    async def aderive(self, entry: CachedPage, kind: str, compute: Callable[[str], Any]) -> Any:
+        return await asyncio.to_thread(self.derive, entry, kind, compute)
+
+    # ── Eviction ──────────────────────────────────────────────────────────────
+
+    def _total_bytes(self, conn: sqlite3.Connection) -> int:
+        bodies = conn.execute("SELECT COALESCE(SUM(size), 0) FROM page_bodies").fetchone()[0]
+        derived = conn.execute("SELECT COALESCE(SUM(size), 0) FROM page_derived").fetchone()[0]
+        return int(bodies) + int(derived)
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """Entfernt die am längsten ungenutzten Einträge bis unter max_bytes."""
+        total = self._total_bytes(conn)
+        if total <= self.max_bytes:
+            return 0
+        evicted = 0
+        victims = conn.execute(
+            "SELECT url_key, content_hash FROM page_entries ORDER BY last_access ASC"
+        ).fetchall()
+        for url_key, content_hash in victims:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM page_entries WHERE url_key=?", (url_key,))
+            evicted += 1
+            still_used = conn.execute(
+                "SELECT 1 FROM page_entries WHERE content_hash=? LIMIT 1", (content_hash,)
+            ).fetchone()
+            if still_used:
+                continue
+            freed = conn.execute(
+                "SELECT COALESCE((SELECT size FROM page_bodies WHERE content_hash=?), 0)"
+                " + COALESCE((SELECT SUM(size) FROM page_derived WHERE content_hash=?), 0)",
+                (content_hash, content_hash),
+            ).fetchone()[0]
+            conn.execute("DELETE FROM page_bodies WHERE content_hash=?", (content_hash,))
+            conn.execute("DELETE FROM page_derived WHERE content_hash=?", (content_hash,))
+            total -= int(freed or 0)
+        conn.commit()
+        self._stats["evicted"] += evicted
+        return evicted
+
+    def evict(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            return self._evict(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": self.db_path is not None, "max_bytes": self.max_bytes, **self._stats}
+
+
+_default_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> PageCache:
+    global _default_cache
+    if _default_cache is None:
+        raw_path = os.getenv("PAGE_CACHE_PATH", "").strip()
+        if not PAGE_CACHE_ENABLED:
+            _default_cache = PageCache(None)
+        else:
+            _default_cache = PageCache(Path(raw_path) if raw_path else DEFAULT_CACHE_PATH)
+    return _default_cache
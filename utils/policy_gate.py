@@ -4,14 +4,18 @@ Leichtgewichtiger Policy-Gate fuer destruktive Aktionen.
 Kein vollstaendiges RBAC — nur Blocklist/Allowlist + Muster-Erkennung.
 """
 
+import atexit
 import json
 import logging
 import os
+import queue as queue_module
 import re
 import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 log = logging.getLogger("policy_gate")
 LOGS_DIR = Path(__file__).resolve().parent.parent / "logs"
@@ -118,6 +122,34 @@ def _policy_rollout_guard_enabled() -> bool:
     return _env_bool("AUTONOMY_POLICY_ROLLBACK_ENABLED", False)
 
 
+_POLICY_RUNTIME_KEYS = ("strict_force_off", "canary_percent_override", "rollout_last_action")
+
+# Runtime-Overrides je TaskQueue-DB: (Version, geladen um, Overrides).
+# Lokale Aenderungen (set_policy_runtime_state) erhoehen die Version sofort;
+# Aenderungen anderer Prozesse werden spaetestens nach der TTL gesehen.
+_runtime_override_cache: Dict[str, Tuple[Any, float, Dict[str, Any]]] = {}
+_runtime_override_lock = threading.Lock()
+
+
+def _policy_runtime_cache_ttl_s() -> float:
+    try:
+        return max(0.0, float(os.getenv("POLICY_RUNTIME_CACHE_TTL_S", "5")))
+    except ValueError:
+        return 5.0
+
+
+def _load_policy_runtime_states(queue) -> Dict[str, Dict[str, Any]]:
+    batch_loader = getattr(queue, "get_policy_runtime_states", None)
+    if callable(batch_loader):
+        return batch_loader(_POLICY_RUNTIME_KEYS)
+    states: Dict[str, Dict[str, Any]] = {}
+    for key in _POLICY_RUNTIME_KEYS:
+        state = queue.get_policy_runtime_state(key)
+        if state:
+            states[key] = state
+    return states
+
+
 def _policy_runtime_overrides() -> Dict[str, Any]:
     overrides: Dict[str, Any] = {
         "strict_force_off": False,
@@ -128,7 +160,16 @@ def _policy_runtime_overrides() -> Dict[str, Any]:
         from orchestration.task_queue import get_queue
 
         queue = get_queue()
-        strict_state = queue.get_policy_runtime_state("strict_force_off")
+        cache_key = str(getattr(queue, "db_path", "") or id(queue))
+        version = getattr(queue, "policy_runtime_version", None)
+        now = time.monotonic()
+        with _runtime_override_lock:
+            cached = _runtime_override_cache.get(cache_key)
+        if cached is not None and cached[0] == version and (now - cached[1]) < _policy_runtime_cache_ttl_s():
+            return dict(cached[2])
+
+        states = _load_policy_runtime_states(queue)
+        strict_state = states.get("strict_force_off")
         if strict_state:
             overrides["strict_force_off"] = str(strict_state.get("state_value") or "").strip().lower() in {
                 "1",
@@ -137,21 +178,30 @@ def _policy_runtime_overrides() -> Dict[str, Any]:
                 "on",
             }
 
-        canary_state = queue.get_policy_runtime_state("canary_percent_override")
+        canary_state = states.get("canary_percent_override")
         if canary_state:
             try:
                 overrides["canary_percent_override"] = int(str(canary_state.get("state_value") or "").strip())
             except Exception:
                 overrides["canary_percent_override"] = None
 
-        last_action_state = queue.get_policy_runtime_state("rollout_last_action")
+        last_action_state = states.get("rollout_last_action")
         if last_action_state:
             overrides["rollout_last_action"] = last_action_state
+
+        with _runtime_override_lock:
+            _runtime_override_cache[cache_key] = (version, now, dict(overrides))
     except Exception:
         return overrides
     return overrides
 
 
+def invalidate_policy_runtime_cache() -> None:
+    """Verwirft gecachte Runtime-Overrides (z.B. nach externen DB-Aenderungen)."""
+    with _runtime_override_lock:
+        _runtime_override_cache.clear()
+
+
 def _detect_sensitive_param_keys(params: Dict[str, Any]) -> list[str]:
     found: list[str] = []
     for key in params.keys():
@@ -400,6 +450,7 @@ def evaluate_and_apply_rollout_guard(*, window_hours: Optional[int] = None, queu
     except Exception:
         cooldown_min = 60
 
+    flush_policy_decisions(timeout_s=2.0)
     metrics = q.get_policy_decision_metrics(window_hours=window)
     decisions_total = int(metrics.get("decisions_total", 0) or 0)
     blocked_total = int(metrics.get("blocked_total", 0) or 0)
@@ -483,6 +534,197 @@ def evaluate_and_apply_rollout_guard(*, window_hours: Optional[int] = None, queu
     }
 
 
+# ── Batch-Writer fuer Policy-Entscheidungen ──────────────────────
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def _policy_decision_writer_enabled() -> bool:
+    return _env_bool("POLICY_DECISION_WRITER_ENABLED", True)
+
+
+class PolicyDecisionWriter:
+    """
+    Schreibt Policy-Entscheidungen gebuendelt in SQLite/JSONL.
+
+    audit_policy_decision() legt nur in eine begrenzte Queue; ein Daemon-Thread
+    schreibt in Gruppen (eine Transaktion, ein JSONL-Append je Datei). Ist die
+    Queue voll, wird verworfen und gezaehlt statt den Tool-Call zu blockieren.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int = 50,
+        flush_interval_s: float = 0.5,
+        max_queue: int = 2000,
+    ):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_s = max(0.01, float(flush_interval_s))
+        self._queue: "queue_module.Queue[Tuple[Dict[str, Any], Any, Optional[Path]]]" = queue_module.Queue(
+            maxsize=max(1, int(max_queue))
+        )
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stats = {"submitted": 0, "written": 0, "jsonl_written": 0, "dropped": 0, "batches": 0, "errors": 0}
+
+    def submit(self, decision: Dict[str, Any], task_queue: Any, jsonl_path: Optional[Path]) -> bool:
+        self._ensure_started()
+        with self._cond:
+            self._pending += 1
+        try:
+            self._queue.put_nowait((decision, task_queue, jsonl_path))
+        except queue_module.Full:
+            with self._cond:
+                self._pending -= 1
+                self._stats["dropped"] += 1
+                self._cond.notify_all()
+            return False
+        with self._cond:
+            self._stats["submitted"] += 1
+        return True
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="policy-decision-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=self.flush_interval_s)
+            except queue_module.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue_module.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            finally:
+                with self._cond:
+                    self._pending -= len(batch)
+                    self._cond.notify_all()
+
+    def _write_batch(self, batch: List[Tuple[Dict[str, Any], Any, Optional[Path]]]) -> None:
+        by_queue: Dict[int, Tuple[Any, List[Dict[str, Any]]]] = {}
+        by_path: Dict[Path, List[str]] = {}
+        for decision, task_queue, jsonl_path in batch:
+            if task_queue is not None:
+                by_queue.setdefault(id(task_queue), (task_queue, []))[1].append(decision)
+            if jsonl_path is not None:
+                by_path.setdefault(jsonl_path, []).append(json.dumps(decision, ensure_ascii=True, default=str))
+
+        written = 0
+        for task_queue, decisions in by_queue.values():
+            try:
+                batch_writer = getattr(task_queue, "record_policy_decisions", None)
+                if callable(batch_writer):
+                    written += int(batch_writer(decisions) or 0)
+                else:
+                    for decision in decisions:
+                        task_queue.record_policy_decision(decision, observed_at=str(decision.get("timestamp") or ""))
+                        written += 1
+            except Exception as e:
+                with self._cond:
+                    self._stats["errors"] += 1
+                log.debug("Policy-Decision-Batch (SQLite) fehlgeschlagen: %s", e)
+
+        jsonl_written = 0
+        for path, lines in by_path.items():
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                jsonl_written += len(lines)
+            except Exception as e:
+                with self._cond:
+                    self._stats["errors"] += 1
+                log.debug("Policy-Decision-Audit fehlgeschlagen: %s", e)
+
+        with self._cond:
+            self._stats["written"] += written
+            self._stats["jsonl_written"] += jsonl_written
+            self._stats["batches"] += 1
+
+    def flush(self, timeout_s: float = 5.0) -> bool:
+        """Wartet, bis alle eingereihten Entscheidungen geschrieben sind."""
+        deadline = time.monotonic() + max(0.0, timeout_s)
+        with self._cond:
+            while self._pending > 0:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout_s: float = 5.0) -> None:
+        self.flush(timeout_s)
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout_s)
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "pending": self._pending,
+                "queue_max": self._queue.maxsize,
+                "batch_size": self.batch_size,
+            }
+
+
+_decision_writer: Optional[PolicyDecisionWriter] = None
+_decision_writer_lock = threading.Lock()
+
+
+def get_policy_decision_writer() -> PolicyDecisionWriter:
+    global _decision_writer
+    if _decision_writer is None:
+        with _decision_writer_lock:
+            if _decision_writer is None:
+                _decision_writer = PolicyDecisionWriter(
+                    batch_size=_env_int("POLICY_DECISION_BATCH_SIZE", 50),
+                    flush_interval_s=float(os.getenv("POLICY_DECISION_FLUSH_INTERVAL_S", "0.5") or 0.5),
+                    max_queue=_env_int("POLICY_DECISION_QUEUE_MAX", 2000),
+                )
+                atexit.register(_decision_writer.close, 2.0)
+                try:
+                    from orchestration.task_queue import register_policy_decision_flush_hook
+
+                    register_policy_decision_flush_hook(flush_policy_decisions)
+                except Exception as e:
+                    log.debug("Policy-Decision-Flush-Hook nicht registriert: %s", e)
+    return _decision_writer
+
+
+def flush_policy_decisions(timeout_s: float = 5.0) -> bool:
+    """Read-your-writes fuer Metrik-Leser: schreibt ausstehende Entscheidungen."""
+    if _decision_writer is None:
+        return True
+    return _decision_writer.flush(timeout_s)
+
+
+def get_policy_decision_writer_stats() -> Dict[str, Any]:
+    if _decision_writer is None:
+        return {"enabled": _policy_decision_writer_enabled(), "started": False}
+    return {"enabled": _policy_decision_writer_enabled(), "started": True, **_decision_writer.stats()}
+
+
 def audit_policy_decision(decision: Dict[str, Any]) -> None:
     """Persistiert Policy-Entscheidungen (optional per Feature-Flag)."""
     if not isinstance(decision, dict):
@@ -503,21 +745,34 @@ def audit_policy_decision(decision: Dict[str, Any]) -> None:
     try:
         from orchestration.task_queue import get_queue
 
-        get_queue().record_policy_decision(
-            decision,
-            observed_at=str(decision.get("timestamp") or ""),
-        )
+        task_queue = get_queue()
     except Exception:
-        pass
+        task_queue = None
 
-    if not bool(decision.get("audit_enabled")):
+    jsonl_path: Optional[Path] = None
+    if bool(decision.get("audit_enabled")):
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        jsonl_path = LOGS_DIR / f"{date_str}_policy_decisions.jsonl"
+
+    if _policy_decision_writer_enabled():
+        get_policy_decision_writer().submit(dict(decision), task_queue, jsonl_path)
+        return
+
+    if task_queue is not None:
+        try:
+            task_queue.record_policy_decision(
+                decision,
+                observed_at=str(decision.get("timestamp") or ""),
+            )
+        except Exception:
+            pass
+
+    if jsonl_path is None:
         return
 
     try:
         LOGS_DIR.mkdir(parents=True, exist_ok=True)
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        path = LOGS_DIR / f"{date_str}_policy_decisions.jsonl"
-        with open(path, "a", encoding="utf-8") as f:
+        with open(jsonl_path, "a", encoding="utf-8") as f:
             f.write(json.dumps(decision, ensure_ascii=True, default=str) + "\n")
     except Exception as e:
         log.debug("Policy-Decision-Audit fehlgeschlagen: %s", e)
@@ -526,6 +781,7 @@ def audit_policy_decision(decision: Dict[str, Any]) -> None:
 def get_policy_decision_metrics(window_hours: int = 24) -> Dict[str, Any]:
     """Liest Policy-Decision-JSONL und aggregiert Kennzahlen fuer Monitoring."""
     window = max(1, int(window_hours))
+    flush_policy_decisions(timeout_s=2.0)
 
     # Primärquelle ab M4.3: persistente TaskQueue-Metriken.
     try:
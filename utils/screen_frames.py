@@ -0,0 +1,403 @@
+# utils/screen_frames.py
+"""
+Prozessweiter Screen-Frame-Service fuer alle Vision-Tools.
+
+Bisher oeffnete jedes Tool pro Screenshot einen eigenen ``mss.mss()``-Kontext
+(X11-Verbindung auf- und abbauen) und griff den Bildschirm neu ab — ein
+Agent-Schritt mit Change-Gate, SoM, OCR und Vision-Message capturte denselben
+Screen mehrfach. Der Service haelt stattdessen:
+
+- einen persistenten mss-Handle pro Thread (mss ist nicht thread-safe);
+  er wird beim Thread-Ende bzw. mit ``stop()`` geschlossen
+- einen Ring-Buffer der letzten Frames als NumPy-Arrays mit monoton
+  steigenden Frame-IDs
+- Single-Flight: gleichzeitige Anfragen warten auf denselben Grab
+
+Frames sind unveraenderlich (read-only Arrays). ``frame.rgb`` und
+``frame.bgr`` sind Views auf den BGRA-Puffer von mss, ``frame.roi(...)``
+ist ein Slice davon — ohne Kopie. Kopiert wird erst bei ``to_pil()``.
+
+Tools fragen "neuester Frame, der neuer als X / juenger als N ms ist" statt
+selbst zu grabben. Wer nach einer Aktion zwingend ein frisches Bild braucht
+(Vorher/Nachher-Vergleich, Beobachtung nach Klick), uebergibt die zuletzt
+gesehene Frame-ID als ``newer_than`` oder ``max_age_s=0``.
+
+Konfiguration:
+    SCREEN_FRAME_BUFFER_SIZE   (default: 4)    Frames im Ring-Buffer
+    SCREEN_FRAME_MAX_AGE_MS    (default: 150)  Wiederverwendung ohne newer_than
+
+USAGE:
+    from utils.screen_frames import get_frame_service
+
+    service = get_frame_service()
+    frame = service.latest()                      # ggf. aus dem Buffer
+    button = frame.roi(100, 200, 80, 30)          # Zero-Copy-View (RGB)
+    after = service.latest(newer_than=frame.frame_id)
+    image = after.to_pil()
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+
+import numpy as np
+
+log = logging.getLogger("ScreenFrames")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def _default_monitor_index() -> int:
+    try:
+        return int(os.getenv("ACTIVE_MONITOR", "1"))
+    except ValueError:
+        return 1
+
+
+def _mss_factory() -> Any:
+    import mss
+
+    return mss.mss()
+
+
+class _GrabberHandle:
+    """mss-Handle eines Threads.
+
+    Liegt nur im threading.local des Threads — endet der Thread, faellt die
+    letzte Referenz weg und ``__del__`` schliesst die X11-Verbindung.
+    """
+
+    __slots__ = ("grabber", "closed", "__weakref__")
+
+    def __init__(self, grabber: Any) -> None:
+        self.grabber = grabber
+        self.closed = False
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        close = getattr(self.grabber, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+    def __del__(self) -> None:
+        self.close()
+
+
+@dataclass(frozen=True)
+class ScreenFrame:
+    """Ein unveraenderlicher Screenshot eines Monitors."""
+
+    frame_id: int
+    timestamp: float  # time.monotonic()
+    monitor_index: int
+    monitor: Dict[str, int]  # left/top/width/height in Desktop-Koordinaten
+    bgra: np.ndarray = field(repr=False)
+
+    @property
+    def width(self) -> int:
+        return int(self.bgra.shape[1])
+
+    @property
+    def height(self) -> int:
+        return int(self.bgra.shape[0])
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    @property
+    def age_s(self) -> float:
+        return time.monotonic() - self.timestamp
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """RGB-View (H, W, 3) ohne Kopie."""
+        return self.bgra[..., 2::-1]
+
+    @property
+    def bgr(self) -> np.ndarray:
+        """BGR-View (H, W, 3) ohne Kopie — fuer OpenCV ggf. np.ascontiguousarray()."""
+        return self.bgra[..., :3]
+
+    def roi(self, x: int, y: int, width: int, height: int, *, bgr: bool = False) -> np.ndarray:
+        """Ausschnitt in Monitor-Koordinaten als Zero-Copy-Slice (auf den Frame geclippt)."""
+        x0 = max(0, min(self.width, int(x)))
+        y0 = max(0, min(self.height, int(y)))
+        x1 = max(x0, min(self.width, int(x) + int(width)))
+        y1 = max(y0, min(self.height, int(y) + int(height)))
+        pixels = self.bgr if bgr else self.rgb
+        return pixels[y0:y1, x0:x1]
+
+    def contains(self, left: int, top: int, width: int, height: int) -> bool:
+        """Liegt ein Bereich in Desktop-Koordinaten vollstaendig in diesem Frame?"""
+        return (
+            left >= self.monitor["left"]
+            and top >= self.monitor["top"]
+            and left + width <= self.monitor["left"] + self.width
+            and top + height <= self.monitor["top"] + self.height
+        )
+
+    def to_pil(self, roi: Optional[Dict[str, int]] = None):
+        """PIL-Image (RGB) des Frames oder eines ROI — hier wird kopiert."""
+        from PIL import Image
+
+        if roi:
+            pixels = self.roi(
+                roi.get("x", 0),
+                roi.get("y", 0),
+                roi.get("width", self.width),
+                roi.get("height", self.height),
+            )
+        else:
+            pixels = self.rgb
+        return Image.fromarray(np.ascontiguousarray(pixels), "RGB")
+
+
+class ScreenFrameService:
+    """Ring-Buffer geteilter Screen-Frames mit persistentem Capture-Handle."""
+
+    def __init__(
+        self,
+        *,
+        buffer_size: Optional[int] = None,
+        max_age_s: Optional[float] = None,
+        grabber_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.buffer_size = buffer_size or _env_int("SCREEN_FRAME_BUFFER_SIZE", 4)
+        self.max_age_s = (
+            max_age_s if max_age_s is not None else _env_float("SCREEN_FRAME_MAX_AGE_MS", 150.0) / 1000.0
+        )
+        self._grabber_factory = grabber_factory or _mss_factory
+        self._frames: Deque[ScreenFrame] = deque(maxlen=self.buffer_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._capture_lock = threading.Lock()
+        self._local = threading.local()
+        self._handles: "weakref.WeakSet[_GrabberHandle]" = weakref.WeakSet()
+        self._handles_lock = threading.Lock()
+        self._stats = {"captures": 0, "region_grabs": 0, "buffer_hits": 0, "capture_ms_total": 0.0}
+
+    # ── Capture-Handle ─────────────────────────────────────────────────────
+
+    def _grabber(self) -> Any:
+        handle = getattr(self._local, "handle", None)
+        if handle is None or handle.closed:
+            handle = _GrabberHandle(self._grabber_factory())
+            self._local.handle = handle
+            with self._handles_lock:
+                self._handles.add(handle)
+        return handle.grabber
+
+    def _reset_grabber(self) -> None:
+        handle = getattr(self._local, "handle", None)
+        self._local.handle = None
+        if handle is not None:
+            handle.close()
+
+    def stop(self) -> None:
+        """Schliesst die mss-Handles aller Threads und leert den Buffer.
+
+        Danach bleibt der Service nutzbar — der naechste Grab eines Threads
+        baut seinen Handle neu auf.
+        """
+        with self._handles_lock:
+            handles = list(self._handles)
+        for handle in handles:
+            handle.close()
+        self.clear()
+
+    def _grab(self, region: Dict[str, int]) -> np.ndarray:
+        try:
+            raw = self._grabber().grab(region)
+        except Exception:
+            # Handle kann nach Display-Wechsel/Sleep ungueltig sein — einmal neu aufbauen.
+            self._reset_grabber()
+            raw = self._grabber().grab(region)
+        width, height = raw.size
+        # mss liefert pro Grab einen frischen Puffer (raw) — direkt wrappen statt kopieren.
+        buffer = getattr(raw, "raw", None)
+        if buffer is None:
+            buffer = raw.bgra
+        return np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 4)
+
+    def monitor_geometry(self, monitor_index: Optional[int] = None) -> Dict[str, int]:
+        index = _default_monitor_index() if monitor_index is None else int(monitor_index)
+        monitors = self._grabber().monitors
+        if index < len(monitors):
+            monitor = monitors[index]
+        else:
+            monitor = monitors[1] if len(monitors) > 1 else monitors[0]
+        return {key: int(monitor[key]) for key in ("left", "top", "width", "height")}
+
+    # ── Frames ─────────────────────────────────────────────────────────────
+
+    def _buffered(
+        self,
+        monitor_index: int,
+        newer_than: Optional[int],
+        max_age_s: float,
+    ) -> Optional[ScreenFrame]:
+        with self._lock:
+            for frame in reversed(self._frames):
+                if frame.monitor_index != monitor_index:
+                    continue
+                if newer_than is not None and frame.frame_id <= newer_than:
+                    return None
+                if newer_than is None and frame.age_s > max_age_s:
+                    return None
+                return frame
+        return None
+
+    def capture(self, monitor_index: Optional[int] = None) -> ScreenFrame:
+        """Grabbt immer einen neuen Frame und legt ihn in den Ring-Buffer."""
+        index = _default_monitor_index() if monitor_index is None else int(monitor_index)
+        started = time.perf_counter()
+        monitor = self.monitor_geometry(index)
+        pixels = self._grab(monitor)
+        pixels.flags.writeable = False
+        with self._lock:
+            frame = ScreenFrame(
+                frame_id=next(self._ids),
+                timestamp=time.monotonic(),
+                monitor_index=index,
+                monitor=monitor,
+                bgra=pixels,
+            )
+            self._frames.append(frame)
+            self._stats["captures"] += 1
+            self._stats["capture_ms_total"] += (time.perf_counter() - started) * 1000.0
+        return frame
+
+    def latest(
+        self,
+        monitor_index: Optional[int] = None,
+        *,
+        newer_than: Optional[int] = None,
+        max_age_s: Optional[float] = None,
+    ) -> ScreenFrame:
+        """Neuester Frame, der ``newer_than`` uebertrifft bzw. juenger als ``max_age_s`` ist.
+
+        Ohne passenden Frame im Buffer wird genau einmal gegrabbt — parallele
+        Aufrufer warten auf diesen Grab statt selbst zu capturen.
+        """
+        index = _default_monitor_index() if monitor_index is None else int(monitor_index)
+        age_limit = self.max_age_s if max_age_s is None else max(0.0, float(max_age_s))
+        frame = self._buffered(index, newer_than, age_limit)
+        if frame is not None:
+            with self._lock:
+                self._stats["buffer_hits"] += 1
+            return frame
+        with self._capture_lock:
+            frame = self._buffered(index, newer_than, age_limit)
+            if frame is not None:
+                with self._lock:
+                    self._stats["buffer_hits"] += 1
+                return frame
+            return self.capture(index)
+
+    def get_frame(self, frame_id: int) -> Optional[ScreenFrame]:
+        with self._lock:
+            for frame in self._frames:
+                if frame.frame_id == frame_id:
+                    return frame
+        return None
+
+    def grab_region(
+        self,
+        left: int,
+        top: int,
+        width: int,
+        height: int,
+        *,
+        newer_than: Optional[int] = None,
+        max_age_s: Optional[float] = None,
+    ) -> np.ndarray:
+        """RGB-Pixel eines Desktop-Bereichs.
+
+        Liegt ein passender Frame im Buffer, kommt ein Zero-Copy-Slice daraus.
+        Sonst wird nur der Bereich selbst gegrabbt (kleine Regionen sind
+        deutlich billiger als ein Vollbild) — nicht gepuffert.
+        """
+        age_limit = self.max_age_s if max_age_s is None else max(0.0, float(max_age_s))
+        with self._lock:
+            candidates = list(reversed(self._frames))
+        for frame in candidates:
+            if newer_than is not None and frame.frame_id <= newer_than:
+                break
+            if newer_than is None and frame.age_s > age_limit:
+                break
+            if frame.contains(left, top, width, height):
+                with self._lock:
+                    self._stats["buffer_hits"] += 1
+                return frame.roi(left - frame.monitor["left"], top - frame.monitor["top"], width, height)
+        pixels = self._grab({"left": int(left), "top": int(top), "width": int(width), "height": int(height)})
+        with self._lock:
+            self._stats["region_grabs"] += 1
+        return pixels[..., 2::-1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+
+    def _open_handles(self) -> int:
+        with self._handles_lock:
+            return sum(1 for handle in self._handles if not handle.closed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            captures = self._stats["captures"]
+            return {
+                "buffer_size": self.buffer_size,
+                "buffered_frames": len(self._frames),
+                "last_frame_id": self._frames[-1].frame_id if self._frames else 0,
+                "captures": captures,
+                "region_grabs": self._stats["region_grabs"],
+                "buffer_hits": self._stats["buffer_hits"],
+                "open_handles": self._open_handles(),
+                "avg_capture_ms": round(self._stats["capture_ms_total"] / captures, 2) if captures else 0.0,
+            }
+
+
+_service: Optional[ScreenFrameService] = None
+_service_lock = threading.Lock()
+
+
+def get_frame_service() -> ScreenFrameService:
+    """Lazy-Singleton des prozessweiten Frame-Service."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ScreenFrameService()
+    return _service
+
+
+def shutdown_frame_service() -> None:
+    """Schliesst die Capture-Handles des Singletons (Server-Shutdown)."""
+    if _service is not None:
+        _service.stop()
@@ -0,0 +1,180 @@
+# utils/screen_tiles.py
+"""
+Kachelbasierte Aenderungskarte fuer Screen-Frames (reines NumPy).
+
+Statt den ganzen Screenshot zu hashen und bei Abweichung nur ein 32x32-
+Thumbnail zu vergleichen, wird jeder Frame einmal vektorisiert auf ein
+Zellraster reduziert (Summe je ``cell`` x ``cell`` Pixel ueber alle Kanaele).
+Zwei solche Signaturen ergeben die Aenderungskarte:
+
+- je Zelle die normierte mittlere Intensitaetsaenderung (0..1)
+- je Kachel (``tile`` x ``tile`` Pixel) das Maximum ihrer Zellen
+
+Das Maximum statt eines Mittelwerts sorgt dafuer, dass kleine, aber
+relevante Aenderungen (Spinner, Dialog-Button, Cursor) ihre Kachel
+markieren, statt im Rest des Bildes zu verschwinden. Benachbarte
+schmutzige Kacheln werden zu Rechtecken zusammengefasst, damit OCR, SoM
+und Florence-2 nur diese Bereiche neu analysieren muessen.
+
+Randpixel jenseits eines ganzen Zellvielfachen (bei 1080p/4K mit cell=8
+keine) fliessen nicht in die Signatur ein.
+
+Konfiguration:
+    SCREEN_TILE_SIZE          (default: 64)  Kachelkante in Pixeln
+    SCREEN_TILE_CELL_SIZE     (default: 8)   Zellkante in Pixeln (Teiler der Kachel)
+
+USAGE:
+    signature = compute_cell_signature(frame.bgra)   # Alpha ist konstant, BGRA ist zusammenhaengend
+    change_map = diff_cell_signatures(previous, signature, threshold=0.01)
+    change_map.dirty_rects(offset=(roi_x, roi_y))
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def default_tile_size() -> int:
+    return _env_int("SCREEN_TILE_SIZE", 64)
+
+
+def default_cell_size() -> int:
+    return _env_int("SCREEN_TILE_CELL_SIZE", 8)
+
+
+@dataclass(frozen=True)
+class CellSignature:
+    """Zellsummen eines Frames plus die Geometrie, aus der sie stammen."""
+
+    sums: np.ndarray  # (rows, cols) uint32
+    cell_size: int
+    image_size: Tuple[int, int]  # (width, height)
+    channels: int
+
+    def compatible_with(self, other: "CellSignature") -> bool:
+        return (
+            self.cell_size == other.cell_size
+            and self.image_size == other.image_size
+            and self.channels == other.channels
+        )
+
+
+def compute_cell_signature(pixels: np.ndarray, cell_size: int | None = None) -> CellSignature:
+    """Reduziert ein (H, W[, C]) uint8-Bild auf Zellsummen — ein vektorisierter Durchlauf."""
+    cell = cell_size or default_cell_size()
+    if pixels.ndim == 2:
+        pixels = pixels[..., None]
+    height, width, channels = pixels.shape
+    rows, cols = height // cell, width // cell
+    view = pixels[: rows * cell, : cols * cell]
+    # Zweistufig: erst jede Zellzeile (passt bei cell<=16 in uint16), dann die Zeilen je Zelle.
+    row_dtype = np.uint16 if cell * channels * 255 <= np.iinfo(np.uint16).max else np.uint32
+    row_sums = view.reshape(rows * cell, cols, cell * channels).sum(axis=2, dtype=row_dtype)
+    sums = row_sums.reshape(rows, cell, cols).sum(axis=1, dtype=np.uint32)
+    return CellSignature(sums=sums, cell_size=cell, image_size=(width, height), channels=channels)
+
+
+@dataclass(frozen=True)
+class TileChangeMap:
+    """Ergebnis eines Signaturvergleichs auf Kachelebene."""
+
+    tile_size: int
+    image_size: Tuple[int, int]
+    tile_scores: np.ndarray  # (tile_rows, tile_cols) float32, 0..1
+    dirty_mask: np.ndarray  # (tile_rows, tile_cols) bool
+
+    @property
+    def total_tiles(self) -> int:
+        return int(self.dirty_mask.size)
+
+    @property
+    def dirty_tiles(self) -> int:
+        return int(self.dirty_mask.sum())
+
+    @property
+    def dirty_ratio(self) -> float:
+        return self.dirty_tiles / self.total_tiles if self.total_tiles else 0.0
+
+    @property
+    def max_score(self) -> float:
+        return float(self.tile_scores.max()) if self.tile_scores.size else 0.0
+
+    def _tile_rect(self, row0: int, col0: int, row1: int, col1: int, offset: Tuple[int, int]) -> Dict[str, int]:
+        width, height = self.image_size
+        x0, y0 = col0 * self.tile_size, row0 * self.tile_size
+        x1 = min(width, (col1 + 1) * self.tile_size)
+        y1 = min(height, (row1 + 1) * self.tile_size)
+        return {"x": x0 + offset[0], "y": y0 + offset[1], "width": x1 - x0, "height": y1 - y0}
+
+    def dirty_tile_rects(self, offset: Tuple[int, int] = (0, 0)) -> List[Dict[str, int]]:
+        """Jede schmutzige Kachel einzeln (fuer kachelgenaue Invalidierung)."""
+        return [
+            self._tile_rect(int(r), int(c), int(r), int(c), offset)
+            for r, c in zip(*np.nonzero(self.dirty_mask))
+        ]
+
+    def dirty_rects(self, offset: Tuple[int, int] = (0, 0)) -> List[Dict[str, int]]:
+        """Bounding-Boxen zusammenhaengender schmutziger Kacheln (4er-Nachbarschaft)."""
+        mask = self.dirty_mask
+        seen = np.zeros_like(mask)
+        rects: List[Dict[str, int]] = []
+        rows, cols = mask.shape
+        for start_r, start_c in zip(*np.nonzero(mask)):
+            if seen[start_r, start_c]:
+                continue
+            stack = [(int(start_r), int(start_c))]
+            seen[start_r, start_c] = True
+            r0 = r1 = int(start_r)
+            c0 = c1 = int(start_c)
+            while stack:
+                r, c = stack.pop()
+                r0, r1, c0, c1 = min(r0, r), max(r1, r), min(c0, c), max(c1, c)
+                for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if 0 <= nr < rows and 0 <= nc < cols and mask[nr, nc] and not seen[nr, nc]:
+                        seen[nr, nc] = True
+                        stack.append((nr, nc))
+            rects.append(self._tile_rect(r0, c0, r1, c1, offset))
+        return rects
+
+
+def diff_cell_signatures(
+    previous: CellSignature,
+    current: CellSignature,
+    *,
+    threshold: float,
+    tile_size: int | None = None,
+) -> TileChangeMap:
+    """Vergleicht zwei Signaturen; eine Kachel ist schmutzig, wenn eine ihrer Zellen >= threshold abweicht."""
+    if not previous.compatible_with(current):
+        raise ValueError("Signaturen stammen aus unterschiedlichen Bildgeometrien")
+    tile = tile_size or default_tile_size()
+    cell = current.cell_size
+    if tile % cell:
+        raise ValueError(f"tile_size ({tile}) muss ein Vielfaches von cell_size ({cell}) sein")
+
+    scale = float(255 * cell * cell * current.channels)
+    cell_scores = np.abs(current.sums.astype(np.int64) - previous.sums.astype(np.int64)).astype(np.float32) / scale
+
+    per_tile = tile // cell
+    rows, cols = cell_scores.shape
+    tile_rows, tile_cols = -(-rows // per_tile), -(-cols // per_tile)
+    padded = np.zeros((tile_rows * per_tile, tile_cols * per_tile), dtype=np.float32)
+    padded[:rows, :cols] = cell_scores
+    tile_scores = padded.reshape(tile_rows, per_tile, tile_cols, per_tile).max(axis=(1, 3))
+    return TileChangeMap(
+        tile_size=tile,
+        image_size=current.image_size,
+        tile_scores=tile_scores,
+        dirty_mask=tile_scores >= threshold,
+    )
@@ -13,15 +13,17 @@ Verwendung:
     from utils.telegram_notify import send_telegram
     await send_telegram("Hallo!")              # gebuffert
     await send_telegram("FEHLER!", urgent=True) # sofort
+    schedule_telegram("Hallo!", loop=loop)     # aus Sync-Code / Worker-Threads
 
 M16: send_with_feedback() sendet immer sofort (interaktiv, braucht Feedback-Buttons).
 """
 
+import asyncio
 import json
 import logging
 import os
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 log = logging.getLogger("telegram_notify")
 
@@ -157,6 +159,48 @@ async def send_telegram(msg: str, parse_mode: str = "Markdown", urgent: bool = F
     return True
 
 
+_scheduled_tasks: Set["asyncio.Task[bool]"] = set()
+
+
+def schedule_telegram(
+    msg: str,
+    *,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    parse_mode: str = "Markdown",
+    urgent: bool = False,
+) -> bool:
+    """
+    Plant send_telegram() aus synchronem Code ein, auch aus Worker-Threads.
+
+    - laeuft im aktuellen Thread ein Event-Loop: als Task auf diesem Loop
+    - Worker-Thread mit uebergebenem (laufendem) Loop: run_coroutine_threadsafe
+    - sonst: synchron per asyncio.run()
+
+    asyncio.get_event_loop() wirft in Worker-Threads (z.B. Heartbeat-Stufen)
+    RuntimeError — Benachrichtigungen gingen dort bisher still verloren.
+    """
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+
+    try:
+        if running is not None:
+            task = running.create_task(send_telegram(msg, parse_mode=parse_mode, urgent=urgent))
+            _scheduled_tasks.add(task)
+            task.add_done_callback(_scheduled_tasks.discard)
+            return True
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(
+                send_telegram(msg, parse_mode=parse_mode, urgent=urgent), loop
+            )
+            return True
+        return bool(asyncio.run(send_telegram(msg, parse_mode=parse_mode, urgent=urgent)))
+    except Exception as e:
+        log.debug("Telegram-Scheduling fehlgeschlagen: %s", e)
+        return False
+
+
 async def flush_telegram_digest() -> bool:
     """Explizites Flushen des Buffers — z.B. beim Herunterfahren."""
     return await _flush_buffer()
@@ -0,0 +1,255 @@
+# utils/vision_cache.py
+"""
+Prozessweiter Ergebnis-Cache fuer Vision-Engines (OCR, Florence-2, SoM).
+
+Innerhalb eines visuellen Workflows werden dieselben Bildschirmbereiche oft
+mehrfach analysiert ("Element finden", "Text lesen", Verifikation) — jedes
+Mal mit voller CPU/GPU-Inferenz. Der Cache haelt die Ergebnisse:
+
+- Schluessel: Inhalts-Hash der Bildpixel (blake2b, inkl. Modus/Groesse)
+  plus Engine, Task und Parameter — gleicher Inhalt, gleicher Aufruf,
+  gleiches Ergebnis. Veraltete Treffer sind dadurch ausgeschlossen.
+- LRU-Eviction, begrenzt ueber die geschaetzte Ergebnisgroesse
+  (VISION_CACHE_MAX_MB)
+- Teil-Invalidierung: Eintraege mit bekannter Bildschirmregion werden
+  verworfen, sobald der Screen-Change-Detector dort schmutzige Kacheln meldet
+  (``invalidate_regions``) — unveraenderte Bereiche bleiben im Cache.
+
+Fehlerergebnisse werden nicht gecacht (``cacheable``-Praedikat).
+
+Konfiguration:
+    VISION_CACHE_ENABLED     (default: true)
+    VISION_CACHE_MAX_MB      (default: 64)
+
+USAGE:
+    from utils.vision_cache import get_vision_cache
+
+    result = get_vision_cache().get_or_compute(
+        image,
+        engine="ocr:easyocr",
+        task="process",
+        params={"with_boxes": True},
+        region={"x": 0, "y": 0, "width": 1920, "height": 1080},
+        compute=lambda: run_ocr(image),
+        cacheable=lambda r: not r.get("error"),
+    )
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+log = logging.getLogger("vision_cache")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default)) or default))
+    except ValueError:
+        return default
+
+
+def vision_cache_enabled() -> bool:
+    return os.getenv("VISION_CACHE_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def image_content_hash(image: Any) -> str:
+    """Inhalts-Hash eines PIL-Bildes oder NumPy-Arrays (Geometrie fliesst mit ein)."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(image, np.ndarray):
+        pixels = np.ascontiguousarray(image)
+        digest.update(f"nd:{pixels.dtype.str}:{pixels.shape}".encode())
+        digest.update(memoryview(pixels).cast("B"))
+    else:
+        digest.update(f"pil:{image.mode}:{image.size}".encode())
+        digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _estimate_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str, ensure_ascii=False))
+    except (TypeError, ValueError):
+        return 4096
+
+
+def _rects_overlap(a: Dict[str, int], b: Dict[str, int]) -> bool:
+    return (
+        a["x"] < b["x"] + b["width"]
+        and b["x"] < a["x"] + a["width"]
+        and a["y"] < b["y"] + b["height"]
+        and b["y"] < a["y"] + a["height"]
+    )
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    size: int
+    region: Optional[Dict[str, int]]
+    created_at: float
+
+
+class VisionResultCache:
+    """LRU-Cache fuer Vision-Ergebnisse mit Speicherbudget und Regions-Invalidierung."""
+
+    def __init__(self, *, max_bytes: Optional[int] = None, enabled: Optional[bool] = None) -> None:
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else int(_env_float("VISION_CACHE_MAX_MB", 64.0) * 1024 * 1024)
+        )
+        self.enabled = vision_cache_enabled() if enabled is None else bool(enabled)
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "hash_ms_total": 0.0,
+            "compute_ms_saved": 0.0,
+        }
+        self._compute_ms: Dict[str, float] = {}
+
+    # ── Schluessel ─────────────────────────────────────────────────────────
+
+    def make_key(self, image: Any, *, engine: str, task: str, params: Optional[Dict[str, Any]] = None) -> str:
+        started = time.perf_counter()
+        content = image_content_hash(image)
+        with self._lock:
+            self._stats["hash_ms_total"] += (time.perf_counter() - started) * 1000.0
+        params_text = json.dumps(params or {}, sort_keys=True, default=str)
+        return f"{engine}|{task}|{params_text}|{content}"
+
+    # ── Zugriff ────────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            self._stats["compute_ms_saved"] += self._compute_ms.get(key, 0.0)
+            value = entry.value
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Any, *, region: Optional[Dict[str, int]] = None, compute_ms: float = 0.0) -> None:
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        entry = _CacheEntry(
+            value=copy.deepcopy(value),
+            size=size,
+            region={k: int(region[k]) for k in ("x", "y", "width", "height")} if region else None,
+            created_at=time.time(),
+        )
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._compute_ms[key] = compute_ms
+            self._bytes += size
+            self._stats["stores"] += 1
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop_locked(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def get_or_compute(
+        self,
+        image: Any,
+        *,
+        engine: str,
+        task: str,
+        compute: Callable[[], Any],
+        params: Optional[Dict[str, Any]] = None,
+        region: Optional[Dict[str, int]] = None,
+        cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Liefert das gecachte Ergebnis oder berechnet und speichert es."""
+        if not self.enabled:
+            return compute()
+        key = self.make_key(image, engine=engine, task=task, params=params)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        started = time.perf_counter()
+        value = compute()
+        if value is not None and (cacheable is None or cacheable(value)):
+            self.put(key, value, region=region, compute_ms=(time.perf_counter() - started) * 1000.0)
+        return value
+
+    # ── Invalidierung ──────────────────────────────────────────────────────
+
+    def _drop_locked(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._compute_ms.pop(key, None)
+        self._bytes -= entry.size
+
+    def invalidate_regions(self, rects: Iterable[Dict[str, int]]) -> int:
+        """Verwirft Eintraege, deren Bildschirmregion eine geaenderte Region schneidet."""
+        rects = [r for r in rects or [] if r.get("width", 0) > 0 and r.get("height", 0) > 0]
+        if not rects:
+            return 0
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._entries.items()
+                if entry.region is not None and any(_rects_overlap(entry.region, rect) for rect in rects)
+            ]
+            for key in stale:
+                self._drop_locked(key)
+            self._stats["invalidations"] += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._compute_ms.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._stats["hits"],
+                "misses": self._stats["misses"],
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+                "stores": self._stats["stores"],
+                "evictions": self._stats["evictions"],
+                "invalidations": self._stats["invalidations"],
+                "avg_hash_ms": round(self._stats["hash_ms_total"] / lookups, 2) if lookups else 0.0,
+                "compute_ms_saved": round(self._stats["compute_ms_saved"], 1),
+            }
+
+
+_cache: Optional[VisionResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_vision_cache() -> VisionResultCache:
+    """Lazy-Singleton des prozessweiten Vision-Ergebnis-Caches."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = VisionResultCache()
+    return _cache